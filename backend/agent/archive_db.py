@@ -1,10 +1,46 @@
+import asyncio
 import json
 import psycopg2
 import psycopg2.extras
 from typing import List, Dict, Any, Optional
 
 # 기존 DB 연결 함수 사용
-from .database import get_recom_db_connection, get_db_connection, release_recom_db_connection, release_db_connection
+from .database import (
+    get_recom_db_connection,
+    get_db_connection,
+    release_recom_db_connection,
+    release_db_connection,
+    perfume_adb,
+    recom_adb,
+)
+
+MY_PERFUMES_SQL = """
+    SELECT 
+        p.member_id, p.perfume_id, p.perfume_name, p.register_status, p.preference,
+        p.register_dt
+    FROM tb_member_my_perfume_t p
+    WHERE p.member_id = %s
+    ORDER BY p.register_dt DESC
+"""
+MY_PERFUME_DETAILS_SQL = """
+    SELECT 
+        b.perfume_id, b.perfume_brand, b.img_link,
+        k.name_kr, k.brand_kr
+    FROM tb_perfume_basic_m b
+    LEFT JOIN tb_perfume_name_kr k ON b.perfume_id = k.perfume_id
+    WHERE b.perfume_id = ANY(%s::INTEGER[])
+"""
+PERFUME_ACCORDS_SQL = """
+    SELECT perfume_id, accord
+    FROM TB_PERFUME_ACCORD_R
+    WHERE perfume_id = ANY(%s::INTEGER[]) AND accord IS NOT NULL
+"""
+PERFUME_NOTES_SQL = """
+    SELECT perfume_id, note
+    FROM TB_PERFUME_NOTES_M
+    WHERE perfume_id = ANY(%s::INTEGER[]) AND note IS NOT NULL
+"""
+
 
 def get_my_perfumes(member_id: int) -> List[Dict[str, Any]]:
     """
@@ -18,14 +54,7 @@ def get_my_perfumes(member_id: int) -> List[Dict[str, Any]]:
     try:
         cur = conn_user.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         # 테이블명: tb_member_my_perfume_t
-        cur.execute("""
-            SELECT 
-                p.member_id, p.perfume_id, p.perfume_name, p.register_status, p.preference,
-                p.register_dt
-            FROM tb_member_my_perfume_t p
-            WHERE p.member_id = %s
-            ORDER BY p.register_dt DESC
-        """, (member_id,))
+        cur.execute(MY_PERFUMES_SQL, (member_id,))
         my_perfumes = cur.fetchall()
         cur.close()
     except Exception as e:
@@ -44,15 +73,7 @@ def get_my_perfumes(member_id: int) -> List[Dict[str, Any]]:
     try:
         with conn_perfume.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
             if perfume_ids:
-                fmt = ','.join(['%s'] * len(perfume_ids))
-                cur.execute(f"""
-                    SELECT 
-                        b.perfume_id, b.perfume_brand, b.img_link,
-                        k.name_kr, k.brand_kr
-                    FROM tb_perfume_basic_m b
-                    LEFT JOIN tb_perfume_name_kr k ON b.perfume_id = k.perfume_id
-                    WHERE b.perfume_id IN ({fmt})
-                """, tuple(perfume_ids))
+                cur.execute(MY_PERFUME_DETAILS_SQL, (perfume_ids,))
                 rows = cur.fetchall()
                 for r in rows:
                     details_map[r['perfume_id']] = r
@@ -61,6 +82,31 @@ def get_my_perfumes(member_id: int) -> List[Dict[str, Any]]:
     finally:
         release_db_connection(conn_perfume)
 
+    return _merge_my_perfumes(my_perfumes, details_map)
+
+
+async def get_my_perfumes_async(member_id: int) -> List[Dict[str, Any]]:
+    """get_my_perfumes의 비동기 버전 (asyncio 풀 + Prepared Statement)"""
+    if not recom_adb.enabled:
+        return await asyncio.to_thread(get_my_perfumes, member_id)
+    try:
+        my_perfumes = await recom_adb.fetch_all(MY_PERFUMES_SQL, (member_id,))
+    except Exception as e:
+        print(f"Error fetching my perfumes: {e}")
+        return []
+    if not my_perfumes:
+        return []
+
+    details_map = {}
+    try:
+        rows = await perfume_adb.fetch_all(MY_PERFUME_DETAILS_SQL, ([p['perfume_id'] for p in my_perfumes],))
+        details_map = {r['perfume_id']: r for r in rows}
+    except Exception as e:
+        print(f"Error fetching perfume details: {e}")
+    return _merge_my_perfumes(my_perfumes, details_map)
+
+
+def _merge_my_perfumes(my_perfumes, details_map) -> List[Dict[str, Any]]:
     result = []
     for p in my_perfumes:
         pid = p['perfume_id']
@@ -180,39 +226,14 @@ def get_perfume_notes_and_accords(perfume_ids: List[int]) -> Dict[int, Dict[str,
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
             # Fetch accords
-            fmt = ','.join(['%s'] * len(perfume_ids))
-            cur.execute(f"""
-                SELECT perfume_id, accord
-                FROM TB_PERFUME_ACCORD_R
-                WHERE perfume_id IN ({fmt}) AND accord IS NOT NULL
-            """, tuple(perfume_ids))
+            cur.execute(PERFUME_ACCORDS_SQL, (list(perfume_ids),))
             accords_rows = cur.fetchall()
             
             # Fetch notes (all types: TOP, MIDDLE, BASE)
-            cur.execute(f"""
-                SELECT perfume_id, note
-                FROM TB_PERFUME_NOTES_M
-                WHERE perfume_id IN ({fmt}) AND note IS NOT NULL
-            """, tuple(perfume_ids))
+            cur.execute(PERFUME_NOTES_SQL, (list(perfume_ids),))
             notes_rows = cur.fetchall()
             
-            # Build result dictionary
-            for pid in perfume_ids:
-                result[pid] = {"notes": [], "accords": []}
-            
-            # Populate accords
-            for row in accords_rows:
-                pid = row['perfume_id']
-                accord = row['accord']
-                if pid in result and accord and accord not in result[pid]["accords"]:
-                    result[pid]["accords"].append(accord)
-            
-            # Populate notes (deduplicated across TOP/MIDDLE/BASE)
-            for row in notes_rows:
-                pid = row['perfume_id']
-                note = row['note']
-                if pid in result and note and note not in result[pid]["notes"]:
-                    result[pid]["notes"].append(note)
+            result = _group_notes_and_accords(perfume_ids, accords_rows, notes_rows)
     
     except Exception as e:
         print(f"Error fetching notes/accords: {e}")
@@ -221,3 +242,40 @@ def get_perfume_notes_and_accords(perfume_ids: List[int]) -> Dict[int, Dict[str,
         release_db_connection(conn)
     
     return result
+
+
+async def get_perfume_notes_and_accords_async(perfume_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """get_perfume_notes_and_accords의 비동기 버전 (어코드/노트 조회를 동시에 실행)"""
+    if not perfume_ids:
+        return {}
+    if not perfume_adb.enabled:
+        return await asyncio.to_thread(get_perfume_notes_and_accords, perfume_ids)
+    try:
+        accords_rows, notes_rows = await asyncio.gather(
+            perfume_adb.fetch_all(PERFUME_ACCORDS_SQL, (list(perfume_ids),)),
+            perfume_adb.fetch_all(PERFUME_NOTES_SQL, (list(perfume_ids),)),
+        )
+    except Exception as e:
+        print(f"Error fetching notes/accords: {e}")
+        return {}
+    return _group_notes_and_accords(perfume_ids, accords_rows, notes_rows)
+
+
+def _group_notes_and_accords(perfume_ids, accords_rows, notes_rows) -> Dict[int, Dict[str, Any]]:
+    # Build result dictionary
+    result = {pid: {"notes": [], "accords": []} for pid in perfume_ids}
+
+    # Populate accords
+    for row in accords_rows:
+        pid = row['perfume_id']
+        accord = row['accord']
+        if pid in result and accord and accord not in result[pid]["accords"]:
+            result[pid]["accords"].append(accord)
+
+    # Populate notes (deduplicated across TOP/MIDDLE/BASE)
+    for row in notes_rows:
+        pid = row['perfume_id']
+        note = row['note']
+        if pid in result and note and note not in result[pid]["notes"]:
+            result[pid]["notes"].append(note)
+    return result
@@ -0,0 +1,113 @@
+# backend/agent/async_db.py
+"""
+비동기 Postgres 커넥션 풀 (psycopg 3 + psycopg_pool)
+
+이벤트 루프 안에서 바로 await 하는 DB 접근 계층입니다.
+- 동시성은 스레드 풀 크기가 아니라 풀의 커넥션 수(ASYNC_DB_POOL_MAX)로 결정
+- prepare_threshold=0: 모든 쿼리를 커넥션별 서버 사이드 Prepared Statement로 준비해 재사용
+  (같은 SQL 문자열은 다시 파싱/플래닝하지 않음. PgBouncer transaction 모드에서는
+   ASYNC_DB_PREPARE_THRESHOLD=none 으로 끌 것)
+- SQL은 psycopg2와 같은 %s 플레이스홀더를 그대로 사용
+- psycopg 3가 설치되지 않은 환경에서는 enabled=False가 되며, 호출 측은 기존 동기 함수를
+  asyncio.to_thread로 실행하는 경로를 사용합니다.
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+try:  # pragma: no cover - optional dependency
+    from psycopg.conninfo import make_conninfo
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:  # pragma: no cover
+    AsyncConnectionPool = None
+
+
+def _prepare_threshold() -> Optional[int]:
+    value = os.getenv("ASYNC_DB_PREPARE_THRESHOLD", "0").strip().lower()
+    return None if value in ("", "none", "off") else int(value)
+
+
+def async_db_available() -> bool:
+    """psycopg 3 설치 여부 + ASYNC_DB_ENABLED (동기 풀 크기 결정에도 사용)"""
+    return AsyncConnectionPool is not None and os.getenv("ASYNC_DB_ENABLED", "1") != "0"
+
+
+class AsyncDatabase:
+    def __init__(self, name: str, config: Dict[str, Any], min_size: int = 1, max_size: int = 20) -> None:
+        self.name = name
+        self.config = config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.enabled = async_db_available()
+        self._pool: Optional["AsyncConnectionPool"] = None
+        self._open_lock: Optional[asyncio.Lock] = None
+
+    async def open(self) -> None:
+        """풀 생성 및 최소 커넥션 확보 (startup에서 호출, 호출 전 첫 사용 시에도 자동으로 열림)"""
+        if not self.enabled or self._pool is not None:
+            return
+        if self._open_lock is None:
+            self._open_lock = asyncio.Lock()
+        async with self._open_lock:
+            if self._pool is not None:
+                return
+            pool = AsyncConnectionPool(
+                make_conninfo(**{k: str(v) for k, v in self.config.items()}),
+                min_size=self.min_size,
+                max_size=self.max_size,
+                kwargs={"prepare_threshold": _prepare_threshold()},
+                name=self.name,
+                open=False,
+            )
+            await pool.open()
+            self._pool = pool
+            print(f"🔌 [AsyncDB] {self.name} pool opened ({self.min_size}-{self.max_size})", flush=True)
+
+    async def close(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await pool.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """psycopg_pool 통계 (대기 요청 수, 대기 시간, 사용 시간 등)"""
+        if self._pool is None:
+            return {"enabled": self.enabled, "open": False}
+        return {"enabled": True, "open": True, **self._pool.get_stats()}
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        """트랜잭션 단위 커넥션 (정상 종료 시 commit, 예외 시 rollback 후 풀에 반납)"""
+        if self._pool is None:
+            await self.open()
+        async with self._pool.connection() as conn:
+            yield conn
+
+    async def fetch_all(self, sql: str, params: Sequence[Any] = (), dict_rows: bool = True) -> List[Any]:
+        async with self.connection() as conn:
+            cur = conn.cursor(row_factory=dict_row) if dict_rows else conn.cursor()
+            async with cur:
+                await cur.execute(sql, params)
+                return await cur.fetchall()
+
+    async def fetch_one(self, sql: str, params: Sequence[Any] = (), dict_rows: bool = True) -> Optional[Any]:
+        async with self.connection() as conn:
+            cur = conn.cursor(row_factory=dict_row) if dict_rows else conn.cursor()
+            async with cur:
+                await cur.execute(sql, params)
+                return await cur.fetchone()
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """단일 쓰기 쿼리 실행 후 commit, 영향받은 행 수 반환"""
+        async with self.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(sql, params)
+                return cur.rowcount
+
+    async def execute_many(self, sql: str, params_seq: Sequence[Sequence[Any]]) -> None:
+        """같은 쓰기 쿼리를 여러 파라미터로 실행 (파이프라인 모드로 왕복 1회) 후 commit"""
+        async with self.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.executemany(sql, params_seq)
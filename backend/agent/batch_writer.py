@@ -0,0 +1,119 @@
+# backend/agent/batch_writer.py
+"""
+행 단위 write-behind 배치 저장기
+
+요청 경로에서는 submit()으로 메모리 버퍼에 행을 쌓기만 하고 바로 반환합니다.
+워커가 max_batch개가 모이거나 flush_interval초가 지나면 한 번에 multi-row INSERT를 합니다.
+- flush_fn이 코루틴 함수면 워커가 직접 await, 동기 함수면 스레드 풀에서 실행
+- 버퍼는 max_pending까지 보관 (DB 장애 등으로 넘치면 오래된 행부터 버리고 dropped에 기록)
+- 저장 실패 시 해당 배치를 버퍼 앞에 되돌려 다음 주기에 다시 시도
+- 종료 시 stop()이 남은 행을 모두 저장한 뒤 워커를 정리
+"""
+
+import asyncio
+from typing import Any, Callable, Iterable, List, Optional
+
+FlushFn = Callable[[List[Any]], Any]
+
+
+class BatchWriter:
+    def __init__(
+        self,
+        flush_fn: FlushFn,
+        max_batch: int = 200,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+        name: str = "batch",
+    ):
+        self._flush_fn = flush_fn
+        self._max_batch = max(1, max_batch)
+        self._flush_interval = flush_interval
+        self._max_pending = max(self._max_batch, max_pending)
+        self.name = name
+        self.dropped = 0
+        self._pending: List[Any] = []
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        # 테스트 등에서 루프가 바뀐 경우 새 루프 기준으로 다시 시작 (버퍼는 유지)
+        self._loop = loop
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = loop.create_task(self._run(), name=f"batch-writer-{self.name}")
+
+    def submit(self, rows: Iterable[Any]) -> None:
+        """행을 버퍼에 추가하고 바로 반환 (이벤트 루프 스레드에서 호출)"""
+        rows = list(rows)
+        if not rows:
+            return
+        self.start()
+        self._pending.extend(rows)
+        overflow = len(self._pending) - self._max_pending
+        if overflow > 0:
+            del self._pending[:overflow]
+            self.dropped += overflow
+            print(f"⚠️ [BatchWriter:{self.name}] buffer full, dropped {overflow} oldest rows", flush=True)
+        if len(self._pending) >= self._max_batch:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """지금까지 submit한 행을 모두 저장할 때까지 대기"""
+        if self._flush_lock is not None:
+            await self._drain()
+
+    async def stop(self) -> None:
+        """남은 행을 모두 저장한 뒤 워커 종료"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+                # 크기 임계값으로 깨어난 경우 꽉 찬 배치만 저장하고 나머지는 다음 주기로
+                full_only = not self._stopping
+            except asyncio.TimeoutError:
+                full_only = False
+            self._wakeup.clear()
+            await self._drain(full_only)
+        await self._drain()
+
+    async def _drain(self, full_only: bool = False) -> None:
+        async with self._flush_lock:
+            while len(self._pending) >= (self._max_batch if full_only else 1):
+                batch = self._pending[: self._max_batch]
+                del self._pending[: self._max_batch]
+                try:
+                    if asyncio.iscoroutinefunction(self._flush_fn):
+                        await self._flush_fn(batch)
+                    else:
+                        await asyncio.to_thread(self._flush_fn, batch)
+                except Exception as e:
+                    print(f"⚠️ [BatchWriter:{self.name}] Failed to write {len(batch)} rows: {e}", flush=True)
+                    if self._stopping:
+                        self.dropped += len(batch) + len(self._pending)
+                        self._pending.clear()
+                    else:
+                        # 다음 주기에 다시 시도
+                        self._pending[:0] = batch
+                    return
@@ -0,0 +1,276 @@
+# backend/agent/brand_resolver.py
+"""
+로컬 브랜드명 해석기 (LLM 브랜드 매처 앞단)
+
+사용자가 입력한 브랜드명을 DB 브랜드 목록에 맞춰 정규화합니다.
+1. 정규화 일치: 대소문자/악센트/공백/기호 무시 (Hermès = hermes = HERMES)
+2. 알려진 별칭: 한글 표기 등 (샤넬 -> Chanel, 조말론 -> Jo Malone London)
+3. 편집 거리 후보: 라틴 문자는 글자 단위, 한글은 자모 단위로 비교 (인접 글자 뒤바뀜 1회 = 거리 1)
+   최단 거리 브랜드가 하나뿐이고 허용 거리 이내일 때만 확정합니다.
+확신이 낮으면 None을 반환하고, 호출 측에서 LLM 매처로 넘깁니다.
+LLM 결과는 BrandMatchMemo(SQLite)에 저장해 같은 오탈자를 다시 묻지 않습니다.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from Levenshtein import distance as _levenshtein
+except ImportError:  # pragma: no cover
+    _levenshtein = None
+
+
+# 한글 표기 -> DB 브랜드 후보 (목록에 있는 첫 번째 후보로 연결)
+BRAND_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "샤넬": ("Chanel",),
+    "디올": ("Dior", "Christian Dior"),
+    "크리스찬디올": ("Christian Dior", "Dior"),
+    "조말론": ("Jo Malone London", "Jo Malone"),
+    "조말론런던": ("Jo Malone London", "Jo Malone"),
+    "딥디크": ("Diptyque",),
+    "딥티크": ("Diptyque",),
+    "바이레도": ("Byredo",),
+    "르라보": ("Le Labo",),
+    "에르메스": ("Hermès", "Hermes"),
+    "구찌": ("Gucci",),
+    "프라다": ("Prada",),
+    "톰포드": ("Tom Ford",),
+    "입생로랑": ("Yves Saint Laurent",),
+    "이브생로랑": ("Yves Saint Laurent",),
+    "생로랑": ("Yves Saint Laurent",),
+    "겔랑": ("Guerlain",),
+    "지방시": ("Givenchy",),
+    "랑콤": ("Lancôme", "Lancome"),
+    "아르마니": ("Giorgio Armani", "Armani"),
+    "조르지오아르마니": ("Giorgio Armani",),
+    "불가리": ("Bvlgari", "Bulgari"),
+    "버버리": ("Burberry",),
+    "캘빈클라인": ("Calvin Klein",),
+    "씨케이": ("Calvin Klein",),
+    "끌로에": ("Chloé", "Chloe"),
+    "클로에": ("Chloé", "Chloe"),
+    "랑방": ("Lanvin",),
+    "몽블랑": ("Montblanc",),
+    "마크제이콥스": ("Marc Jacobs",),
+    "메종마르지엘라": ("Maison Margiela", "Maison Martin Margiela"),
+    "마르지엘라": ("Maison Margiela", "Maison Martin Margiela"),
+    "메종프란시스커정": ("Maison Francis Kurkdjian",),
+    "프란시스커정": ("Maison Francis Kurkdjian",),
+    "크리드": ("Creed",),
+    "킬리안": ("Kilian", "By Kilian"),
+    "펜할리곤스": ("Penhaligon's",),
+    "아쿠아디파르마": ("Acqua di Parma",),
+    "아틀리에코롱": ("Atelier Cologne",),
+    "산타마리아노벨라": ("Santa Maria Novella",),
+    "돌체앤가바나": ("Dolce&Gabbana", "Dolce & Gabbana"),
+    "베르사체": ("Versace",),
+    "발렌티노": ("Valentino",),
+    "페라가모": ("Salvatore Ferragamo",),
+    "에스티로더": ("Estée Lauder", "Estee Lauder"),
+    "논픽션": ("Nonfiction",),
+    "탬버린즈": ("Tamburins",),
+    "이솝": ("Aesop",),
+}
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+_NON_WORD = re.compile(r"[^0-9a-zㄱ-ㆎ가-힣]+")
+
+
+def normalize_brand(text: str) -> str:
+    """악센트/대소문자/공백/기호를 제거한 비교용 키 (한글은 그대로 유지)"""
+    decomposed = unicodedata.normalize("NFKD", text.lower().replace("&", " and "))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    # NFKD가 한글 음절을 자모로 쪼개므로 다시 합침
+    return _NON_WORD.sub("", unicodedata.normalize("NFC", stripped))
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모열로 분해 (오탈자 거리 계산용)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            offset = code - _HANGUL_BASE
+            out.append(_CHOSEONG[offset // 588])
+            out.append(_JUNGSEONG[(offset % 588) // 28])
+            if offset % 28:
+                out.append(_JONGSEONG[offset % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _is_hangul(key: str) -> bool:
+    return any(_HANGUL_BASE <= ord(ch) <= _HANGUL_LAST for ch in key)
+
+
+def allowed_distance(length: int) -> int:
+    if length < 4:
+        return 0
+    if length <= 5:
+        return 1
+    if length <= 10:
+        return 2
+    return 3
+
+
+def osa_distance(a: str, b: str) -> int:
+    """인접 글자 뒤바뀜을 1로 세는 편집 거리 (Optimal String Alignment)"""
+    if a == b:
+        return 0
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def brands_fingerprint(brands: Iterable[str]) -> str:
+    """브랜드 목록이 바뀌면 LLM 메모를 새로 쓰도록 목록 해시를 키에 포함"""
+    return hashlib.sha256("\n".join(sorted(brands)).encode("utf-8")).hexdigest()[:16]
+
+
+class BrandResolver:
+    def __init__(self, brands: Sequence[str], aliases: Optional[Dict[str, Tuple[str, ...]]] = None) -> None:
+        self.brands = list(brands)
+        self.fingerprint = brands_fingerprint(self.brands)
+
+        # 기존 동작과 같게 대소문자만 다른 경우 목록의 첫 브랜드를 우선
+        self._lower: Dict[str, str] = {}
+        self._exact: Dict[str, str] = {}
+        for brand in self.brands:
+            self._lower.setdefault(brand.lower(), brand)
+            key = normalize_brand(brand)
+            if key:
+                self._exact.setdefault(key, brand)
+
+        for alias, targets in (BRAND_ALIASES if aliases is None else aliases).items():
+            key = normalize_brand(alias)
+            if not key or key in self._exact:
+                continue
+            for target in targets:
+                brand = self._exact.get(normalize_brand(target))
+                if brand:
+                    self._exact[key] = brand
+                    break
+
+        # 편집 거리 비교용 키: (비교 문자열) 길이별 버킷
+        self._fuzzy: Dict[int, List[Tuple[str, str]]] = defaultdict(list)
+        for key, brand in self._exact.items():
+            form = to_jamo(key) if _is_hangul(key) else key
+            self._fuzzy[len(form)].append((form, brand))
+
+    def resolve(self, user_input: str) -> Optional[str]:
+        """확신할 수 있는 DB 브랜드명, 없으면 None"""
+        if not user_input:
+            return None
+        brand = self._lower.get(user_input.lower())
+        if brand:
+            return brand
+        key = normalize_brand(user_input)
+        if not key:
+            return None
+        brand = self._exact.get(key)
+        if brand:
+            return brand
+        return self._resolve_fuzzy(to_jamo(key) if _is_hangul(key) else key)
+
+    def _resolve_fuzzy(self, form: str) -> Optional[str]:
+        limit = allowed_distance(len(form))
+        if limit == 0:
+            return None
+
+        best_distance = limit + 1
+        best: set = set()
+        for length in range(len(form) - limit, len(form) + limit + 1):
+            for candidate, brand in self._fuzzy.get(length, ()):
+                # 레벤슈타인 거리는 OSA 거리의 2배를 넘지 않으므로 C 구현으로 먼저 거름
+                if _levenshtein is not None and _levenshtein(form, candidate) > 2 * limit:
+                    continue
+                d = osa_distance(form, candidate)
+                if d < best_distance:
+                    best_distance, best = d, {brand}
+                elif d == best_distance:
+                    best.add(brand)
+
+        # 같은 거리의 서로 다른 브랜드가 있으면 모호하므로 LLM에 맡김
+        return next(iter(best)) if len(best) == 1 else None
+
+
+class BrandMatchMemo:
+    """LLM 브랜드 매칭 결과 저장소 (프로세스 메모리 + SQLite, 재시작 후에도 유지)"""
+
+    def __init__(self, store_path: Optional[str] = None) -> None:
+        self._memory: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        self._store: Optional[sqlite3.Connection] = None
+        if store_path:
+            self._open_store(store_path)
+
+    def _open_store(self, path: str) -> None:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS brand_match ("
+                "fingerprint TEXT NOT NULL, query TEXT NOT NULL, brand TEXT NOT NULL, "
+                "PRIMARY KEY (fingerprint, query))"
+            )
+            conn.commit()
+            self._store = conn
+        except Exception as e:
+            print(f"⚠️ Brand Match Store Error: {e}")
+            self._store = None
+
+    def get(self, fingerprint: str, query: str) -> Optional[str]:
+        """저장된 결과 (매칭 실패는 빈 문자열), 기록이 없으면 None"""
+        key = (fingerprint, query)
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+            if self._store is None:
+                return None
+            try:
+                row = self._store.execute(
+                    "SELECT brand FROM brand_match WHERE fingerprint = ? AND query = ?", key
+                ).fetchone()
+            except Exception as e:
+                print(f"⚠️ Brand Match Read Error: {e}")
+                return None
+            if row is None:
+                return None
+            self._memory[key] = row[0]
+            return row[0]
+
+    def put(self, fingerprint: str, query: str, brand: str) -> None:
+        with self._lock:
+            self._memory[(fingerprint, query)] = brand
+            if self._store is None:
+                return
+            try:
+                self._store.execute(
+                    "INSERT OR REPLACE INTO brand_match (fingerprint, query, brand) VALUES (?, ?, ?)",
+                    (fingerprint, query, brand),
+                )
+                self._store.commit()
+            except Exception as e:
+                print(f"⚠️ Brand Match Write Error: {e}")
@@ -0,0 +1,94 @@
+# backend/agent/chat_history.py
+"""
+채팅 히스토리 keyset 페이지네이션
+
+(CREATED_DT, MESSAGE_ID) 순서의 keyset 커서로 대화를 페이지 단위로 읽습니다.
+- OFFSET 없이 (THREAD_ID, CREATED_DT, MESSAGE_ID) 인덱스만 타므로 긴 대화에서도 페이지 비용이 일정
+- 커서는 마지막으로 받은 메시지의 (created_dt, id)를 base64로 감싼 불투명 문자열
+- before: 커서보다 이전 메시지 (최신 → 과거로 스크롤), after: 커서 이후 메시지 (순서대로 스트리밍)
+- META_DATA(JSON)는 include_meta=True일 때만 조회
+결과 messages는 항상 시간 순(오래된 것 먼저)입니다.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+BEFORE = "before"
+AFTER = "after"
+
+_BASE_COLUMNS = "MESSAGE_ID as id, CREATED_DT as created_dt, ROLE as role, MESSAGE as text"
+
+
+def encode_cursor(created_dt: Any, message_id: int) -> str:
+    created = created_dt.isoformat() if isinstance(created_dt, datetime) else str(created_dt)
+    raw = f"{created}|{int(message_id)}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """잘못된 커서는 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created, message_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").rsplit("|", 1)
+        return datetime.fromisoformat(created), int(message_id)
+    except Exception as e:
+        raise ValueError(f"invalid history cursor: {cursor!r}") from e
+
+
+def build_history_query(
+    thread_id: str,
+    limit: Optional[int] = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    include_meta: bool = True,
+    oldest_first: bool = False,
+) -> Tuple[str, Tuple[Any, ...], bool]:
+    """(sql, params, reversed) - reversed=True면 DESC로 읽었으므로 호출 측에서 뒤집어야 함
+
+    limit만 주면 가장 최근 limit개(oldest_first=True면 가장 오래된 limit개),
+    limit이 없으면 대화 전체를 읽습니다.
+    같은 옵션 조합은 항상 같은 SQL 문자열이 되도록 만듭니다. (Prepared Statement 재사용)
+    """
+    if before and after:
+        raise ValueError("before and after cannot be used together")
+    columns = _BASE_COLUMNS + (", META_DATA as metadata" if include_meta else "")
+    sql = f"SELECT {columns} FROM TB_CHAT_MESSAGE_T WHERE THREAD_ID = %s"
+    params: List[Any] = [thread_id]
+
+    if before or after:
+        created_dt, message_id = decode_cursor(before or after)
+        sql += f" AND (CREATED_DT, MESSAGE_ID) {'<' if before else '>'} (%s, %s)"
+        params += [created_dt, message_id]
+
+    # 최근 창(limit만 지정) 또는 before는 최신부터 읽고 뒤집음
+    descending = bool(before) or (limit is not None and not after and not oldest_first)
+    order = "DESC" if descending else "ASC"
+    sql += f" ORDER BY CREATED_DT {order}, MESSAGE_ID {order}"
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return sql, tuple(params), descending
+
+
+def history_rows(rows: List[Dict[str, Any]], reversed_order: bool) -> List[Dict[str, Any]]:
+    messages = [dict(row) for row in rows]
+    if reversed_order:
+        messages.reverse()
+    for message in messages:
+        if isinstance(message.get("created_dt"), datetime):
+            message["created_dt"] = message["created_dt"].isoformat()
+    return messages
+
+
+def history_page(messages: List[Dict[str, Any]], limit: int, direction: str) -> Dict[str, Any]:
+    """limit + 1개를 읽은 결과로 페이지 구성 (다음 페이지 존재 여부와 이어 읽을 커서)"""
+    has_more = len(messages) > limit
+    if has_more:
+        # before/최근 창은 가장 오래된 쪽, after는 가장 최신 쪽이 남는 메시지
+        messages = messages[1:] if direction == BEFORE else messages[:limit]
+    next_cursor = None
+    if has_more and messages:
+        edge = messages[0] if direction == BEFORE else messages[-1]
+        next_cursor = encode_cursor(edge["created_dt"], edge["id"])
+    return {"messages": messages, "has_more": has_more, "next_cursor": next_cursor}
@@ -0,0 +1,94 @@
+# backend/agent/chat_writer.py
+"""
+채팅 메시지 백그라운드 저장기
+
+SSE 스트리밍 중 DB INSERT가 응답 경로를 막지 않도록 메시지 저장을 큐에 넣고 워커가 처리합니다.
+- save_fn이 코루틴 함수면 워커가 직접 await, 동기 함수면 스레드 풀에서 실행합니다.
+- thread_id 해시로 샤드를 고정하므로 같은 대화방의 메시지는 들어온 순서대로 저장됩니다.
+- 큐 크기가 제한되어 있어 DB가 느려지면 enqueue에서 대기(backpressure)합니다.
+- 종료 시 stop()이 남은 메시지를 모두 저장한 뒤 워커를 정리합니다.
+"""
+
+import asyncio
+import zlib
+from typing import Any, Callable, List, Optional, Tuple
+
+SaveFn = Callable[..., Any]
+
+_STOP = object()
+
+
+class ChatMessageWriter:
+    def __init__(self, save_fn: SaveFn, shards: int = 4, max_queue_size: int = 1000):
+        self._save_fn = save_fn
+        self._shards = max(1, shards)
+        self._max_queue_size = max_queue_size
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queues = [asyncio.Queue(maxsize=self._max_queue_size) for _ in range(self._shards)]
+        self._workers = [
+            asyncio.create_task(self._run(queue), name=f"chat-writer-{i}")
+            for i, queue in enumerate(self._queues)
+        ]
+
+    def _queue_for(self, thread_id: str) -> asyncio.Queue:
+        if not self._workers or self._loop is not asyncio.get_running_loop():
+            # 테스트 등에서 루프가 바뀐 경우 새 루프 기준으로 다시 시작
+            self._workers = []
+            self.start()
+        return self._queues[zlib.crc32(str(thread_id).encode("utf-8")) % self._shards]
+
+    async def enqueue(
+        self, thread_id: str, member_id: int, role: str, message: str, meta: dict = None
+    ) -> None:
+        """저장 요청을 큐에 넣고 바로 반환 (큐가 가득 차면 빈 자리가 날 때까지 대기)"""
+        args: Tuple = (thread_id, member_id, role, message)
+        await self._queue_for(thread_id).put((args, meta, None))
+
+    async def flush(self, thread_id: str) -> None:
+        """해당 대화방에 대해 지금까지 넣은 메시지가 모두 저장될 때까지 대기"""
+        done = asyncio.get_running_loop().create_future()
+        await self._queue_for(thread_id).put((None, None, done))
+        await done
+
+    async def stop(self) -> None:
+        """남은 메시지를 모두 저장한 뒤 워커 종료"""
+        if not self._workers:
+            return
+        for queue in self._queues:
+            await queue.put(_STOP)
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queues = []
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            item = await queue.get()
+            try:
+                if item is _STOP:
+                    return
+                args, meta, done = item
+                if done is not None:
+                    if not done.done():
+                        done.set_result(None)
+                    continue
+                try:
+                    call_args = (*args, meta) if meta else args
+                    if asyncio.iscoroutinefunction(self._save_fn):
+                        await self._save_fn(*call_args)
+                    else:
+                        await asyncio.to_thread(self._save_fn, *call_args)
+                except Exception as e:
+                    print(f"⚠️ [ChatWriter] Failed to save message ({args[0]}): {e}", flush=True)
+            finally:
+                queue.task_done()
@@ -0,0 +1,630 @@
+# backend/agent/checkpointer.py
+"""
+영속 LangGraph 체크포인터 (SQLite / Postgres + 메모리 Hot Tier)
+
+MemorySaver는 프로세스 메모리에만 상태를 보관하므로 재배포 시 대화 상태가 사라지고
+(→ stream_generator의 DB 히스토리 복원 경로), 워커를 여러 개 띄울 수 없으며,
+트래픽이 쌓이면 메모리가 계속 늘어납니다.
+
+- 영속 저장소: 로컬은 SQLite 파일, 운영은 Postgres(recom_db) 테이블
+- Hot Tier: 대화방별 최신 체크포인트를 LRU + TTL로 제한된 개수만 메모리에 유지
+  (다른 워커가 같은 대화방을 갱신했을 수 있으므로 대화방별 head 행(최신 ID + 쓰기마다 올라가는 버전)을
+   기본 키로 한 번 읽어 유효성 확인)
+- 대화방마다 최근 N개 체크포인트만 남기고 오래된 것은 정리
+"""
+
+import abc
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig  # type: ignore[reportMissingImports]
+from langgraph.checkpoint.base import (  # type: ignore[reportMissingImports]
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import MemorySaver  # type: ignore[reportMissingImports]
+
+
+# ==========================================
+# 영속 저장소 (SQLite / Postgres 공용 SQL)
+# ==========================================
+class _SQLCheckpointStore(abc.ABC):
+    """DB-API 커넥션 위에서 동작하는 체크포인트/쓰기 테이블 접근 계층"""
+
+    placeholder = "?"
+    blob_type = "BLOB"
+
+    def setup(self) -> None:
+        p = self.blob_type
+        with self.cursor() as cur:
+            cur.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS TB_GRAPH_CHECKPOINT_T (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    parent_checkpoint_id TEXT,
+                    checkpoint_type TEXT NOT NULL,
+                    checkpoint {p} NOT NULL,
+                    metadata_type TEXT NOT NULL,
+                    metadata {p} NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                )
+                """
+            )
+            cur.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS TB_GRAPH_CHECKPOINT_WRITE_T (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    channel TEXT NOT NULL,
+                    value_type TEXT NOT NULL,
+                    value {p} NOT NULL,
+                    task_path TEXT NOT NULL DEFAULT '',
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                )
+                """
+            )
+            # 대화방별 최신 체크포인트 ID와 버전 (체크포인트/쓰기가 저장될 때마다 버전 증가)
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS TB_GRAPH_CHECKPOINT_HEAD_T (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (thread_id, checkpoint_ns)
+                )
+                """
+            )
+
+    @abc.abstractmethod
+    def cursor(self) -> ContextManager[Any]:
+        """커밋/롤백까지 처리하는 커서 컨텍스트"""
+
+    def _sql(self, sql: str) -> str:
+        return sql.replace("%s", self.placeholder)
+
+    def put_checkpoint(self, row: Tuple) -> Tuple[str, int]:
+        """체크포인트 저장 후 대화방의 head (최신 체크포인트 ID, 버전) 반환"""
+        thread_id, checkpoint_ns, checkpoint_id = row[:3]
+        with self.cursor() as cur:
+            cur.execute(
+                self._sql(
+                    """
+                    INSERT INTO TB_GRAPH_CHECKPOINT_T
+                        (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+                         checkpoint_type, checkpoint, metadata_type, metadata)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id) DO UPDATE SET
+                        checkpoint_type = EXCLUDED.checkpoint_type,
+                        checkpoint = EXCLUDED.checkpoint,
+                        metadata_type = EXCLUDED.metadata_type,
+                        metadata = EXCLUDED.metadata
+                    """
+                ),
+                row,
+            )
+            # 체크포인트 ID는 시간순이므로 더 큰 ID만 head로
+            cur.execute(
+                self._sql(
+                    """
+                    INSERT INTO TB_GRAPH_CHECKPOINT_HEAD_T (thread_id, checkpoint_ns, checkpoint_id, version)
+                    VALUES (%s, %s, %s, 1)
+                    ON CONFLICT (thread_id, checkpoint_ns) DO UPDATE SET
+                        checkpoint_id = CASE
+                            WHEN EXCLUDED.checkpoint_id > TB_GRAPH_CHECKPOINT_HEAD_T.checkpoint_id
+                            THEN EXCLUDED.checkpoint_id
+                            ELSE TB_GRAPH_CHECKPOINT_HEAD_T.checkpoint_id
+                        END,
+                        version = TB_GRAPH_CHECKPOINT_HEAD_T.version + 1
+                    """
+                ),
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+            return self._read_head(cur, thread_id, checkpoint_ns)
+
+    def put_writes(self, rows: List[Tuple], replace: bool) -> None:
+        conflict = (
+            "DO UPDATE SET channel = EXCLUDED.channel, value_type = EXCLUDED.value_type, "
+            "value = EXCLUDED.value, task_path = EXCLUDED.task_path"
+            if replace
+            else "DO NOTHING"
+        )
+        with self.cursor() as cur:
+            cur.executemany(
+                self._sql(
+                    f"""
+                    INSERT INTO TB_GRAPH_CHECKPOINT_WRITE_T
+                        (thread_id, checkpoint_ns, checkpoint_id, task_id, idx,
+                         channel, value_type, value, task_path)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id, task_id, idx) {conflict}
+                    """
+                ),
+                rows,
+            )
+            # pending write가 바뀌었으므로 head 버전을 올려 다른 워커의 Hot Tier 무효화
+            cur.execute(
+                self._sql(
+                    "UPDATE TB_GRAPH_CHECKPOINT_HEAD_T SET version = version + 1 "
+                    "WHERE thread_id = %s AND checkpoint_ns = %s"
+                ),
+                (rows[0][0], rows[0][1]),
+            )
+
+    def _read_head(self, cur, thread_id: str, checkpoint_ns: str) -> Optional[Tuple[str, int]]:
+        cur.execute(
+            self._sql(
+                "SELECT checkpoint_id, version FROM TB_GRAPH_CHECKPOINT_HEAD_T "
+                "WHERE thread_id = %s AND checkpoint_ns = %s"
+            ),
+            (thread_id, checkpoint_ns),
+        )
+        row = cur.fetchone()
+        return (row[0], int(row[1])) if row else None
+
+    def latest_signature(self, thread_id: str, checkpoint_ns: str) -> Optional[Tuple[str, int]]:
+        """최신 체크포인트 ID와 head 버전 (기본 키 조회 한 번)"""
+        with self.cursor() as cur:
+            head = self._read_head(cur, thread_id, checkpoint_ns)
+            if head is not None:
+                return head
+            # head 테이블 도입 전에 저장된 대화방: 최신 체크포인트로 head 행을 한 번 채움
+            cur.execute(
+                self._sql(
+                    """
+                    SELECT checkpoint_id FROM TB_GRAPH_CHECKPOINT_T
+                    WHERE thread_id = %s AND checkpoint_ns = %s
+                    ORDER BY checkpoint_id DESC
+                    LIMIT 1
+                    """
+                ),
+                (thread_id, checkpoint_ns),
+            )
+            row = cur.fetchone()
+            if not row:
+                return None
+            cur.execute(
+                self._sql(
+                    """
+                    INSERT INTO TB_GRAPH_CHECKPOINT_HEAD_T (thread_id, checkpoint_ns, checkpoint_id, version)
+                    VALUES (%s, %s, %s, 0)
+                    ON CONFLICT (thread_id, checkpoint_ns) DO NOTHING
+                    """
+                ),
+                (thread_id, checkpoint_ns, row[0]),
+            )
+            return self._read_head(cur, thread_id, checkpoint_ns)
+
+    def list_checkpoints(
+        self,
+        thread_id: Optional[str],
+        checkpoint_ns: Optional[str],
+        checkpoint_id: Optional[str],
+        before_id: Optional[str],
+        limit: Optional[int],
+    ) -> List[Tuple]:
+        clauses, params = [], []
+        if thread_id is not None:
+            clauses.append("thread_id = %s")
+            params.append(thread_id)
+        if checkpoint_ns is not None:
+            clauses.append("checkpoint_ns = %s")
+            params.append(checkpoint_ns)
+        if checkpoint_id is not None:
+            clauses.append("checkpoint_id = %s")
+            params.append(checkpoint_id)
+        if before_id is not None:
+            clauses.append("checkpoint_id < %s")
+            params.append(before_id)
+        sql = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "checkpoint_type, checkpoint, metadata_type, metadata FROM TB_GRAPH_CHECKPOINT_T"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY checkpoint_id DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self.cursor() as cur:
+            cur.execute(self._sql(sql), params)
+            return cur.fetchall()
+
+    def get_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[Tuple]:
+        with self.cursor() as cur:
+            cur.execute(
+                self._sql(
+                    """
+                    SELECT task_id, channel, value_type, value
+                    FROM TB_GRAPH_CHECKPOINT_WRITE_T
+                    WHERE thread_id = %s AND checkpoint_ns = %s AND checkpoint_id = %s
+                    ORDER BY task_path, task_id, idx
+                    """
+                ),
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+            return cur.fetchall()
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.cursor() as cur:
+            cur.execute(self._sql("DELETE FROM TB_GRAPH_CHECKPOINT_T WHERE thread_id = %s"), (thread_id,))
+            cur.execute(self._sql("DELETE FROM TB_GRAPH_CHECKPOINT_WRITE_T WHERE thread_id = %s"), (thread_id,))
+            cur.execute(self._sql("DELETE FROM TB_GRAPH_CHECKPOINT_HEAD_T WHERE thread_id = %s"), (thread_id,))
+
+    def prune(self, thread_id: str, checkpoint_ns: str, keep: int) -> None:
+        """대화방별 최근 keep개 체크포인트(와 그 쓰기)만 남김"""
+        with self.cursor() as cur:
+            cur.execute(
+                self._sql(
+                    f"""
+                    SELECT checkpoint_id FROM TB_GRAPH_CHECKPOINT_T
+                    WHERE thread_id = %s AND checkpoint_ns = %s
+                    ORDER BY checkpoint_id DESC
+                    LIMIT 1 OFFSET {int(keep) - 1}
+                    """
+                ),
+                (thread_id, checkpoint_ns),
+            )
+            row = cur.fetchone()
+            if not row:
+                return
+            oldest_kept = row[0]
+            for table in ("TB_GRAPH_CHECKPOINT_T", "TB_GRAPH_CHECKPOINT_WRITE_T"):
+                cur.execute(
+                    self._sql(
+                        f"DELETE FROM {table} WHERE thread_id = %s AND checkpoint_ns = %s AND checkpoint_id < %s"
+                    ),
+                    (thread_id, checkpoint_ns, oldest_kept),
+                )
+
+
+class SQLiteCheckpointStore(_SQLCheckpointStore):
+    placeholder = "?"
+    blob_type = "BLOB"
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        self.setup()
+
+    @contextmanager
+    def cursor(self):
+        with self._lock:
+            cur = self._conn.cursor()
+            try:
+                yield cur
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+
+class PostgresCheckpointStore(_SQLCheckpointStore):
+    placeholder = "%s"
+    blob_type = "BYTEA"
+
+    def __init__(self, get_conn: Callable[[], Any], release_conn: Callable[[Any], None]):
+        self._get_conn = get_conn
+        self._release_conn = release_conn
+        self.setup()
+
+    @contextmanager
+    def cursor(self):
+        conn = self._get_conn()
+        cur = conn.cursor()
+        try:
+            yield cur
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+            self._release_conn(conn)
+
+
+# ==========================================
+# 체크포인터
+# ==========================================
+class TieredCheckpointSaver(BaseCheckpointSaver[str]):
+    def __init__(
+        self,
+        store: _SQLCheckpointStore,
+        *,
+        hot_max_threads: int = 1000,
+        hot_ttl_seconds: float = 1800,
+        keep_per_thread: int = 20,
+        serde=None,
+    ):
+        super().__init__(serde=serde)
+        self.store = store
+        self.hot_max_threads = hot_max_threads
+        self.hot_ttl_seconds = hot_ttl_seconds
+        self.keep_per_thread = keep_per_thread
+        # (thread_id, checkpoint_ns) -> (저장 시각, (checkpoint_id, head 버전), (체크포인트 행, write 행))
+        self._hot: "OrderedDict[Tuple[str, str], Tuple[float, Tuple[str, int], Tuple]]" = OrderedDict()
+        self._hot_lock = threading.Lock()
+
+    # ---------------- Hot Tier ----------------
+    def _hot_get(self, key: Tuple[str, str]):
+        with self._hot_lock:
+            entry = self._hot.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.hot_ttl_seconds:
+                del self._hot[key]
+                return None
+            self._hot.move_to_end(key)
+            return entry
+
+    def _hot_put(self, key: Tuple[str, str], signature: Tuple[str, int], loaded: Tuple) -> None:
+        with self._hot_lock:
+            self._hot[key] = (time.monotonic(), signature, loaded)
+            self._hot.move_to_end(key)
+            while len(self._hot) > self.hot_max_threads:
+                self._hot.popitem(last=False)
+
+    def _hot_drop(self, thread_id: str, checkpoint_ns: Optional[str] = None) -> None:
+        with self._hot_lock:
+            for key in [k for k in self._hot if k[0] == thread_id and checkpoint_ns in (None, k[1])]:
+                del self._hot[key]
+
+    @property
+    def hot_size(self) -> int:
+        return len(self._hot)
+
+    # ---------------- 직렬화 ----------------
+    def _build_tuple(self, row: Tuple, writes: List[Tuple]) -> CheckpointTuple:
+        """저장소 행 → CheckpointTuple (Hot Tier도 직렬화된 행을 보관해 객체 공유를 피함)"""
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, c_type, c_blob, m_type, m_blob = row
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((c_type, bytes(c_blob))),
+            metadata=self.serde.loads_typed((m_type, bytes(m_blob))),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((v_type, bytes(v_blob))))
+                for task_id, channel, v_type, v_blob in writes
+            ],
+        )
+
+    def _load_row(self, row: Tuple) -> Tuple[Tuple, List[Tuple]]:
+        thread_id, checkpoint_ns, checkpoint_id = row[:3]
+        return row, self.store.get_writes(thread_id, checkpoint_ns, checkpoint_id)
+
+    # ---------------- 동기 API ----------------
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        if checkpoint_id:
+            rows = self.store.list_checkpoints(thread_id, checkpoint_ns, checkpoint_id, None, 1)
+            return self._build_tuple(*self._load_row(rows[0])) if rows else None
+
+        key = (thread_id, checkpoint_ns)
+        signature = self.store.latest_signature(thread_id, checkpoint_ns)
+        if signature is None:
+            self._hot_drop(thread_id, checkpoint_ns)
+            return None
+        entry = self._hot_get(key)
+        if entry is not None and entry[1] == signature:
+            return self._build_tuple(*entry[2])
+
+        rows = self.store.list_checkpoints(thread_id, checkpoint_ns, signature[0], None, 1)
+        if not rows:
+            return None
+        row, writes = self._load_row(rows[0])
+        # 읽는 사이 쓰기가 더 들어왔다면 head 버전이 달라져 다음 조회에서 다시 읽음
+        self._hot_put(key, signature, (row, writes))
+        return self._build_tuple(row, writes)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        configurable = config["configurable"] if config else {}
+        rows = self.store.list_checkpoints(
+            configurable.get("thread_id"),
+            configurable.get("checkpoint_ns"),
+            get_checkpoint_id(config) if config else None,
+            get_checkpoint_id(before) if before else None,
+            None if filter else limit,
+        )
+        for row in rows:
+            if limit is not None and limit <= 0:
+                break
+            tup = self._build_tuple(*self._load_row(row))
+            if filter and not all(tup.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield tup
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_id = config["configurable"].get("checkpoint_id")
+        c_type, c_blob = self.serde.dumps_typed(checkpoint)
+        m_type, m_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        row = (thread_id, checkpoint_ns, checkpoint["id"], parent_id, c_type, c_blob, m_type, m_blob)
+        head = self.store.put_checkpoint(row)
+        if self.keep_per_thread > 0:
+            self.store.prune(thread_id, checkpoint_ns, self.keep_per_thread)
+
+        # 방금 쓴 체크포인트가 최신이면 Hot Tier에 올려 다음 턴에 저장소에서 다시 읽지 않도록 함
+        if head is not None and head[0] == checkpoint["id"]:
+            self._hot_put((thread_id, checkpoint_ns), head, (row, []))
+        else:
+            self._hot_drop(thread_id, checkpoint_ns)
+        next_config = {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+        return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            v_type, v_blob = self.serde.dumps_typed(value)
+            rows.append(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id,
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    v_type,
+                    v_blob,
+                    task_path,
+                )
+            )
+        if rows:
+            self.store.put_writes(rows, replace=all(w[0] in WRITES_IDX_MAP for w in writes))
+        # pending write가 바뀌었으므로 다음 조회 때 저장소에서 다시 읽음
+        self._hot_drop(thread_id, checkpoint_ns)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.store.delete_thread(thread_id)
+        self._hot_drop(thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # MemorySaver와 같은 "{버전:032}.{난수:016}" 형식 (기존 버전 문자열과 호환)
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # ---------------- 비동기 API (psycopg2/sqlite3는 동기이므로 스레드 풀에서 실행) ----------------
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ):
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def build_checkpointer() -> BaseCheckpointSaver:
+    """
+    CHECKPOINT_BACKEND 환경변수에 따라 체크포인터 생성
+    - sqlite (기본): CHECKPOINT_SQLITE_PATH 파일 (단일 호스트, 재시작 후 유지)
+    - postgres: recom_db의 TB_GRAPH_CHECKPOINT_T (여러 워커/호스트 공유)
+    - memory: 기존 MemorySaver (테스트용)
+    """
+    backend = os.getenv("CHECKPOINT_BACKEND", "sqlite").lower()
+    options = dict(
+        hot_max_threads=int(os.getenv("CHECKPOINT_HOT_MAX_THREADS", "1000")),
+        hot_ttl_seconds=float(os.getenv("CHECKPOINT_HOT_TTL_SECONDS", "1800")),
+        keep_per_thread=int(os.getenv("CHECKPOINT_KEEP_PER_THREAD", "20")),
+    )
+    try:
+        if backend == "memory":
+            return MemorySaver()
+        if backend == "postgres":
+            from .database import get_recom_db_connection, release_recom_db_connection
+
+            store = PostgresCheckpointStore(get_recom_db_connection, release_recom_db_connection)
+        else:
+            store = SQLiteCheckpointStore(
+                os.getenv("CHECKPOINT_SQLITE_PATH", "/tmp/scentence_checkpoints.sqlite3")
+            )
+        return TieredCheckpointSaver(store, **options)
+    except Exception as e:
+        print(f"⚠️ [Checkpointer] {backend} 초기화 실패, MemorySaver로 대체: {e}", flush=True)
+        return MemorySaver()
@@ -2,22 +2,31 @@
 import os
 import traceback
 import json
+import time
 import asyncio
-from typing import List, Dict, Any, Optional
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import psycopg2
 from psycopg2 import pool  # [최적화] 커넥션 풀 도입
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from dotenv import load_dotenv
 from openai import OpenAI, AsyncOpenAI  # [최적화] 비동기 클라이언트 추가
 
-# 오탈자 보정 라이브러리
-try:
-    from Levenshtein import distance
-except ImportError:
-
-    def distance(s1, s2):
-        return 0 if s1 == s2 else 100
-
+from .async_db import AsyncDatabase, async_db_available
+from .batch_writer import BatchWriter
+from .chat_history import AFTER, BEFORE, build_history_query, encode_cursor, history_page, history_rows
+from .embedding_cache import EmbeddingCache, normalize_text
+from .brand_resolver import BrandMatchMemo, BrandResolver, normalize_brand
+from .facet_index import PerfumeFacetIndex, is_plain_value, relaxation_tier, relaxation_tiers
+from .note_index import NoteSpellingIndex
+from .note_vector_index import NoteVectorIndex
+from .popularity import PopularityEvent, PopularityScores
+from .pool_metrics import InstrumentedConnectionPool, register_stats_source
+from .review_index import NO_REVIEW, ReviewEmbeddingIndex, group_review_rows
+from .rerank_context import RerankContext, current_rerank_context
+from .snapshot_cache import VersionedSnapshotCache
 
 load_dotenv()
 
@@ -32,14 +41,29 @@ DB_CONFIG = {
     "port": os.getenv("DB_PORT", "5432"),
 }
 
-# [최적화] 병렬 처리를 위한 커넥션 풀 생성 (최소 1개, 최대 20개 유지)
-perfume_db_pool = pool.ThreadedConnectionPool(1, 20, **DB_CONFIG)
+# [최적화] DB당 커넥션 상한(DB_POOL_MAX)을 동기(psycopg2) 풀과 비동기 풀이 나눠 가짐
+# - 비동기 풀 사용 시: 요청 경로의 *_async 쿼리는 비동기 풀(ASYNC_DB_POOL_MAX)로,
+#   동기 풀(SYNC_DB_POOL_MAX)은 백그라운드 스레드(스냅샷/인덱스/인기도 refresher, 배치 writer)와
+#   아직 동기로 남은 호출(브랜드/카탈로그/노트 조회, routers/perfumes, archive_db)만 담당
+# - 비동기 풀이 없으면 *_async가 동기 함수를 스레드에서 실행하므로 동기 풀이 상한 전체를 사용
+# psycopg2 풀은 고갈 시 기다리지 않고 PoolError를 내므로 동기 풀을 너무 작게 잡지 말 것
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "20"))
+ASYNC_DB_POOL_MIN = int(os.getenv("ASYNC_DB_POOL_MIN", "1"))
+if async_db_available():
+    SYNC_DB_POOL_MAX = int(os.getenv("SYNC_DB_POOL_MAX", str(DB_POOL_MAX // 2)))
+    ASYNC_DB_POOL_MAX = int(os.getenv("ASYNC_DB_POOL_MAX", str(max(DB_POOL_MAX - SYNC_DB_POOL_MAX, 1))))
+else:
+    SYNC_DB_POOL_MAX = int(os.getenv("SYNC_DB_POOL_MAX", str(DB_POOL_MAX)))
+    ASYNC_DB_POOL_MAX = 0
+
+# 대기/점유 시간, 고갈, 장기 점유 호출 위치를 기록하는 계측 풀 (/metrics/pools)
+perfume_db_pool = InstrumentedConnectionPool(pool.ThreadedConnectionPool(1, SYNC_DB_POOL_MAX, **DB_CONFIG), "perfume_db")
 
 RECOM_DB_CONFIG = {
     **DB_CONFIG,
     "dbname": os.getenv("RECOM_DB_NAME", "recom_db"),
 }
-recom_db_pool = pool.ThreadedConnectionPool(1, 20, **RECOM_DB_CONFIG)
+recom_db_pool = InstrumentedConnectionPool(pool.ThreadedConnectionPool(1, SYNC_DB_POOL_MAX, **RECOM_DB_CONFIG), "recom_db")
 
 # ============ 추가 ============
 MEMBER_DB_CONFIG = {
@@ -48,14 +72,37 @@ MEMBER_DB_CONFIG = {
 }
 # ============ 추가 ============
 
-# [최적화] 회원 DB 풀 추가 (로그인/프로필 병목 해결)
-member_db_pool = pool.ThreadedConnectionPool(1, 20, **MEMBER_DB_CONFIG)
+# [최적화] 회원 DB 풀 추가 (로그인/프로필 병목 해결) - 비동기 풀이 없으므로 상한 전체 사용
+member_db_pool = InstrumentedConnectionPool(pool.ThreadedConnectionPool(1, DB_POOL_MAX, **MEMBER_DB_CONFIG), "member_db")
+
+# [최적화] 비동기 노드/도구용 asyncio 커넥션 풀 (서버 사이드 Prepared Statement 재사용)
+# psycopg 3가 없으면 enabled=False -> 각 *_async 함수는 동기 함수를 스레드에서 실행
+perfume_adb = AsyncDatabase("perfume_db", DB_CONFIG, ASYNC_DB_POOL_MIN, ASYNC_DB_POOL_MAX)
+recom_adb = AsyncDatabase("recom_db", RECOM_DB_CONFIG, ASYNC_DB_POOL_MIN, ASYNC_DB_POOL_MAX)
+for _adb in (perfume_adb, recom_adb):
+    register_stats_source(f"{_adb.name}_async", _adb.stats)
+
+
+async def open_async_pools() -> None:
+    for adb in (perfume_adb, recom_adb):
+        try:
+            await adb.open()
+        except Exception as e:
+            # 열지 못해도 첫 사용 시 다시 시도
+            print(f"⚠️ [AsyncDB] {adb.name} pool open failed: {e}", flush=True)
+
+
+async def close_async_pools() -> None:
+    for adb in (perfume_adb, recom_adb):
+        await adb.close()
+
 
 # [최적화] 동기/비동기 OpenAI 클라이언트 이원화
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-BRAND_CACHE = []
+# 향수 프로필 읽기 모델 (7. 섹션 참고)
+PERFUME_PROFILE_VIEW = "MV_PERFUME_PROFILE"
 
 
 # [함수 수정] 풀에서 연결 가져오기 및 반납 로직
@@ -83,64 +130,163 @@ def release_member_db_connection(conn):
     member_db_pool.putconn(conn)
 # ======================================
 
+# [최적화] 임베딩 캐시 (LRU + 로컬 SQLite, 동일 텍스트 요청 합치기)
+EMBEDDING_MODEL = "text-embedding-3-small"
+embedding_cache = EmbeddingCache(
+    EMBEDDING_MODEL,
+    max_entries=int(os.getenv("EMBEDDING_CACHE_SIZE", "4096")),
+    # 빈 문자열이면 로컬 저장소 없이 메모리 캐시만 사용
+    store_path=os.getenv("EMBEDDING_CACHE_PATH", "/tmp/scentence_embedding_cache.sqlite3"),
+)
+
+
+async def _fetch_embeddings_async(texts: List[str]) -> List[List[float]]:
+    response = await async_client.embeddings.create(input=texts, model=EMBEDDING_MODEL)
+    return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
+
+def _fetch_embeddings(texts: List[str]) -> List[List[float]]:
+    response = client.embeddings.create(input=texts, model=EMBEDDING_MODEL)
+    return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
+
 # [최적화] 비동기 임베딩 생성 (API 블로킹 방지)
 async def get_embedding_async(text: str) -> List[float]:
     try:
         if not text:
             return []
-        response = await async_client.embeddings.create(
-            input=text.replace("\n", " "), model="text-embedding-3-small"
-        )
-        return response.data[0].embedding
+        return await embedding_cache.get_async(text, _fetch_embeddings_async)
     except Exception as e:
         print(f"⚠️ Embedding Error: {e}")
         return []
 
 
+async def get_embeddings_async(texts: List[str]) -> List[List[float]]:
+    """여러 텍스트를 한 번의 embeddings 요청으로 처리 (캐시 히트는 제외)"""
+    try:
+        return await embedding_cache.get_many_async(texts, _fetch_embeddings_async)
+    except Exception as e:
+        print(f"⚠️ Batch Embedding Error: {e}")
+        return [[] for _ in texts]
+
+
 # 기존 동기 함수 (필요 시 유지)
 def get_embedding(text: str) -> List[float]:
     try:
         if not text:
             return []
-        return (
-            client.embeddings.create(
-                input=text.replace("\n", " "), model="text-embedding-3-small"
-            )
-            .data[0]
-            .embedding
-        )
+        return embedding_cache.get(text, _fetch_embeddings)
     except Exception as e:
         print(f"⚠️ Sync Embedding Error: {e}")
         return []
 
 
+def get_embeddings(texts: List[str]) -> List[List[float]]:
+    try:
+        return embedding_cache.get_many(texts, _fetch_embeddings)
+    except Exception as e:
+        print(f"⚠️ Sync Batch Embedding Error: {e}")
+        return [[] for _ in texts]
+
+
 # ==========================================
 # 1. 브랜드 및 메타데이터 관리
 # ==========================================
-def get_all_brands() -> List[str]:
-    global BRAND_CACHE
-    if BRAND_CACHE:
-        return BRAND_CACHE
+# [최적화] 계절/상황/어코드/브랜드/노트 목록을 하나의 버전 스냅샷으로 캐싱
+# - TTL 이내는 메모리에서 바로 반환 (sanitize_filters가 검색마다 DISTINCT 3회 조회하던 문제)
+# - TTL 초과 후 META_CACHE_MAX_STALE_SECONDS 동안은 기존 값을 반환하며 백그라운드 갱신
+# - 원본이 바뀌면 invalidate_catalog_snapshot()으로 즉시 무효화
+META_CACHE_TTL_SECONDS = float(os.getenv("META_CACHE_TTL_SECONDS", "600"))
+META_CACHE_MAX_STALE_SECONDS = float(os.getenv("META_CACHE_MAX_STALE_SECONDS", "3600"))
+
 
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    seasons: Tuple[str, ...]
+    occasions: Tuple[str, ...]
+    accords: Tuple[str, ...]
+    brands: Tuple[str, ...]
+    notes: Tuple[str, ...]
+
+
+def _load_catalog_snapshot() -> CatalogSnapshot:
     conn = get_db_connection()
     cur = conn.cursor()
     try:
-        cur.execute("SELECT DISTINCT perfume_brand FROM TB_PERFUME_BASIC_M")
-        BRAND_CACHE = [r[0] for r in cur.fetchall() if r[0]]
-        return BRAND_CACHE
+        values = {}
+        for key, sql in (
+            ("seasons", "SELECT DISTINCT season FROM TB_PERFUME_SEASON_R"),
+            ("occasions", "SELECT DISTINCT occasion FROM TB_PERFUME_OCA_R"),
+            ("accords", "SELECT DISTINCT accord FROM TB_PERFUME_ACCORD_R LIMIT 100"),
+            ("brands", "SELECT DISTINCT perfume_brand FROM TB_PERFUME_BASIC_M"),
+            ("notes", "SELECT DISTINCT note FROM TB_PERFUME_NOTES_M"),
+        ):
+            cur.execute(sql)
+            values[key] = tuple(str(r[0]) for r in cur.fetchall() if r[0])
+        return CatalogSnapshot(**values)
     finally:
         cur.close()
         release_db_connection(conn)
 
 
+catalog_cache = VersionedSnapshotCache(
+    _load_catalog_snapshot,
+    ttl_seconds=META_CACHE_TTL_SECONDS,
+    max_stale_seconds=META_CACHE_MAX_STALE_SECONDS,
+    name="catalog",
+)
+
+
+def invalidate_catalog_snapshot() -> None:
+    """브랜드/메타데이터 원본 변경 시 호출 - 다음 조회에서 새 스냅샷을 로딩"""
+    catalog_cache.invalidate()
+
+
+def get_all_brands() -> List[str]:
+    return list(catalog_cache.get().brands)
+
+
+# 스냅샷에서 만든 조회 인덱스 (이름 -> (스냅샷 버전, 인덱스))
+_catalog_indexes: Dict[str, Tuple[int, Any]] = {}
+_catalog_indexes_lock = threading.Lock()
+
+
+def _catalog_index(name: str, build):
+    """카탈로그 스냅샷 버전이 바뀔 때만 build(snapshot)로 인덱스를 다시 만듦"""
+    snapshot = catalog_cache.get_snapshot()
+    with _catalog_indexes_lock:
+        cached = _catalog_indexes.get(name)
+        if cached is None or cached[0] != snapshot.version:
+            cached = (snapshot.version, build(snapshot.value))
+            _catalog_indexes[name] = cached
+        return cached[1]
+
+
+# [최적화] 브랜드명은 로컬 해석기(정규화/별칭/편집 거리)로 먼저 처리하고,
+# 확신이 낮은 입력만 LLM에 묻되 그 결과는 영구 저장해 재사용
+brand_match_memo = BrandMatchMemo(
+    os.getenv("BRAND_MATCH_CACHE_PATH", "/tmp/scentence_brand_match_cache.sqlite3")
+)
+
+
+def get_brand_resolver() -> BrandResolver:
+    return _catalog_index("brands", lambda snapshot: BrandResolver(snapshot.brands))
+
+
 def match_brand_name(user_input: str) -> str:
     if not user_input:
         return user_input
-    all_brands = get_all_brands()
-    for b in all_brands:
-        if b.lower() == user_input.lower():
-            return b
+    resolver = get_brand_resolver()
+    resolved = resolver.resolve(user_input)
+    if resolved:
+        return resolved
+
+    query = normalize_brand(user_input) or user_input.strip().lower()
+    remembered = brand_match_memo.get(resolver.fingerprint, query)
+    if remembered is not None:
+        return remembered or user_input
 
+    all_brands = resolver.brands
     try:
         brands_str = ", ".join(all_brands)
         response = client.chat.completions.create(
@@ -159,37 +305,37 @@ def match_brand_name(user_input: str) -> str:
         )
         matched = response.choices[0].message.content.strip()
         if matched and matched != "None" and matched in all_brands:
+            brand_match_memo.put(resolver.fingerprint, query, matched)
             return matched
+        # 매칭 실패도 저장 (같은 입력으로 다시 LLM을 부르지 않음)
+        brand_match_memo.put(resolver.fingerprint, query, "")
     except Exception:
         pass
     return user_input
 
 
 def fetch_meta_data() -> Dict[str, str]:
-    meta = {}
-    conn = None
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT DISTINCT season FROM TB_PERFUME_SEASON_R")
-        meta["seasons"] = ", ".join([str(r[0]) for r in cur.fetchall() if r[0]])
-        cur.execute("SELECT DISTINCT occasion FROM TB_PERFUME_OCA_R")
-        meta["occasions"] = ", ".join([str(r[0]) for r in cur.fetchall() if r[0]])
-        cur.execute("SELECT DISTINCT accord FROM TB_PERFUME_ACCORD_R LIMIT 100")
-        meta["accords"] = ", ".join([str(r[0]) for r in cur.fetchall() if r[0]])
-        meta["genders"] = "Women, Men, Unisex"
+        snapshot = catalog_cache.get()
     except Exception:
-        meta = {}
-    finally:
-        if conn:
-            cur.close()
-            release_db_connection(conn)
-    return meta
+        return {}
+    return {
+        "seasons": ", ".join(snapshot.seasons),
+        "occasions": ", ".join(snapshot.occasions),
+        "accords": ", ".join(snapshot.accords),
+        "genders": "Women, Men, Unisex",
+    }
 
 
 # ==========================================
 # 2. 검색 엔진 (Connection Pool 적용)
 # ==========================================
+PROFILE_SEARCH_COLUMNS = """
+    m.perfume_id as id, m.perfume_brand as brand, m.perfume_name as name, m.concentration, m.img_link as image_url,
+    m.accords, m.gender, m.top_notes, m.middle_notes, m.base_notes, m.seasons, m.occasions
+"""
+
+
 def search_perfumes(
     hard_filters: Dict[str, Any],
     strategy_filters: Dict[str, List[str]],
@@ -197,97 +343,217 @@ def search_perfumes(
     exclude_brands: List[str] = None,
     limit: int = 20,
 ) -> List[Dict[str, Any]]:
+    brand = match_brand_name(hard_filters["brand"]) if hard_filters.get("brand") else None
+    ids = _search_ids_with_index(hard_filters, strategy_filters, exclude_ids, exclude_brands, brand, limit)
+    if ids is not None:
+        return fetch_perfume_profiles(ids)
+
+    return _search_perfumes_sql(hard_filters, strategy_filters, exclude_ids, exclude_brands, limit, brand)
+
+
+async def search_perfumes_async(
+    hard_filters: Dict[str, Any],
+    strategy_filters: Dict[str, List[str]],
+    exclude_ids: List[int] = None,
+    exclude_brands: List[str] = None,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """search_perfumes의 비동기 버전 (asyncio 풀 + Prepared Statement)"""
+    if not perfume_adb.enabled:
+        return await asyncio.to_thread(
+            search_perfumes, hard_filters, strategy_filters, exclude_ids, exclude_brands, limit
+        )
+    brand = None
+    if hard_filters.get("brand"):
+        # 로컬 해석기로 대부분 즉시 끝나지만 LLM 매처로 넘어갈 수 있으므로 스레드에서 실행
+        brand = await asyncio.to_thread(match_brand_name, hard_filters["brand"])
+    ids = _search_ids_with_index(hard_filters, strategy_filters, exclude_ids, exclude_brands, brand, limit)
+    if ids is not None:
+        return await fetch_perfume_profiles_async(ids)
+
+    sql, params = _build_search_sql(hard_filters, strategy_filters, exclude_ids, exclude_brands, limit, brand)
+    return await perfume_adb.fetch_all(sql, params)
+
+
+def _search_ids_with_index(
+    hard_filters: Dict[str, Any],
+    strategy_filters: Dict[str, List[str]],
+    exclude_ids: Optional[List[int]],
+    exclude_brands: Optional[List[str]],
+    brand: Optional[str],
+    limit: int,
+) -> Optional[List[int]]:
+    """[최적화] 패싯 인덱스가 준비되어 있으면 필터는 메모리 비트 연산으로 (불가능하면 None)"""
+    index = _facet_index
+    if index is None or not PerfumeFacetIndex.supports(hard_filters, strategy_filters):
+        return None
+    if brand is not None and not is_plain_value(brand):
+        return None
+    return index.search(
+        hard_filters,
+        strategy_filters,
+        exclude_ids=exclude_ids,
+        exclude_brands=exclude_brands,
+        brand=brand,
+        limit=limit,
+    )
+
+
+PROFILES_BY_IDS_SQL = (
+    f"SELECT {PROFILE_SEARCH_COLUMNS} FROM {PERFUME_PROFILE_VIEW} m "
+    "WHERE m.perfume_id = ANY(%s) ORDER BY m.vote_total DESC, m.perfume_id"
+)
+
+
+def fetch_perfume_profiles(perfume_ids: List[int]) -> List[Dict[str, Any]]:
+    """프로필 뷰에서 주어진 ID들의 검색 결과 행을 인기순(패싯 인덱스와 같은 순서)으로 조회"""
+    if not perfume_ids:
+        return []
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     try:
-        sql = """
-            SELECT DISTINCT m.perfume_id as id, m.perfume_brand as brand, m.perfume_name as name, m.concentration, m.img_link as image_url,
-            (SELECT STRING_AGG(DISTINCT accord, ', ') FROM TB_PERFUME_ACCORD_R WHERE perfume_id = m.perfume_id) as accords,
-            (SELECT gender FROM TB_PERFUME_GENDER_R WHERE perfume_id = m.perfume_id LIMIT 1) as gender,
-            (SELECT STRING_AGG(DISTINCT n.note, ', ') FROM TB_PERFUME_NOTES_M n WHERE n.perfume_id = m.perfume_id AND UPPER(n.type) = 'TOP') as top_notes,
-            (SELECT STRING_AGG(DISTINCT n.note, ', ') FROM TB_PERFUME_NOTES_M n WHERE n.perfume_id = m.perfume_id AND UPPER(n.type) = 'MIDDLE') as middle_notes,
-            (SELECT STRING_AGG(DISTINCT n.note, ', ') FROM TB_PERFUME_NOTES_M n WHERE n.perfume_id = m.perfume_id AND UPPER(n.type) = 'BASE') as base_notes,
-            (SELECT STRING_AGG(season, ', ') FROM TB_PERFUME_SEASON_R WHERE perfume_id = m.perfume_id) as seasons,
-            (SELECT STRING_AGG(occasion, ', ') FROM TB_PERFUME_OCA_R WHERE perfume_id = m.perfume_id) as occasions
-            FROM TB_PERFUME_BASIC_M m
-        """
-        params, where_clauses = [], []
+        cur.execute(PROFILES_BY_IDS_SQL, (list(perfume_ids),))
+        return [dict(row) for row in cur.fetchall()]
+    finally:
+        cur.close()
+        release_db_connection(conn)
+
+
+async def fetch_perfume_profiles_async(perfume_ids: List[int]) -> List[Dict[str, Any]]:
+    if not perfume_ids:
+        return []
+    if not perfume_adb.enabled:
+        return await asyncio.to_thread(fetch_perfume_profiles, perfume_ids)
+    return await perfume_adb.fetch_all(PROFILES_BY_IDS_SQL, (list(perfume_ids),))
+
+
+def _build_search_sql(
+    hard_filters: Dict[str, Any],
+    strategy_filters: Dict[str, List[str]],
+    exclude_ids: Optional[List[int]],
+    exclude_brands: Optional[List[str]],
+    limit: int,
+    brand: Optional[str],
+) -> Tuple[str, List[Any]]:
+    """
+    필터 조합별 검색 SQL 생성.
+    목록 값은 배열 파라미터 하나(<> ALL(%s))로, LIMIT도 파라미터로 넘겨
+    같은 필터 조합은 항상 같은 SQL 문자열이 되도록 함 (Prepared Statement 재사용)
+    """
+    # [최적화] 프로필 읽기 모델(MV_PERFUME_PROFILE)에서 집계 컬럼을 바로 읽음
+    sql = f"SELECT {PROFILE_SEARCH_COLUMNS} FROM {PERFUME_PROFILE_VIEW} m"
+    where_clauses, params = _base_search_clauses(hard_filters, exclude_ids, exclude_brands, brand)
 
-        if exclude_ids:
+    for k, vals in strategy_filters.items():
+        clause = _strategy_clause(k, vals)
+        if clause:
+            where_clauses.append(clause[0])
+            params.extend(clause[1])
+
+    if where_clauses:
+        sql += " WHERE " + " AND ".join(where_clauses)
+    # 패싯 인덱스와 같은 인기순 (ID 순으로 자르면 오래된 향수만 후보가 됨)
+    sql += " ORDER BY m.vote_total DESC, m.perfume_id LIMIT %s"
+    params.append(int(limit))
+    return sql, params
+
+
+def _base_search_clauses(
+    hard_filters: Dict[str, Any],
+    exclude_ids: Optional[List[int]],
+    exclude_brands: Optional[List[str]],
+    brand: Optional[str],
+) -> Tuple[List[str], List[Any]]:
+    """hard_filters + 제외 조건의 WHERE 절 목록과 파라미터"""
+    params, where_clauses = [], []
+
+    if exclude_ids:
+        where_clauses.append("m.perfume_id <> ALL(%s::INTEGER[])")
+        params.append([int(i) for i in exclude_ids])
+
+    if exclude_brands:
+        where_clauses.append("m.perfume_brand <> ALL(%s::TEXT[])")
+        params.append(list(exclude_brands))
+
+    if hard_filters.get("gender"):
+        g = hard_filters["gender"].lower()
+
+        if g in ["women", "female"]:
+            # 여성용 요청 시: 여성용 + 유니섹스 포함
             where_clauses.append(
-                f"m.perfume_id NOT IN ({','.join(['%s']*len(exclude_ids))})"
+                "m.perfume_id IN (SELECT perfume_id FROM TB_PERFUME_GENDER_R WHERE gender IN (%s, %s))"
             )
-            params.extend(exclude_ids)
+            params.extend(["Feminine", "Unisex"])  # 여기서 값을 추가합니다.
 
-        if exclude_brands:
+        elif g in ["men", "male"]:
+            # 남성용 요청 시: 남성용 + 유니섹스 포함
             where_clauses.append(
-                f"m.perfume_brand NOT IN ({','.join(['%s']*len(exclude_brands))})"
+                "m.perfume_id IN (SELECT perfume_id FROM TB_PERFUME_GENDER_R WHERE gender IN (%s, %s))"
             )
-            params.extend(exclude_brands)
-
-        if hard_filters.get("gender"):
-            g = hard_filters["gender"].lower()
-
-            if g in ["women", "female"]:
-                # 여성용 요청 시: 여성용 + 유니섹스 포함
-                where_clauses.append(
-                    "m.perfume_id IN (SELECT perfume_id FROM TB_PERFUME_GENDER_R WHERE gender IN (%s, %s))"
-                )
-                params.extend(["Feminine", "Unisex"])  # 여기서 값을 추가합니다.
-
-            elif g in ["men", "male"]:
-                # 남성용 요청 시: 남성용 + 유니섹스 포함
-                where_clauses.append(
-                    "m.perfume_id IN (SELECT perfume_id FROM TB_PERFUME_GENDER_R WHERE gender IN (%s, %s))"
-                )
-                params.extend(["Masculine", "Unisex"])  # 여기서 값을 추가합니다.
-
-            else:
-                # 유니섹스 요청 시: 오직 'Unisex'만 검색
-                where_clauses.append(
-                    "m.perfume_id IN (SELECT perfume_id FROM TB_PERFUME_GENDER_R WHERE gender = %s)"
-                )
-                params.append("Unisex")  # 여기서 값을 추가합니다.
-
-        if hard_filters.get("brand"):
-            where_clauses.append("m.perfume_brand ILIKE %s")
-            params.append(match_brand_name(hard_filters["brand"]))
-
-        hard_meta_map = {
-            "season": ("TB_PERFUME_SEASON_R", "season"),
-            "occasion": ("TB_PERFUME_OCA_R", "occasion"),
-            "accord": ("TB_PERFUME_ACCORD_R", "accord"),
-            "note": ("TB_PERFUME_NOTES_M", "note"),
-        }
-        for k, (t, c) in hard_meta_map.items():
-            if hard_filters.get(k):
-                where_clauses.append(
-                    f"m.perfume_id IN (SELECT perfume_id FROM {t} WHERE {c} ILIKE %s)"
-                )
-                params.append(hard_filters[k])
-
-        strategy_map = {
-            "accord": ("TB_PERFUME_ACCORD_R", "accord"),
-            "season": ("TB_PERFUME_SEASON_R", "season"),
-            "occasion": ("TB_PERFUME_OCA_R", "occasion"),
-            "note": ("TB_PERFUME_NOTES_M", "note"),
-        }
-        for k, vals in strategy_filters.items():
-            if not vals or k == "gender":
-                continue
-            mapping = strategy_map.get(k.lower())
-            if mapping:
-                t, c = mapping
-                clauses = [
-                    f"m.perfume_id IN (SELECT perfume_id FROM {t} WHERE {c} ILIKE %s)"
-                    for v in vals
-                ]
-                params.extend(vals)
-                where_clauses.append(f"({' OR '.join(clauses)})")
-
-        if where_clauses:
-            sql += " WHERE " + " AND ".join(where_clauses)
-        sql += f" LIMIT {limit}"
+            params.extend(["Masculine", "Unisex"])  # 여기서 값을 추가합니다.
+
+        else:
+            # 유니섹스 요청 시: 오직 'Unisex'만 검색
+            where_clauses.append(
+                "m.perfume_id IN (SELECT perfume_id FROM TB_PERFUME_GENDER_R WHERE gender = %s)"
+            )
+            params.append("Unisex")  # 여기서 값을 추가합니다.
+
+    if brand:
+        where_clauses.append("m.perfume_brand ILIKE %s")
+        params.append(brand)
+
+    hard_meta_map = {
+        "season": ("TB_PERFUME_SEASON_R", "season"),
+        "occasion": ("TB_PERFUME_OCA_R", "occasion"),
+        "accord": ("TB_PERFUME_ACCORD_R", "accord"),
+        "note": ("TB_PERFUME_NOTES_M", "note"),
+    }
+    for k, (t, c) in hard_meta_map.items():
+        if hard_filters.get(k):
+            where_clauses.append(
+                f"m.perfume_id IN (SELECT perfume_id FROM {t} WHERE {c} ILIKE %s)"
+            )
+            params.append(hard_filters[k])
+    return where_clauses, params
+
+
+STRATEGY_SQL_MAP = {
+    "accord": ("TB_PERFUME_ACCORD_R", "accord"),
+    "season": ("TB_PERFUME_SEASON_R", "season"),
+    "occasion": ("TB_PERFUME_OCA_R", "occasion"),
+    "note": ("TB_PERFUME_NOTES_M", "note"),
+}
+
+
+def _strategy_clause(key: str, vals: List[str]) -> Optional[Tuple[str, List[Any]]]:
+    """전략 필터 하나(값끼리 OR)의 조건식 (적용 대상이 아니면 None)"""
+    if not vals or key == "gender":
+        return None
+    mapping = STRATEGY_SQL_MAP.get(key.lower())
+    if not mapping:
+        return None
+    t, c = mapping
+    clauses = [
+        f"m.perfume_id IN (SELECT perfume_id FROM {t} WHERE {c} ILIKE %s)"
+        for v in vals
+    ]
+    return f"({' OR '.join(clauses)})", list(vals)
+
+
+def _search_perfumes_sql(
+    hard_filters: Dict[str, Any],
+    strategy_filters: Dict[str, List[str]],
+    exclude_ids: List[int] = None,
+    exclude_brands: List[str] = None,
+    limit: int = 20,
+    brand: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """패싯 인덱스를 쓸 수 없을 때(로딩 전, 와일드카드 포함 값 등)의 SQL 검색"""
+    sql, params = _build_search_sql(hard_filters, strategy_filters, exclude_ids, exclude_brands, limit, brand)
+    conn = get_db_connection()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    try:
         cur.execute(sql, params)
         return [dict(row) for row in cur.fetchall()]
     finally:
@@ -295,121 +561,376 @@ def search_perfumes(
         release_db_connection(conn)
 
 
+# [최적화] 전략 필터 완화 단계를 한 번의 검색으로 평가 (smart_perfume_search)
+# 후보마다 relax_tier(relaxation_tiers 순서의 위치)와 relax_level을 붙여 단계 순으로 반환
+def _build_relaxed_search_sql(
+    hard_filters: Dict[str, Any],
+    strategy_filters: Dict[str, List[str]],
+    relax_keys: List[str],
+    exclude_ids: Optional[List[int]],
+    exclude_brands: Optional[List[str]],
+    limit: int,
+    brand: Optional[str],
+) -> Tuple[str, List[Any]]:
+    """후보별로 완화 대상 조건의 일치 여부(relax_i)와 나머지 전략 필터 일치 여부(relax_rest)를 함께 조회"""
+    where_clauses, where_params = _base_search_clauses(hard_filters, exclude_ids, exclude_brands, brand)
+    flag_columns, params = [], []
+    for i, key in enumerate(relax_keys):
+        clause_sql, clause_params = _strategy_clause(key, strategy_filters[key])
+        flag_columns.append(f"{clause_sql} AS relax_{i}")
+        params.extend(clause_params)
+    rest = [_strategy_clause(k, v) for k, v in strategy_filters.items() if k not in relax_keys]
+    rest = [c for c in rest if c]
+    flag_columns.append(f"({' AND '.join(c[0] for c in rest) if rest else 'TRUE'}) AS relax_rest")
+    for _, clause_params in rest:
+        params.extend(clause_params)
+    params.extend(where_params)
+
+    # 패싯 인덱스(search_relaxed)와 같은 순서: 완화 단계 위치, 단계 안에서는 인기순 (vote_total DESC, ID)
+    conditions = []
+    for level, keys in relaxation_tiers(relax_keys):
+        flags = [f"s.relax_{relax_keys.index(key)}" for key in keys]
+        if level == 0:
+            flags.append("s.relax_rest")
+        conditions.append(" AND ".join(flags))
+    tier_case = "CASE " + " ".join(f"WHEN {c} THEN {i}" for i, c in enumerate(conditions)) + " END"
+
+    sql = (
+        f"SELECT * FROM (SELECT s.*, {tier_case} AS relax_position FROM ("
+        f"SELECT {PROFILE_SEARCH_COLUMNS}, m.vote_total AS relax_votes, {', '.join(flag_columns)} "
+        f"FROM {PERFUME_PROFILE_VIEW} m"
+        + (" WHERE " + " AND ".join(where_clauses) if where_clauses else "")
+        + ") s) t WHERE t.relax_position IS NOT NULL "
+        "ORDER BY t.relax_position, t.relax_votes DESC, t.id LIMIT %s"
+    )
+    params.append(int(limit))
+    return sql, params
+
+
+def _annotate_relaxed_rows(rows: List[Dict[str, Any]], relax_keys: List[str]) -> List[Dict[str, Any]]:
+    tiers = relaxation_tiers(relax_keys)
+    results = []
+    for row in rows:
+        row = dict(row)
+        row.pop("relax_position", None)
+        row.pop("relax_votes", None)
+        matched = {key for i, key in enumerate(relax_keys) if row.pop(f"relax_{i}")}
+        tier = relaxation_tier(tiers, matched, bool(row.pop("relax_rest")))
+        if tier is None:
+            continue
+        row["relax_tier"], row["relax_level"] = tier, tiers[tier][0]
+        results.append(row)
+    results.sort(key=lambda r: r["relax_tier"])
+    return results
+
+
+def _relaxed_ids_with_index(
+    hard_filters: Dict[str, Any],
+    strategy_filters: Dict[str, List[str]],
+    relax_keys: List[str],
+    exclude_ids: Optional[List[int]],
+    exclude_brands: Optional[List[str]],
+    brand: Optional[str],
+    limit: int,
+) -> Optional[List[Tuple[int, int]]]:
+    index = _facet_index
+    if index is None or not PerfumeFacetIndex.supports(hard_filters, strategy_filters):
+        return None
+    if brand is not None and not is_plain_value(brand):
+        return None
+    return index.search_relaxed(
+        hard_filters,
+        strategy_filters,
+        relax_keys,
+        exclude_ids=exclude_ids,
+        exclude_brands=exclude_brands,
+        brand=brand,
+        limit=limit,
+    )
+
+
+def _attach_relax_tiers(
+    profiles: List[Dict[str, Any]], picked: List[Tuple[int, int]], relax_keys: List[str]
+) -> List[Dict[str, Any]]:
+    tiers = relaxation_tiers(relax_keys)
+    tier_by_id = dict(picked)
+    for profile in profiles:
+        tier = tier_by_id[profile["id"]]
+        profile["relax_tier"], profile["relax_level"] = tier, tiers[tier][0]
+    # 같은 단계 안에서는 조회 순서(인기순) 유지
+    profiles.sort(key=lambda p: p["relax_tier"])
+    return profiles
+
+
+def search_perfumes_relaxed(
+    hard_filters: Dict[str, Any],
+    strategy_filters: Dict[str, List[str]],
+    relax_keys: List[str],
+    exclude_ids: List[int] = None,
+    exclude_brands: List[str] = None,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    brand = match_brand_name(hard_filters["brand"]) if hard_filters.get("brand") else None
+    picked = _relaxed_ids_with_index(
+        hard_filters, strategy_filters, relax_keys, exclude_ids, exclude_brands, brand, limit
+    )
+    if picked is not None:
+        profiles = fetch_perfume_profiles([pid for pid, _ in picked])
+        return _attach_relax_tiers(profiles, picked, relax_keys)
+
+    sql, params = _build_relaxed_search_sql(
+        hard_filters, strategy_filters, relax_keys, exclude_ids, exclude_brands, limit, brand
+    )
+    conn = get_db_connection()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cur.execute(sql, params)
+        return _annotate_relaxed_rows(cur.fetchall(), relax_keys)
+    finally:
+        cur.close()
+        release_db_connection(conn)
+
+
+async def search_perfumes_relaxed_async(
+    hard_filters: Dict[str, Any],
+    strategy_filters: Dict[str, List[str]],
+    relax_keys: List[str],
+    exclude_ids: List[int] = None,
+    exclude_brands: List[str] = None,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    if not perfume_adb.enabled:
+        return await asyncio.to_thread(
+            search_perfumes_relaxed,
+            hard_filters,
+            strategy_filters,
+            relax_keys,
+            exclude_ids,
+            exclude_brands,
+            limit,
+        )
+    brand = None
+    if hard_filters.get("brand"):
+        brand = await asyncio.to_thread(match_brand_name, hard_filters["brand"])
+    picked = _relaxed_ids_with_index(
+        hard_filters, strategy_filters, relax_keys, exclude_ids, exclude_brands, brand, limit
+    )
+    if picked is not None:
+        profiles = await fetch_perfume_profiles_async([pid for pid, _ in picked])
+        return _attach_relax_tiers(profiles, picked, relax_keys)
+
+    sql, params = _build_relaxed_search_sql(
+        hard_filters, strategy_filters, relax_keys, exclude_ids, exclude_brands, limit, brand
+    )
+    return _annotate_relaxed_rows(await perfume_adb.fetch_all(sql, params), relax_keys)
+
+
 # ==========================================
 # 3. 비동기 리랭킹 엔진
 # ==========================================
+async def _prepare_rerank_query(query_text: str) -> List[float]:
+    """리랭크 질의 준비: 한국어 전략 의도 -> 향 묘사 문장(gpt-4o-mini) -> 임베딩"""
+    system_prompt = "You are a Perfume Data Analyst. Transform the Korean logic into a sensory description..."
+    translation = await async_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": query_text},
+        ],
+        temperature=0,
+    )
+    stylized_query = translation.choices[0].message.content.strip()
+    return await get_embedding_async(stylized_query)
+
+
 async def rerank_perfumes_async(
     candidates: List[Dict[str, Any]],
     query_text: str,
     top_k: int = 5,
     rank_mode: str = "DEFAULT",
+    context: Optional[RerankContext] = None,
 ) -> List[Dict[str, Any]]:
     if not candidates or not query_text:
         return candidates[:top_k]
 
+    # [Task D2] Popularity Ranking
+    if rank_mode == "POPULAR":
+        candidate_ids = [p["id"] for p in candidates]
+        if not candidate_ids:
+            return []
+
+        # Query vote counts (SUM of votes from TB_PERFUME_ACCORD_M)
+        # [최적화] 백그라운드에서 미리 계산한 인기도 맵이 있으면 DB 집계 없이 사용
+        popularity = _popularity
+        if popularity is not None:
+            vote_map = popularity.vote_map(candidate_ids)
+        else:
+            vote_map = await _fetch_vote_map_async(candidate_ids)
+
+        # Assign votes and Sort
+        for p in candidates:
+            p["review_score"] = vote_map.get(
+                p["id"], 0
+            )  # Use review_score field for compatibility
+            p["best_review"] = (
+                f"인기도(Vote): {p['review_score']}"  # Optional info
+            )
+
+        # 캐시/DB 집계 어느 쪽이든 같은 투표 합계 순서 (표시되는 인기도(Vote)와 일치)
+        candidates.sort(key=lambda x: x.get("review_score", 0), reverse=True)
+        return candidates[:top_k]
+
+    # [Default] Semantic Reranking (비동기 번역 및 스타일링)
+    # [최적화] LLM/임베딩 호출을 기다리는 동안 DB 커넥션을 잡고 있지 않음
+    # [최적화] 요청 단위 컨텍스트가 있으면 같은 query_text의 번역/임베딩을 재사용
+    context = context or current_rerank_context()
+    if context is not None:
+        query_vector = await context.query_vector(query_text, _prepare_rerank_query)
+    else:
+        query_vector = await _prepare_rerank_query(query_text)
+    if not query_vector:
+        return candidates[:top_k]
+
+    candidate_ids = [p["id"] for p in candidates]
+    index = _review_index
+    if index is not None:
+        # [최적화] 메모리 리뷰 인덱스의 중심 벡터 내적으로 점수 계산 (DB 조회 없음)
+        scores = {
+            pid: {"similarity_score": score, "best_review": review}
+            for pid, (score, review) in index.score(query_vector, candidate_ids).items()
+        }
+    else:
+        scores = await _review_scores_sql_async(query_vector, candidate_ids)
+
+    reranked = []
+    for p in candidates:
+        sc = scores.get(
+            p["id"], {"similarity_score": 0, "best_review": NO_REVIEW}
+        )
+        p.update(
+            {
+                "review_score": sc["similarity_score"],
+                "best_review": sc["best_review"],
+            }
+        )
+        reranked.append(p)
+    reranked.sort(key=lambda x: x.get("review_score", 0), reverse=True)
+    return reranked[:top_k]
+
+
+VOTE_COUNTS_SQL = """
+    SELECT perfume_id, SUM(vote) as total_vote
+    FROM TB_PERFUME_ACCORD_M
+    WHERE perfume_id = ANY(%s::INTEGER[])
+    GROUP BY perfume_id
+"""
+
+REVIEW_SCORES_SQL = """
+    SELECT m.perfume_id, MAX(1 - (e.embedding <=> %s::vector)) as similarity_score,
+    (ARRAY_AGG(m.content ORDER BY (e.embedding <=> %s::vector) ASC))[1] as best_review
+    FROM TB_PERFUME_REVIEW_M m
+    JOIN TB_REVIEW_EMBEDDING_M e ON m.review_id = e.review_id
+    WHERE m.perfume_id = ANY(%s::INTEGER[])
+    GROUP BY m.perfume_id
+    ORDER BY similarity_score DESC
+"""
+
+
+def _fetch_vote_map(candidate_ids: List[int]) -> Dict[int, Any]:
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     try:
-        # [Task D2] Popularity Ranking
-        if rank_mode == "POPULAR":
-            candidate_ids = [p["id"] for p in candidates]
-            if not candidate_ids:
-                return []
-
-            # Query vote counts (SUM of votes from TB_PERFUME_ACCORD_M)
-            # Using placeholders for array of IDs
-            placeholders = ",".join(["%s"] * len(candidate_ids))
-            sql = f"""
-                SELECT perfume_id, SUM(vote) as total_vote
-                FROM TB_PERFUME_ACCORD_M
-                WHERE perfume_id IN ({placeholders})
-                GROUP BY perfume_id
-            """
-            cur.execute(sql, candidate_ids)
-            vote_map = {
-                row["perfume_id"]: row["total_vote"] for row in cur.fetchall()
-            }
+        cur.execute(VOTE_COUNTS_SQL, (list(candidate_ids),))
+        return {row["perfume_id"]: row["total_vote"] for row in cur.fetchall()}
+    finally:
+        cur.close()
+        release_db_connection(conn)
 
-            # Assign votes and Sort
-            for p in candidates:
-                p["review_score"] = vote_map.get(
-                    p["id"], 0
-                )  # Use review_score field for compatibility
-                p["best_review"] = (
-                    f"인기도(Vote): {p['review_score']}"  # Optional info
-                )
-
-            candidates.sort(key=lambda x: x.get("review_score", 0), reverse=True)
-            return candidates[:top_k]
-
-        # [Default] Semantic Reranking (비동기 번역 및 스타일링)
-        system_prompt = "You are a Perfume Data Analyst. Transform the Korean logic into a sensory description..."
-        translation = await async_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": query_text},
-            ],
-            temperature=0,
-        )
-        stylized_query = translation.choices[0].message.content.strip()
-        query_vector = await get_embedding_async(stylized_query)
-        if not query_vector:
-            return candidates[:top_k]
 
-        candidate_ids = [p["id"] for p in candidates]
-        placeholders = ",".join(["%s"] * len(candidate_ids))
-        sql = f"""
-            SELECT m.perfume_id, MAX(1 - (e.embedding <=> %s::vector)) as similarity_score,
-            (ARRAY_AGG(m.content ORDER BY (e.embedding <=> %s::vector) ASC))[1] as best_review
-            FROM TB_PERFUME_REVIEW_M m
-            JOIN TB_REVIEW_EMBEDDING_M e ON m.review_id = e.review_id
-            WHERE m.perfume_id IN ({placeholders})
-            GROUP BY m.perfume_id
-            ORDER BY similarity_score DESC
-        """
-        cur.execute(sql, [query_vector, query_vector] + candidate_ids)
-        scores = {row["perfume_id"]: row for row in cur.fetchall()}
+async def _fetch_vote_map_async(candidate_ids: List[int]) -> Dict[int, Any]:
+    if not perfume_adb.enabled:
+        return await asyncio.to_thread(_fetch_vote_map, candidate_ids)
+    rows = await perfume_adb.fetch_all(VOTE_COUNTS_SQL, (list(candidate_ids),))
+    return {row["perfume_id"]: row["total_vote"] for row in rows}
 
-        reranked = []
-        for p in candidates:
-            sc = scores.get(
-                p["id"], {"similarity_score": 0, "best_review": "관련 리뷰 없음"}
-            )
-            p.update(
-                {
-                    "review_score": sc["similarity_score"],
-                    "best_review": sc["best_review"],
-                }
-            )
-            reranked.append(p)
-        reranked.sort(key=lambda x: x.get("review_score", 0), reverse=True)
-        return reranked[:top_k]
+
+def _review_scores_sql(query_vector: List[float], candidate_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """리뷰 인덱스가 없을 때: 후보 향수의 전체 리뷰와 pgvector로 비교"""
+    conn = get_db_connection()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cur.execute(REVIEW_SCORES_SQL, (query_vector, query_vector, list(candidate_ids)))
+        return {row["perfume_id"]: row for row in cur.fetchall()}
     finally:
         cur.close()
         release_db_connection(conn)
 
 
+async def _review_scores_sql_async(query_vector: List[float], candidate_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    if not perfume_adb.enabled:
+        return await asyncio.to_thread(_review_scores_sql, query_vector, candidate_ids)
+    rows = await perfume_adb.fetch_all(REVIEW_SCORES_SQL, (query_vector, query_vector, list(candidate_ids)))
+    return {row["perfume_id"]: row for row in rows}
+
+
 # ==========================================
 # 4. 추천 로그 및 저장 (Connection Pool 적용)
 # ==========================================
-def save_recommendation_log(
-    member_id: int, perfumes: List[Dict[str, Any]], reason: str
-):
-    if not member_id or not perfumes:
-        return
+# [최적화] 추천 결과 로그는 write-behind 배치로 저장
+# - save_recommendation_log는 버퍼에 넣기만 하고 바로 반환 (전략 준비 경로에서 DB 왕복 제거)
+# - RECO_LOG_BATCH_SIZE개가 모이거나 RECO_LOG_FLUSH_SECONDS마다 multi-row INSERT
+RECOMMENDATION_LOG_SQL = (
+    "INSERT INTO TB_MEMBER_RECOM_RESULT_T "
+    "(MEMBER_ID, PERFUME_ID, PERFUME_NAME, RECOM_TYPE, RECOM_REASON, INTEREST_YN) VALUES %s"
+)
+RECOMMENDATION_LOG_TEMPLATE = "(%s, %s, %s, 'GENERAL', %s, 'N')"
+
+
+def _insert_recommendation_rows(rows: List[Tuple[Any, ...]]) -> None:
     conn = get_recom_db_connection()
+    cur = conn.cursor()
     try:
-        cur = conn.cursor()
-        sql = "INSERT INTO TB_MEMBER_RECOM_RESULT_T (MEMBER_ID, PERFUME_ID, PERFUME_NAME, RECOM_TYPE, RECOM_REASON, INTEREST_YN) VALUES (%s, %s, %s, 'GENERAL', %s, 'N')"
-        for p in perfumes:
-            cur.execute(sql, (member_id, p.get("id"), p.get("name"), reason))
+        execute_values(cur, RECOMMENDATION_LOG_SQL, rows, template=RECOMMENDATION_LOG_TEMPLATE, page_size=len(rows))
         conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
     finally:
         cur.close()
         release_recom_db_connection(conn)
 
 
+async def _insert_recommendation_rows_async(rows: List[Tuple[Any, ...]]) -> None:
+    if not recom_adb.enabled:
+        return await asyncio.to_thread(_insert_recommendation_rows, rows)
+    # executemany는 파이프라인 모드로 한 번에 전송 (배치 크기와 무관하게 같은 Prepared Statement 재사용)
+    await recom_adb.execute_many(RECOMMENDATION_LOG_SQL % RECOMMENDATION_LOG_TEMPLATE, rows)
+
+
+recommendation_log_writer = BatchWriter(
+    _insert_recommendation_rows_async,
+    max_batch=int(os.getenv("RECO_LOG_BATCH_SIZE", "200")),
+    flush_interval=float(os.getenv("RECO_LOG_FLUSH_SECONDS", "1.0")),
+    max_pending=int(os.getenv("RECO_LOG_MAX_PENDING", "10000")),
+    name="reco_log",
+)
+
+
+def save_recommendation_log(
+    member_id: int, perfumes: List[Dict[str, Any]], reason: str
+):
+    if not member_id or not perfumes:
+        return
+    rows = [(member_id, p.get("id"), p.get("name"), reason) for p in perfumes]
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # 이벤트 루프 밖(스크립트 등)에서는 바로 저장
+        _insert_recommendation_rows(rows)
+        return
+    recommendation_log_writer.submit(rows)
+
+
 def add_my_perfume(member_id: int, perfume_id: int, perfume_name: str):
     conn = get_recom_db_connection()
     try:
@@ -434,67 +955,165 @@ def add_my_perfume(member_id: int, perfume_id: int, perfume_name: str):
 # ==========================================
 # 5. 채팅 시스템 (Connection Pool 적용)
 # ==========================================
+CHAT_THREAD_UPSERT_SQL = """
+    INSERT INTO TB_CHAT_THREAD_T (THREAD_ID, MEMBER_ID, TITLE, LAST_CHAT_DT) 
+    VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
+    ON CONFLICT (THREAD_ID) DO UPDATE SET 
+        LAST_CHAT_DT = CURRENT_TIMESTAMP,
+        TITLE = CASE 
+            WHEN TB_CHAT_THREAD_T.TITLE IS NULL OR TB_CHAT_THREAD_T.TITLE = '' 
+            THEN EXCLUDED.TITLE 
+            ELSE TB_CHAT_THREAD_T.TITLE 
+        END,
+        MEMBER_ID = CASE 
+            WHEN EXCLUDED.MEMBER_ID > 0 THEN EXCLUDED.MEMBER_ID 
+            ELSE TB_CHAT_THREAD_T.MEMBER_ID 
+        END
+"""
+CHAT_MESSAGE_INSERT_SQL = "INSERT INTO TB_CHAT_MESSAGE_T (THREAD_ID, MEMBER_ID, ROLE, MESSAGE, META_DATA) VALUES (%s, %s, %s, %s, %s)"
+# [최적화] 히스토리는 (CREATED_DT, MESSAGE_ID) keyset 페이지 단위로 조회 (agent/chat_history.py)
+CHAT_HISTORY_PAGE_SIZE = int(os.getenv("CHAT_HISTORY_PAGE_SIZE", "50"))
+CHAT_HISTORY_MAX_PAGE_SIZE = int(os.getenv("CHAT_HISTORY_MAX_PAGE_SIZE", "500"))
+CHAT_HISTORY_INDEX_SQL = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS IDX_CHAT_MESSAGE_THREAD_KEYSET "
+    "ON TB_CHAT_MESSAGE_T (THREAD_ID, CREATED_DT, MESSAGE_ID)"
+)
+
+
+def _chat_message_params(thread_id: str, member_id: int, role: str, message: str, meta: Optional[dict]):
+    title_snippet = message[:30] + "..." if len(message) > 30 else message
+    thread_params = (thread_id, member_id, title_snippet)
+    message_params = (
+        thread_id,
+        member_id,
+        role,
+        message,
+        json.dumps(meta, ensure_ascii=False) if meta else None,
+    )
+    return thread_params, message_params
+
+
 def save_chat_message(
     thread_id: str, member_id: int, role: str, message: str, meta: dict = None
 ):
+    thread_params, message_params = _chat_message_params(thread_id, member_id, role, message, meta)
     conn = get_recom_db_connection()
     try:
         cur = conn.cursor()
-        title_snippet = message[:30] + "..." if len(message) > 30 else message
         # ================================================================
         # [수정] 스레드가 이미 존재할 때, 로그인한 사용자라면(member_id > 0) 소유권을 가져오도록 수정
         # ================================================================
-        cur.execute(
-            """
-            INSERT INTO TB_CHAT_THREAD_T (THREAD_ID, MEMBER_ID, TITLE, LAST_CHAT_DT) 
-            VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
-            ON CONFLICT (THREAD_ID) DO UPDATE SET 
-                LAST_CHAT_DT = CURRENT_TIMESTAMP,
-                TITLE = CASE 
-                    WHEN TB_CHAT_THREAD_T.TITLE IS NULL OR TB_CHAT_THREAD_T.TITLE = '' 
-                    THEN EXCLUDED.TITLE 
-                    ELSE TB_CHAT_THREAD_T.TITLE 
-                END,
-                MEMBER_ID = CASE 
-                    WHEN EXCLUDED.MEMBER_ID > 0 THEN EXCLUDED.MEMBER_ID 
-                    ELSE TB_CHAT_THREAD_T.MEMBER_ID 
-                END
-            """,
-            (thread_id, member_id, title_snippet),
-        )
+        cur.execute(CHAT_THREAD_UPSERT_SQL, thread_params)
         # ================================================================
         # [수정 종료]
         # ================================================================
-        cur.execute(
-            "INSERT INTO TB_CHAT_MESSAGE_T (THREAD_ID, MEMBER_ID, ROLE, MESSAGE, META_DATA) VALUES (%s, %s, %s, %s, %s)",
-            (
-                thread_id,
-                member_id,
-                role,
-                message,
-                json.dumps(meta, ensure_ascii=False) if meta else None,
-            ),
-        )
+        cur.execute(CHAT_MESSAGE_INSERT_SQL, message_params)
         conn.commit()
     finally:
         cur.close()
         release_recom_db_connection(conn)
 
 
-def get_chat_history(thread_id: str) -> List[Dict[str, Any]]:
+async def save_chat_message_async(
+    thread_id: str, member_id: int, role: str, message: str, meta: dict = None
+):
+    """save_chat_message의 비동기 버전 (스레드 upsert + 메시지 insert를 한 트랜잭션으로)"""
+    if not recom_adb.enabled:
+        return await asyncio.to_thread(save_chat_message, thread_id, member_id, role, message, meta)
+    thread_params, message_params = _chat_message_params(thread_id, member_id, role, message, meta)
+    async with recom_adb.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(CHAT_THREAD_UPSERT_SQL, thread_params)
+            await cur.execute(CHAT_MESSAGE_INSERT_SQL, message_params)
+
+
+def ensure_chat_history_index():
+    """keyset 페이지네이션용 인덱스 (없을 때만, 쓰기를 막지 않도록 CONCURRENTLY)"""
+    conn = get_recom_db_connection()
+    try:
+        conn.autocommit = True
+        cur = conn.cursor()
+        cur.execute(CHAT_HISTORY_INDEX_SQL)
+        cur.close()
+    except Exception as e:
+        print(f"⚠️ [ChatHistory] Failed to ensure keyset index: {e}", flush=True)
+    finally:
+        conn.autocommit = False
+        release_recom_db_connection(conn)
+
+
+def get_chat_history(
+    thread_id: str,
+    limit: Optional[int] = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    include_meta: bool = True,
+    oldest_first: bool = False,
+) -> List[Dict[str, Any]]:
+    """시간 순 메시지 목록 (limit만 주면 최근 limit개, 아무것도 없으면 대화 전체)
+
+    before/after 커서와 oldest_first는 agent/chat_history.build_history_query 참고
+    """
+    sql, params, reversed_order = build_history_query(
+        thread_id, limit, before, after, include_meta, oldest_first
+    )
     conn = get_recom_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     try:
-        cur.execute(
-            "SELECT ROLE as role, MESSAGE as text, META_DATA as metadata FROM TB_CHAT_MESSAGE_T WHERE THREAD_ID = %s ORDER BY CREATED_DT ASC",
-            (thread_id,),
-        )
-        return [dict(row) for row in cur.fetchall()]
+        cur.execute(sql, params)
+        return history_rows(cur.fetchall(), reversed_order)
     finally:
         cur.close()
         release_recom_db_connection(conn)
 
 
+async def get_chat_history_async(
+    thread_id: str,
+    limit: Optional[int] = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    include_meta: bool = True,
+    oldest_first: bool = False,
+) -> List[Dict[str, Any]]:
+    if not recom_adb.enabled:
+        return await asyncio.to_thread(
+            get_chat_history, thread_id, limit, before, after, include_meta, oldest_first
+        )
+    sql, params, reversed_order = build_history_query(
+        thread_id, limit, before, after, include_meta, oldest_first
+    )
+    return history_rows(await recom_adb.fetch_all(sql, params), reversed_order)
+
+
+async def get_chat_history_page_async(
+    thread_id: str,
+    limit: int = CHAT_HISTORY_PAGE_SIZE,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    include_meta: bool = False,
+) -> Dict[str, Any]:
+    """{"messages", "has_more", "next_cursor"} - 커서 없이 부르면 가장 최근 페이지"""
+    limit = max(1, min(limit, CHAT_HISTORY_MAX_PAGE_SIZE))
+    messages = await get_chat_history_async(thread_id, limit + 1, before, after, include_meta)
+    return history_page(messages, limit, AFTER if after else BEFORE)
+
+
+async def iter_chat_history_async(
+    thread_id: str, page_size: int = CHAT_HISTORY_MAX_PAGE_SIZE, include_meta: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """대화 전체를 오래된 순으로 page_size씩 끊어 읽으며 메시지 단위로 반환 (NDJSON 스트리밍용)"""
+    cursor = None
+    while True:
+        page = await get_chat_history_async(
+            thread_id, page_size, after=cursor, include_meta=include_meta, oldest_first=True
+        )
+        for message in page:
+            yield message
+        if len(page) < page_size:
+            return
+        cursor = encode_cursor(page[-1]["created_dt"], page[-1]["id"])
+
+
 def get_user_chat_list(member_id: int) -> List[Dict[str, Any]]:
     if not member_id:
         return []
@@ -556,47 +1175,59 @@ def soft_delete_chat_room(member_id: int, thread_id: str) -> bool:
         release_recom_db_connection(conn)
 
 
-def lookup_note_by_string(keyword: str) -> List[str]:
-    """사용자 입력 텍스트와 일치하거나 유사한 노트를 DB에서 찾습니다."""
-    conn = get_db_connection()
-    cur = conn.cursor()
-    keyword_clean = keyword.strip().lower()
-    found_notes = set()
+def get_note_index() -> NoteSpellingIndex:
+    return _catalog_index("notes", lambda snapshot: NoteSpellingIndex(snapshot.notes))
+
 
+def lookup_note_by_string(keyword: str) -> List[str]:
+    """사용자 입력 텍스트와 일치하거나 유사한 노트를 찾습니다."""
+    # [최적화] 매 호출마다 전체 노트를 DB에서 읽어 순회하지 않고 카탈로그와 함께 갱신되는 인덱스 사용
     try:
-        # 1. 완전 일치 확인
-        cur.execute(
-            "SELECT note FROM TB_PERFUME_NOTES_M WHERE LOWER(note) = %s LIMIT 1",
-            (keyword_clean,),
-        )
-        row = cur.fetchone()
-        if row:
-            return [row[0]]
-
-        # 2. 유사도 기반 검색 (Levenshtein distance)
-        cur.execute("SELECT DISTINCT note FROM TB_PERFUME_NOTES_M")
-        all_notes = [r[0] for r in cur.fetchall() if r[0]]
-
-        for db_note in all_notes:
-            if len(keyword_clean) < 3:
-                if keyword_clean == db_note.lower():
-                    found_notes.add(db_note)
-                continue
-            if distance(keyword_clean, db_note.lower()) <= 2:
-                found_notes.add(db_note)
-
-        return list(found_notes)
+        return get_note_index().lookup(keyword)
     except Exception as e:
         print(f"⚠️ Lookup String Note Error: {e}")
         return []
-    finally:
-        cur.close()
-        release_db_connection(conn)
+
+
+NOTE_VECTOR_TOP_K = 10
 
 
 def lookup_note_by_vector(keyword: str) -> List[str]:
     """벡터 검색을 통해 유사한 노트 후보군을 찾습니다."""
-    # 비동기가 아닌 동기식 도구에서 호출되므로 동기 방식으로 구현
+    index = get_note_vector_index()
+    if index is None:
+        return _lookup_note_by_vector_sql(keyword)
+    key = normalize_text(keyword)
+    cached = index.memo_get(key)
+    if cached is not None:
+        return list(cached)
+    query_vector = get_embedding(keyword)
+    if not query_vector:
+        return []
+    result = index.top_k(query_vector, NOTE_VECTOR_TOP_K)
+    index.memo_put(key, result)
+    return list(result)
+
+
+async def lookup_note_by_vector_async(keyword: str) -> List[str]:
+    """lookup_note_by_vector의 비동기 버전 (임베딩은 비동기 클라이언트, 검색은 메모리 인덱스)"""
+    index = _note_vector_index or await asyncio.to_thread(get_note_vector_index)
+    if index is None:
+        return await asyncio.to_thread(_lookup_note_by_vector_sql, keyword)
+    key = normalize_text(keyword)
+    cached = index.memo_get(key)
+    if cached is not None:
+        return list(cached)
+    query_vector = await get_embedding_async(keyword)
+    if not query_vector:
+        return []
+    result = index.top_k(query_vector, NOTE_VECTOR_TOP_K)
+    index.memo_put(key, result)
+    return list(result)
+
+
+def _lookup_note_by_vector_sql(keyword: str) -> List[str]:
+    """노트 벡터 인덱스를 쓸 수 없을 때: pgvector로 직접 검색"""
     conn = get_db_connection()
     cur = conn.cursor()
     try:
@@ -618,6 +1249,23 @@ def lookup_note_by_vector(keyword: str) -> List[str]:
 # ==========================================
 # 6. Recommended History 관리
 # ==========================================
+RECOMMENDED_HISTORY_UPDATE_SQL = """
+    UPDATE TB_CHAT_THREAD_T
+    SET RECOMMENDED_HISTORY = (
+        SELECT ARRAY(
+            SELECT DISTINCT id FROM (
+                SELECT unnest(COALESCE(RECOMMENDED_HISTORY, '{}') || %s::INTEGER[]) AS id
+            ) sub
+            ORDER BY id DESC
+            LIMIT %s
+        )
+    )
+    WHERE THREAD_ID = %s
+"""
+RECOMMENDED_HISTORY_SELECT_SQL = "SELECT RECOMMENDED_HISTORY FROM TB_CHAT_THREAD_T WHERE THREAD_ID = %s"
+RECOMMENDED_HISTORY_CLEAR_SQL = "UPDATE TB_CHAT_THREAD_T SET RECOMMENDED_HISTORY = '{}' WHERE THREAD_ID = %s"
+
+
 def update_recommended_history(thread_id: str, perfume_ids: List[int], max_size: int = 100):
     """
     스레드의 recommended_history 업데이트 (중복 제거 + 크기 제한)
@@ -634,19 +1282,7 @@ def update_recommended_history(thread_id: str, perfume_ids: List[int], max_size:
     try:
         cur = conn.cursor()
         # 기존 히스토리와 새 ID 병합 후 중복 제거, 최근 max_size개만 유지
-        cur.execute("""
-            UPDATE TB_CHAT_THREAD_T
-            SET RECOMMENDED_HISTORY = (
-                SELECT ARRAY(
-                    SELECT DISTINCT id FROM (
-                        SELECT unnest(COALESCE(RECOMMENDED_HISTORY, '{}') || %s::INTEGER[]) AS id
-                    ) sub
-                    ORDER BY id DESC
-                    LIMIT %s
-                )
-            )
-            WHERE THREAD_ID = %s
-        """, (perfume_ids, max_size, thread_id))
+        cur.execute(RECOMMENDED_HISTORY_UPDATE_SQL, (perfume_ids, max_size, thread_id))
         conn.commit()
         print(f"   💾 [DB] Updated recommended_history for thread {thread_id[:8]}... (+{len(perfume_ids)} IDs)", flush=True)
     except Exception as e:
@@ -657,6 +1293,18 @@ def update_recommended_history(thread_id: str, perfume_ids: List[int], max_size:
         release_recom_db_connection(conn)
 
 
+async def update_recommended_history_async(thread_id: str, perfume_ids: List[int], max_size: int = 100):
+    if not thread_id or not perfume_ids:
+        return
+    if not recom_adb.enabled:
+        return await asyncio.to_thread(update_recommended_history, thread_id, perfume_ids, max_size)
+    try:
+        await recom_adb.execute(RECOMMENDED_HISTORY_UPDATE_SQL, (list(perfume_ids), max_size, thread_id))
+        print(f"   💾 [DB] Updated recommended_history for thread {thread_id[:8]}... (+{len(perfume_ids)} IDs)", flush=True)
+    except Exception as e:
+        print(f"   ⚠️ [DB] Failed to update recommended_history: {e}", flush=True)
+
+
 def get_recommended_history(thread_id: str) -> List[int]:
     """
     스레드의 recommended_history 조회
@@ -673,10 +1321,7 @@ def get_recommended_history(thread_id: str) -> List[int]:
     conn = get_recom_db_connection()
     try:
         cur = conn.cursor()
-        cur.execute(
-            "SELECT RECOMMENDED_HISTORY FROM TB_CHAT_THREAD_T WHERE THREAD_ID = %s",
-            (thread_id,)
-        )
+        cur.execute(RECOMMENDED_HISTORY_SELECT_SQL, (thread_id,))
         row = cur.fetchone()
         history = list(row[0]) if row and row[0] else []
         if history:
@@ -690,6 +1335,22 @@ def get_recommended_history(thread_id: str) -> List[int]:
         release_recom_db_connection(conn)
 
 
+async def get_recommended_history_async(thread_id: str) -> List[int]:
+    if not thread_id:
+        return []
+    if not recom_adb.enabled:
+        return await asyncio.to_thread(get_recommended_history, thread_id)
+    try:
+        row = await recom_adb.fetch_one(RECOMMENDED_HISTORY_SELECT_SQL, (thread_id,), dict_rows=False)
+    except Exception as e:
+        print(f"   ⚠️ [DB] Failed to load recommended_history: {e}", flush=True)
+        return []
+    history = list(row[0]) if row and row[0] else []
+    if history:
+        print(f"   📖 [DB] Loaded recommended_history for thread {thread_id[:8]}... ({len(history)} IDs)", flush=True)
+    return history
+
+
 def clear_recommended_history(thread_id: str):
     """
     스레드의 recommended_history 초기화 (NEW_RECO/RESET 시)
@@ -703,10 +1364,7 @@ def clear_recommended_history(thread_id: str):
     conn = get_recom_db_connection()
     try:
         cur = conn.cursor()
-        cur.execute(
-            "UPDATE TB_CHAT_THREAD_T SET RECOMMENDED_HISTORY = '{}' WHERE THREAD_ID = %s",
-            (thread_id,)
-        )
+        cur.execute(RECOMMENDED_HISTORY_CLEAR_SQL, (thread_id,))
         conn.commit()
         print(f"   🗑️  [DB] Cleared recommended_history for thread {thread_id[:8]}...", flush=True)
     except Exception as e:
@@ -717,6 +1375,18 @@ def clear_recommended_history(thread_id: str):
         release_recom_db_connection(conn)
 
 
+async def clear_recommended_history_async(thread_id: str):
+    if not thread_id:
+        return
+    if not recom_adb.enabled:
+        return await asyncio.to_thread(clear_recommended_history, thread_id)
+    try:
+        await recom_adb.execute(RECOMMENDED_HISTORY_CLEAR_SQL, (thread_id,))
+        print(f"   🗑️  [DB] Cleared recommended_history for thread {thread_id[:8]}...", flush=True)
+    except Exception as e:
+        print(f"   ⚠️ [DB] Failed to clear recommended_history: {e}", flush=True)
+
+
 def get_perfumes_by_note(note_name: str, limit: int = 5) -> List[Dict]:
     """
     특정 노트가 포함된 향수 목록을 반환합니다.
@@ -755,3 +1425,567 @@ def get_perfumes_by_note(note_name: str, limit: int = 5) -> List[Dict]:
     finally:
         cur.close()
         release_db_connection(conn)
+
+
+# ==========================================
+# 7. 향수 프로필 읽기 모델 (Materialized View)
+# ==========================================
+# search_perfumes / lookup_perfume_by_id_tool / /perfumes/detail 이 공통으로 읽는
+# 향수 1건당 1행의 비정규화 프로필. 행마다 STRING_AGG 상관 서브쿼리를 돌리는 대신
+# 테이블별로 한 번씩 집계한 결과를 조인해 두고, 배치 잡에서 주기적으로 REFRESH 합니다.
+
+PERFUME_PROFILE_DDL = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS {PERFUME_PROFILE_VIEW} AS
+WITH accords AS (
+    SELECT perfume_id,
+           STRING_AGG(accord, ', ' ORDER BY ratio DESC NULLS LAST, accord) AS accords,
+           JSONB_AGG(JSONB_BUILD_OBJECT('name', accord, 'ratio', ratio)
+                     ORDER BY ratio DESC NULLS LAST, accord) AS accord_ratios
+    FROM (
+        SELECT perfume_id, accord, MAX(ratio) AS ratio
+        FROM TB_PERFUME_ACCORD_R
+        WHERE accord IS NOT NULL
+        GROUP BY perfume_id, accord
+    ) a
+    GROUP BY perfume_id
+),
+seasons AS (
+    SELECT perfume_id,
+           STRING_AGG(season, ', ' ORDER BY ratio DESC NULLS LAST, season) AS seasons,
+           JSONB_AGG(JSONB_BUILD_OBJECT('name', season, 'ratio', ratio)
+                     ORDER BY ratio DESC NULLS LAST, season) AS season_ratios
+    FROM (
+        SELECT perfume_id, season, MAX(ratio) AS ratio
+        FROM TB_PERFUME_SEASON_R
+        WHERE season IS NOT NULL
+        GROUP BY perfume_id, season
+    ) s
+    GROUP BY perfume_id
+),
+occasions AS (
+    SELECT perfume_id,
+           STRING_AGG(occasion, ', ' ORDER BY ratio DESC NULLS LAST, occasion) AS occasions,
+           JSONB_AGG(JSONB_BUILD_OBJECT('name', occasion, 'ratio', ratio)
+                     ORDER BY ratio DESC NULLS LAST, occasion) AS occasion_ratios
+    FROM (
+        SELECT perfume_id, occasion, MAX(ratio) AS ratio
+        FROM TB_PERFUME_OCA_R
+        WHERE occasion IS NOT NULL
+        GROUP BY perfume_id, occasion
+    ) o
+    GROUP BY perfume_id
+),
+notes AS (
+    SELECT perfume_id,
+           STRING_AGG(note, ', ' ORDER BY note) FILTER (WHERE note_type = 'TOP') AS top_notes,
+           STRING_AGG(note, ', ' ORDER BY note) FILTER (WHERE note_type = 'MIDDLE') AS middle_notes,
+           STRING_AGG(note, ', ' ORDER BY note) FILTER (WHERE note_type = 'BASE') AS base_notes,
+           ARRAY_AGG(note ORDER BY note) FILTER (WHERE note_type = 'TOP') AS top_note_list,
+           ARRAY_AGG(note ORDER BY note) FILTER (WHERE note_type = 'MIDDLE') AS middle_note_list,
+           ARRAY_AGG(note ORDER BY note) FILTER (WHERE note_type = 'BASE') AS base_note_list
+    FROM (
+        SELECT DISTINCT perfume_id, TRIM(note) AS note, UPPER(TRIM(type)) AS note_type
+        FROM TB_PERFUME_NOTES_M
+        WHERE TRIM(COALESCE(note, '')) <> ''
+    ) n
+    GROUP BY perfume_id
+),
+genders AS (
+    SELECT DISTINCT ON (perfume_id) perfume_id, gender
+    FROM TB_PERFUME_GENDER_R
+    ORDER BY perfume_id
+),
+votes AS (
+    SELECT perfume_id, SUM(vote) AS vote_total
+    FROM TB_PERFUME_ACCORD_M
+    GROUP BY perfume_id
+)
+SELECT m.perfume_id, m.perfume_brand, m.perfume_name, m.concentration, m.img_link,
+       m.release_year, m.perfumer,
+       g.gender,
+       COALESCE(v.vote_total, 0) AS vote_total,
+       a.accords, a.accord_ratios,
+       n.top_notes, n.middle_notes, n.base_notes,
+       n.top_note_list, n.middle_note_list, n.base_note_list,
+       s.seasons, s.season_ratios,
+       o.occasions, o.occasion_ratios
+FROM TB_PERFUME_BASIC_M m
+LEFT JOIN accords a ON a.perfume_id = m.perfume_id
+LEFT JOIN seasons s ON s.perfume_id = m.perfume_id
+LEFT JOIN occasions o ON o.perfume_id = m.perfume_id
+LEFT JOIN notes n ON n.perfume_id = m.perfume_id
+LEFT JOIN genders g ON g.perfume_id = m.perfume_id
+LEFT JOIN votes v ON v.perfume_id = m.perfume_id
+WITH DATA;
+
+-- REFRESH ... CONCURRENTLY 에는 UNIQUE 인덱스가 필요
+CREATE UNIQUE INDEX IF NOT EXISTS UX_{PERFUME_PROFILE_VIEW}_ID ON {PERFUME_PROFILE_VIEW} (perfume_id);
+CREATE INDEX IF NOT EXISTS IX_{PERFUME_PROFILE_VIEW}_BRAND ON {PERFUME_PROFILE_VIEW} (perfume_brand);
+-- 검색 후보를 인기순으로 자르는 ORDER BY vote_total DESC, perfume_id 용
+CREATE INDEX IF NOT EXISTS IX_{PERFUME_PROFILE_VIEW}_VOTES ON {PERFUME_PROFILE_VIEW} (vote_total DESC, perfume_id);
+"""
+# vote_total 컬럼이 추가되기 전에 만든 뷰인지 확인 (있으면 1행)
+PERFUME_PROFILE_VOTES_COLUMN_SQL = """
+    SELECT 1 FROM pg_attribute
+    WHERE attrelid = to_regclass(%s) AND attname = 'vote_total' AND NOT attisdropped
+"""
+
+
+def ensure_perfume_profile_view():
+    """프로필 Materialized View가 없으면 생성 (vote_total 컬럼이 없는 이전 버전이면 다시 생성)"""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL", (PERFUME_PROFILE_VIEW,))
+        if cur.fetchone()[0]:
+            cur.execute(PERFUME_PROFILE_VOTES_COLUMN_SQL, (PERFUME_PROFILE_VIEW,))
+            if cur.fetchone() is None:
+                print(f"🔧 [DB] Recreating {PERFUME_PROFILE_VIEW} with vote_total", flush=True)
+                cur.execute(f"DROP MATERIALIZED VIEW {PERFUME_PROFILE_VIEW}")
+        cur.execute(PERFUME_PROFILE_DDL)
+        conn.commit()
+        cur.close()
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ [DB] Perfume profile view setup failed: {e}", flush=True)
+    finally:
+        release_db_connection(conn)
+
+
+def refresh_perfume_profile_view(concurrently: bool = True) -> bool:
+    """
+    원본 테이블(노트/어코드/계절/상황/성별) 변경분을 프로필 뷰에 반영합니다.
+    CONCURRENTLY 모드는 갱신 중에도 검색이 기존 데이터를 계속 읽을 수 있습니다.
+    """
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        mode = "CONCURRENTLY " if concurrently else ""
+        started = time.time()
+        cur.execute(f"REFRESH MATERIALIZED VIEW {mode}{PERFUME_PROFILE_VIEW}")
+        conn.commit()
+        cur.close()
+        print(
+            f"🔄 [DB] {PERFUME_PROFILE_VIEW} refreshed in {time.time() - started:.2f}s",
+            flush=True,
+        )
+        invalidate_catalog_snapshot()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ [DB] Perfume profile view refresh failed: {e}", flush=True)
+        return False
+    finally:
+        release_db_connection(conn)
+
+
+def _start_periodic(name: str, interval_seconds: int, job) -> Optional[threading.Thread]:
+    """interval_seconds 마다 job을 실행하는 데몬 스레드 시작 (0 이하면 비활성)"""
+    if interval_seconds <= 0:
+        return None
+
+    def _loop():
+        while True:
+            time.sleep(interval_seconds)
+            job()
+
+    thread = threading.Thread(target=_loop, name=name, daemon=True)
+    thread.start()
+    return thread
+
+
+def start_perfume_profile_refresher(interval_seconds: int) -> Optional[threading.Thread]:
+    """interval_seconds 마다 프로필 뷰를 갱신하는 데몬 스레드 시작 (0 이하면 비활성)"""
+    return _start_periodic("perfume-profile-refresher", interval_seconds, refresh_perfume_profile_view)
+
+
+# ==========================================
+# 8. 검색 패싯 인덱스 (메모리 비트맵)
+# ==========================================
+# search_perfumes의 필터를 DB 서브쿼리 대신 메모리 비트 연산으로 계산하기 위한 인덱스.
+# 새 인덱스를 다 만든 뒤 참조만 교체하므로 갱신 중에도 검색은 이전 인덱스를 그대로 사용합니다.
+_facet_index: Optional[PerfumeFacetIndex] = None
+
+FACET_SOURCES = {
+    "gender": "SELECT perfume_id, gender FROM TB_PERFUME_GENDER_R",
+    "season": "SELECT perfume_id, season FROM TB_PERFUME_SEASON_R",
+    "occasion": "SELECT perfume_id, occasion FROM TB_PERFUME_OCA_R",
+    "accord": "SELECT perfume_id, accord FROM TB_PERFUME_ACCORD_R",
+    "note": "SELECT perfume_id, note FROM TB_PERFUME_NOTES_M",
+}
+
+
+def load_facet_index() -> bool:
+    """DB에서 패싯 인덱스를 새로 만들어 교체 (실패 시 기존 인덱스/SQL 경로 유지)"""
+    global _facet_index
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        started = time.time()
+        cur.execute(f"SELECT perfume_id, perfume_brand, vote_total FROM {PERFUME_PROFILE_VIEW}")
+        rows = cur.fetchall()
+        perfumes = [(pid, brand) for pid, brand, _ in rows]
+        votes = {pid: int(vote_total or 0) for pid, _, vote_total in rows}
+        facet_rows = {}
+        for facet, sql in FACET_SOURCES.items():
+            cur.execute(sql)
+            facet_rows[facet] = cur.fetchall()
+        cur.close()
+        conn.rollback()  # 읽기 전용 트랜잭션 정리
+        _facet_index = PerfumeFacetIndex(perfumes, facet_rows, votes)
+        print(
+            f"🧮 [DB] Facet index loaded: {_facet_index.size} perfumes in {time.time() - started:.2f}s",
+            flush=True,
+        )
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ [DB] Facet index load failed: {e}", flush=True)
+        return False
+    finally:
+        release_db_connection(conn)
+
+
+def start_facet_index_refresher(interval_seconds: int) -> Optional[threading.Thread]:
+    """interval_seconds 마다 패싯 인덱스를 다시 만드는 데몬 스레드 시작 (0 이하면 비활성)"""
+    return _start_periodic("facet-index-refresher", interval_seconds, load_facet_index)
+
+
+# ==========================================
+# 9. 리뷰 임베딩 인덱스 (rerank용 메모리 벡터)
+# ==========================================
+# 향수별 리뷰 중심 벡터 + 대표 리뷰. 최초 1회 전체 로딩 후에는
+# 마지막으로 읽은 review_id 이후 리뷰가 생긴 향수만 다시 읽어 교체합니다.
+_review_index: Optional[ReviewEmbeddingIndex] = None
+
+REVIEW_ROWS_SQL = """
+    SELECT m.perfume_id, m.review_id, m.content, e.embedding::real[]
+    FROM TB_PERFUME_REVIEW_M m
+    JOIN TB_REVIEW_EMBEDDING_M e ON m.review_id = e.review_id
+"""
+
+
+def _load_review_rows(index: ReviewEmbeddingIndex, where: str = "", params: tuple = ()) -> int:
+    """조건에 맞는 향수들의 리뷰 전체를 향수 단위로 index에 반영, 반영한 향수 수 반환"""
+    conn = get_db_connection()
+    try:
+        # 서버 사이드 커서로 나눠 읽어 전체 리뷰를 한 번에 메모리에 올리지 않음
+        cur = conn.cursor(name=f"review_index_{threading.get_ident()}")
+        cur.itersize = 2000
+        cur.execute(f"{REVIEW_ROWS_SQL} {where} ORDER BY m.perfume_id, m.review_id", params)
+        count = 0
+        for perfume_id, reviews in group_review_rows(cur):
+            index.upsert(perfume_id, reviews)
+            count += 1
+        cur.close()
+        conn.rollback()  # 읽기 전용 트랜잭션 정리
+        return count
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        release_db_connection(conn)
+
+
+def load_review_index() -> bool:
+    """리뷰 인덱스를 처음부터 새로 만들어 교체 (실패 시 기존 인덱스/SQL 경로 유지)"""
+    global _review_index
+    index = ReviewEmbeddingIndex(
+        representatives=int(os.getenv("REVIEW_INDEX_REPRESENTATIVES", "3")),
+        quantize=os.getenv("REVIEW_INDEX_QUANTIZE", "int8"),
+    )
+    try:
+        started = time.time()
+        _load_review_rows(index)
+        _review_index = index
+        print(
+            f"🧮 [DB] Review index loaded: {len(index)} perfumes ({index.quantize}) in {time.time() - started:.2f}s",
+            flush=True,
+        )
+        return True
+    except Exception as e:
+        print(f"⚠️ [DB] Review index load failed: {e}", flush=True)
+        return False
+
+
+def refresh_review_index() -> bool:
+    """마지막 로딩 이후 새 리뷰가 생긴 향수만 다시 읽어 반영 (인덱스가 없으면 전체 로딩)"""
+    index = _review_index
+    if index is None:
+        return load_review_index()
+    try:
+        count = _load_review_rows(
+            index,
+            "WHERE m.perfume_id IN (SELECT perfume_id FROM TB_PERFUME_REVIEW_M WHERE review_id > %s)",
+            (index.max_review_id,),
+        )
+        if count:
+            print(f"🔄 [DB] Review index updated: {count} perfumes", flush=True)
+        return True
+    except Exception as e:
+        print(f"⚠️ [DB] Review index refresh failed: {e}", flush=True)
+        return False
+
+
+def start_review_index_refresher(interval_seconds: int) -> Optional[threading.Thread]:
+    """interval_seconds 마다 리뷰 인덱스를 증분 갱신하는 데몬 스레드 시작 (0 이하면 비활성)"""
+    return _start_periodic("review-index-refresher", interval_seconds, refresh_review_index)
+
+
+# ==========================================
+# 10. 노트 임베딩 인덱스 (lookup_note_by_vector용 메모리 행렬)
+# ==========================================
+# 노트 테이블은 작으므로 전체 임베딩을 메모리에 올려 두고 top-k를 직접 계산합니다.
+# 첫 조회 때 로딩하며, 실패하면 잠시 뒤 다시 시도할 때까지 pgvector 경로를 사용합니다.
+_note_vector_index: Optional[NoteVectorIndex] = None
+_note_vector_index_lock = threading.Lock()
+_note_vector_index_failed_at = 0.0
+NOTE_VECTOR_INDEX_RETRY_SECONDS = 60
+
+
+def load_note_vector_index() -> bool:
+    """DB에서 노트 임베딩 행렬을 새로 읽어 교체 (실패 시 기존 인덱스 유지)"""
+    global _note_vector_index, _note_vector_index_failed_at
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        started = time.time()
+        cur.execute("SELECT note, embedding::real[] FROM TB_NOTE_EMBEDDING_M WHERE embedding IS NOT NULL")
+        rows = cur.fetchall()
+        cur.close()
+        conn.rollback()  # 읽기 전용 트랜잭션 정리
+        _note_vector_index = NoteVectorIndex([r[0] for r in rows], [r[1] for r in rows])
+        print(
+            f"🧮 [DB] Note vector index loaded: {len(rows)} notes in {time.time() - started:.2f}s",
+            flush=True,
+        )
+        return True
+    except Exception as e:
+        conn.rollback()
+        _note_vector_index_failed_at = time.time()
+        print(f"⚠️ [DB] Note vector index load failed: {e}", flush=True)
+        return False
+    finally:
+        release_db_connection(conn)
+
+
+def get_note_vector_index() -> Optional[NoteVectorIndex]:
+    """로딩된 인덱스 반환 (없으면 로딩 시도, 최근 실패했다면 None)"""
+    if _note_vector_index is not None:
+        return _note_vector_index
+    with _note_vector_index_lock:
+        if _note_vector_index is None and time.time() - _note_vector_index_failed_at >= NOTE_VECTOR_INDEX_RETRY_SECONDS:
+            load_note_vector_index()
+    return _note_vector_index
+
+
+def start_note_vector_index_refresher(interval_seconds: int) -> Optional[threading.Thread]:
+    """interval_seconds 마다 노트 임베딩 인덱스를 다시 읽는 데몬 스레드 시작 (0 이하면 비활성)"""
+    return _start_periodic("note-vector-index-refresher", interval_seconds, load_note_vector_index)
+
+
+# ==========================================
+# 11. 인기도 / 트렌딩 점수 (백그라운드 집계)
+# ==========================================
+# 향수별 투표 합계(perfume_db), 아카이브 등록 수와 시간 감쇠 트렌딩(recom_db)을 미리 계산해
+# 메모리 맵(_popularity)과 recom_db의 TB_PERFUME_POPULARITY_T에 보관합니다. (scentmap도 테이블을 읽음)
+# 최초/주기적(POPULARITY_FULL_REFRESH_SECONDS) 전체 재계산 후에는 새 추천 결과/아카이브 등록만 반영합니다.
+# 증분 조회는 마지막 조회 시각 - POPULARITY_EVENT_OVERLAP_SECONDS 이후를 다시 읽고 이벤트 키로 중복 제거
+# (동시에 쓰는 배치 writer 때문에 ID/시각 순서와 커밋 순서가 다를 수 있음)
+_popularity: Optional[PopularityScores] = None
+_popularity_lock = threading.Lock()
+_popularity_loaded_at = 0.0
+
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "72"))
+TRENDING_ARCHIVE_WEIGHT = float(os.getenv("TRENDING_ARCHIVE_WEIGHT", "3"))
+POPULARITY_FULL_REFRESH_SECONDS = int(os.getenv("POPULARITY_FULL_REFRESH_SECONDS", "21600"))
+POPULARITY_EVENT_OVERLAP_SECONDS = int(os.getenv("POPULARITY_EVENT_OVERLAP_SECONDS", "600"))
+# 반감기의 10배 이전 이벤트는 기여도가 0.1% 미만이므로 전체 재계산에서 제외
+TRENDING_WINDOW_HALF_LIVES = 10
+
+POPULARITY_DDL = """
+CREATE TABLE IF NOT EXISTS TB_PERFUME_POPULARITY_T (
+    PERFUME_ID INTEGER PRIMARY KEY,
+    VOTE_TOTAL BIGINT NOT NULL DEFAULT 0,
+    ARCHIVE_COUNT INTEGER NOT NULL DEFAULT 0,
+    TRENDING_SCORE DOUBLE PRECISION NOT NULL DEFAULT 0,
+    SCORE_AS_OF TIMESTAMP,
+    UPDATED_DT TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS IDX_PERFUME_POPULARITY_ARCHIVE ON TB_PERFUME_POPULARITY_T (ARCHIVE_COUNT DESC, VOTE_TOTAL DESC);
+"""
+POPULARITY_VOTES_SQL = "SELECT perfume_id, SUM(vote) FROM TB_PERFUME_ACCORD_M GROUP BY perfume_id"
+POPULARITY_ARCHIVES_SQL = "SELECT perfume_id, COUNT(*) FROM TB_MEMBER_MY_PERFUME_T GROUP BY perfume_id"
+# 이벤트별 감쇠 가중치 합 (%(now)s 기준, 반감기 %(half_life)s초)
+TRENDING_FULL_SQL = """
+    SELECT perfume_id, SUM(weight * POWER(0.5, EXTRACT(EPOCH FROM (%(now)s - event_dt)) / %(half_life)s))
+    FROM (
+        SELECT perfume_id, recom_dt AS event_dt, 1.0 AS weight
+        FROM TB_MEMBER_RECOM_RESULT_T WHERE recom_dt > %(since)s AND recom_dt <= %(now)s
+        UNION ALL
+        SELECT perfume_id, register_dt, %(archive_weight)s
+        FROM TB_MEMBER_MY_PERFUME_T WHERE register_dt > %(since)s AND register_dt <= %(now)s
+    ) events
+    GROUP BY perfume_id
+"""
+# (since, now] 구간 이벤트 (증분 갱신 및 전체 재계산 직후 overlap 구간의 키 기록)
+RECENT_RECOMMENDATIONS_SQL = """
+    SELECT recom_id, perfume_id, recom_dt FROM TB_MEMBER_RECOM_RESULT_T
+    WHERE recom_dt > %s AND recom_dt <= %s AND perfume_id IS NOT NULL
+"""
+RECENT_ARCHIVES_SQL = """
+    SELECT member_id, perfume_id, register_dt FROM TB_MEMBER_MY_PERFUME_T
+    WHERE register_dt > %s AND register_dt <= %s AND perfume_id IS NOT NULL
+"""
+POPULARITY_UPSERT_SQL = """
+    INSERT INTO TB_PERFUME_POPULARITY_T (PERFUME_ID, VOTE_TOTAL, ARCHIVE_COUNT, TRENDING_SCORE, SCORE_AS_OF)
+    VALUES %s
+    ON CONFLICT (PERFUME_ID) DO UPDATE SET
+        VOTE_TOTAL = EXCLUDED.VOTE_TOTAL,
+        ARCHIVE_COUNT = EXCLUDED.ARCHIVE_COUNT,
+        TRENDING_SCORE = EXCLUDED.TRENDING_SCORE,
+        SCORE_AS_OF = EXCLUDED.SCORE_AS_OF,
+        UPDATED_DT = CURRENT_TIMESTAMP
+"""
+
+
+def ensure_popularity_table():
+    conn = get_recom_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(POPULARITY_DDL)
+        conn.commit()
+        cur.close()
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ [DB] Popularity table setup failed: {e}", flush=True)
+    finally:
+        release_recom_db_connection(conn)
+
+
+def _save_popularity_rows(rows: List[Tuple[Any, ...]]) -> None:
+    if not rows:
+        return
+    conn = get_recom_db_connection()
+    cur = conn.cursor()
+    try:
+        execute_values(cur, POPULARITY_UPSERT_SQL, rows, page_size=1000)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        release_recom_db_connection(conn)
+
+
+def _fetch_recent_popularity_events(cur, since: datetime, now: datetime) -> List[PopularityEvent]:
+    cur.execute(RECENT_RECOMMENDATIONS_SQL, (since, now))
+    events = [
+        PopularityEvent(("recom", recom_id), pid, recom_dt, 1.0)
+        for recom_id, pid, recom_dt in cur.fetchall()
+    ]
+    cur.execute(RECENT_ARCHIVES_SQL, (since, now))
+    events += [
+        PopularityEvent(("archive", member_id, pid, register_dt), pid, register_dt, TRENDING_ARCHIVE_WEIGHT, archived=True)
+        for member_id, pid, register_dt in cur.fetchall()
+    ]
+    return events
+
+
+def load_popularity() -> bool:
+    """인기도/트렌딩 전체 재계산 후 메모리 맵과 테이블 교체 (실패 시 기존 맵/SQL 경로 유지)"""
+    global _popularity, _popularity_loaded_at
+    half_life = timedelta(hours=TRENDING_HALF_LIFE_HOURS)
+    perfume_conn = get_db_connection()
+    recom_conn = None
+    try:
+        started = time.time()
+        cur = perfume_conn.cursor()
+        cur.execute(POPULARITY_VOTES_SQL)
+        votes = {pid: int(total or 0) for pid, total in cur.fetchall()}
+        cur.close()
+        perfume_conn.rollback()  # 읽기 전용 트랜잭션 정리
+
+        recom_conn = get_recom_db_connection()
+        cur = recom_conn.cursor()
+        # 집계/overlap 키를 같은 스냅샷에서 읽어야 이후 증분에서 빠지거나 두 번 더해지지 않음
+        cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        # 시각은 모두 DB 시계 기준 (이벤트 시각과 같은 시계로 감쇠 계산, 트랜잭션 시작 시각)
+        cur.execute("SELECT LOCALTIMESTAMP")
+        now = cur.fetchone()[0]
+        params = {
+            "now": now,
+            "since": now - half_life * TRENDING_WINDOW_HALF_LIVES,
+            "half_life": half_life.total_seconds(),
+            "archive_weight": TRENDING_ARCHIVE_WEIGHT,
+        }
+        cur.execute(POPULARITY_ARCHIVES_SQL)
+        archives = {pid: int(count) for pid, count in cur.fetchall() if pid is not None}
+        cur.execute(TRENDING_FULL_SQL, params)
+        trending = {pid: float(score) for pid, score in cur.fetchall() if pid is not None}
+        overlap = timedelta(seconds=POPULARITY_EVENT_OVERLAP_SECONDS)
+        recent_events = _fetch_recent_popularity_events(cur, now - overlap, now)
+        cur.close()
+        recom_conn.rollback()
+
+        scores = PopularityScores(half_life, overlap)
+        scores.load(votes, archives, trending, now, recent_events)
+        _popularity = scores
+        _popularity_loaded_at = time.time()
+        _save_popularity_rows(scores.rows())
+        print(
+            f"🧮 [DB] Popularity scores loaded: {len(scores)} perfumes in {time.time() - started:.2f}s",
+            flush=True,
+        )
+        return True
+    except Exception as e:
+        perfume_conn.rollback()
+        if recom_conn is not None:
+            recom_conn.rollback()
+        print(f"⚠️ [DB] Popularity load failed: {e}", flush=True)
+        return False
+    finally:
+        release_db_connection(perfume_conn)
+        if recom_conn is not None:
+            release_recom_db_connection(recom_conn)
+
+
+def refresh_popularity() -> bool:
+    """마지막 반영 이후의 추천 결과/아카이브 등록만 더해 갱신 (맵이 없거나 오래됐으면 전체 재계산)"""
+    with _popularity_lock:
+        scores = _popularity
+        if scores is None or time.time() - _popularity_loaded_at >= POPULARITY_FULL_REFRESH_SECONDS:
+            return load_popularity()
+        conn = get_recom_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT LOCALTIMESTAMP")
+            now = cur.fetchone()[0]
+            events = _fetch_recent_popularity_events(cur, scores.events_since(), now)
+            cur.close()
+            conn.rollback()  # 읽기 전용 트랜잭션 정리
+        except Exception as e:
+            conn.rollback()
+            print(f"⚠️ [DB] Popularity refresh failed: {e}", flush=True)
+            return False
+        finally:
+            release_recom_db_connection(conn)
+
+        touched = scores.add_events(events, now)
+        try:
+            _save_popularity_rows(scores.rows(touched))
+        except Exception as e:
+            print(f"⚠️ [DB] Popularity table update failed: {e}", flush=True)
+        if touched:
+            print(f"🔄 [DB] Popularity updated: {len(touched)} perfumes", flush=True)
+        return True
+
+
+def get_popularity() -> Optional[PopularityScores]:
+    return _popularity
+
+
+def start_popularity_refresher(interval_seconds: int) -> Optional[threading.Thread]:
+    """interval_seconds 마다 인기도/트렌딩을 증분 갱신하는 데몬 스레드 시작 (0 이하면 비활성)"""
+    return _start_periodic("popularity-refresher", interval_seconds, refresh_popularity)
@@ -0,0 +1,301 @@
+# backend/agent/embedding_cache.py
+"""
+임베딩 캐시 (Content-addressed)
+
+(모델명 + 정규화된 텍스트)의 해시를 키로 임베딩 벡터를 저장합니다.
+- 1차: 프로세스 내 LRU (OrderedDict)
+- 2차: 로컬 SQLite 파일 (재시작 후에도 유지)
+- 동일 텍스트에 대한 동시 요청은 한 번의 API 호출로 합쳐집니다 (single-flight).
+- 캐시에 없는 텍스트 여러 개는 한 번의 embeddings 요청으로 묶어 보냅니다.
+- 비동기 API는 SQLite 조회를 스레드에서 실행하고 저장은 기다리지 않음(write-behind) - 이벤트 루프를 막지 않음
+"""
+
+import array
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+# OpenAI embeddings API의 요청당 최대 입력 개수
+MAX_BATCH_SIZE = 2048
+
+FetchBatch = Callable[[List[str]], List[List[float]]]
+FetchBatchAsync = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+def normalize_text(text: str) -> str:
+    """줄바꿈/연속 공백을 하나의 공백으로 정리 (API 입력과 캐시 키에 동일하게 사용)"""
+    return " ".join(text.split())
+
+
+class _Flight:
+    """동기 호출용 single-flight 슬롯"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[List[float]] = None
+        self.error: Optional[BaseException] = None
+
+
+class EmbeddingCache:
+    def __init__(self, model: str, max_entries: int = 4096, store_path: Optional[str] = None):
+        self.model = model
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sync_inflight: Dict[str, _Flight] = {}
+        self._async_inflight: Dict[str, asyncio.Future] = {}
+        self._store: Optional[sqlite3.Connection] = None
+        self._store_lock = threading.Lock()
+        self._pending_writes: Set["asyncio.Future[None]"] = set()
+        if store_path:
+            self._open_store(store_path)
+
+    # ------------------------------------------------------------------
+    # 키 / 저장소
+    # ------------------------------------------------------------------
+    def key(self, normalized: str) -> str:
+        return hashlib.sha256(f"{self.model}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def _open_store(self, path: str) -> None:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embedding_cache ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL)"
+            )
+            conn.commit()
+            self._store = conn
+        except Exception as e:
+            # 저장소를 열 수 없으면 메모리 캐시만 사용
+            print(f"⚠️ Embedding Cache Store Error: {e}")
+            self._store = None
+
+    def _store_get(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        if self._store is None or not keys:
+            return {}
+        found: Dict[str, List[float]] = {}
+        try:
+            with self._store_lock:
+                for i in range(0, len(keys), 500):
+                    chunk = list(keys[i : i + 500])
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._store.execute(
+                        f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[key] = array.array("d", blob).tolist()
+        except Exception as e:
+            print(f"⚠️ Embedding Cache Read Error: {e}")
+        return found
+
+    def _store_put(self, items: Dict[str, List[float]]) -> None:
+        if self._store is None or not items:
+            return
+        try:
+            with self._store_lock:
+                self._store.executemany(
+                    "INSERT OR REPLACE INTO embedding_cache (key, model, vector) VALUES (?, ?, ?)",
+                    [
+                        (key, self.model, array.array("d", vector).tobytes())
+                        for key, vector in items.items()
+                    ],
+                )
+                self._store.commit()
+        except Exception as e:
+            print(f"⚠️ Embedding Cache Write Error: {e}")
+
+    # ------------------------------------------------------------------
+    # LRU
+    # ------------------------------------------------------------------
+    def _lru_get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._lru.get(key)
+            if vector is not None:
+                self._lru.move_to_end(key)
+            return vector
+
+    def _lru_put(self, key: str, vector: List[float]) -> None:
+        with self._lock:
+            self._lru[key] = vector
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _lookup_memory(self, keys: Sequence[str]) -> Tuple[Dict[str, List[float]], List[str]]:
+        found: Dict[str, List[float]] = {}
+        missing = []
+        for key in keys:
+            vector = self._lru_get(key)
+            if vector is not None:
+                found[key] = vector
+            else:
+                missing.append(key)
+        return found, missing
+
+    def _promote(self, found: Dict[str, List[float]], stored: Dict[str, List[float]]) -> Dict[str, List[float]]:
+        for key, vector in stored.items():
+            self._lru_put(key, vector)
+            found[key] = vector
+        return found
+
+    def _lookup(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """LRU → 로컬 저장소 순으로 조회 (저장소 히트는 LRU로 승격)"""
+        found, missing = self._lookup_memory(keys)
+        return self._promote(found, self._store_get(missing))
+
+    async def _lookup_async(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        found, missing = self._lookup_memory(keys)
+        if self._store is None or not missing:
+            return found
+        return self._promote(found, await asyncio.to_thread(self._store_get, missing))
+
+    def _remember(self, items: Dict[str, List[float]]) -> None:
+        for key, vector in items.items():
+            self._lru_put(key, vector)
+        self._store_put(items)
+
+    def _remember_async(self, items: Dict[str, List[float]]) -> None:
+        """LRU에는 바로 반영하고 SQLite 저장은 스레드에서 (기다리지 않음)"""
+        for key, vector in items.items():
+            self._lru_put(key, vector)
+        if self._store is not None and items:
+            write = asyncio.get_running_loop().run_in_executor(None, self._store_put, dict(items))
+            self._pending_writes.add(write)
+            write.add_done_callback(self._pending_writes.discard)
+
+    async def flush_async(self) -> None:
+        """진행 중인 write-behind 저장이 끝날 때까지 대기"""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes)
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    # ------------------------------------------------------------------
+    # 동기 API
+    # ------------------------------------------------------------------
+    def get_many(self, texts: Sequence[str], fetch_batch: FetchBatch) -> List[List[float]]:
+        """텍스트 목록의 임베딩을 입력 순서대로 반환 (빈 텍스트는 [])"""
+        normalized = [normalize_text(t or "") for t in texts]
+        keys = [self.key(n) if n else None for n in normalized]
+        unique = {k: n for k, n in zip(keys, normalized) if k}
+        results = self._lookup(list(unique))
+
+        owned: Dict[str, _Flight] = {}
+        waiting: Dict[str, _Flight] = {}
+        with self._lock:
+            for key in unique:
+                if key in results:
+                    continue
+                flight = self._sync_inflight.get(key)
+                if flight is None:
+                    flight = _Flight()
+                    self._sync_inflight[key] = flight
+                    owned[key] = flight
+                else:
+                    waiting[key] = flight
+
+        if owned:
+            owned_keys = list(owned)
+            try:
+                fetched: Dict[str, List[float]] = {}
+                for i in range(0, len(owned_keys), MAX_BATCH_SIZE):
+                    chunk = owned_keys[i : i + MAX_BATCH_SIZE]
+                    vectors = fetch_batch([unique[k] for k in chunk])
+                    fetched.update(zip(chunk, vectors))
+                self._remember(fetched)
+                results.update(fetched)
+                for key, flight in owned.items():
+                    flight.result = fetched.get(key)
+            except BaseException as e:
+                for flight in owned.values():
+                    flight.error = e
+                raise
+            finally:
+                with self._lock:
+                    for key, flight in owned.items():
+                        self._sync_inflight.pop(key, None)
+                        flight.done.set()
+
+        for key, flight in waiting.items():
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            results[key] = flight.result
+
+        return [results.get(k) or [] if k else [] for k in keys]
+
+    def get(self, text: str, fetch_batch: FetchBatch) -> List[float]:
+        return self.get_many([text], fetch_batch)[0]
+
+    # ------------------------------------------------------------------
+    # 비동기 API
+    # ------------------------------------------------------------------
+    async def get_many_async(
+        self, texts: Sequence[str], fetch_batch: FetchBatchAsync
+    ) -> List[List[float]]:
+        """get_many의 비동기 버전 (동일 이벤트 루프 내 동시 요청을 합침)"""
+        normalized = [normalize_text(t or "") for t in texts]
+        keys = [self.key(n) if n else None for n in normalized]
+        unique = {k: n for k, n in zip(keys, normalized) if k}
+        results = await self._lookup_async(list(unique))
+
+        loop = asyncio.get_running_loop()
+        owned: Dict[str, asyncio.Future] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        for key in unique:
+            if key in results:
+                continue
+            future = self._async_inflight.get(key)
+            if future is not None and future.get_loop() is loop and not future.done():
+                waiting[key] = future
+            else:
+                future = loop.create_future()
+                self._async_inflight[key] = future
+                owned[key] = future
+
+        if owned:
+            owned_keys = list(owned)
+            try:
+                fetched: Dict[str, List[float]] = {}
+                for i in range(0, len(owned_keys), MAX_BATCH_SIZE):
+                    chunk = owned_keys[i : i + MAX_BATCH_SIZE]
+                    vectors = await fetch_batch([unique[k] for k in chunk])
+                    fetched.update(zip(chunk, vectors))
+                self._remember_async(fetched)
+                results.update(fetched)
+                for key, future in owned.items():
+                    if not future.done():
+                        future.set_result(fetched.get(key))
+            except BaseException as e:
+                error = e
+                if isinstance(e, asyncio.CancelledError):
+                    # 요청한 쪽이 취소되어도 기다리던 다른 요청은 일반 오류로 처리
+                    error = RuntimeError("embedding request cancelled")
+                for future in owned.values():
+                    if not future.done():
+                        future.set_exception(error)
+                        # 기다리는 쪽이 없으면 "exception never retrieved" 경고가 나지 않도록 소비
+                        future.exception()
+                raise
+            finally:
+                for key, future in owned.items():
+                    if self._async_inflight.get(key) is future:
+                        del self._async_inflight[key]
+
+        for key, future in waiting.items():
+            results[key] = await asyncio.shield(future)
+
+        return [results.get(k) or [] if k else [] for k in keys]
+
+    async def get_async(self, text: str, fetch_batch: FetchBatchAsync) -> List[float]:
+        return (await self.get_many_async([text], fetch_batch))[0]
@@ -0,0 +1,291 @@
+# backend/agent/facet_index.py
+"""
+향수 검색 필터용 비트맵 패싯 인덱스
+
+어코드/계절/상황/성별/노트 값마다 해당 향수 ID 비트맵을 메모리에 들고 있다가
+search_perfumes의 hard_filters(AND), strategy_filters(패싯 내 OR, 패싯 간 AND),
+exclude_ids, exclude_brands를 비트 연산으로 계산합니다.
+Postgres에는 최종 후보 ID의 상세 정보만 조회합니다.
+후보는 인기순(어코드 투표 합계 내림차순, 같으면 ID 오름차순)으로 limit개를 자릅니다.
+(ID 순으로 자르면 오래된/작은 ID 향수만 리랭크 후보가 되므로, 비트맵에는 인기순 위치를 저장)
+search_relaxed는 전략 필터 완화 단계(relaxation_tiers)를 한 번에 평가해 단계 순으로 후보를 고릅니다.
+
+- pyroaring이 설치되어 있으면 Roaring 압축 비트맵, 없으면 파이썬 정수 비트셋을 사용
+- 필터 의미는 기존 SQL과 동일: 성별은 정확히 일치, 나머지는 ILIKE(대소문자 무시) 일치,
+  perfume_brand NOT IN 은 브랜드가 NULL인 향수도 제외
+"""
+
+import itertools
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:  # pragma: no cover - optional dependency
+    from pyroaring import BitMap  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    BitMap = None
+
+
+class IntBitMap:
+    """pyroaring.BitMap과 같은 연산(|, &, -, len, 오름차순 순회)을 지원하는 정수 비트셋"""
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, values: Iterable[int] = ()) -> None:
+        bits = 0
+        for value in values:
+            bits |= 1 << value
+        self._bits = bits
+
+    @classmethod
+    def _wrap(cls, bits: int) -> "IntBitMap":
+        bitmap = cls.__new__(cls)
+        bitmap._bits = bits
+        return bitmap
+
+    def __or__(self, other: "IntBitMap") -> "IntBitMap":
+        return self._wrap(self._bits | other._bits)
+
+    def __and__(self, other: "IntBitMap") -> "IntBitMap":
+        return self._wrap(self._bits & other._bits)
+
+    def __sub__(self, other: "IntBitMap") -> "IntBitMap":
+        return self._wrap(self._bits & ~other._bits)
+
+    def __len__(self) -> int:
+        return bin(self._bits).count("1")
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def __iter__(self) -> Iterator[int]:
+        bits = self._bits
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+
+def make_bitmap(values: Iterable[int] = ()) -> Any:
+    return BitMap(values) if BitMap is not None else IntBitMap(values)
+
+
+# 기존 SQL 조건과 같은 성별 그룹 (여성/남성 요청은 유니섹스 포함, 그 외는 유니섹스만)
+GENDER_GROUPS = {
+    "women": ("Feminine", "Unisex"),
+    "female": ("Feminine", "Unisex"),
+    "men": ("Masculine", "Unisex"),
+    "male": ("Masculine", "Unisex"),
+}
+HARD_FACETS = ("season", "occasion", "accord", "note")
+STRATEGY_FACETS = ("accord", "season", "occasion", "note")
+_LIKE_WILDCARDS = ("%", "_", "\\")
+
+
+def relaxation_tiers(relax_keys: Sequence[str]) -> List[Tuple[int, Tuple[str, ...]]]:
+    """완화 단계 순서 [(level, 유지할 키들)]
+
+    level 0은 모든 조건(완화 대상이 아닌 전략 필터 포함), 이후 level L은 relax_keys 중
+    L개를 뺀 조합을 itertools.combinations 순서(앞쪽 키 우선)로 나열합니다.
+    (조건이 하나뿐이면 완화 단계 없음)
+    """
+    keys = tuple(relax_keys)
+    tiers: List[Tuple[int, Tuple[str, ...]]] = [(0, keys)]
+    for r in range(len(keys) - 1, 0, -1):
+        tiers.extend((len(keys) - r, combo) for combo in itertools.combinations(keys, r))
+    return tiers
+
+
+def relaxation_tier(
+    tiers: Sequence[Tuple[int, Tuple[str, ...]]], matched: Set[str], matched_rest: bool
+) -> Optional[int]:
+    """후보가 만족한 조건(matched)으로 들어가는 가장 앞선 단계의 위치 (해당 없음이면 None)"""
+    for position, (level, keys) in enumerate(tiers):
+        if level == 0:
+            if matched_rest and matched.issuperset(keys):
+                return position
+        elif matched.issuperset(keys):
+            return position
+    return None
+
+
+def is_plain_value(value: Any) -> bool:
+    """ILIKE 와일드카드가 없는 문자열만 인덱스로 처리 (그 외는 SQL 경로로)"""
+    return isinstance(value, str) and not any(ch in value for ch in _LIKE_WILDCARDS)
+
+
+class PerfumeFacetIndex:
+    def __init__(
+        self,
+        perfumes: Iterable[Tuple[int, Optional[str]]],
+        facet_rows: Dict[str, Iterable[Tuple[int, Optional[str]]]],
+        votes: Optional[Dict[int, int]] = None,
+    ) -> None:
+        """
+        Args:
+            perfumes: (perfume_id, perfume_brand) - 검색 대상 전체 (프로필 뷰 기준)
+            facet_rows: {"gender"|"season"|"occasion"|"accord"|"note": [(perfume_id, value), ...]}
+            votes: {perfume_id: 어코드 투표 합계} - 후보 순서 (없으면 0)
+        """
+        votes = votes or {}
+        perfumes = sorted(perfumes, key=lambda row: (-votes.get(row[0], 0), row[0]))
+        # 비트맵 값은 향수 ID가 아니라 인기순 위치 (오름차순 순회 = 인기순)
+        self._ids: List[int] = [perfume_id for perfume_id, _ in perfumes]
+        self._position: Dict[int, int] = {perfume_id: i for i, perfume_id in enumerate(self._ids)}
+        brand_exact: Dict[str, List[int]] = defaultdict(list)
+        brand_lower: Dict[str, List[int]] = defaultdict(list)
+        null_brand: List[int] = []
+        for position, (_perfume_id, brand) in enumerate(perfumes):
+            if brand is None:
+                null_brand.append(position)
+            else:
+                brand_exact[brand].append(position)
+                brand_lower[brand.lower()].append(position)
+
+        self.all = make_bitmap(range(len(self._ids)))
+        self._empty = make_bitmap()
+        self._brand_exact = {k: make_bitmap(v) for k, v in brand_exact.items()}
+        self._brand_lower = {k: make_bitmap(v) for k, v in brand_lower.items()}
+        self._null_brand = make_bitmap(null_brand)
+
+        self._facets: Dict[str, Dict[str, Any]] = {}
+        for facet, rows in facet_rows.items():
+            grouped: Dict[str, List[int]] = defaultdict(list)
+            for perfume_id, value in rows:
+                position = self._position.get(perfume_id)
+                if value is None or position is None:
+                    continue
+                # 성별은 SQL에서도 정확히 일치(IN) 비교, 나머지는 ILIKE
+                grouped[value if facet == "gender" else value.lower()].append(position)
+            self._facets[facet] = {k: make_bitmap(v) for k, v in grouped.items()}
+
+        self.size = len(self._ids)
+        self.loaded_at = time.time()
+
+    def _lookup(self, facet: str, value: str) -> Any:
+        key = value if facet == "gender" else value.lower()
+        return self._facets.get(facet, {}).get(key, self._empty)
+
+    @staticmethod
+    def supports(hard_filters: Dict[str, Any], strategy_filters: Dict[str, Any]) -> bool:
+        """인덱스로 SQL과 같은 결과를 낼 수 있는 필터인지 확인"""
+        gender = hard_filters.get("gender")
+        if gender and not isinstance(gender, str):
+            return False
+        for key in HARD_FACETS:
+            value = hard_filters.get(key)
+            if value and not is_plain_value(value):
+                return False
+        for key, values in strategy_filters.items():
+            if not values or key == "gender" or key.lower() not in STRATEGY_FACETS:
+                continue
+            if not isinstance(values, (list, tuple)) or not all(is_plain_value(v) for v in values):
+                return False
+        return True
+
+    def search(
+        self,
+        hard_filters: Dict[str, Any],
+        strategy_filters: Dict[str, Any],
+        exclude_ids: Optional[Sequence[int]] = None,
+        exclude_brands: Optional[Sequence[str]] = None,
+        brand: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[int]:
+        """조건을 만족하는 향수 ID를 인기순으로 최대 limit개 반환"""
+        result = self._base(hard_filters, exclude_ids, exclude_brands, brand)
+        for key, values in strategy_filters.items():
+            matched = self._strategy_match(key, values)
+            if matched is not None:
+                result = result & matched
+
+        ids: List[int] = []
+        for position in result:
+            if len(ids) >= limit:
+                break
+            ids.append(self._ids[position])
+        return ids
+
+    def search_relaxed(
+        self,
+        hard_filters: Dict[str, Any],
+        strategy_filters: Dict[str, Any],
+        relax_keys: Sequence[str],
+        exclude_ids: Optional[Sequence[int]] = None,
+        exclude_brands: Optional[Sequence[str]] = None,
+        brand: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Tuple[int, int]]:
+        """모든 완화 단계를 한 번에 평가해 [(perfume_id, tier 위치)]를 단계 순으로 최대 limit개 반환
+
+        단계 순서는 relaxation_tiers, 같은 단계 안에서는 인기순.
+        """
+        base = self._base(hard_filters, exclude_ids, exclude_brands, brand)
+        by_key = {key: self._strategy_match(key, strategy_filters[key]) for key in relax_keys}
+        rest = base
+        for key, values in strategy_filters.items():
+            matched = None if key in by_key else self._strategy_match(key, values)
+            if matched is not None:
+                rest = rest & matched
+
+        picked: List[Tuple[int, int]] = []
+        seen = self._empty
+        for position, (level, keys) in enumerate(relaxation_tiers(relax_keys)):
+            tier = rest if level == 0 else base
+            for key in keys:
+                if by_key[key] is not None:
+                    tier = tier & by_key[key]
+            for candidate in tier - seen:
+                if len(picked) >= limit:
+                    return picked
+                picked.append((self._ids[candidate], position))
+            seen = seen | tier
+        return picked
+
+    def _base(
+        self,
+        hard_filters: Dict[str, Any],
+        exclude_ids: Optional[Sequence[int]],
+        exclude_brands: Optional[Sequence[str]],
+        brand: Optional[str],
+    ) -> Any:
+        """hard_filters(AND) + 제외 조건을 적용한 비트맵"""
+        result = self.all
+
+        if exclude_ids:
+            positions = (self._position.get(int(i)) for i in exclude_ids)
+            result = result - make_bitmap(p for p in positions if p is not None)
+
+        if exclude_brands:
+            excluded = self._null_brand
+            for name in exclude_brands:
+                excluded = excluded | self._brand_exact.get(name, self._empty)
+            result = result - excluded
+
+        gender = hard_filters.get("gender")
+        if gender:
+            allowed = self._empty
+            for value in GENDER_GROUPS.get(gender.lower(), ("Unisex",)):
+                allowed = allowed | self._lookup("gender", value)
+            result = result & allowed
+
+        if brand:
+            result = result & self._brand_lower.get(brand.lower(), self._empty)
+
+        for key in HARD_FACETS:
+            value = hard_filters.get(key)
+            if value:
+                result = result & self._lookup(key, value)
+        return result
+
+    def _strategy_match(self, key: str, values: Any) -> Optional[Any]:
+        """전략 필터 하나(패싯 내 OR)의 비트맵 (적용 대상이 아니면 None)"""
+        if not values or key == "gender":
+            return None
+        facet = key.lower()
+        if facet not in STRATEGY_FACETS:
+            return None
+        matched = self._empty
+        for value in values:
+            matched = matched | self._lookup(facet, value)
+        return matched
@@ -13,7 +13,6 @@ from langchain_core.messages import (  # type: ignore[reportMissingImports]
     HumanMessage,
 )
 from langgraph.graph import StateGraph, START, END  # type: ignore[reportMissingImports]
-from langgraph.checkpoint.memory import MemorySaver  # type: ignore[reportMissingImports]
 
 # [Import] 로컬 모듈
 from .schemas import (
@@ -47,12 +46,15 @@ from .prompts import (
     WRITER_FAILURE_PROMPT,
     WRITER_RECOMMENDATION_PROMPT_SINGLE,
     WRITER_RECOMMENDATION_PROMPT_EXPERT_SINGLE,
+    WRITER_CLOSING_PROMPT,
 )
 from .database import save_recommendation_log, fetch_meta_data
+from .checkpointer import build_checkpointer
 from .denylist import has_forbidden_words, UserFriendlyStrategyLabels
 
 from .followup_classifier import classify_followup
-from .personalization import get_personalization_summary
+from .personalization import get_personalization_summary_async
+from .rerank_context import RerankContext, use_rerank_context
 from .use_case_utils import infer_use_case
 
 # [정보 검색 전용 서브 그래프 임포트]
@@ -523,6 +525,8 @@ class RecoSearcher:
         self.batch_selected_ids = batch_selected_ids
         self.brand_counts = brand_counts
         self.search_fn = search_fn
+        # 이번 턴의 모든 전략/재검색이 공유하는 리랭크 질의 메모 (같은 reason은 번역/임베딩 1회)
+        self.rerank_context = RerankContext()
         self.user_requested_brand = bool(
             user_prefs.get("brand") or user_prefs.get("reference_brand")
         )
@@ -656,6 +660,8 @@ class RecoSearcher:
     async def prepare_strategy(
         self, strategy_name: str, priority: int, rank_mode: str
     ) -> Dict[str, Any]:
+        # 전략 태스크에 바인딩 -> search_fn 내부의 rerank_perfumes_async가 사용
+        use_rerank_context(self.rerank_context)
         plan_messages = [
             SystemMessage(content=self.researcher_prompt),
             HumanMessage(
@@ -681,55 +687,21 @@ class RecoSearcher:
                 "priority": priority,
             }
 
-        user_label = await self.generate_user_label(plan.reason)
-
-        try:
-            h_filters = plan.hard_filters.model_dump(exclude_none=True)
-            s_filters = plan.strategy_filters.model_dump(exclude_none=True)
-        except Exception:
-            h_filters = {}
-            s_filters = {}
-
+        # [최적화] 사용자용 라벨 생성(LLM)은 검색/리랭크와 무관하므로 동시에 진행하고
+        # 후보 선택이 끝난 뒤 섹션을 만들 때만 기다림
+        label_task = asyncio.create_task(self.generate_user_label(plan.reason))
         try:
-            exclude_ids = await self._snapshot_exclude_ids()
-            # 로그: 전략별 검색 시 사용되는 제외 ID
-            print(f"   🔍 [Strategy {priority}] Searching with {len(exclude_ids)} exclusions", flush=True)
-            candidates, _match_type = await self._run_search(
-                h_filters,
-                s_filters,
-                exclude_ids=exclude_ids,
-                query_text=plan.reason,
-                rank_mode=rank_mode,
-            )
-        except Exception as e:
-            return {
-                "error": True,
-                "error_type": "tool_error",
-                "error_detail": str(e),
-                "section_data": None,
-                "priority": priority,
-            }
-
-        if not candidates:
-            return {
-                "error": True,
-                "error_type": "no_results",
-                "error_detail": "No candidates returned",
-                "section_data": None,
-                "priority": priority,
-            }
-
-        selected_perfume = await self._select_candidate(candidates)
-
-        # 로그: 선택된 향수
-        if selected_perfume:
-            print(f"   ✅ [Strategy {priority}] Selected perfume ID: {selected_perfume.get('id')}", flush=True)
+            try:
+                h_filters = plan.hard_filters.model_dump(exclude_none=True)
+                s_filters = plan.strategy_filters.model_dump(exclude_none=True)
+            except Exception:
+                h_filters = {}
+                s_filters = {}
 
-        if not selected_perfume:
             try:
                 exclude_ids = await self._snapshot_exclude_ids()
-                # 로그: 재시도 시 제외 ID
-                print(f"   🔄 [Strategy {priority}] Retry with {len(exclude_ids)} exclusions", flush=True)
+                # 로그: 전략별 검색 시 사용되는 제외 ID
+                print(f"   🔍 [Strategy {priority}] Searching with {len(exclude_ids)} exclusions", flush=True)
                 candidates, _match_type = await self._run_search(
                     h_filters,
                     s_filters,
@@ -745,20 +717,62 @@ class RecoSearcher:
                     "section_data": None,
                     "priority": priority,
                 }
+
+            if not candidates:
+                return {
+                    "error": True,
+                    "error_type": "no_results",
+                    "error_detail": "No candidates returned",
+                    "section_data": None,
+                    "priority": priority,
+                }
+
             selected_perfume = await self._select_candidate(candidates)
 
-            # 로그: 재시도 후 선택된 향수
+            # 로그: 선택된 향수
             if selected_perfume:
-                print(f"   ✅ [Strategy {priority}] Selected perfume ID (retry): {selected_perfume.get('id')}", flush=True)
+                print(f"   ✅ [Strategy {priority}] Selected perfume ID: {selected_perfume.get('id')}", flush=True)
 
-        if not selected_perfume:
-            return {
-                "error": True,
-                "error_type": "no_candidates",
-                "error_detail": "No candidates selected",
-                "section_data": None,
-                "priority": priority,
-            }
+            if not selected_perfume:
+                try:
+                    exclude_ids = await self._snapshot_exclude_ids()
+                    # 로그: 재시도 시 제외 ID
+                    print(f"   🔄 [Strategy {priority}] Retry with {len(exclude_ids)} exclusions", flush=True)
+                    candidates, _match_type = await self._run_search(
+                        h_filters,
+                        s_filters,
+                        exclude_ids=exclude_ids,
+                        query_text=plan.reason,
+                        rank_mode=rank_mode,
+                    )
+                except Exception as e:
+                    return {
+                        "error": True,
+                        "error_type": "tool_error",
+                        "error_detail": str(e),
+                        "section_data": None,
+                        "priority": priority,
+                    }
+                selected_perfume = await self._select_candidate(candidates)
+
+                # 로그: 재시도 후 선택된 향수
+                if selected_perfume:
+                    print(f"   ✅ [Strategy {priority}] Selected perfume ID (retry): {selected_perfume.get('id')}", flush=True)
+
+            if not selected_perfume:
+                return {
+                    "error": True,
+                    "error_type": "no_candidates",
+                    "error_detail": "No candidates selected",
+                    "section_data": None,
+                    "priority": priority,
+                }
+
+            user_label = await label_task
+        finally:
+            # 검색/선택 실패로 섹션을 만들지 않는 경우 라벨 생성 취소
+            if not label_task.done():
+                label_task.cancel()
 
         save_recommendation_log(
             member_id=self.member_id,
@@ -869,7 +883,6 @@ class RecoWriter:
         display_priority: int,
         *,
         is_first: bool,
-        is_last: bool,
     ) -> Optional[str]:
         if not prepared_data:
             return None
@@ -890,22 +903,11 @@ class RecoWriter:
         content_parts = [
             f"[섹션 번호]: {display_priority}",
             f"[도입부 포함]: {'예' if is_first else '아니오'}",
-            f"[마지막 섹션 여부]: {'예' if is_last else '아니오'}",
             (
                 f"[출력 규칙]: 도입부 포함이 '아니오'이면 첫 줄을 반드시 '## {display_priority}.'로 시작하고 도입부 문장을 쓰지 마세요."
             ),
         ]
 
-        # [★추가] 마지막 섹션일 때 종합 의견 추가 지시
-        if is_last:
-            content_parts.append(
-                "\n[마지막 섹션 지시사항]: 이 섹션이 마지막이므로, 향수 설명과 [[SAVE:...]] 태그를 모두 작성한 후 "
-                "구분선(---)을 추가하고, 그 아래에 향수 사용에 대한 친절한 종합 의견을 2-3문장으로 작성해주세요. "
-                "예: '마지막으로, 향을 처음 들이실 땐 1~2번만 가볍게 뿌려서 내 살결에 어떻게 남는지부터 확인해보세요. "
-                "데일리일수록 \"과하지 않은 잔향\"이 가장 오래 갑니다.'"
-            )
-
-
         if expression_text:
             content_parts.append(f"\n[감각 표현 참고]:\n{expression_text}")
 
@@ -954,6 +956,44 @@ class RecoWriter:
             logger.error(f"Writer error: {e}")
             return None
 
+    async def generate_closing(self, prepared_data_list: List[Dict[str, Any]]) -> Optional[str]:
+        """모든 섹션 출력 후 답변 끝에 붙일 종합 의견 (섹션과 별도 단계로 스트리밍)"""
+        perfumes = []
+        for prepared_data in prepared_data_list:
+            section_data = prepared_data.get("section_data") or {}
+            perfume = section_data.get("perfume", {})
+            strategy = section_data.get("strategy", {})
+            perfumes.append(
+                f"- {perfume.get('perfume_brand', '')} - {perfume.get('perfume_name', '')}"
+                f" ({strategy.get('user_label', '')})"
+            )
+        user_prefs = self.state.get("user_preferences", {})
+
+        messages = [
+            SystemMessage(content=WRITER_CLOSING_PROMPT),
+            HumanMessage(
+                content=(
+                    f"[사용자 모드]: {self.user_mode}\n"
+                    f"[사용자 정보]: {json.dumps(user_prefs, ensure_ascii=False)}\n"
+                    "[추천한 향수]:\n" + "\n".join(perfumes)
+                )
+            ),
+        ]
+
+        try:
+            result_text = ""
+            if hasattr(SUPER_SMART_LLM, "astream"):
+                async for chunk in SUPER_SMART_LLM.astream(messages):
+                    if chunk.content:
+                        result_text += chunk.content
+            else:
+                response = await SUPER_SMART_LLM.ainvoke(messages)
+                result_text = response.content or ""
+            return result_text.strip() or None
+        except Exception as e:
+            logger.error(f"Closing writer error: {e}")
+            return None
+
 
 async def parallel_reco_node(state: AgentState):
     member_id = state.get("member_id", 0)
@@ -964,7 +1004,7 @@ async def parallel_reco_node(state: AgentState):
 
     personalization = {}
     if use_case == "SELF" and member_id > 0:
-        personalization = get_personalization_summary(member_id) or {}
+        personalization = await get_personalization_summary_async(member_id) or {}
         if personalization.get("summary_text"):
             print(f"🎯 [Personalization] {personalization['summary_text']}", flush=True)
     else:
@@ -1063,10 +1103,11 @@ async def parallel_reco_node(state: AgentState):
     ]
 
     errors_encountered: List[Dict[str, str]] = []
-    pending_result: Optional[Dict[str, Any]] = None
     output_texts: List[str] = []
     prepared_data_list: List[Dict[str, Any]] = []
 
+    # [최적화] 전략이 끝나는 즉시 해당 섹션을 작성(스트리밍)
+    # 마지막 섹션 여부를 알기 위해 결과를 하나씩 붙잡아 두지 않고, 종합 의견은 모든 전략이 끝난 뒤 별도 단계로 작성
     for future in asyncio.as_completed(prep_tasks):
         try:
             result = await future
@@ -1089,38 +1130,15 @@ async def parallel_reco_node(state: AgentState):
                 )
             continue
 
-        if pending_result:
-            section_number = len(output_texts) + 1
-            output_text = await writer.generate_section(
-                pending_result,
-                section_number,
-                is_first=section_number == 1,
-                is_last=False,
-            )
-            if output_text:
-                output_texts.append(output_text)
-                prepared_data_list.append(pending_result)
-            else:
-                errors_encountered.append(
-                    {
-                        "type": "writer_error",
-                        "detail": "Writer failed to produce output",
-                    }
-                )
-
-        pending_result = result
-
-    if pending_result:
         section_number = len(output_texts) + 1
         output_text = await writer.generate_section(
-            pending_result,
+            result,
             section_number,
             is_first=section_number == 1,
-            is_last=True,
         )
         if output_text:
             output_texts.append(output_text)
-            prepared_data_list.append(pending_result)
+            prepared_data_list.append(result)
         else:
             errors_encountered.append(
                 {
@@ -1129,11 +1147,16 @@ async def parallel_reco_node(state: AgentState):
                 }
             )
 
+    # Tail: 마지막 섹션 뒤에 붙는 종합 의견
+    closing_text = await writer.generate_closing(prepared_data_list) if output_texts else None
+
     if output_texts:
         full_text = output_texts[0]
         for next_text in output_texts[1:]:
             next_text = _normalize_section_boundary(full_text, next_text)
             full_text = f"{full_text}\n\n{next_text}"
+        if closing_text:
+            full_text = f"{full_text}\n\n{closing_text}"
 
         # [★추가] 스트리밍 후 안내 메시지 (케이스 1 + 케이스 2)
         actual_count = len(output_texts)
@@ -1153,7 +1176,7 @@ async def parallel_reco_node(state: AgentState):
             # 케이스 2: 부분 실패 (과다 요청이 아닐 때만)
             notice_msg = post_notice_msg.strip()
 
-        # [★수정] 종합 의견은 LLM이 마지막 섹션에서 자동 생성 (하드코딩 제거)
+        # [★수정] 종합 의견은 모든 섹션 출력 후 별도 LLM 단계(generate_closing)에서 생성 (하드코딩 제거)
         # 안내 메시지만 조건부로 추가
         if notice_msg:
             full_text = f"{full_text}\n{notice_msg}"
@@ -1208,9 +1231,9 @@ async def parallel_reco_node(state: AgentState):
     # [★추가] DB에 recommended_history 저장 (thread_id 안전성 검증)
     thread_id = state.get("thread_id")
     if thread_id and current_batch_ids:
-        from .database import update_recommended_history
+        from .database import update_recommended_history_async
         try:
-            update_recommended_history(thread_id, current_batch_ids, max_size=100)
+            await update_recommended_history_async(thread_id, current_batch_ids, max_size=100)
         except Exception as e:
             print(f"   ⚠️ [DB] Failed to save recommended_history: {e}", flush=True)
             # DB 저장 실패해도 state의 recommended_history는 유지됨 (메모리 fallback)
@@ -1429,5 +1452,6 @@ workflow.add_edge("out_of_scope_handler", END)
 workflow.add_edge("unsupported_request_handler", END)
 workflow.add_edge("info_retrieval_subgraph", END)
 
-checkpointer = MemorySaver()
+# [최적화] 영속 체크포인터 (SQLite/Postgres + LRU/TTL Hot Tier, CHECKPOINT_BACKEND로 선택)
+checkpointer = build_checkpointer()
 app_graph = workflow.compile(checkpointer=checkpointer)
@@ -0,0 +1,83 @@
+# backend/agent/note_index.py
+"""
+노트 이름 오탈자 보정 인덱스 (SymSpell 방식 삭제 사전)
+
+카탈로그의 노트 이름(소문자)마다 최대 MAX_EDIT_DISTANCE 글자를 지운 변형을 미리 만들어 두고,
+조회 시 입력의 삭제 변형과 겹치는 노트만 후보로 꺼내 레벤슈타인 거리로 검증합니다.
+거리 k 이내인 두 문자열은 각각 k글자 이하를 지워 같은 문자열을 만들 수 있으므로
+전체 노트를 순회하던 기존 방식과 같은 결과를 냅니다.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+try:
+    from Levenshtein import distance
+except ImportError:  # pragma: no cover
+
+    def distance(s1: str, s2: str) -> int:
+        prev = list(range(len(s2) + 1))
+        for i, c1 in enumerate(s1, 1):
+            cur = [i]
+            for j, c2 in enumerate(s2, 1):
+                cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (c1 != c2)))
+            prev = cur
+        return prev[-1]
+
+
+MAX_EDIT_DISTANCE = 2
+# 이보다 짧은 입력은 오탈자 보정 없이 완전 일치만 허용 (기존 동작과 동일)
+MIN_FUZZY_LENGTH = 3
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """word에서 최대 max_distance 글자를 지운 모든 변형 (원본 포함)"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            for i in range(len(item)):
+                variant = item[:i] + item[i + 1 :]
+                if variant not in results:
+                    next_frontier.add(variant)
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+class NoteSpellingIndex:
+    def __init__(self, notes: Iterable[str], max_distance: int = MAX_EDIT_DISTANCE) -> None:
+        self.max_distance = max_distance
+        # 소문자 이름 -> DB 표기들 (대소문자만 다른 노트가 여러 개일 수 있음)
+        self._variants: Dict[str, List[str]] = defaultdict(list)
+        for note in notes:
+            if note and note not in self._variants[note.lower()]:
+                self._variants[note.lower()].append(note)
+
+        self._deletes: Dict[str, List[str]] = defaultdict(list)
+        for lowered in self._variants:
+            for variant in _deletes(lowered, max_distance):
+                self._deletes[variant].append(lowered)
+
+    def __len__(self) -> int:
+        return len(self._variants)
+
+    def lookup(self, keyword: str) -> List[str]:
+        """완전 일치(대소문자 무시)면 그 노트 하나, 아니면 거리 max_distance 이내의 모든 노트"""
+        keyword_clean = keyword.strip().lower()
+        exact = self._variants.get(keyword_clean)
+        if exact:
+            return [exact[0]]
+        if len(keyword_clean) < MIN_FUZZY_LENGTH:
+            return []
+
+        candidates: Set[str] = set()
+        for variant in _deletes(keyword_clean, self.max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+
+        found: List[str] = []
+        for lowered in sorted(candidates):
+            if distance(keyword_clean, lowered) <= self.max_distance:
+                found.extend(self._variants[lowered])
+        return found
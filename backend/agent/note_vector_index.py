@@ -0,0 +1,58 @@
+# backend/agent/note_vector_index.py
+"""
+노트 임베딩 top-k 메모리 인덱스
+
+TB_NOTE_EMBEDDING_M 전체를 단위 길이로 정규화한 float32 행렬로 들고 있다가
+질의 벡터와의 내적(= 코사인 유사도) 상위 k개를 argpartition으로 고릅니다.
+(pgvector의 ORDER BY embedding <=> q LIMIT k 와 같은 순서)
+같은 키워드의 결과는 인덱스별 LRU 메모에 보관하며, 인덱스를 새로 만들면 메모도 함께 비워집니다.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+class NoteVectorIndex:
+    def __init__(self, notes: Sequence[str], vectors: Sequence[Sequence[float]], memo_size: int = 1024) -> None:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or len(notes) != matrix.shape[0]:
+            raise ValueError("notes and vectors must have matching rows")
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._matrix = matrix / np.where(norms == 0, 1.0, norms)
+        self._notes = list(notes)
+        self._memo: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._memo_size = memo_size
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._notes)
+
+    def top_k(self, query_vector: Sequence[float], k: int = 10) -> List[str]:
+        if not self._notes:
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        scores = self._matrix @ (query / norm)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [self._notes[i] for i in top]
+
+    def memo_get(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            result = self._memo.get(key)
+            if result is not None:
+                self._memo.move_to_end(key)
+            return result
+
+    def memo_put(self, key: str, result: List[str]) -> None:
+        with self._lock:
+            self._memo[key] = result
+            self._memo.move_to_end(key)
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
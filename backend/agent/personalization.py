@@ -7,7 +7,12 @@ tb_member_my_perfume_t 기반 사용자 취향을 분석하여
 
 from typing import List, Dict, Any, Optional
 from collections import defaultdict
-from .archive_db import get_my_perfumes, get_perfume_notes_and_accords
+from .archive_db import (
+    get_my_perfumes,
+    get_my_perfumes_async,
+    get_perfume_notes_and_accords,
+    get_perfume_notes_and_accords_async,
+)
 
 # =================================================================
 # 개인화 신호 가중치 설정
@@ -126,6 +131,32 @@ def get_personalization_summary(member_id: int) -> Dict[str, Any]:
     perfume_ids = [p['perfume_id'] for p in my_perfumes]
     notes_accords_map = get_perfume_notes_and_accords(perfume_ids)
 
+    return _summarize(my_perfumes, notes_accords_map)
+
+
+async def get_personalization_summary_async(member_id: int) -> Dict[str, Any]:
+    """get_personalization_summary의 비동기 버전 (DB 조회를 이벤트 루프에서 await)"""
+    if not member_id or member_id == 0:
+        return _empty_summary()
+
+    try:
+        my_perfumes = await get_my_perfumes_async(member_id)
+    except Exception as e:
+        print(f"⚠️ [Personalization] Error fetching my_perfumes: {e}")
+        return _empty_summary()
+
+    if not my_perfumes:
+        return _empty_summary()
+
+    my_perfumes = my_perfumes[:QUERY_LIMIT]
+    perfume_ids = [p['perfume_id'] for p in my_perfumes]
+    notes_accords_map = await get_perfume_notes_and_accords_async(perfume_ids)
+
+    return _summarize(my_perfumes, notes_accords_map)
+
+
+def _summarize(my_perfumes: List[Dict[str, Any]], notes_accords_map: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """조회한 향수 목록과 노트/어코드로 개인화 요약 계산"""
     # 점수 계산
     scored_perfumes = []
     brand_scores = defaultdict(float)
@@ -0,0 +1,113 @@
+# backend/agent/popularity.py
+"""
+향수 인기도/트렌딩 점수 (메모리 맵)
+
+요청마다 TB_PERFUME_ACCORD_M 전체를 SUM(vote)로 묶거나 아카이브 테이블을 GROUP BY 하던 대신,
+백그라운드 작업이 미리 계산한 점수를 보관합니다. (DB 접근은 agent.database의 refresher 담당)
+- votes: 향수별 어코드 투표 합계 (인기도)
+- archives: 회원 아카이브(TB_MEMBER_MY_PERFUME_T) 등록 수
+- trending: 추천 결과/아카이브 등록 이벤트의 시간 감쇠 합계 (반감기 half_life)
+  score(t) = Σ weight * 0.5 ** ((t - t_i) / half_life)
+  as_of 기준으로 저장하므로 새 이벤트만 더하고(증분) 기존 점수는 경과 시간만큼 한 번에 감쇠
+- 증분 조회는 ID/시각 워터마크 대신 마지막 조회 시각 - overlap 이후를 다시 읽고 이벤트 키로 중복 제거
+  (같은 시각에 늦게 커밋된 아카이브, 더 큰 ID보다 늦게 커밋된 추천 결과도 overlap 안이면 반영.
+   그보다 늦게 보이는 이벤트는 주기적 전체 재계산에서 반영)
+- 갱신은 새 dict를 만든 뒤 참조만 교체하므로 읽는 쪽은 락 없이 조회
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class PopularityEvent(NamedTuple):
+    key: Hashable  # 중복 제거용 (추천 결과 ID, 아카이브 (회원, 향수, 등록 시각) 등)
+    perfume_id: int
+    event_dt: datetime
+    weight: float
+    archived: bool = False
+
+
+class PopularityScores:
+    def __init__(self, half_life: timedelta, overlap: timedelta = timedelta(minutes=10)) -> None:
+        self.half_life = half_life
+        self.overlap = overlap
+        self.votes: Dict[int, int] = {}
+        self.archives: Dict[int, int] = {}
+        self.trending: Dict[int, float] = {}
+        self.as_of: Optional[datetime] = None
+        # overlap 구간 안에서 이미 반영한 이벤트 키 -> 이벤트 시각
+        self._seen: Dict[Hashable, datetime] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.votes.keys() | self.archives.keys() | self.trending.keys())
+
+    def decay_factor(self, elapsed: timedelta) -> float:
+        return 0.5 ** (max(elapsed.total_seconds(), 0.0) / self.half_life.total_seconds())
+
+    def load(
+        self,
+        votes: Dict[int, int],
+        archives: Dict[int, int],
+        trending: Dict[int, float],
+        as_of: datetime,
+        recent_events: Iterable[PopularityEvent] = (),
+    ) -> None:
+        """전체 재계산 결과로 교체 (recent_events: 재계산에 포함된 overlap 구간 이벤트, 다음 증분에서 중복 제외)"""
+        with self._lock:
+            self.votes = dict(votes)
+            self.archives = dict(archives)
+            self.trending = dict(trending)
+            self.as_of = as_of
+            self._seen = {e.key: e.event_dt for e in recent_events}
+
+    def events_since(self) -> Optional[datetime]:
+        """다음 증분 조회의 시작 시각 (이 시각 이후 이벤트를 다시 읽음)"""
+        return self.as_of - self.overlap if self.as_of else None
+
+    def add_events(self, events: Iterable[PopularityEvent], now: datetime) -> List[int]:
+        """기존 점수를 now까지 감쇠시키고 처음 보는 이벤트만 더함, 점수가 바뀐 향수 ID 반환"""
+        with self._lock:
+            factor = self.decay_factor(now - self.as_of) if self.as_of else 1.0
+            trending = {pid: score * factor for pid, score in self.trending.items()}
+            archives = dict(self.archives)
+            seen = dict(self._seen)
+            touched = set()
+            for event in events:
+                if event.key in seen:
+                    continue
+                seen[event.key] = event.event_dt
+                trending[event.perfume_id] = (
+                    trending.get(event.perfume_id, 0.0) + event.weight * self.decay_factor(now - event.event_dt)
+                )
+                if event.archived:
+                    archives[event.perfume_id] = archives.get(event.perfume_id, 0) + 1
+                touched.add(event.perfume_id)
+            # 다음 조회 구간(now - overlap 이후)보다 오래된 키는 다시 읽히지 않으므로 정리
+            cutoff = now - self.overlap
+            self._seen = {key: dt for key, dt in seen.items() if dt > cutoff}
+            self.trending, self.archives, self.as_of = trending, archives, now
+            return sorted(touched)
+
+    def vote_map(self, perfume_ids: Iterable[int]) -> Dict[int, int]:
+        votes = self.votes
+        return {pid: votes[pid] for pid in perfume_ids if pid in votes}
+
+    def trending_score(self, perfume_id: int, now: Optional[datetime] = None) -> float:
+        score = self.trending.get(perfume_id, 0.0)
+        if now is None or self.as_of is None:
+            return score
+        return score * self.decay_factor(now - self.as_of)
+
+    def rank_by_votes(self, perfume_ids: Iterable[int], limit: Optional[int] = None) -> List[int]:
+        """투표 합계 내림차순 (투표 정보가 없는 향수는 뒤로, 같은 점수는 입력 순서 유지)"""
+        votes = self.votes
+        ranked = sorted(perfume_ids, key=lambda pid: (pid not in votes, -votes.get(pid, 0)))
+        return ranked if limit is None else ranked[:limit]
+
+    def rows(self, perfume_ids: Optional[Iterable[int]] = None) -> List[Tuple[int, int, int, float, datetime]]:
+        """테이블 저장용 (perfume_id, vote_total, archive_count, trending_score, score_as_of)"""
+        votes, archives, trending, as_of = self.votes, self.archives, self.trending, self.as_of
+        ids = sorted(votes.keys() | archives.keys() | trending.keys()) if perfume_ids is None else perfume_ids
+        return [(pid, votes.get(pid, 0), archives.get(pid, 0), trending.get(pid, 0.0), as_of) for pid in ids]
@@ -0,0 +1,55 @@
+# backend/agent/rerank_context.py
+"""
+요청 단위 리랭크 질의 메모이제이션
+
+rerank_perfumes_async(DEFAULT)는 query_text마다 gpt-4o-mini "번역" + 임베딩 두 번의 네트워크 호출을 합니다.
+한 턴 안에서는 같은 query_text로 여러 번 리랭크하므로 (재검색, 같은 reason을 가진 전략 등)
+RerankContext가 query_text -> 질의 벡터를 요청이 끝날 때까지 기억합니다.
+- 같은 query_text의 동시 요청은 한 번의 준비 작업을 함께 기다림 (single-flight)
+- 실패하거나 빈 벡터가 나온 경우는 기억하지 않아 다음 호출에서 다시 시도
+- 컨텍스트는 명시적으로 넘기거나, use_rerank_context()로 현재 asyncio 태스크에 바인딩
+  (태스크 생성 시 contextvars가 복사되므로 하위 태스크에도 적용, 요청이 끝나면 함께 사라짐)
+"""
+
+import asyncio
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, List, Optional
+
+PrepareFn = Callable[[str], Awaitable[List[float]]]
+
+
+class RerankContext:
+    def __init__(self) -> None:
+        self._prepared: Dict[str, "asyncio.Future[List[float]]"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def query_vector(self, query_text: str, prepare: PrepareFn) -> List[float]:
+        """query_text의 질의 벡터 (이 컨텍스트에서 처음이면 prepare 실행)"""
+        future = self._prepared.get(query_text)
+        if future is None:
+            self.misses += 1
+            future = asyncio.ensure_future(prepare(query_text))
+            self._prepared[query_text] = future
+            future.add_done_callback(lambda f, key=query_text: self._forget_failed(key, f))
+        else:
+            self.hits += 1
+        # 먼저 요청한 쪽이 취소되어도 함께 기다리는 다른 리랭크는 영향받지 않도록 shield
+        return await asyncio.shield(future)
+
+    def _forget_failed(self, query_text: str, future: "asyncio.Future[List[float]]") -> None:
+        if future.cancelled() or future.exception() is not None or not future.result():
+            if self._prepared.get(query_text) is future:
+                del self._prepared[query_text]
+
+
+_current: ContextVar[Optional[RerankContext]] = ContextVar("rerank_context", default=None)
+
+
+def use_rerank_context(context: Optional[RerankContext]) -> None:
+    """현재 태스크(와 이후 생성되는 하위 태스크)의 리랭크 컨텍스트 지정"""
+    _current.set(context)
+
+
+def current_rerank_context() -> Optional[RerankContext]:
+    return _current.get()
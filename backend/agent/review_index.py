@@ -0,0 +1,130 @@
+# backend/agent/review_index.py
+"""
+리뷰 임베딩 메모리 인덱스 (rerank용)
+
+향수마다 리뷰 임베딩의 중심 벡터(centroid) 1개와 중심에 가장 가까운 대표 리뷰 몇 개를 보관합니다.
+rerank_perfumes_async(DEFAULT)는 후보 향수의 중심 벡터와 질의 벡터의 내적으로 점수를 매기고,
+대표 리뷰 중 질의와 가장 가까운 리뷰를 best_review로 사용합니다.
+(매 전략마다 후보의 전체 리뷰를 pgvector로 비교하던 쿼리를 대체)
+
+- 모든 벡터는 단위 길이로 정규화해 두므로 내적 = 코사인 유사도
+- quantize="int8"이면 벡터별 스케일과 함께 int8로 저장 (float32 대비 메모리 1/4)
+- 향수 단위로 교체(upsert)할 수 있어 새 리뷰가 생긴 향수만 다시 읽어 증분 갱신
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+NO_REVIEW = "관련 리뷰 없음"
+
+
+@dataclass(frozen=True)
+class PerfumeReviewVectors:
+    centroid: np.ndarray  # (D,) float32 또는 int8
+    centroid_scale: float
+    reps: np.ndarray  # (K, D) float32 또는 int8
+    rep_scales: np.ndarray  # (K,)
+    rep_texts: Tuple[str, ...]
+    review_count: int
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def _quantize(matrix: np.ndarray, quantize: str) -> Tuple[np.ndarray, np.ndarray]:
+    """행 단위 대칭 int8 양자화 (quantize="float32"면 그대로)"""
+    if quantize != "int8":
+        return matrix.astype(np.float32), np.ones(matrix.shape[:-1], dtype=np.float32)
+    scales = np.abs(matrix).max(axis=-1) / 127.0
+    scales = np.where(scales == 0, 1.0, scales).astype(np.float32)
+    quantized = np.rint(matrix / scales[..., None]).astype(np.int8)
+    return quantized, scales
+
+
+class ReviewEmbeddingIndex:
+    def __init__(self, representatives: int = 3, quantize: str = "int8") -> None:
+        self.representatives = representatives
+        self.quantize = quantize
+        self.max_review_id = 0
+        self._entries: Dict[int, PerfumeReviewVectors] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, perfume_id: int) -> bool:
+        return perfume_id in self._entries
+
+    def build_entry(self, reviews: Sequence[Tuple[int, str, Sequence[float]]]) -> Optional[PerfumeReviewVectors]:
+        """(review_id, content, embedding) 목록으로 한 향수의 벡터 묶음 생성"""
+        rows = [(content, vector) for _, content, vector in reviews if vector is not None and len(vector)]
+        if not rows:
+            return None
+        matrix = _normalize(np.asarray([vector for _, vector in rows], dtype=np.float32))
+        centroid = _normalize(matrix.mean(axis=0))
+
+        # 중심에 가까운 순서로 대표 리뷰 선택
+        order = np.argsort(-(matrix @ centroid), kind="stable")[: self.representatives]
+        reps, rep_scales = _quantize(matrix[order], self.quantize)
+        centroid_q, centroid_scale = _quantize(centroid[None, :], self.quantize)
+        return PerfumeReviewVectors(
+            centroid=centroid_q[0],
+            centroid_scale=float(centroid_scale[0]),
+            reps=reps,
+            rep_scales=rep_scales,
+            rep_texts=tuple(rows[i][0] for i in order),
+            review_count=len(rows),
+        )
+
+    def upsert(self, perfume_id: int, reviews: Sequence[Tuple[int, str, Sequence[float]]]) -> None:
+        """향수 하나의 리뷰 전체로 항목을 교체 (리뷰가 없으면 제거)"""
+        entry = self.build_entry(reviews)
+        with self._lock:
+            if entry is None:
+                self._entries.pop(perfume_id, None)
+            else:
+                self._entries[perfume_id] = entry
+            if reviews:
+                self.max_review_id = max(self.max_review_id, max(r[0] for r in reviews))
+
+    def load(self, grouped_reviews: Iterable[Tuple[int, Sequence[Tuple[int, str, Sequence[float]]]]]) -> None:
+        for perfume_id, reviews in grouped_reviews:
+            self.upsert(perfume_id, reviews)
+
+    def score(self, query_vector: Sequence[float], perfume_ids: Sequence[int]) -> Dict[int, Tuple[float, str]]:
+        """{perfume_id: (유사도, 대표 리뷰)} - 인덱스에 없는(리뷰 없는) 향수는 제외"""
+        query = _normalize(np.asarray(query_vector, dtype=np.float32))
+        with self._lock:
+            entries = [(pid, self._entries[pid]) for pid in perfume_ids if pid in self._entries]
+        if not entries:
+            return {}
+
+        centroids = np.stack([entry.centroid for _, entry in entries]).astype(np.float32)
+        scales = np.asarray([entry.centroid_scale for _, entry in entries], dtype=np.float32)
+        similarities = (centroids @ query) * scales
+
+        results: Dict[int, Tuple[float, str]] = {}
+        for (perfume_id, entry), similarity in zip(entries, similarities):
+            rep_scores = (entry.reps.astype(np.float32) @ query) * entry.rep_scales
+            best = entry.rep_texts[int(np.argmax(rep_scores))]
+            results[perfume_id] = (float(similarity), best)
+        return results
+
+
+def group_review_rows(rows: Iterable[Tuple[int, int, str, Sequence[float]]]):
+    """perfume_id 순으로 정렬된 (perfume_id, review_id, content, embedding) 행을 향수별로 묶음"""
+    current: Optional[int] = None
+    bucket: List[Tuple[int, str, Sequence[float]]] = []
+    for perfume_id, review_id, content, embedding in rows:
+        if perfume_id != current:
+            if current is not None:
+                yield current, bucket
+            current, bucket = perfume_id, []
+        bucket.append((review_id, content, embedding))
+    if current is not None:
+        yield current, bucket
@@ -0,0 +1,117 @@
+# backend/agent/snapshot_cache.py
+"""
+버전 관리되는 스냅샷 캐시 (TTL + stale-while-revalidate + 명시적 무효화)
+
+카탈로그 메타데이터(계절/상황/어코드/브랜드 목록)처럼 자주 읽고 드물게 바뀌는 값을
+한 번에 로딩해 불변 스냅샷으로 보관합니다.
+- TTL 이내: 캐시된 스냅샷 반환
+- TTL 초과 ~ TTL + max_stale: 기존 스냅샷을 바로 반환하고 백그라운드에서 한 번만 재로딩
+- 그 이후 / 첫 조회: 호출 스레드에서 동기 로딩 (동시 호출은 하나의 로딩을 기다림)
+- 로딩 실패 시 기존 스냅샷이 있으면 계속 사용, 없으면 예외 전파 (실패는 캐시하지 않음)
+- invalidate(): 다음 조회 때 기존 스냅샷을 stale로 취급해 재로딩
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Snapshot(Generic[T]):
+    version: int
+    loaded_at: float
+    value: T
+
+
+class VersionedSnapshotCache(Generic[T]):
+    def __init__(
+        self,
+        loader: Callable[[], T],
+        ttl_seconds: float,
+        max_stale_seconds: float = 0.0,
+        name: str = "snapshot",
+    ) -> None:
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.name = name
+        self._snapshot: Optional[Snapshot[T]] = None
+        self._invalidated = False
+        self._lock = threading.Lock()  # 스냅샷/상태 보호
+        self._load_lock = threading.Lock()  # 동기 로딩 single-flight
+        self._refreshing = False
+
+    @property
+    def version(self) -> int:
+        snapshot = self._snapshot
+        return snapshot.version if snapshot else 0
+
+    def _age(self, snapshot: Snapshot[T]) -> float:
+        return time.time() - snapshot.loaded_at
+
+    def _load(self) -> Snapshot[T]:
+        value = self._loader()
+        with self._lock:
+            version = (self._snapshot.version if self._snapshot else 0) + 1
+            self._snapshot = Snapshot(version=version, loaded_at=time.time(), value=value)
+            self._invalidated = False
+            return self._snapshot
+
+    def _refresh_in_background(self) -> None:
+        def _run():
+            try:
+                self._load()
+            except Exception as e:
+                print(f"⚠️ [Cache] {self.name} background refresh failed: {e}", flush=True)
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=_run, name=f"{self.name}-refresh", daemon=True).start()
+
+    def get_snapshot(self) -> Snapshot[T]:
+        with self._lock:
+            snapshot = self._snapshot
+            invalidated = self._invalidated
+        if snapshot is not None and not invalidated:
+            age = self._age(snapshot)
+            if age < self.ttl_seconds:
+                return snapshot
+            if age < self.ttl_seconds + self.max_stale_seconds:
+                with self._lock:
+                    start = not self._refreshing
+                    self._refreshing = True
+                if start:
+                    self._refresh_in_background()
+                return snapshot
+
+        with self._load_lock:
+            # 기다리는 동안 다른 호출이 이미 새로 로딩했으면 그대로 사용
+            with self._lock:
+                current = self._snapshot
+                fresh = (
+                    current is not None
+                    and not self._invalidated
+                    and current is not snapshot
+                    and self._age(current) < self.ttl_seconds
+                )
+            if fresh:
+                return current
+            try:
+                return self._load()
+            except Exception as e:
+                if current is not None:
+                    print(f"⚠️ [Cache] {self.name} reload failed, serving v{current.version}: {e}", flush=True)
+                    return current
+                raise
+
+    def get(self) -> T:
+        return self.get_snapshot().value
+
+    def invalidate(self) -> None:
+        """원본 데이터가 바뀌었을 때 호출 - 다음 조회에서 재로딩"""
+        with self._lock:
+            self._invalidated = True
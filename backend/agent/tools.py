@@ -1,6 +1,5 @@
 # backend/agent/tools.py
 import asyncio
-import itertools
 import json
 from typing import List, Dict, Any, Tuple, Optional
 
@@ -12,10 +11,13 @@ from .database import (
     get_db_connection,
     release_db_connection,
     lookup_note_by_string,
-    lookup_note_by_vector,
-    search_perfumes,
+    lookup_note_by_vector_async,
+    search_perfumes_async,
+    search_perfumes_relaxed_async,
     rerank_perfumes_async,
     get_perfumes_by_note,
+    get_popularity,
+    PERFUME_PROFILE_VIEW,
 )
 from .expression_loader import ExpressionLoader
 from .schemas import (
@@ -60,8 +62,8 @@ async def lookup_note_by_vector_tool(keyword: str) -> List[str]:
     추상적인 향기 느낌이나 키워드와 관련된 실제 향료 후보군 10개를 검색합니다.
     - AI가 제안한 키워드를 실제 DB 노드로 변환할 때 사용하세요.
     """
-    # [최적화] 동기 함수를 비동기 스레드에서 처리
-    return await asyncio.to_thread(lookup_note_by_vector, keyword)
+    # [최적화] 비동기 임베딩 + 메모리 노트 벡터 인덱스 (스레드/DB 왕복 없음)
+    return await lookup_note_by_vector_async(keyword)
 
 
 @tool(args_schema=AdvancedSearchInput)
@@ -83,9 +85,8 @@ async def advanced_perfume_search_tool(
     safe_exclude_ids: List[int] = exclude_ids or []
     safe_exclude_brands: List[str] = exclude_brands or []
 
-    # 1. Broad Retrieval (Thread Pool 사용으로 병렬성 확보)
-    candidates = await asyncio.to_thread(
-        search_perfumes,
+    # 1. Broad Retrieval (asyncio 커넥션 풀에서 직접 await)
+    candidates = await search_perfumes_async(
         hard_filters=hard_filters,
         strategy_filters=strategy_filters,
         exclude_ids=safe_exclude_ids,
@@ -121,35 +122,32 @@ async def smart_perfume_search(
         k for k in priority_order if k in sanitized_strategy and sanitized_strategy[k]
     ]
 
-    tool_runner: Any = advanced_perfume_search_tool
-    results = await tool_runner.ainvoke(
-        {
-            "hard_filters": sanitized_hard,
-            "strategy_filters": sanitized_strategy,
-            "exclude_ids": exclude_ids,
-            "query_text": query_text,
-            "rank_mode": rank_mode,
-        }
+    # [최적화] 모든 완화 단계(전체 일치 -> note/accord/occasion 조합 순)를 한 번의 검색으로 평가하고
+    # 한 번의 리랭크 후 단계 순으로 정렬 (단계별 검색+리랭크를 순차로 반복하지 않음)
+    candidates = await search_perfumes_relaxed_async(
+        hard_filters=sanitized_hard,
+        strategy_filters=sanitized_strategy,
+        relax_keys=active_keys,
+        exclude_ids=exclude_ids or [],
+        limit=20,
     )
-    if results:
-        return results, "Perfect Match"
-
-    for r in range(len(active_keys) - 1, 0, -1):
-        for combo_keys in itertools.combinations(active_keys, r):
-            temp_filters = {k: sanitized_strategy[k] for k in combo_keys}
-            results = await tool_runner.ainvoke(
-                {
-                    "hard_filters": sanitized_hard,
-                    "strategy_filters": temp_filters,
-                    "exclude_ids": exclude_ids,
-                    "query_text": query_text,
-                    "rank_mode": rank_mode,
-                }
-            )
-            if results:
-                return results, f"Relaxed (Level {len(active_keys) - r})"
+    if not candidates:
+        return [], "No Results"
 
-    return [], "No Results"
+    ranked = await rerank_perfumes_async(
+        candidates, query_text, top_k=len(candidates), rank_mode=rank_mode
+    )
+    # 같은 단계 안에서는 리랭크 순서 유지 (stable sort)
+    ranked.sort(key=lambda p: p["relax_tier"])
+    results = ranked[:5]
+    best_level = results[0]["relax_level"]
+    for perfume in results:
+        perfume.pop("relax_tier", None)
+        perfume.pop("relax_level", None)
+
+    if best_level == 0:
+        return results, "Perfect Match"
+    return results, f"Relaxed (Level {best_level})"
 
 
 @tool
@@ -185,17 +183,12 @@ def lookup_perfume_info_tool(user_input: str) -> Dict[str, Any] | List:
         # [Phase 1] 특수문자 완전 제거
         normalized_name = remove_special_chars(target_name)
 
-        sql = """
+        sql = f"""
             SELECT
                 p.perfume_id, p.perfume_brand, p.perfume_name, p.img_link,
-                (SELECT gender FROM TB_PERFUME_GENDER_R WHERE perfume_id = p.perfume_id LIMIT 1) as gender,
-                (SELECT STRING_AGG(DISTINCT note, ', ') FROM TB_PERFUME_NOTES_M WHERE perfume_id = p.perfume_id AND type='TOP') as top_notes,
-                (SELECT STRING_AGG(DISTINCT note, ', ') FROM TB_PERFUME_NOTES_M WHERE perfume_id = p.perfume_id AND type='MIDDLE') as middle_notes,
-                (SELECT STRING_AGG(DISTINCT note, ', ') FROM TB_PERFUME_NOTES_M WHERE perfume_id = p.perfume_id AND type='BASE') as base_notes,
-                (SELECT STRING_AGG(accord, ', ' ORDER BY ratio DESC) FROM TB_PERFUME_ACCORD_R WHERE perfume_id = p.perfume_id) as accords,
-                (SELECT STRING_AGG(season, ', ' ORDER BY ratio DESC) FROM TB_PERFUME_SEASON_R WHERE perfume_id = p.perfume_id) as seasons,
-                (SELECT STRING_AGG(occasion, ', ' ORDER BY ratio DESC) FROM TB_PERFUME_OCA_R WHERE perfume_id = p.perfume_id) as occasions
-            FROM TB_PERFUME_BASIC_M p
+                p.gender, p.top_notes, p.middle_notes, p.base_notes,
+                p.accords, p.seasons, p.occasions
+            FROM {PERFUME_PROFILE_VIEW} p
             LEFT JOIN TB_PERFUME_NAME_KR n ON p.perfume_id = n.perfume_id
 
             WHERE p.perfume_brand ILIKE %s
@@ -257,17 +250,12 @@ def lookup_perfume_by_id_tool(perfume_id: int) -> Dict[str, Any] | List:
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
 
-        sql = """
+        sql = f"""
             SELECT
                 p.perfume_id, p.perfume_brand, p.perfume_name, p.img_link,
-                (SELECT gender FROM TB_PERFUME_GENDER_R WHERE perfume_id = p.perfume_id LIMIT 1) as gender,
-                (SELECT STRING_AGG(DISTINCT note, ', ') FROM TB_PERFUME_NOTES_M WHERE perfume_id = p.perfume_id AND type='TOP') as top_notes,
-                (SELECT STRING_AGG(DISTINCT note, ', ') FROM TB_PERFUME_NOTES_M WHERE perfume_id = p.perfume_id AND type='MIDDLE') as middle_notes,
-                (SELECT STRING_AGG(DISTINCT note, ', ') FROM TB_PERFUME_NOTES_M WHERE perfume_id = p.perfume_id AND type='BASE') as base_notes,
-                (SELECT STRING_AGG(accord, ', ' ORDER BY ratio DESC) FROM TB_PERFUME_ACCORD_R WHERE perfume_id = p.perfume_id) as accords,
-                (SELECT STRING_AGG(season, ', ' ORDER BY ratio DESC) FROM TB_PERFUME_SEASON_R WHERE perfume_id = p.perfume_id) as seasons,
-                (SELECT STRING_AGG(occasion, ', ' ORDER BY ratio DESC) FROM TB_PERFUME_OCA_R WHERE perfume_id = p.perfume_id) as occasions
-            FROM TB_PERFUME_BASIC_M p
+                p.gender, p.top_notes, p.middle_notes, p.base_notes,
+                p.accords, p.seasons, p.occasions
+            FROM {PERFUME_PROFILE_VIEW} p
             WHERE p.perfume_id = %s
         """
 
@@ -286,6 +274,28 @@ def lookup_perfume_by_id_tool(perfume_id: int) -> Dict[str, Any] | List:
             release_db_connection(conn)
 
 
+def _popular_perfumes_by_note_sql(cur, note: str) -> List[Dict[str, Any]]:
+    """인기도 맵이 아직 없을 때: 투표 합계를 쿼리 안에서 집계해 정렬"""
+    sql_perfumes = """
+        SELECT
+            m.perfume_brand,
+            m.perfume_name
+        FROM TB_PERFUME_NOTES_M n
+        JOIN TB_PERFUME_BASIC_M m ON n.perfume_id = m.perfume_id
+        LEFT JOIN (
+            SELECT PERFUME_ID, SUM(VOTE) as total_votes
+            FROM TB_PERFUME_ACCORD_M
+            GROUP BY PERFUME_ID
+        ) pop ON m.perfume_id = pop.PERFUME_ID
+        WHERE n.note ILIKE %s
+        GROUP BY m.perfume_id, m.perfume_brand, m.perfume_name, pop.total_votes
+        ORDER BY pop.total_votes DESC NULLS LAST
+        LIMIT 3
+    """
+    cur.execute(sql_perfumes, (f"%{note}%",))
+    return cur.fetchall()
+
+
 @tool(args_schema=NoteSearchInput)
 def lookup_note_info_tool(keywords: List[str]) -> Dict[str, Any] | List:
     """
@@ -315,27 +325,28 @@ def lookup_note_info_tool(keywords: List[str]) -> Dict[str, Any] | List:
     cur = conn.cursor(cursor_factory=RealDictCursor)
     final_info = {}
 
+    # [최적화] 백그라운드에서 미리 계산한 인기도가 있으면 노트가 일치하는 향수만 읽고 메모리에서 정렬
+    popularity = get_popularity()
+
     try:
         for note in target_notes:
-            sql_perfumes = """
-                SELECT
-                    m.perfume_brand,
-                    m.perfume_name
-                FROM TB_PERFUME_NOTES_M n
-                JOIN TB_PERFUME_BASIC_M m ON n.perfume_id = m.perfume_id
-                LEFT JOIN (
-                    SELECT PERFUME_ID, SUM(VOTE) as total_votes
-                    FROM TB_PERFUME_ACCORD_M
-                    GROUP BY PERFUME_ID
-                ) pop ON m.perfume_id = pop.PERFUME_ID
-                WHERE n.note ILIKE %s
-                GROUP BY m.perfume_id, m.perfume_brand, m.perfume_name, pop.total_votes
-                ORDER BY pop.total_votes DESC NULLS LAST
-                LIMIT 3
-            """
-            cur.execute(sql_perfumes, (f"%{note}%",))
+            if popularity is not None:
+                cur.execute(
+                    """
+                    SELECT DISTINCT m.perfume_id, m.perfume_brand, m.perfume_name
+                    FROM TB_PERFUME_NOTES_M n
+                    JOIN TB_PERFUME_BASIC_M m ON n.perfume_id = m.perfume_id
+                    WHERE n.note ILIKE %s
+                    ORDER BY m.perfume_id
+                    """,
+                    (f"%{note}%",),
+                )
+                by_id = {r["perfume_id"]: r for r in cur.fetchall()}
+                rows = [by_id[pid] for pid in popularity.rank_by_votes(by_id, limit=3)]
+            else:
+                rows = _popular_perfumes_by_note_sql(cur, note)
             examples = [
-                f"{r['perfume_brand']} {r['perfume_name']}" for r in cur.fetchall()
+                f"{r['perfume_brand']} {r['perfume_name']}" for r in rows
             ]
 
             if not examples:
@@ -0,0 +1,17 @@
+"""
+추천 파이프라인 오프라인 벤치마크 하네스
+
+OpenAI 호출을 지연 시간이 설정 가능한 결정적 가짜 모델로 바꾸고,
+로컬 Postgres(pgvector)에 시드 데이터를 넣어 app_graph 핫패스를 반복 측정합니다.
+
+    # 1) 로컬 pgvector 준비 (예: docker run -d -p 5432:5432 -e POSTGRES_PASSWORD=scentence pgvector/pgvector:pg16)
+    # 2) 시드
+    DB_HOST=localhost DB_USER=postgres DB_PASSWORD=scentence python -m benchmarks.seed --perfumes 2000
+    # 3) 측정
+    DB_HOST=localhost DB_USER=postgres DB_PASSWORD=scentence python -m benchmarks.run_reco --iterations 5
+
+- fakes.py: 가짜 Chat 모델 / OpenAI 클라이언트 / 임베딩 (LatencyProfile로 지연 조절)
+- instrumentation.py: 노드별 실행 시간, DB 시간, LLM 호출 수 집계
+- seed.py: 벤치마크용 스키마 + 결정적 시드 데이터
+- run_reco.py: stream_generator를 구동해 TTFT 포함 리포트 출력
+"""
@@ -0,0 +1,305 @@
+# backend/benchmarks/fakes.py
+"""
+벤치마크용 결정적 가짜 모델
+
+- FakeChatModel: ChatOpenAI 대체. BaseChatModel을 상속하므로 콜백/astream_events가
+  실제 모델과 똑같이 발생하고(stream_generator TTFT 측정 가능), 지연 시간은 LatencyProfile로 조절.
+- FakeOpenAI / FakeAsyncOpenAI: database.py의 OpenAI SDK 클라이언트 대체
+  (리랭킹 번역, 브랜드 매칭, 임베딩).
+- PipelineResponder: 스키마/프롬프트별로 항상 같은 응답을 만들어
+  pre_validator → supervisor → interviewer → parallel_reco 경로를 타게 함.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, replace
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.language_models.chat_models import BaseChatModel  # type: ignore[reportMissingImports]
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage  # type: ignore[reportMissingImports]
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult  # type: ignore[reportMissingImports]
+from langchain_core.runnables import RunnableLambda  # type: ignore[reportMissingImports]
+
+from .instrumentation import record_llm
+
+# text-embedding-3-small 차원 (pgvector 컬럼과 동일해야 함)
+EMBEDDING_DIM = 1536
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """가짜 모델 지연 시간 (초)"""
+
+    structured: float = 0.8  # with_structured_output 응답 1회
+    first_token: float = 0.4  # 텍스트 응답 첫 토큰까지
+    per_token: float = 0.02  # 이후 청크 간격
+    completion: float = 0.3  # OpenAI SDK chat.completions (리랭킹 번역 등)
+    embedding: float = 0.15  # OpenAI SDK embeddings 요청 1회
+    tokens: int = 40  # 텍스트 응답 청크 수
+
+    def scaled(self, factor: float) -> "LatencyProfile":
+        return replace(
+            self,
+            structured=self.structured * factor,
+            first_token=self.first_token * factor,
+            per_token=self.per_token * factor,
+            completion=self.completion * factor,
+            embedding=self.embedding * factor,
+        )
+
+
+def fake_embedding(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """텍스트 해시를 시드로 한 단위 벡터 (같은 텍스트 → 같은 벡터)"""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def vector_literal(vector: Sequence[float]) -> str:
+    return "[" + ",".join(f"{v:.6f}" for v in vector) + "]"
+
+
+def _split_chunks(text: str, count: int) -> List[str]:
+    count = max(1, min(count, len(text)))
+    size = math.ceil(len(text) / count)
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _message_text(message: Any) -> str:
+    if isinstance(message, BaseMessage):
+        return message.content if isinstance(message.content, str) else str(message.content)
+    if isinstance(message, dict):
+        return str(message.get("content", ""))
+    return str(message)
+
+
+class PipelineResponder:
+    """스키마/프롬프트별 결정적 응답 생성기 (seed.py 카탈로그 어휘 사용)"""
+
+    _STRATEGY_NAMES = ["이미지 강조", "이미지 보완", "이미지 반전"]
+
+    def __init__(
+        self,
+        accords: Sequence[str],
+        notes: Sequence[str],
+        occasions: Sequence[str],
+        preferences: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.accords = list(accords)
+        self.notes = list(notes)
+        self.occasions = list(occasions)
+        self.preferences = preferences or {
+            "target": "20대 여성",
+            "gender": "Women",
+            "season": "Spring",
+            "style": "Daily",
+            "accord": self.accords[0],
+        }
+
+    def structured(self, schema: Any, messages: Sequence[Any]) -> Any:
+        name = getattr(schema, "__name__", str(schema))
+        last = _message_text(messages[-1]) if messages else ""
+        if name == "ValidationResult":
+            data = {"is_unsupported": False, "unsupported_category": None, "reason": "지원 가능한 추천 요청"}
+        elif name == "RoutingDecision":
+            data = {"next_step": "interviewer"}
+        elif name == "InterviewResult":
+            data = {
+                "user_preferences": self.preferences,
+                "is_sufficient": True,
+                "response_message": "추천을 준비할게요.",
+                "is_off_topic": False,
+            }
+        elif name == "SearchStrategyPlan":
+            match = re.search(r"우선순위:\s*(\d+)", last)
+            priority = int(match.group(1)) if match else 1
+            accord = self.accords[(priority - 1) % len(self.accords)]
+            note = self.notes[(priority - 1) % len(self.notes)]
+            data = {
+                "priority": priority,
+                "strategy_name": self._STRATEGY_NAMES[(priority - 1) % len(self._STRATEGY_NAMES)],
+                "reason": f"{accord} 계열에 {note} 포인트로 분위기를 살리는 선택",
+                "hard_filters": {"gender": self.preferences.get("gender", "Unisex")},
+                "strategy_filters": {
+                    "accord": [accord],
+                    "occasion": [self.occasions[(priority - 1) % len(self.occasions)]],
+                },
+                "strategy_keyword": [accord, note],
+            }
+        else:
+            raise NotImplementedError(f"No benchmark response for schema {name}")
+        return schema.model_validate(data)
+
+    def text(self, messages: Sequence[Any]) -> str:
+        last = _message_text(messages[-1]) if messages else ""
+        if "전략명:" in last:
+            return "은은하고 편안한 첫인상"
+        section = re.search(r"\[섹션 번호\]:\s*(\d+)", last)
+        perfume_id = re.search(r'"id":\s*(\d+)', last)
+        perfume_name = re.search(r'"perfume_name":\s*"([^"]*)"', last)
+        if section and perfume_id:
+            name = perfume_name.group(1) if perfume_name else "Perfume"
+            body = " ".join(["잔잔하게 피어오르는 향이 하루 종일 부드럽게 남습니다."] * 4)
+            return f"## {section.group(1)}. {name}\n{body}\n[[SAVE:{perfume_id.group(1)}:{name}]]\n---"
+        return "조건에 맞는 향수를 찾지 못했어요. 다른 분위기로 다시 찾아볼까요?"
+
+    def completion(self, messages: Sequence[Any]) -> str:
+        system = _message_text(messages[0]) if messages else ""
+        if "Brand Matcher" in system:
+            return "None"
+        return f"A soft sensory impression: {_message_text(messages[-1])}"
+
+
+class FakeChatModel(BaseChatModel):
+    """ChatOpenAI 자리에 넣는 결정적 가짜 모델"""
+
+    model_name: str = "fake-chat"
+    latency: LatencyProfile = LatencyProfile()
+    responder: Any = None
+    streaming: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "scentence-bench-fake"
+
+    def _chunks(self, messages: List[BaseMessage]) -> List[str]:
+        return _split_chunks(self.responder.text(messages), self.latency.tokens)
+
+    def _total_delay(self, chunks: List[str]) -> float:
+        return self.latency.first_token + self.latency.per_token * (len(chunks) - 1)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        started = time.perf_counter()
+        chunks = self._chunks(messages)
+        time.sleep(self._total_delay(chunks))
+        record_llm("chat", time.perf_counter() - started)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(chunks)))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        started = time.perf_counter()
+        chunks = self._chunks(messages)
+        await asyncio.sleep(self._total_delay(chunks))
+        record_llm("chat", time.perf_counter() - started)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(chunks)))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        started = time.perf_counter()
+        for i, piece in enumerate(self._chunks(messages)):
+            time.sleep(self.latency.first_token if i == 0 else self.latency.per_token)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+        record_llm("stream", time.perf_counter() - started)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        started = time.perf_counter()
+        for i, piece in enumerate(self._chunks(messages)):
+            await asyncio.sleep(self.latency.first_token if i == 0 else self.latency.per_token)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+        record_llm("stream", time.perf_counter() - started)
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> RunnableLambda:
+        def invoke(messages):
+            started = time.perf_counter()
+            time.sleep(self.latency.structured)
+            record_llm("structured", time.perf_counter() - started)
+            return self.responder.structured(schema, messages)
+
+        async def ainvoke(messages):
+            started = time.perf_counter()
+            await asyncio.sleep(self.latency.structured)
+            record_llm("structured", time.perf_counter() - started)
+            return self.responder.structured(schema, messages)
+
+        return RunnableLambda(invoke, afunc=ainvoke, name=f"{self.model_name}:{getattr(schema, '__name__', 'schema')}")
+
+
+def _completion_response(text: str) -> Any:
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def _embedding_response(inputs: Any) -> Any:
+    texts = [inputs] if isinstance(inputs, str) else list(inputs)
+    return SimpleNamespace(
+        data=[SimpleNamespace(embedding=fake_embedding(t), index=i) for i, t in enumerate(texts)]
+    )
+
+
+class FakeOpenAI:
+    """openai.OpenAI 대체 (chat.completions.create / embeddings.create만 지원)"""
+
+    def __init__(self, latency: LatencyProfile, responder: PipelineResponder) -> None:
+        self.latency = latency
+        self.responder = responder
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_completion))
+        self.embeddings = SimpleNamespace(create=self._create_embedding)
+
+    def _create_completion(self, *, messages, **kwargs):
+        started = time.perf_counter()
+        time.sleep(self.latency.completion)
+        record_llm("completion", time.perf_counter() - started)
+        return _completion_response(self.responder.completion(messages))
+
+    def _create_embedding(self, *, input, **kwargs):
+        started = time.perf_counter()
+        time.sleep(self.latency.embedding)
+        record_llm("embedding", time.perf_counter() - started)
+        return _embedding_response(input)
+
+
+class FakeAsyncOpenAI(FakeOpenAI):
+    """openai.AsyncOpenAI 대체"""
+
+    async def _create_completion(self, *, messages, **kwargs):
+        started = time.perf_counter()
+        await asyncio.sleep(self.latency.completion)
+        record_llm("completion", time.perf_counter() - started)
+        return _completion_response(self.responder.completion(messages))
+
+    async def _create_embedding(self, *, input, **kwargs):
+        started = time.perf_counter()
+        await asyncio.sleep(self.latency.embedding)
+        record_llm("embedding", time.perf_counter() - started)
+        return _embedding_response(input)
+
+
+def install_fakes(
+    latency: LatencyProfile, responder: PipelineResponder, prefix: str = "agent."
+) -> Dict[str, int]:
+    """
+    이미 import된 agent.* 모듈의 ChatOpenAI / OpenAI 클라이언트 전역 변수를 가짜로 교체.
+    노드 함수는 호출 시점에 모듈 전역을 읽으므로 그래프를 다시 컴파일할 필요가 없습니다.
+    (import 시점에 체인으로 묶인 모델은 교체되지 않음 - 추천 핫패스에는 없음)
+    """
+    from langchain_openai import ChatOpenAI  # type: ignore[reportMissingImports]
+    from openai import AsyncOpenAI, OpenAI
+
+    patched = {"chat_models": 0, "clients": 0}
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not module_name.startswith(prefix):
+            continue
+        for attr, value in list(vars(module).items()):
+            if isinstance(value, ChatOpenAI):
+                extra = {"streaming": True} if value.streaming else {}
+                fake = FakeChatModel(
+                    model_name=value.model_name,
+                    tags=value.tags,
+                    latency=latency,
+                    responder=responder,
+                    **extra,
+                )
+                setattr(module, attr, fake)
+                patched["chat_models"] += 1
+            elif isinstance(value, AsyncOpenAI):
+                setattr(module, attr, FakeAsyncOpenAI(latency, responder))
+                patched["clients"] += 1
+            elif isinstance(value, OpenAI):
+                setattr(module, attr, FakeOpenAI(latency, responder))
+                patched["clients"] += 1
+    return patched
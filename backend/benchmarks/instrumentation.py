@@ -0,0 +1,221 @@
+# backend/benchmarks/instrumentation.py
+"""
+벤치마크 계측기
+
+- 노드 실행 시간: LangChain configure hook으로 모든 그래프 실행에 콜백을 붙여
+  on_chain_start/end 중 LangGraph 노드 자신의 실행만 골라 시간을 잽니다.
+  (stream_generator 내부의 app_graph 실행도 코드 수정 없이 측정됨)
+- DB 시간: 커넥션 풀을 TimedConnection으로 다시 만들어 cursor.execute 시간을 잽니다.
+  비동기 풀(AsyncDatabase)은 fetch_all/fetch_one/execute/execute_many 호출 시간을 잽니다.
+- LLM 호출 수: 가짜 모델(fakes.py)이 record_llm()으로 보고합니다.
+
+DB/LLM 시간은 호출 시점의 langgraph_node(컨텍스트 변수)로 노드에 귀속시키고,
+그래프 밖(stream_generator의 히스토리 복원 등)은 OUTSIDE_GRAPH로 모읍니다.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+import psycopg2.extensions
+from psycopg2 import pool
+from langchain_core.callbacks import BaseCallbackHandler  # type: ignore[reportMissingImports]
+from langchain_core.runnables.config import var_child_runnable_config  # type: ignore[reportMissingImports]
+from langchain_core.tracers.context import register_configure_hook  # type: ignore[reportMissingImports]
+
+from agent.pool_metrics import InstrumentedConnectionPool
+
+OUTSIDE_GRAPH = "(outside)"
+
+
+def current_node() -> str:
+    """현재 실행 중인 LangGraph 노드 이름 (그래프 밖이면 OUTSIDE_GRAPH)"""
+    config = var_child_runnable_config.get()
+    if config:
+        node = (config.get("metadata") or {}).get("langgraph_node")
+        if node:
+            return node
+    return OUTSIDE_GRAPH
+
+
+class BenchRecorder:
+    """한 번의 요청(이터레이션) 동안의 측정값"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.node_seconds: Dict[str, float] = defaultdict(float)
+        self.node_runs: Dict[str, int] = defaultdict(int)
+        self.db_seconds: Dict[str, float] = defaultdict(float)
+        self.db_queries: Dict[str, int] = defaultdict(int)
+        # node -> kind(structured/chat/stream/completion/embedding) -> 호출 수
+        self.llm_calls: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.llm_seconds: Dict[str, float] = defaultdict(float)
+
+    def record_node(self, node: str, seconds: float) -> None:
+        with self._lock:
+            self.node_seconds[node] += seconds
+            self.node_runs[node] += 1
+
+    def record_db(self, node: str, seconds: float) -> None:
+        with self._lock:
+            self.db_seconds[node] += seconds
+            self.db_queries[node] += 1
+
+    def record_llm(self, node: str, kind: str, seconds: float) -> None:
+        with self._lock:
+            self.llm_calls[node][kind] += 1
+            self.llm_seconds[node] += seconds
+
+    def nodes(self) -> List[str]:
+        with self._lock:
+            names = set(self.node_seconds) | set(self.db_seconds) | set(self.llm_calls)
+        return sorted(names, key=lambda n: (n == OUTSIDE_GRAPH, n))
+
+
+_active_recorder: Optional[BenchRecorder] = None
+
+
+def record_db(seconds: float) -> None:
+    recorder = _active_recorder
+    if recorder is not None:
+        recorder.record_db(current_node(), seconds)
+
+
+def record_llm(kind: str, seconds: float) -> None:
+    recorder = _active_recorder
+    if recorder is not None:
+        recorder.record_llm(current_node(), kind, seconds)
+
+
+class NodeTimingHandler(BaseCallbackHandler):
+    """LangGraph 노드 실행(on_chain_start/end)만 골라 실행 시간을 기록"""
+
+    run_inline = True
+
+    def __init__(self, recorder: BenchRecorder) -> None:
+        self.recorder = recorder
+        self._starts: Dict[UUID, tuple] = {}
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name")
+        if name and metadata and metadata.get("langgraph_node") == name:
+            self._starts[run_id] = (name, time.perf_counter())
+
+    def _finish(self, run_id: UUID) -> None:
+        started = self._starts.pop(run_id, None)
+        if started:
+            name, at = started
+            self.recorder.record_node(name, time.perf_counter() - at)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+
+_node_timer: ContextVar[Optional[NodeTimingHandler]] = ContextVar("bench_node_timer", default=None)
+register_configure_hook(_node_timer, inheritable=True)
+
+
+@contextmanager
+def recording(recorder: BenchRecorder) -> Iterator[BenchRecorder]:
+    """블록 안에서 실행되는 그래프/DB/가짜 LLM 호출을 recorder에 기록"""
+    global _active_recorder
+    previous = _active_recorder
+    token = _node_timer.set(NodeTimingHandler(recorder))
+    _active_recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _active_recorder = previous
+        _node_timer.reset(token)
+
+
+# ==========================================
+# DB 시간 측정 (psycopg2 커넥션/커서 서브클래스)
+# ==========================================
+_timed_cursor_classes: Dict[type, type] = {}
+
+
+def _timed_cursor_class(base: type) -> type:
+    cls = _timed_cursor_classes.get(base)
+    if cls is None:
+
+        class TimedCursor(base):  # type: ignore[misc, valid-type]
+            def execute(self, query, vars=None):
+                started = time.perf_counter()
+                try:
+                    return super().execute(query, vars)
+                finally:
+                    record_db(time.perf_counter() - started)
+
+            def executemany(self, query, vars_list):
+                started = time.perf_counter()
+                try:
+                    return super().executemany(query, vars_list)
+                finally:
+                    record_db(time.perf_counter() - started)
+
+        cls = _timed_cursor_classes[base] = TimedCursor
+    return cls
+
+
+class TimedConnection(psycopg2.extensions.connection):
+    """cursor_factory(RealDictCursor 등)를 유지한 채 execute 시간을 재는 커서를 반환"""
+
+    def cursor(self, *args, **kwargs):
+        base = kwargs.pop("cursor_factory", None) or self.cursor_factory or psycopg2.extensions.cursor
+        return super().cursor(*args, cursor_factory=_timed_cursor_class(base), **kwargs)
+
+
+def instrument_db_pools(database: Any, maxconn: int = 20) -> None:
+    """agent.database의 커넥션 풀을 TimedConnection 풀로 교체"""
+    for pool_name, config_name in (
+        ("perfume_db_pool", "DB_CONFIG"),
+        ("recom_db_pool", "RECOM_DB_CONFIG"),
+        ("member_db_pool", "MEMBER_DB_CONFIG"),
+    ):
+        old = getattr(database, pool_name)
+        setattr(
+            database,
+            pool_name,
+            InstrumentedConnectionPool(
+                pool.ThreadedConnectionPool(
+                    1, maxconn, connection_factory=TimedConnection, **getattr(database, config_name)
+                ),
+                getattr(old, "name", pool_name),
+            ),
+        )
+        old.closeall()
+    for adb_name in ("perfume_adb", "recom_adb"):
+        adb = getattr(database, adb_name, None)
+        if adb is not None:
+            _time_async_database(adb)
+
+
+def _time_async_database(adb: Any) -> None:
+    """AsyncDatabase 인스턴스의 쿼리 메서드를 시간 측정 버전으로 감쌈"""
+    for method_name in ("fetch_all", "fetch_one", "execute", "execute_many"):
+        original = getattr(adb, method_name)
+
+        async def timed(*args, _original=original, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await _original(*args, **kwargs)
+            finally:
+                record_db(time.perf_counter() - started)
+
+        setattr(adb, method_name, timed)
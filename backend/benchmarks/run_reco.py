@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark for the recommendation hot path.
+
+Drives main.stream_generator (and therefore app_graph: pre_validator ->
+supervisor -> interviewer -> parallel_reco) against the seeded local database
+(see benchmarks/seed.py), with every OpenAI model replaced by a deterministic
+fake whose latency is configurable. Reports per-node wall time, DB time and
+query counts, LLM call counts, and time-to-first-token of stream_generator:
+    python -m benchmarks.run_reco --iterations 5 --warmup 1
+    python -m benchmarks.run_reco --latency-scale 0 --json bench.json   # CPU/DB only
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add backend directory to Python path
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.fakes import LatencyProfile, PipelineResponder, install_fakes
+from benchmarks.instrumentation import BenchRecorder, instrument_db_pools, recording
+from benchmarks.seed import ACCORDS, NOTES, OCCASIONS
+
+
+def _configure_env(args: argparse.Namespace) -> None:
+    # agent.* import 전에 설정해야 함 (풀/체크포인터/임베딩 캐시가 import 시점에 생성됨)
+    os.environ.setdefault("DB_HOST", "localhost")
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ["CHECKPOINT_BACKEND"] = args.checkpoint
+    os.environ["EMBEDDING_CACHE_PATH"] = ""
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _stats_ms(values: List[float]) -> Dict[str, float]:
+    return {
+        "mean_ms": round(statistics.fmean(values) * 1000, 1) if values else 0.0,
+        "p50_ms": round(_percentile(values, 50) * 1000, 1),
+        "p95_ms": round(_percentile(values, 95) * 1000, 1),
+    }
+
+
+async def run_once(main_module: Any, args: argparse.Namespace) -> Dict[str, Any]:
+    recorder = BenchRecorder()
+    thread_id = f"bench-{uuid.uuid4().hex[:12]}"
+    first_event: Optional[float] = None
+    ttft: Optional[float] = None
+    answer_chunks = 0
+
+    with recording(recorder):
+        started = time.perf_counter()
+        async for chunk in main_module.stream_generator(
+            args.query, thread_id, args.member_id, args.user_mode, args.count
+        ):
+            elapsed = time.perf_counter() - started
+            if first_event is None:
+                first_event = elapsed
+            if not chunk.startswith("data: "):
+                continue
+            try:
+                payload = json.loads(chunk[len("data: "):])
+            except ValueError:
+                continue
+            if payload.get("type") == "answer":
+                answer_chunks += 1
+                if ttft is None:
+                    ttft = elapsed
+        total = time.perf_counter() - started
+
+    # 채팅 저장은 응답 경로 밖(백그라운드)이므로 측정이 끝난 뒤 비움
+    await main_module.chat_writer.flush(thread_id)
+
+    return {
+        "total": total,
+        "first_event": first_event,
+        "ttft": ttft,
+        "answer_chunks": answer_chunks,
+        "recorder": recorder,
+    }
+
+
+def build_report(runs: List[Dict[str, Any]], args: argparse.Namespace) -> Dict[str, Any]:
+    nodes: List[str] = []
+    for run in runs:
+        for node in run["recorder"].nodes():
+            if node not in nodes:
+                nodes.append(node)
+
+    node_report = {}
+    for node in nodes:
+        recs = [run["recorder"] for run in runs]
+        llm_calls: Dict[str, float] = {}
+        for rec in recs:
+            for kind, count in rec.llm_calls.get(node, {}).items():
+                llm_calls[kind] = llm_calls.get(kind, 0) + count
+        node_report[node] = {
+            "wall": _stats_ms([rec.node_seconds[node] for rec in recs if node in rec.node_seconds]),
+            "db_ms_mean": round(statistics.fmean([rec.db_seconds.get(node, 0.0) for rec in recs]) * 1000, 1),
+            "db_queries_mean": round(statistics.fmean([rec.db_queries.get(node, 0) for rec in recs]), 1),
+            "llm_calls_mean": {k: round(v / len(recs), 1) for k, v in sorted(llm_calls.items())},
+        }
+
+    missing_ttft = sum(1 for run in runs if run["ttft"] is None)
+    return {
+        "config": {
+            "query": args.query,
+            "count": args.count,
+            "iterations": len(runs),
+            "latency_scale": args.latency_scale,
+            "checkpoint": args.checkpoint,
+            "warm_embeddings": args.warm_embeddings,
+        },
+        "stream_generator": {
+            "total": _stats_ms([run["total"] for run in runs]),
+            "ttft": _stats_ms([run["ttft"] for run in runs if run["ttft"] is not None]),
+            "first_event": _stats_ms([run["first_event"] for run in runs if run["first_event"] is not None]),
+            "runs_without_answer": missing_ttft,
+        },
+        "nodes": node_report,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    config = report["config"]
+    sg = report["stream_generator"]
+    print("\n" + "=" * 78, flush=True)
+    print(
+        f"📊 [Bench] {config['iterations']} runs | count={config['count']} | "
+        f"latency x{config['latency_scale']} | checkpoint={config['checkpoint']}",
+        flush=True,
+    )
+    for label, key in (("TTFT", "ttft"), ("Total", "total"), ("First event", "first_event")):
+        s = sg[key]
+        print(f"   {label:<12} mean {s['mean_ms']:>8.1f}ms  p50 {s['p50_ms']:>8.1f}ms  p95 {s['p95_ms']:>8.1f}ms")
+    if sg["runs_without_answer"]:
+        print(f"   ⚠️ {sg['runs_without_answer']} run(s) produced no answer chunk", flush=True)
+
+    print("-" * 78)
+    print(f"   {'node':<26}{'wall p50':>10}{'wall p95':>10}{'db ms':>9}{'queries':>9}  llm calls")
+    for node, row in report["nodes"].items():
+        calls = ", ".join(f"{k}={v:g}" for k, v in row["llm_calls_mean"].items()) or "-"
+        print(
+            f"   {node:<26}{row['wall']['p50_ms']:>10.1f}{row['wall']['p95_ms']:>10.1f}"
+            f"{row['db_ms_mean']:>9.1f}{row['db_queries_mean']:>9g}  {calls}"
+        )
+    print("=" * 78, flush=True)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    _configure_env(args)
+
+    from agent import database
+    from agent.embedding_cache import EmbeddingCache
+
+    instrument_db_pools(database)
+    import main as main_module
+
+    latency = LatencyProfile(
+        structured=args.structured_latency,
+        first_token=args.first_token_latency,
+        per_token=args.per_token_latency,
+        completion=args.completion_latency,
+        embedding=args.embedding_latency,
+        tokens=args.tokens,
+    ).scaled(args.latency_scale)
+    patched = install_fakes(latency, PipelineResponder(ACCORDS, NOTES, OCCASIONS))
+    print(f"🧪 [Bench] Fakes installed: {patched}", flush=True)
+
+    # main.py startup 이벤트와 같은 준비 작업
+    database.ensure_perfume_profile_view()
+    database.load_facet_index()
+    database.load_review_index()
+    database.load_note_vector_index()
+    database.ensure_popularity_table()
+    database.load_popularity()
+    await database.open_async_pools()
+    main_module.chat_writer.start()
+    database.recommendation_log_writer.start()
+
+    runs: List[Dict[str, Any]] = []
+    try:
+        for i in range(args.warmup + args.iterations):
+            if not args.warm_embeddings:
+                # 매 요청을 콜드 캐시로 측정 (로컬 저장소 없는 새 캐시)
+                database.embedding_cache = EmbeddingCache(database.EMBEDDING_MODEL)
+            result = await run_once(main_module, args)
+            label = "warmup" if i < args.warmup else f"run {i - args.warmup + 1}"
+            ttft_ms = f"{result['ttft'] * 1000:.1f}ms" if result["ttft"] is not None else "n/a"
+            print(f"   ⏱️ [Bench] {label}: total {result['total'] * 1000:.1f}ms, TTFT {ttft_ms}", flush=True)
+            if i >= args.warmup:
+                runs.append(result)
+    finally:
+        # main.py shutdown 이벤트와 같이 남은 쓰기를 반영한 뒤 풀 종료
+        await main_module.chat_writer.stop()
+        await database.recommendation_log_writer.stop()
+        await database.close_async_pools()
+
+    report = build_report(runs, args)
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"💾 [Bench] Report written to {args.json}", flush=True)
+    return report
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    defaults = LatencyProfile()
+    parser = argparse.ArgumentParser(description="Offline recommendation pipeline benchmark")
+    parser.add_argument("--query", default="20대 여성이 봄에 데일리로 쓸 우디 향수 3개 추천해줘")
+    parser.add_argument("--count", type=int, default=3, help="recommended_count passed to stream_generator")
+    parser.add_argument("--member-id", type=int, default=0)
+    parser.add_argument("--user-mode", default="BEGINNER")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--checkpoint", default="memory", choices=["memory", "sqlite", "postgres"])
+    parser.add_argument("--warm-embeddings", action="store_true", help="Keep the embedding cache across runs")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiply all fake latencies (0 = no model latency)")
+    parser.add_argument("--structured-latency", type=float, default=defaults.structured)
+    parser.add_argument("--first-token-latency", type=float, default=defaults.first_token)
+    parser.add_argument("--per-token-latency", type=float, default=defaults.per_token)
+    parser.add_argument("--completion-latency", type=float, default=defaults.completion)
+    parser.add_argument("--embedding-latency", type=float, default=defaults.embedding)
+    parser.add_argument("--tokens", type=int, default=defaults.tokens, help="Chunks per fake text response")
+    parser.add_argument("--json", help="Write the report as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def main():
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Seed a local Postgres/pgvector instance with a deterministic perfume catalog
+for the offline recommendation benchmark.
+
+Creates (if missing) the perfume / recommendation / member databases named by
+DB_NAME / RECOM_DB_NAME / member_db, recreates the tables the recommendation
+hot path reads and writes, fills them from a fixed RNG seed and builds
+MV_PERFUME_PROFILE:
+    python -m benchmarks.seed --perfumes 2000 --reviews-per-perfume 3
+
+Tables are dropped and recreated on every run, so the script refuses to touch
+a non-local DB_HOST unless --force is given.
+"""
+
+import argparse
+import os
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+
+# Add backend directory to Python path
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.fakes import EMBEDDING_DIM, fake_embedding, vector_literal
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "postgres", "db"}
+
+BRANDS = [
+    "Aesop", "Byredo", "Chanel", "Creed", "Dior", "Diptyque",
+    "Guerlain", "Hermes", "Jo Malone", "Le Labo", "Maison Margiela", "Tom Ford",
+]
+ACCORDS = [
+    "Woody", "Citrus", "Floral", "White Floral", "Fresh Spicy", "Warm Spicy", "Amber", "Musky",
+    "Powdery", "Vanilla", "Green", "Aquatic", "Fruity", "Leather", "Aromatic", "Earthy",
+]
+NOTES = [
+    "Bergamot", "Lemon", "Neroli", "Pink Pepper", "Lavender", "Rose", "Jasmine", "Iris", "Fig", "Tea",
+    "Sandalwood", "Vetiver", "Cedar", "Patchouli", "Vanilla", "Musk", "Amber", "Tonka Bean", "Oud", "Leather",
+]
+SEASONS = ["Spring", "Summer", "Fall", "Winter"]
+OCCASIONS = ["Daily", "Business", "Leisure", "Evening", "Night Out", "Sport"]
+GENDERS = ["Feminine", "Masculine", "Unisex"]
+CONCENTRATIONS = ["EDP", "EDT", "Parfum", "Cologne"]
+_NAME_WORDS = ["Santal", "Bloom", "Noir", "Eau", "Velvet", "Smoke", "Garden", "Soleil", "Ambre", "Mist"]
+
+PERFUME_SCHEMA = f"""
+CREATE EXTENSION IF NOT EXISTS vector;
+
+DROP MATERIALIZED VIEW IF EXISTS MV_PERFUME_PROFILE;
+DROP TABLE IF EXISTS TB_REVIEW_EMBEDDING_M, TB_PERFUME_REVIEW_M, TB_NOTE_EMBEDDING_M,
+    TB_PERFUME_NAME_KR, TB_PERFUME_NOTES_M, TB_PERFUME_GENDER_R, TB_PERFUME_OCA_R,
+    TB_PERFUME_SEASON_R, TB_PERFUME_ACCORD_M, TB_PERFUME_ACCORD_R, TB_PERFUME_BASIC_M CASCADE;
+
+CREATE TABLE TB_PERFUME_BASIC_M (
+    perfume_id INTEGER PRIMARY KEY,
+    perfume_brand VARCHAR(100),
+    perfume_name VARCHAR(200),
+    concentration VARCHAR(50),
+    img_link TEXT,
+    release_year INTEGER,
+    perfumer VARCHAR(100)
+);
+CREATE TABLE TB_PERFUME_NAME_KR (perfume_id INTEGER, name_kr VARCHAR(200), brand_kr VARCHAR(100));
+CREATE TABLE TB_PERFUME_ACCORD_R (perfume_id INTEGER, accord VARCHAR(50), ratio INTEGER);
+CREATE TABLE TB_PERFUME_ACCORD_M (perfume_id INTEGER, accord VARCHAR(50), vote INTEGER);
+CREATE TABLE TB_PERFUME_SEASON_R (perfume_id INTEGER, season VARCHAR(20), ratio INTEGER);
+CREATE TABLE TB_PERFUME_OCA_R (perfume_id INTEGER, occasion VARCHAR(50), ratio INTEGER);
+CREATE TABLE TB_PERFUME_GENDER_R (perfume_id INTEGER, gender VARCHAR(20));
+CREATE TABLE TB_PERFUME_NOTES_M (perfume_id INTEGER, note VARCHAR(100), type VARCHAR(10));
+CREATE TABLE TB_NOTE_EMBEDDING_M (note VARCHAR(100) PRIMARY KEY, description TEXT, embedding vector({EMBEDDING_DIM}));
+CREATE TABLE TB_PERFUME_REVIEW_M (review_id INTEGER PRIMARY KEY, perfume_id INTEGER, content TEXT);
+CREATE TABLE TB_REVIEW_EMBEDDING_M (review_id INTEGER PRIMARY KEY, embedding vector({EMBEDDING_DIM}));
+
+CREATE INDEX ON TB_PERFUME_NAME_KR (perfume_id);
+CREATE INDEX ON TB_PERFUME_ACCORD_R (perfume_id);
+CREATE INDEX ON TB_PERFUME_ACCORD_M (perfume_id);
+CREATE INDEX ON TB_PERFUME_SEASON_R (perfume_id);
+CREATE INDEX ON TB_PERFUME_OCA_R (perfume_id);
+CREATE INDEX ON TB_PERFUME_GENDER_R (perfume_id);
+CREATE INDEX ON TB_PERFUME_NOTES_M (perfume_id);
+CREATE INDEX ON TB_PERFUME_REVIEW_M (perfume_id);
+"""
+
+RECOM_SCHEMA = """
+DROP TABLE IF EXISTS TB_CHAT_MESSAGE_T, TB_CHAT_THREAD_T, TB_MEMBER_RECOM_RESULT_T CASCADE;
+
+CREATE TABLE TB_CHAT_THREAD_T (
+    thread_id VARCHAR(100) PRIMARY KEY,
+    member_id INTEGER,
+    title VARCHAR(100),
+    last_chat_dt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    recommended_history INTEGER[] DEFAULT '{}',
+    is_deleted CHAR(1) DEFAULT 'N'
+);
+CREATE TABLE TB_CHAT_MESSAGE_T (
+    message_id BIGSERIAL PRIMARY KEY,
+    thread_id VARCHAR(100),
+    member_id INTEGER,
+    role VARCHAR(20),
+    message TEXT,
+    meta_data JSONB,
+    created_dt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX ON TB_CHAT_MESSAGE_T (thread_id, created_dt, message_id);
+CREATE TABLE TB_MEMBER_RECOM_RESULT_T (
+    recom_id BIGSERIAL PRIMARY KEY,
+    member_id INTEGER,
+    perfume_id INTEGER,
+    perfume_name VARCHAR(200),
+    recom_type VARCHAR(20),
+    recom_reason TEXT,
+    interest_yn CHAR(1),
+    recom_dt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+def _server_config() -> Dict[str, str]:
+    return {
+        "user": os.getenv("DB_USER", "scentence"),
+        "password": os.getenv("DB_PASSWORD", "scentence"),
+        "host": os.getenv("DB_HOST", "localhost"),
+        "port": os.getenv("DB_PORT", "5432"),
+    }
+
+
+def ensure_databases(names: List[str]) -> None:
+    conn = psycopg2.connect(dbname=os.getenv("DB_ADMIN_NAME", "postgres"), **_server_config())
+    conn.autocommit = True
+    try:
+        cur = conn.cursor()
+        for name in names:
+            cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (name,))
+            if not cur.fetchone():
+                cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(name)))
+                print(f"🆕 [Seed] Created database {name}", flush=True)
+        cur.close()
+    finally:
+        conn.close()
+
+
+def build_catalog(perfumes: int, reviews_per_perfume: int, seed: int) -> Dict[str, List[tuple]]:
+    """고정 시드로 향수 카탈로그 행을 생성 (같은 인자면 항상 같은 데이터)"""
+    rng = random.Random(seed)
+    rows: Dict[str, List[tuple]] = {
+        "basic": [], "name_kr": [], "accord_r": [], "accord_m": [], "season": [],
+        "occasion": [], "gender": [], "notes": [], "reviews": [], "review_embeddings": [],
+    }
+    review_id = 0
+    for perfume_id in range(1, perfumes + 1):
+        brand = rng.choice(BRANDS)
+        name = f"{rng.choice(_NAME_WORDS)} {rng.choice(_NAME_WORDS)} {perfume_id}"
+        rows["basic"].append((
+            perfume_id, brand, name, rng.choice(CONCENTRATIONS), None,
+            rng.randint(1990, 2025), f"Perfumer {rng.randint(1, 40)}",
+        ))
+        rows["name_kr"].append((perfume_id, f"향수 {perfume_id}", brand))
+        rows["gender"].append((perfume_id, rng.choice(GENDERS)))
+
+        accords = rng.sample(ACCORDS, rng.randint(3, 5))
+        for rank, accord in enumerate(accords):
+            rows["accord_r"].append((perfume_id, accord, 100 - rank * 15 - rng.randint(0, 10)))
+            rows["accord_m"].append((perfume_id, accord, rng.randint(0, 500)))
+        for rank, season in enumerate(rng.sample(SEASONS, 2)):
+            rows["season"].append((perfume_id, season, 80 - rank * 30))
+        for rank, occasion in enumerate(rng.sample(OCCASIONS, 2)):
+            rows["occasion"].append((perfume_id, occasion, 80 - rank * 30))
+
+        notes = rng.sample(NOTES, 7)
+        for note, note_type in zip(notes, ["TOP", "TOP", "MIDDLE", "MIDDLE", "MIDDLE", "BASE", "BASE"]):
+            rows["notes"].append((perfume_id, note, note_type))
+
+        for _ in range(reviews_per_perfume):
+            review_id += 1
+            content = f"{accords[0]} 느낌이 강하고 {rng.choice(notes)} 잔향이 {rng.choice(['은은해요', '오래가요', '포근해요', '상쾌해요'])}"
+            rows["reviews"].append((review_id, perfume_id, content))
+            rows["review_embeddings"].append((review_id, vector_literal(fake_embedding(content))))
+    return rows
+
+
+def seed_perfume_db(conn, rows: Dict[str, List[tuple]]) -> None:
+    cur = conn.cursor()
+    cur.execute(PERFUME_SCHEMA)
+    inserts = [
+        ("TB_PERFUME_BASIC_M (perfume_id, perfume_brand, perfume_name, concentration, img_link, release_year, perfumer)", "basic", None),
+        ("TB_PERFUME_NAME_KR (perfume_id, name_kr, brand_kr)", "name_kr", None),
+        ("TB_PERFUME_ACCORD_R (perfume_id, accord, ratio)", "accord_r", None),
+        ("TB_PERFUME_ACCORD_M (perfume_id, accord, vote)", "accord_m", None),
+        ("TB_PERFUME_SEASON_R (perfume_id, season, ratio)", "season", None),
+        ("TB_PERFUME_OCA_R (perfume_id, occasion, ratio)", "occasion", None),
+        ("TB_PERFUME_GENDER_R (perfume_id, gender)", "gender", None),
+        ("TB_PERFUME_NOTES_M (perfume_id, note, type)", "notes", None),
+        ("TB_PERFUME_REVIEW_M (review_id, perfume_id, content)", "reviews", None),
+        ("TB_REVIEW_EMBEDDING_M (review_id, embedding)", "review_embeddings", "(%s, %s::vector)"),
+    ]
+    for target, key, template in inserts:
+        execute_values(cur, f"INSERT INTO {target} VALUES %s", rows[key], template=template, page_size=500)
+        print(f"   📥 [Seed] {target.split(' ')[0]}: {len(rows[key])} rows", flush=True)
+
+    note_rows = [
+        (note, f"{note} 향료", vector_literal(fake_embedding(note)))
+        for note in NOTES
+    ]
+    execute_values(
+        cur, "INSERT INTO TB_NOTE_EMBEDDING_M (note, description, embedding) VALUES %s",
+        note_rows, template="(%s, %s, %s::vector)",
+    )
+    conn.commit()
+    cur.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the offline benchmark database")
+    parser.add_argument("--perfumes", type=int, default=2000)
+    parser.add_argument("--reviews-per-perfume", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--force", action="store_true", help="Allow a non-local DB_HOST (tables are dropped!)")
+    args = parser.parse_args()
+
+    # agent.database와 같은 접속 정보를 쓰도록 기본 호스트만 로컬로 맞춤
+    os.environ.setdefault("DB_HOST", "localhost")
+    server = _server_config()
+    if server["host"] not in LOCAL_HOSTS and not args.force:
+        print(f"❌ [Seed] Refusing to drop tables on non-local host {server['host']} (use --force)", flush=True)
+        sys.exit(1)
+
+    perfume_db = os.getenv("DB_NAME", "perfume_db")
+    recom_db = os.getenv("RECOM_DB_NAME", "recom_db")
+    ensure_databases([perfume_db, recom_db, "member_db"])
+
+    rows = build_catalog(args.perfumes, args.reviews_per_perfume, args.seed)
+
+    conn = psycopg2.connect(dbname=perfume_db, **server)
+    try:
+        seed_perfume_db(conn, rows)
+    finally:
+        conn.close()
+
+    conn = psycopg2.connect(dbname=recom_db, **server)
+    try:
+        cur = conn.cursor()
+        cur.execute(RECOM_SCHEMA)
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+
+    # 프로필 MV는 서비스와 같은 DDL로 생성 (DB가 준비된 뒤에 import)
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ["EMBEDDING_CACHE_PATH"] = ""
+    from agent.database import ensure_perfume_profile_view, refresh_perfume_profile_view
+
+    ensure_perfume_profile_view()
+    refresh_perfume_profile_view(concurrently=False)
+    print(f"✅ [Seed] {args.perfumes} perfumes seeded (seed={args.seed})", flush=True)
+
+
+if __name__ == "__main__":
+    main()
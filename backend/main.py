@@ -1,8 +1,9 @@
+import asyncio
 import json
 import re
 import time
 from typing import Generator, List
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
@@ -20,6 +21,8 @@ from routers import auth
 from agent.schemas import ChatRequest
 from agent.graph import app_graph
 from agent.utils import parse_recommended_count, normalize_recommended_count
+from agent.chat_writer import ChatMessageWriter
+from agent.pool_metrics import pool_metrics
 # [26.02.09 변경 이력 - 프론트 우클릭 히스토리 삭제 대응]
 # [이전 코드]
 # from agent.database import (
@@ -32,16 +35,44 @@ from agent.utils import parse_recommended_count, normalize_recommended_count
 # - 프론트(Chat Sidebar)에서 우클릭으로 대화방 삭제 기능을 추가함.
 # - 삭제 API에서 thread를 soft-delete 처리하기 위해 DB 함수 import가 필요함.
 from agent.database import (
-    save_chat_message,
-    get_chat_history,
+    save_chat_message_async,
+    get_chat_history_async,
+    get_chat_history_page_async,
+    iter_chat_history_async,
+    ensure_chat_history_index,
+    CHAT_HISTORY_PAGE_SIZE,
     get_user_chat_list,
-    get_recommended_history,
+    get_recommended_history_async,
+    open_async_pools,
+    close_async_pools,
+    recommendation_log_writer,
     soft_delete_chat_room,
+    ensure_perfume_profile_view,
+    start_perfume_profile_refresher,
+    load_facet_index,
+    start_facet_index_refresher,
+    load_review_index,
+    start_review_index_refresher,
+    load_note_vector_index,
+    start_note_vector_index_refresher,
+    ensure_popularity_table,
+    load_popularity,
+    start_popularity_refresher,
 )
 from routers import users, perfumes, archive, auth # <--- ksu 추가
 
 app = FastAPI(title="Perfume Re-Act Chatbot")
 
+# checkpointer가 비어 DB에서 대화를 복원할 때 읽는 최근 메시지 수
+CHAT_RESTORE_WINDOW = int(os.getenv("CHAT_RESTORE_WINDOW", "40"))
+
+# [최적화] 채팅 메시지 백그라운드 저장기 (대화방별 순서 보장, 종료 시 drain)
+chat_writer = ChatMessageWriter(
+    save_chat_message_async,
+    shards=int(os.getenv("CHAT_WRITER_SHARDS", "4")),
+    max_queue_size=int(os.getenv("CHAT_WRITER_QUEUE_SIZE", "1000")),
+)
+
 uploads_dir = os.path.join(os.getcwd(), "uploads")
 os.makedirs(uploads_dir, exist_ok=True)
 app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
@@ -51,6 +82,67 @@ app.include_router(perfumes.router) # <--- ksu 추가
 app.include_router(archive.router) # <--- ksu 추가
 app.include_router(auth.router) # <--- ksu 추가 (routers/auth.py)
 
+
+@app.on_event("startup")
+async def start_chat_writer():
+    # 비동기 DB 풀을 먼저 열어 첫 요청이 커넥션 생성 비용을 내지 않도록 함
+    await open_async_pools()
+    chat_writer.start()
+    recommendation_log_writer.start()
+
+
+@app.on_event("shutdown")
+async def drain_chat_writer():
+    # 아직 저장되지 않은 메시지/추천 로그를 모두 DB에 반영한 뒤 풀 종료
+    await chat_writer.stop()
+    await recommendation_log_writer.stop()
+    await close_async_pools()
+
+
+@app.on_event("startup")
+def init_chat_history_index():
+    # /chat/history keyset 페이지네이션용 (THREAD_ID, CREATED_DT, MESSAGE_ID) 인덱스
+    ensure_chat_history_index()
+
+
+@app.on_event("startup")
+def init_perfume_profile_view():
+    # 검색/상세 조회가 읽는 프로필 Materialized View 준비 + 주기적 갱신
+    ensure_perfume_profile_view()
+    start_perfume_profile_refresher(
+        int(os.getenv("PERFUME_PROFILE_REFRESH_SECONDS", "3600"))
+    )
+
+
+@app.on_event("startup")
+def init_facet_index():
+    # search_perfumes 필터용 메모리 비트맵 인덱스 (프로필 뷰 준비 후 로딩)
+    load_facet_index()
+    start_facet_index_refresher(int(os.getenv("FACET_INDEX_REFRESH_SECONDS", "600")))
+
+
+@app.on_event("startup")
+def init_review_index():
+    # rerank용 리뷰 임베딩 메모리 인덱스 (이후 새 리뷰만 증분 반영)
+    load_review_index()
+    start_review_index_refresher(int(os.getenv("REVIEW_INDEX_REFRESH_SECONDS", "900")))
+
+
+@app.on_event("startup")
+def init_note_vector_index():
+    # lookup_note_by_vector용 노트 임베딩 메모리 행렬
+    load_note_vector_index()
+    start_note_vector_index_refresher(int(os.getenv("NOTE_VECTOR_INDEX_REFRESH_SECONDS", "3600")))
+
+
+@app.on_event("startup")
+def init_popularity():
+    # 인기도(투표 합계)/트렌딩 점수 미리 계산 (이후 새 추천 결과/아카이브 등록만 증분 반영)
+    ensure_popularity_table()
+    load_popularity()
+    start_popularity_refresher(int(os.getenv("POPULARITY_REFRESH_SECONDS", "300")))
+
+
 # CORS origins from environment variable
 cors_origins_env = os.getenv("BACKEND_CORS_ORIGINS", "")
 if cors_origins_env:
@@ -101,13 +193,15 @@ async def stream_generator(
     recommended_count: int = 3,
 ) -> Generator[str, None, None]:
 
-    save_chat_message(thread_id, member_id, "user", user_query)
+    # [최적화] 메시지 저장은 백그라운드 writer로 넘겨 이벤트 루프를 막지 않음
+    await chat_writer.enqueue(thread_id, member_id, "user", user_query)
     config = {"configurable": {"thread_id": thread_id}}
 
     # [★ 수정] 히스토리 중복 방지 로직
     # checkpointer에 state가 있는지 확인
+    # (체크포인터는 SQLite/Postgres head 조회를 하므로 이벤트 루프를 막지 않도록 비동기 조회)
     try:
-        current_state = app_graph.get_state(config)
+        current_state = await app_graph.aget_state(config)
         has_checkpointed_state = (
             current_state
             and current_state.values
@@ -119,7 +213,12 @@ async def stream_generator(
     # checkpointer가 비어있으면 (서버 재시작 등) DB에서 복원
     if not has_checkpointed_state:
         print(f"   🔄 [History] Checkpointer empty, restoring from DB (thread_id: {thread_id})")
-        db_history = get_chat_history(thread_id)
+        # 이전 턴의 저장 대기분을 먼저 반영한 뒤 조회
+        await chat_writer.flush(thread_id)
+        # 긴 대화도 최근 CHAT_RESTORE_WINDOW개만 복원 (META_DATA 제외)
+        db_history = await get_chat_history_async(
+            thread_id, limit=CHAT_RESTORE_WINDOW, include_meta=False
+        )
         restored_messages = []
 
         for msg in db_history:
@@ -131,7 +230,7 @@ async def stream_generator(
                 restored_messages.append(AIMessage(content=msg["text"]))
 
         # [★추가] DB에서 recommended_history 복원
-        db_recommended_history = get_recommended_history(thread_id)
+        db_recommended_history = await get_recommended_history_async(thread_id)
 
         # 첫 요청: DB 복원 메시지 + 새 메시지
         input_messages = restored_messages + [HumanMessage(content=user_query)]
@@ -212,9 +311,8 @@ async def stream_generator(
                         if node_name == "parallel_reco" or node_name.startswith(
                             "parallel_reco"
                         ):
-                            if pending_parallel_reco_separator and content.lstrip().startswith(
-                                "##"
-                            ):
+                            # 섹션 구분선(---) 뒤에 오는 다음 섹션(##) 또는 마무리 종합 의견과 붙지 않도록 빈 줄 삽입
+                            if pending_parallel_reco_separator and content.strip():
                                 content = f"\n\n{content.lstrip()}"
                                 pending_parallel_reco_separator = False
                             content = content.replace("---##", "---\n\n##").replace(
@@ -321,7 +419,7 @@ async def stream_generator(
                 yield f"data: {data}\n\n"
 
         if full_ai_response:
-            save_chat_message(thread_id, member_id, "assistant", full_ai_response)
+            await chat_writer.enqueue(thread_id, member_id, "assistant", full_ai_response)
 
     except GeneratorExit:
         return
@@ -378,6 +476,19 @@ async def chat_stream(request: ChatRequest, identity = Depends(get_identity)):
 def health():
     return {"status": "ok"}
 
+
+# 내부 운영용: POOL_METRICS_ENABLED=1일 때만 노출 (기본 404)
+POOL_METRICS_ENABLED = os.getenv("POOL_METRICS_ENABLED", "0") == "1"
+
+
+@app.get("/metrics/pools")
+def get_pool_metrics(include_stacks: bool = Query(False)):
+    # 커넥션 풀별 대기/점유 시간, 고갈 횟수, 오래 반납되지 않은 커넥션의 호출 위치
+    # (전체 스택은 POOL_TRACK_STACKS=1로 수집 중일 때 include_stacks=true로만 조회)
+    if not POOL_METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return pool_metrics(include_stacks=include_stacks)
+
 # 기존 코드 주석처리
 # @app.get("/chat/rooms/{member_id}")
 # async def get_rooms(member_id: int):
@@ -394,9 +505,31 @@ async def get_rooms(member_id: int, identity = Depends(get_identity)):
 
 
 @app.get("/chat/history/{thread_id}")
-async def get_history(thread_id: str):
-    messages = get_chat_history(thread_id)
-    return {"messages": messages}
+async def get_history(
+    thread_id: str,
+    limit: int = Query(CHAT_HISTORY_PAGE_SIZE, ge=1),
+    before: str | None = None,
+    after: str | None = None,
+    include_meta: bool = False,
+    format: str = "json",
+):
+    """
+    keyset 페이지 단위 히스토리 (커서 없이 부르면 가장 최근 limit개)
+    - before=next_cursor 로 이전 페이지, after=커서 로 이후 페이지
+    - format=ndjson 이면 대화 전체를 한 줄에 메시지 하나씩 스트리밍
+    """
+    if format == "ndjson":
+
+        async def ndjson_lines():
+            async for message in iter_chat_history_async(thread_id, include_meta=include_meta):
+                yield json.dumps(message, ensure_ascii=False, default=str) + "\n"
+
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+    try:
+        return await get_chat_history_page_async(thread_id, limit, before, after, include_meta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 # [26.02.09 변경 이력 - 채팅방 삭제 API 추가]
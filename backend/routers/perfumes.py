@@ -9,7 +9,7 @@ from typing import Any,Optional,List
 from pydantic import BaseModel
 # [수정: 2026-01-28] DB 커넥션 풀 사용을 위한 임포트 추가
 # database.py에서 정의한 풀(Pool) 관리 함수를 가져옵니다.
-from agent.database import get_db_connection, release_db_connection
+from agent.database import get_db_connection, release_db_connection, PERFUME_PROFILE_VIEW
 
 psycopg2: Any = importlib.import_module("psycopg2")
 RealDictCursor: Any = importlib.import_module("psycopg2.extras").RealDictCursor
@@ -295,11 +295,14 @@ def get_perfume_detail(
         conn = get_perfume_db()
         with conn:
             with conn.cursor() as cur:
+                # [최적화] 프로필 읽기 모델에서 한 번에 조회 (노트/어코드/계절/상황 포함)
                 cur.execute(
-                    """
+                    f"""
                     SELECT perfume_id, perfume_name, perfume_brand, release_year,
-                           concentration, perfumer, img_link
-                    FROM tb_perfume_basic_m
+                           concentration, perfumer, img_link,
+                           top_note_list, middle_note_list, base_note_list,
+                           accord_ratios, season_ratios, occasion_ratios
+                    FROM {PERFUME_PROFILE_VIEW}
                     WHERE perfume_id = %s;
                     """,
                     (perfume_id,),
@@ -308,81 +311,22 @@ def get_perfume_detail(
                 if not basic:
                     raise HTTPException(status_code=404, detail="Perfume not found")
 
-                cur.execute(
-                    """
-                    SELECT note, type
-                    FROM tb_perfume_notes_m
-                    WHERE perfume_id = %s;
-                    """,
-                    (perfume_id,),
-                )
-                note_rows = cur.fetchall()
-
-                cur.execute(
-                    """
-                    SELECT accord, ratio
-                    FROM tb_perfume_accord_r
-                    WHERE perfume_id = %s
-                    ORDER BY ratio DESC NULLS LAST
-                    LIMIT 5;
-                    """,
-                    (perfume_id,),
-                )
-                accord_rows = cur.fetchall()
-
-                cur.execute(
-                    """
-                    SELECT season, ratio
-                    FROM tb_perfume_season_r
-                    WHERE perfume_id = %s
-                    ORDER BY ratio DESC NULLS LAST
-                    LIMIT 5;
-                    """,
-                    (perfume_id,),
-                )
-                season_rows = cur.fetchall()
-
-                cur.execute(
-                    """
-                    SELECT occasion, ratio
-                    FROM tb_perfume_oca_r
-                    WHERE perfume_id = %s
-                    ORDER BY ratio DESC NULLS LAST
-                    LIMIT 5;
-                    """,
-                    (perfume_id,),
-                )
-                occasion_rows = cur.fetchall()
-
         conn.close()
 
-        notes_map = {"TOP": [], "MIDDLE": [], "BASE": []}
-        for row in note_rows:
-            note = (row.get("note") or "").strip()
-            note_type = (row.get("type") or "").strip().upper()
-            if not note or note_type not in notes_map:
-                continue
-            if note not in notes_map[note_type]:
-                notes_map[note_type].append(note)
-
         notes = PerfumeNotes(
-            top=notes_map["TOP"],
-            middle=notes_map["MIDDLE"],
-            base=notes_map["BASE"],
+            top=basic.get("top_note_list") or [],
+            middle=basic.get("middle_note_list") or [],
+            base=basic.get("base_note_list") or [],
         )
 
-        accords = [
-            RatioItem(name=row["accord"], ratio=normalize_ratio(row.get("ratio")))
-            for row in accord_rows
-        ]
-        seasons = [
-            RatioItem(name=row["season"], ratio=normalize_ratio(row.get("ratio")))
-            for row in season_rows
-        ]
-        occasions = [
-            RatioItem(name=row["occasion"], ratio=normalize_ratio(row.get("ratio")))
-            for row in occasion_rows
-        ]
+        # ratio 내림차순으로 집계되어 있으므로 상위 5개만 사용
+        accords, seasons, occasions = (
+            [
+                RatioItem(name=item["name"], ratio=normalize_ratio(item.get("ratio")))
+                for item in (basic.get(column) or [])[:5]
+            ]
+            for column in ("accord_ratios", "season_ratios", "occasion_ratios")
+        )
 
         return PerfumeDetailResponse(
             perfume_id=basic["perfume_id"],
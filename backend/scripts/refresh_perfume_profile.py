@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Refresh the denormalized perfume profile read model (MV_PERFUME_PROFILE).
+
+Run after catalog loads (notes/accords/seasons/occasions/gender) or from cron:
+    python scripts/refresh_perfume_profile.py            # CONCURRENTLY (reads keep working)
+    python scripts/refresh_perfume_profile.py --blocking # plain REFRESH (faster, locks reads)
+
+The view is created on first run if it does not exist yet.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend directory to Python path
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.database import ensure_perfume_profile_view, refresh_perfume_profile_view
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh MV_PERFUME_PROFILE")
+    parser.add_argument("--blocking", action="store_true", help="Use plain REFRESH instead of CONCURRENTLY")
+    args = parser.parse_args()
+
+    ensure_perfume_profile_view()
+    ok = refresh_perfume_profile_view(concurrently=not args.blocking)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,9 @@ from dotenv import load_dotenv
 # Load env vars from .env
 load_dotenv()
 
+# 테스트 간 대화 상태가 파일로 남지 않도록 app_graph는 메모리 체크포인터 사용
+os.environ.setdefault("CHECKPOINT_BACKEND", "memory")
+
 # Mock backend.agent.database to prevent DB connection at import time
 mock_db = MagicMock()
 mock_db.save_recommendation_log = MagicMock()
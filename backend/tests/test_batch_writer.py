@@ -0,0 +1,77 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.batch_writer import BatchWriter
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_size_threshold_and_drains_on_stop():
+    batches = []
+
+    def write(rows):
+        time.sleep(0.01)
+        batches.append(list(rows))
+
+    writer = BatchWriter(write, max_batch=3, flush_interval=60)
+    writer.start()
+
+    writer.submit([1, 2])
+    await asyncio.sleep(0.05)
+    assert batches == []  # 크기/시간 임계값 전
+
+    writer.submit([3, 4])
+    await asyncio.sleep(0.05)
+    assert batches == [[1, 2, 3]]
+
+    writer.submit([5])
+    await writer.stop()
+    assert batches == [[1, 2, 3], [4, 5]]
+    assert not writer.running
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_time_threshold_with_async_fn():
+    batches = []
+
+    async def write(rows):
+        batches.append(list(rows))
+
+    writer = BatchWriter(write, max_batch=100, flush_interval=0.02)
+    writer.submit(["a"])
+    assert batches == []
+    await asyncio.sleep(0.1)
+    assert batches == [["a"]]
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_burst_is_bounded_and_failed_batches_are_retried():
+    batches = []
+    fail = {"on": True}
+
+    def write(rows):
+        if fail["on"]:
+            raise RuntimeError("db down")
+        batches.append(list(rows))
+
+    writer = BatchWriter(write, max_batch=2, flush_interval=60, max_pending=4)
+    writer.start()
+
+    writer.submit(range(6))
+    assert writer.dropped == 2 and writer.pending == 4
+    await writer.flush()
+    assert batches == [] and writer.pending == 4  # 실패한 배치는 버퍼로 되돌림
+
+    fail["on"] = False
+    await writer.flush()
+    assert batches == [[2, 3], [4, 5]]
+    await writer.stop()
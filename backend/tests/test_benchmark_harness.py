@@ -0,0 +1,90 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import Annotated, List, TypedDict
+
+import pytest
+from langchain_core.messages import BaseMessage, HumanMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.schemas import SearchStrategyPlan, ValidationResult
+from benchmarks.fakes import FakeChatModel, LatencyProfile, PipelineResponder
+from benchmarks.instrumentation import BenchRecorder, recording
+from benchmarks.run_reco import build_report
+from benchmarks.seed import ACCORDS, NOTES, OCCASIONS, build_catalog
+
+
+class BenchState(TypedDict):
+    messages: Annotated[List[BaseMessage], add_messages]
+
+
+def _model(**kwargs):
+    latency = LatencyProfile(structured=0.02, first_token=0.02, per_token=0.001, tokens=5)
+    return FakeChatModel(
+        model_name="fake", latency=latency, responder=PipelineResponder(ACCORDS, NOTES, OCCASIONS), **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_fake_models_stream_and_are_attributed_to_nodes():
+    smart = _model()
+    writer = _model(streaming=True)
+
+    def validate(state: BenchState):
+        result = smart.with_structured_output(ValidationResult).invoke(state["messages"])
+        assert result.is_unsupported is False
+        return {}
+
+    async def reco(state: BenchState):
+        plan = await smart.with_structured_output(SearchStrategyPlan).ainvoke(
+            [HumanMessage(content="우선순위: 2")]
+        )
+        prompt = f'[섹션 번호]: 1\n"id": 7, "perfume_name": "{plan.strategy_keyword[0]}"'
+        text = ""
+        async for chunk in writer.astream([HumanMessage(content=prompt)]):
+            text += chunk.content
+        return {"messages": [HumanMessage(content=text)]}
+
+    workflow = StateGraph(BenchState)
+    workflow.add_node("pre_validator", validate)
+    workflow.add_node("parallel_reco", reco)
+    workflow.add_edge(START, "pre_validator")
+    workflow.add_edge("pre_validator", "parallel_reco")
+    workflow.add_edge("parallel_reco", END)
+    app = workflow.compile()
+
+    recorder = BenchRecorder()
+    streamed = []
+    with recording(recorder):
+        async for event in app.astream_events({"messages": [HumanMessage(content="추천")]}, version="v2"):
+            if event["event"] == "on_chat_model_stream":
+                streamed.append(event["metadata"]["langgraph_node"])
+
+    assert streamed and set(streamed) == {"parallel_reco"}
+    assert recorder.node_runs == {"pre_validator": 1, "parallel_reco": 1}
+    assert recorder.node_seconds["parallel_reco"] >= 0.04
+    assert dict(recorder.llm_calls["pre_validator"]) == {"structured": 1}
+    assert dict(recorder.llm_calls["parallel_reco"]) == {"structured": 1, "stream": 1}
+
+    report = build_report(
+        [{"total": 0.1, "first_event": 0.01, "ttft": 0.05, "recorder": recorder}],
+        argparse.Namespace(query="q", count=1, latency_scale=1.0, checkpoint="memory", warm_embeddings=False),
+    )
+    assert list(report["nodes"]) == ["parallel_reco", "pre_validator"]
+    assert report["nodes"]["parallel_reco"]["llm_calls_mean"] == {"stream": 1, "structured": 1}
+    assert report["stream_generator"]["ttft"]["p50_ms"] == 50.0
+
+
+def test_seed_catalog_is_deterministic():
+    first = build_catalog(20, 2, seed=7)
+    second = build_catalog(20, 2, seed=7)
+    assert first == second
+    assert len(first["basic"]) == 20
+    assert len(first["reviews"]) == len(first["review_embeddings"]) == 40
+    assert {row[2] for row in first["notes"]} == {"TOP", "MIDDLE", "BASE"}
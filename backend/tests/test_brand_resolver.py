@@ -0,0 +1,82 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.brand_resolver import BrandMatchMemo, BrandResolver, normalize_brand, osa_distance, to_jamo
+
+BRANDS = [
+    "Chanel", "Dior", "Christian Dior", "Jo Malone London", "Diptyque", "Byredo", "Le Labo",
+    "Hermès", "Maison Margiela", "Tom Ford", "Penhaligon's", "Dolce&Gabbana", "Creed", "Gucci", "Guess",
+]
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return BrandResolver(BRANDS)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("chanel", "Chanel"),
+        ("HERMES", "Hermès"),
+        ("le-labo", "Le Labo"),
+        ("penhaligons", "Penhaligon's"),
+        ("Dolce & Gabbana", "Dolce&Gabbana"),
+        ("샤넬", "Chanel"),
+        ("조 말론", "Jo Malone London"),
+        ("에르메스", "Hermès"),
+        ("chanle", "Chanel"),  # 인접 글자 뒤바뀜
+        ("byreod", "Byredo"),
+        ("diptyqe", "Diptyque"),
+        ("maison margela", "Maison Margiela"),
+        ("조말롱", "Jo Malone London"),  # 자모 단위 오탈자
+        ("딥디끄", "Diptyque"),
+    ],
+)
+def test_resolves_locally(resolver, query, expected):
+    assert resolver.resolve(query) == expected
+
+
+@pytest.mark.parametrize("query", ["gucs", "dio", "향수", "Amouage", "xx"])
+def test_low_confidence_is_left_to_llm(resolver, query):
+    # 짧은 입력, 허용 거리 밖, 목록에 없는 브랜드는 확정하지 않음
+    assert resolver.resolve(query) is None
+
+
+def test_equally_close_brands_are_ambiguous():
+    assert BrandResolver(["Gucci", "Pucci"]).resolve("Hucci") is None
+    assert BrandResolver(["Gucci", "Pucci"]).resolve("Guccci") == "Gucci"
+
+
+def test_aliases_only_point_to_listed_brands():
+    resolver = BrandResolver(["Dior"])
+    assert resolver.resolve("디올") == "Dior"
+    assert resolver.resolve("샤넬") is None
+
+
+def test_normalization_helpers():
+    assert normalize_brand("  Hermès  Paris ") == "hermesparis"
+    assert normalize_brand("조 말론") == "조말론"
+    assert to_jamo("말론") == "ㅁㅏㄹㄹㅗㄴ"
+    assert osa_distance("chanel", "chanle") == 1
+    assert osa_distance("abc", "abc") == 0
+
+
+def test_memo_persists_across_instances(tmp_path):
+    path = str(tmp_path / "brand_match.sqlite3")
+    memo = BrandMatchMemo(path)
+    assert memo.get("fp", "chaneru") is None
+    memo.put("fp", "chaneru", "Chanel")
+    memo.put("fp", "unknown", "")
+
+    reopened = BrandMatchMemo(path)
+    assert reopened.get("fp", "chaneru") == "Chanel"
+    assert reopened.get("fp", "unknown") == ""
+    assert reopened.get("other", "chaneru") is None
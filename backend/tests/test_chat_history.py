@@ -0,0 +1,97 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.chat_history import (
+    AFTER,
+    BEFORE,
+    build_history_query,
+    decode_cursor,
+    encode_cursor,
+    history_page,
+    history_rows,
+)
+
+START = datetime(2026, 1, 1, 12, 0, 0)
+# 같은 시각에 저장된 메시지가 섞이도록 created_dt가 겹치게 생성
+ROWS = [
+    {"id": i + 1, "created_dt": START + timedelta(seconds=i // 2), "role": "user", "text": f"m{i + 1}"}
+    for i in range(11)
+]
+
+
+def run_query(sql, params, rows=ROWS):
+    """build_history_query가 만든 WHERE/ORDER/LIMIT를 메모리에서 흉내"""
+    params = list(params)
+    assert params.pop(0) == "t"
+    key = lambda r: (r["created_dt"], r["id"])
+    selected = list(rows)
+    if "(CREATED_DT, MESSAGE_ID) <" in sql:
+        bound = (params.pop(0), params.pop(0))
+        selected = [r for r in selected if key(r) < bound]
+    elif "(CREATED_DT, MESSAGE_ID) >" in sql:
+        bound = (params.pop(0), params.pop(0))
+        selected = [r for r in selected if key(r) > bound]
+    selected.sort(key=key, reverse="CREATED_DT DESC" in sql)
+    if "LIMIT %s" in sql:
+        selected = selected[: params.pop(0)]
+    assert not params
+    return selected
+
+
+def fetch_page(limit, before=None, after=None):
+    sql, params, reversed_order = build_history_query("t", limit + 1, before, after, include_meta=False)
+    messages = history_rows(run_query(sql, params), reversed_order)
+    return history_page(messages, limit, AFTER if after else BEFORE)
+
+
+def test_cursor_round_trip_and_invalid_cursor():
+    cursor = encode_cursor(START, 42)
+    assert decode_cursor(cursor) == (START, 42)
+    assert decode_cursor(encode_cursor(START.isoformat(), 42)) == (START, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_paging_backwards_from_latest_covers_thread_once():
+    page = fetch_page(4)
+    assert [m["text"] for m in page["messages"]] == ["m8", "m9", "m10", "m11"]
+    assert page["has_more"]
+
+    seen = list(page["messages"])
+    while page["has_more"]:
+        page = fetch_page(4, before=page["next_cursor"])
+        seen = page["messages"] + seen
+    assert [m["id"] for m in seen] == list(range(1, 12))
+    assert page["next_cursor"] is None
+
+
+def test_paging_forward_with_after_cursor():
+    first = encode_cursor(ROWS[2]["created_dt"], ROWS[2]["id"])
+    page = fetch_page(5, after=first)
+    assert [m["id"] for m in page["messages"]] == [4, 5, 6, 7, 8]
+    page = fetch_page(5, after=page["next_cursor"])
+    assert [m["id"] for m in page["messages"]] == [9, 10, 11]
+    assert not page["has_more"]
+
+
+def test_query_shape():
+    sql, params, reversed_order = build_history_query("t")
+    assert "META_DATA" in sql and "LIMIT" not in sql and not reversed_order
+    assert sql.endswith("ORDER BY CREATED_DT ASC, MESSAGE_ID ASC") and params == ("t",)
+
+    sql, _, reversed_order = build_history_query("t", 10, include_meta=False)
+    assert "META_DATA" not in sql and reversed_order
+
+    _, _, reversed_order = build_history_query("t", 10, oldest_first=True)
+    assert not reversed_order
+
+    with pytest.raises(ValueError):
+        build_history_query("t", 10, before=encode_cursor(START, 1), after=encode_cursor(START, 2))
@@ -0,0 +1,93 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.chat_writer import ChatMessageWriter
+
+
+@pytest.mark.asyncio
+async def test_messages_are_saved_in_order_per_thread_and_drained_on_stop():
+    saved = []
+
+    def slow_save(thread_id, member_id, role, message):
+        time.sleep(0.01)
+        saved.append((thread_id, message))
+
+    writer = ChatMessageWriter(slow_save, shards=2, max_queue_size=2)
+    writer.start()
+
+    for i in range(5):
+        for thread_id in ("a", "b", "c"):
+            await writer.enqueue(thread_id, 0, "user", f"{thread_id}-{i}")
+
+    await writer.stop()
+
+    assert len(saved) == 15
+    for thread_id in ("a", "b", "c"):
+        assert [m for t, m in saved if t == thread_id] == [f"{thread_id}-{i}" for i in range(5)]
+    assert not writer.running
+
+
+@pytest.mark.asyncio
+async def test_enqueue_does_not_block_event_loop():
+    def blocking_save(*_):
+        time.sleep(0.2)
+
+    writer = ChatMessageWriter(blocking_save, shards=1)
+    writer.start()
+
+    started = time.perf_counter()
+    await writer.enqueue("t", 0, "assistant", "hello")
+    await asyncio.sleep(0.01)
+    assert time.perf_counter() - started < 0.1
+
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_flush_waits_for_pending_writes_and_survives_errors():
+    saved = []
+
+    def flaky_save(thread_id, member_id, role, message, meta=None):
+        if message == "boom":
+            raise RuntimeError("db down")
+        time.sleep(0.01)
+        saved.append((message, meta))
+
+    writer = ChatMessageWriter(flaky_save, shards=1)
+    writer.start()
+
+    await writer.enqueue("t", 0, "user", "boom")
+    await writer.enqueue("t", 0, "user", "first")
+    await writer.enqueue("t", 0, "assistant", "second", meta={"k": 1})
+    await writer.flush("t")
+
+    assert saved == [("first", None), ("second", {"k": 1})]
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_coroutine_save_fn_is_awaited_on_the_loop():
+    saved = []
+
+    async def async_save(thread_id, member_id, role, message, meta=None):
+        await asyncio.sleep(0.01)
+        saved.append((thread_id, message, meta))
+
+    writer = ChatMessageWriter(async_save, shards=2)
+    writer.start()
+
+    for i in range(3):
+        await writer.enqueue("t", 0, "user", f"m-{i}", meta={"i": i} if i else None)
+    await writer.flush("t")
+
+    assert saved == [("t", "m-0", None), ("t", "m-1", {"i": 1}), ("t", "m-2", {"i": 2})]
+    await writer.stop()
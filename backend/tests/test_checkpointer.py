@@ -0,0 +1,136 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Annotated, List, TypedDict
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.checkpointer import SQLiteCheckpointStore, TieredCheckpointSaver
+
+
+class EchoState(TypedDict):
+    messages: Annotated[List[BaseMessage], add_messages]
+
+
+def _compile(saver):
+    def echo_node(state: EchoState):
+        return {"messages": [AIMessage(content=f"Echo: {state['messages'][-1].content}")]}
+
+    workflow = StateGraph(EchoState)
+    workflow.add_node("echo", echo_node)
+    workflow.add_edge(START, "echo")
+    workflow.add_edge("echo", END)
+    return workflow.compile(checkpointer=saver)
+
+
+def test_state_survives_restart_and_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    config = {"configurable": {"thread_id": "thread-1"}}
+
+    worker_a = _compile(TieredCheckpointSaver(SQLiteCheckpointStore(path)))
+    worker_a.invoke({"messages": [HumanMessage(content="안녕")]}, config=config)
+
+    # 새 프로세스(재시작/다른 워커) 시뮬레이션: 같은 파일을 여는 새 체크포인터
+    worker_b = _compile(TieredCheckpointSaver(SQLiteCheckpointStore(path)))
+    assert [m.content for m in worker_b.get_state(config).values["messages"]] == ["안녕", "Echo: 안녕"]
+    worker_b.invoke({"messages": [HumanMessage(content="추천해줘")]}, config=config)
+
+    # worker_a의 Hot Tier는 최신 체크포인트 ID 확인으로 무효화되어야 함
+    contents = [m.content for m in worker_a.get_state(config).values["messages"]]
+    assert contents == ["안녕", "Echo: 안녕", "추천해줘", "Echo: 추천해줘"]
+
+
+@pytest.mark.asyncio
+async def test_async_stream_and_bounded_hot_tier(tmp_path):
+    saver = TieredCheckpointSaver(
+        SQLiteCheckpointStore(str(tmp_path / "c.sqlite3")), hot_max_threads=2, keep_per_thread=3
+    )
+    app = _compile(saver)
+
+    for i in range(4):
+        config = {"configurable": {"thread_id": f"t{i}"}}
+        await app.ainvoke({"messages": [HumanMessage(content=f"m{i}")]}, config=config)
+    assert saver.hot_size == 2
+
+    config = {"configurable": {"thread_id": "t0"}}
+    for turn in range(3):
+        await app.ainvoke({"messages": [HumanMessage(content=f"again{turn}")]}, config=config)
+    state = await app.aget_state(config)
+    assert len(state.values["messages"]) == 8
+
+    # 대화방별 최근 keep_per_thread개 체크포인트만 보관
+    history = [c async for c in saver.alist(config)]
+    assert len(history) == 3
+
+
+def test_pending_writes_from_another_worker_invalidate_hot_tier(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    config = {"configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}}
+
+    saver_a = TieredCheckpointSaver(SQLiteCheckpointStore(path))
+    _compile(saver_a).invoke({"messages": [HumanMessage(content="안녕")]}, config=config)
+    latest = saver_a.get_tuple(config)
+    assert latest.pending_writes == []
+
+    # 다른 워커가 같은 체크포인트에 pending write만 추가 (체크포인트 ID는 그대로)
+    saver_b = TieredCheckpointSaver(SQLiteCheckpointStore(path))
+    saver_b.put_writes(latest.config, [("messages", "pending")], task_id="task-1")
+
+    # head 버전이 올라 worker_a도 저장소에서 다시 읽음
+    assert [w[1:] for w in saver_a.get_tuple(config).pending_writes] == [("messages", "pending")]
+
+
+class _SlowStore(SQLiteCheckpointStore):
+    """head 조회마다 DB 왕복 지연을 흉내내는 저장소 (동기 sleep)"""
+
+    def latest_signature(self, thread_id, checkpoint_ns):
+        time.sleep(0.2)
+        return super().latest_signature(thread_id, checkpoint_ns)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_streams_do_not_block_event_loop_on_checkpoint_reads(tmp_path, monkeypatch):
+    with patch("psycopg2.pool.ThreadedConnectionPool"):
+        import main
+
+    saver = TieredCheckpointSaver(_SlowStore(str(tmp_path / "c.sqlite3")))
+    monkeypatch.setattr(main, "app_graph", _compile(saver))
+    monkeypatch.setattr(main, "chat_writer", MagicMock(enqueue=AsyncMock(), flush=AsyncMock()))
+    monkeypatch.setattr(main, "get_chat_history_async", AsyncMock(return_value=[]))
+    monkeypatch.setattr(main, "get_recommended_history_async", AsyncMock(return_value=[]))
+
+    async def drain(thread_id):
+        return [chunk async for chunk in main.stream_generator("안녕", thread_id)]
+
+    gaps = []
+
+    async def ticker():
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        while True:
+            await asyncio.sleep(0.01)
+            now = loop.time()
+            gaps.append(now - last)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    try:
+        await asyncio.gather(drain("thread-a"), drain("thread-b"))
+    finally:
+        tick.cancel()
+
+    # 체크포인트 조회(0.2초)가 이벤트 루프에서 돌았다면 다른 스트림/태스크가 그만큼 멈춤
+    assert gaps and max(gaps) < 0.15
+    for thread_id in ("thread-a", "thread-b"):
+        state = await saver.aget_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}})
+        assert [m.content for m in state.checkpoint["channel_values"]["messages"]] == ["안녕", "Echo: 안녕"]
@@ -0,0 +1,122 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.embedding_cache import EmbeddingCache
+
+
+def _fake_vector(text):
+    return [float(len(text)), float(sum(map(ord, text)) % 97)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_call():
+    cache = EmbeddingCache("test-model")
+    calls = []
+
+    async def fetch(texts):
+        calls.append(list(texts))
+        await asyncio.sleep(0.05)
+        return [_fake_vector(t) for t in texts]
+
+    results = await asyncio.gather(
+        *[cache.get_async("woody\nvanilla", fetch) for _ in range(5)]
+    )
+
+    assert calls == [["woody vanilla"]]
+    assert all(r == _fake_vector("woody vanilla") for r in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_only_fetches_misses_in_one_request():
+    cache = EmbeddingCache("test-model")
+    calls = []
+
+    async def fetch(texts):
+        calls.append(list(texts))
+        return [_fake_vector(t) for t in texts]
+
+    await cache.get_async("rose", fetch)
+    results = await cache.get_many_async(["rose", "musk", "", "musk", "amber"], fetch)
+
+    assert calls == [["rose"], ["musk", "amber"]]
+    assert results[2] == []
+    assert results[1] == results[3] == _fake_vector("musk")
+
+
+def test_persistent_store_survives_new_instance(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    calls = []
+
+    def fetch(texts):
+        calls.append(list(texts))
+        return [_fake_vector(t) for t in texts]
+
+    first = EmbeddingCache("test-model", store_path=path)
+    vector = first.get("citrus", fetch)
+
+    second = EmbeddingCache("test-model", store_path=path)
+    assert second.get("citrus", fetch) == vector
+    assert len(calls) == 1
+
+    # 모델이 다르면 다른 키
+    other = EmbeddingCache("other-model", store_path=path)
+    other.get("citrus", fetch)
+    assert len(calls) == 2
+
+
+def test_failed_fetch_is_not_cached():
+    cache = EmbeddingCache("test-model", max_entries=2)
+    state = {"fail": True}
+
+    def fetch(texts):
+        if state["fail"]:
+            raise RuntimeError("boom")
+        return [_fake_vector(t) for t in texts]
+
+    with pytest.raises(RuntimeError):
+        cache.get("leather", fetch)
+
+    state["fail"] = False
+    assert cache.get("leather", fetch) == _fake_vector("leather")
+    cache.get("a", fetch)
+    cache.get("b", fetch)
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_store_access_runs_off_the_event_loop(tmp_path, monkeypatch):
+    path = str(tmp_path / "embeddings.sqlite3")
+    loop_thread = threading.get_ident()
+    store_threads = []
+
+    async def fetch(texts):
+        return [_fake_vector(t) for t in texts]
+
+    first = EmbeddingCache("test-model", store_path=path)
+    for name in ("_store_get", "_store_put"):
+        original = getattr(first, name)
+
+        def traced(*args, _original=original):
+            store_threads.append(threading.get_ident())
+            return _original(*args)
+
+        monkeypatch.setattr(first, name, traced)
+    vector = await first.get_async("citrus", fetch)
+    await first.flush_async()
+    assert store_threads and loop_thread not in store_threads
+
+    # write-behind로 저장된 벡터를 새 인스턴스가 비동기 조회로 읽음
+    async def no_fetch(texts):
+        raise AssertionError("should be served from the local store")
+
+    second = EmbeddingCache("test-model", store_path=path)
+    assert await second.get_async("citrus", no_fetch) == vector
@@ -0,0 +1,159 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.facet_index import IntBitMap, PerfumeFacetIndex, relaxation_tiers
+
+ACCORDS = ["Woody", "Citrus", "Floral", "Amber", "Musky", "Green"]
+NOTES = ["Rose", "Vanilla", "Bergamot", "Musk", "Oud", "Iris"]
+SEASONS = ["Spring", "Summer", "Fall", "Winter"]
+OCCASIONS = ["Daily", "Business", "Evening"]
+GENDERS = ["Feminine", "Masculine", "Unisex"]
+BRANDS = ["Chanel", "Dior", "Le Labo", None]
+
+
+def _catalog(seed=3, size=300):
+    rng = random.Random(seed)
+    perfumes = [(pid, rng.choice(BRANDS)) for pid in range(1, size + 1)]
+    # 동점과 투표 정보 없는 향수 포함
+    votes = {pid: rng.choice([0, 10, 10, 50, 900]) for pid, _ in perfumes if rng.random() < 0.8}
+    rows = {"gender": [], "season": [], "occasion": [], "accord": [], "note": []}
+    for pid, _ in perfumes:
+        if rng.random() < 0.9:
+            rows["gender"].append((pid, rng.choice(GENDERS)))
+        for facet, vocab, k in (
+            ("season", SEASONS, 2), ("occasion", OCCASIONS, 1), ("accord", ACCORDS, 3), ("note", NOTES, 3)
+        ):
+            # 원본 데이터 대소문자가 섞여 있어도 ILIKE처럼 매칭되어야 함
+            rows[facet].extend((pid, v.upper() if rng.random() < 0.1 else v) for v in rng.sample(vocab, k))
+    return perfumes, rows, votes
+
+
+def _reference(perfumes, rows, votes, hard, strategy, exclude_ids, exclude_brands, brand, limit):
+    """기존 search_perfumes SQL의 WHERE 절 + ORDER BY vote_total DESC, perfume_id 기준 구현"""
+    def ids_where(facet, value):
+        return {pid for pid, v in rows[facet] if v is not None and v.lower() == value.lower()}
+
+    out = []
+    for pid, perfume_brand in sorted(perfumes, key=lambda row: (-votes.get(row[0], 0), row[0])):
+        if exclude_ids and pid in exclude_ids:
+            continue
+        if exclude_brands and (perfume_brand is None or perfume_brand in exclude_brands):
+            continue
+        if hard.get("gender"):
+            g = hard["gender"].lower()
+            allowed = {"women": {"Feminine", "Unisex"}, "female": {"Feminine", "Unisex"},
+                       "men": {"Masculine", "Unisex"}, "male": {"Masculine", "Unisex"}}.get(g, {"Unisex"})
+            if pid not in {p for p, v in rows["gender"] if v in allowed}:
+                continue
+        if brand and (perfume_brand is None or perfume_brand.lower() != brand.lower()):
+            continue
+        if any(hard.get(k) and pid not in ids_where(k, hard[k]) for k in ("season", "occasion", "accord", "note")):
+            continue
+        ok = True
+        for k, vals in strategy.items():
+            if not vals or k == "gender":
+                continue
+            if not any(pid in ids_where(k.lower(), v) for v in vals):
+                ok = False
+        if ok:
+            out.append(pid)
+    return out[:limit]
+
+
+def test_bitmap_algebra_matches_sql_semantics():
+    perfumes, rows, votes = _catalog()
+    index = PerfumeFacetIndex(perfumes, rows, votes)
+    rng = random.Random(11)
+
+    for _ in range(200):
+        hard = {}
+        if rng.random() < 0.8:
+            hard["gender"] = rng.choice(["Women", "men", "Unisex", "Female"])
+        for key, vocab in (("season", SEASONS), ("accord", ACCORDS), ("note", NOTES)):
+            if rng.random() < 0.2:
+                hard[key] = rng.choice(vocab).lower()
+        strategy = {}
+        for key, vocab in (("accord", ACCORDS), ("occasion", OCCASIONS), ("note", NOTES)):
+            if rng.random() < 0.6:
+                strategy[key] = rng.sample(vocab, rng.randint(1, 2))
+        exclude_ids = rng.sample(range(1, 301), rng.randint(0, 40))
+        exclude_brands = rng.sample(["Chanel", "Dior"], rng.randint(0, 1))
+        brand = rng.choice([None, None, "le labo", "CHANEL"])
+        limit = rng.choice([5, 20])
+
+        assert PerfumeFacetIndex.supports(hard, strategy)
+        got = index.search(hard, strategy, exclude_ids, exclude_brands, brand=brand, limit=limit)
+        assert got == _reference(perfumes, rows, votes, hard, strategy, set(exclude_ids), exclude_brands, brand, limit)
+
+
+def test_relaxed_search_matches_sequential_relaxation_loop():
+    """한 번에 평가한 완화 단계가 기존 단계별 검색 루프(전체 -> 조합 순)와 같은 순서인지"""
+    perfumes, rows, votes = _catalog(seed=5)
+    index = PerfumeFacetIndex(perfumes, rows, votes)
+    rng = random.Random(17)
+
+    assert relaxation_tiers(["note"]) == [(0, ("note",))]
+    assert relaxation_tiers(["note", "accord", "occasion"]) == [
+        (0, ("note", "accord", "occasion")),
+        (1, ("note", "accord")), (1, ("note", "occasion")), (1, ("accord", "occasion")),
+        (2, ("note",)), (2, ("accord",)), (2, ("occasion",)),
+    ]
+
+    for _ in range(100):
+        hard = {"gender": rng.choice(["Women", "men"])}
+        strategy = {
+            "note": rng.sample(NOTES, rng.randint(1, 2)),
+            "accord": rng.sample(ACCORDS, rng.randint(1, 2)),
+            "occasion": rng.sample(OCCASIONS, 1),
+        }
+        relax_keys = [k for k in ("note", "accord", "occasion") if rng.random() < 0.8]
+        exclude_ids = rng.sample(range(1, 301), rng.randint(0, 40))
+
+        expected, seen = [], set()
+        for position, (level, keys) in enumerate(relaxation_tiers(relax_keys)):
+            tier_strategy = strategy if level == 0 else {k: strategy[k] for k in keys}
+            for pid in _reference(perfumes, rows, votes, hard, tier_strategy, set(exclude_ids), None, None, 1000):
+                if pid not in seen:
+                    seen.add(pid)
+                    expected.append((pid, position))
+
+        got = index.search_relaxed(hard, strategy, relax_keys, exclude_ids, limit=20)
+        assert got == expected[:20]
+
+
+def test_wildcards_and_unexpected_shapes_fall_back_to_sql():
+    assert not PerfumeFacetIndex.supports({"note": "Ros%"}, {})
+    assert not PerfumeFacetIndex.supports({}, {"accord": ["Wood_"]})
+    assert not PerfumeFacetIndex.supports({"gender": ["Women", "Men"]}, {})
+    assert not PerfumeFacetIndex.supports({}, {"note": "Rose"})
+    # 매핑되지 않는 전략 키는 SQL에서도 무시되므로 인덱스로 처리 가능
+    assert PerfumeFacetIndex.supports({"gender": "Women"}, {"style": "Daily"})
+
+
+@pytest.mark.parametrize("values", [[], [0], [1, 5, 64, 1000], list(range(0, 200, 3))])
+def test_int_bitmap_operations(values):
+    other = [5, 6, 1000, 3]
+    a, b = IntBitMap(values), IntBitMap(other)
+    assert list(a) == sorted(set(values))
+    assert len(a) == len(set(values))
+    assert list(a | b) == sorted(set(values) | set(other))
+    assert list(a & b) == sorted(set(values) & set(other))
+    assert list(a - b) == sorted(set(values) - set(other))
+    assert bool(a) == bool(values)
+
+
+def test_candidate_cut_prefers_popular_perfumes_over_low_ids():
+    perfumes = [(pid, "Brand") for pid in range(1, 6)]
+    rows = {"accord": [(pid, "Woody") for pid in range(1, 6)]}
+    index = PerfumeFacetIndex(perfumes, rows, votes={5: 900, 3: 50, 4: 50})
+
+    assert index.search({}, {"accord": ["woody"]}, limit=3) == [5, 3, 4]
+    assert index.search({}, {"accord": ["woody"]}, exclude_ids=[5, 99], limit=3) == [3, 4, 1]
@@ -4,7 +4,7 @@ FCFS (First-Come-First-Served) 스트리밍 테스트
 parallel_reco_node의 FCFS 파이프라인이 올바르게 동작하는지 검증:
 1. 전략들이 완료되는 즉시 출력되는지 (FCFS 순서)
 2. 섹션 넘버링이 1..N으로 연속되는지
-3. 마지막 템플릿이 "진짜 마지막"에만 적용되는지
+3. 종합 의견은 모든 섹션 이후 별도 단계로 한 번만 작성되는지
 """
 import pytest
 import asyncio
@@ -144,17 +144,14 @@ class TestSectionNumbering:
                     assert "## 1." in content or "##1." in content.replace(" ", "")
 
 
-class TestLastTemplateApplication:
-    """마지막 템플릿 적용 검증"""
+class TestClosingTail:
+    """종합 의견(마무리) 단계 검증"""
 
     @pytest.mark.asyncio
-    async def test_last_template_only_applied_to_final_section(self):
+    async def test_closing_written_once_after_all_sections(self):
         """
-        "마지막 템플릿"이 진짜 마지막 섹션에만 적용되어야 함.
-
-        검증:
-        - 중간 섹션들은 is_last=False로 생성
-        - 마지막 섹션만 is_last=True로 생성
+        섹션은 마지막 여부와 무관하게 바로 작성하고,
+        종합 의견은 모든 전략이 끝난 뒤 별도 단계로 한 번만 작성해야 함.
         """
         state = {
             "user_preferences": {"gender": "Unisex"},
@@ -165,14 +162,23 @@ class TestLastTemplateApplication:
             "recommended_count": 2,
         }
 
-        with patch('agent.graph.smart_search_with_retry_async') as mock_search:
-            mock_search.return_value = (
-                [{"id": 1, "name": "Test", "brand": "Test", "accords": "Test",
+        strategy_ids = iter([1, 2])
+
+        async def mock_search(h_filters, s_filters, exclude_ids=None, query_text="", **kwargs):
+            strategy_id = next(strategy_ids)
+            return (
+                [{"id": strategy_id, "name": "Test", "brand": f"Brand {strategy_id}", "accords": "Test",
                   "best_review": "Test", "top_notes": "Test", "middle_notes": "Test",
                   "base_notes": "Test", "gender": "Unisex"}],
                 "Perfect Match"
             )
 
+        with patch('agent.graph.smart_search_with_retry_async', side_effect=mock_search), \
+             patch('agent.graph.save_recommendation_log'), \
+             patch('agent.graph.SUPER_SMART_LLM') as mock_writer_llm:
+            # 섹션/마무리는 아래에서 대체하므로 작성 LLM이 호출되면 실패 (폴백 경로 진입 방지)
+            mock_writer_llm.ainvoke = AsyncMock(side_effect=AssertionError("writer LLM must not be called"))
+
             with patch('agent.graph.SMART_LLM') as mock_llm:
                 mock_strategy = MagicMock()
                 mock_strategy.strategy_name = "Test"
@@ -187,56 +193,156 @@ class TestLastTemplateApplication:
                 mock_label_response.content = "테스트"
                 mock_llm.ainvoke = AsyncMock(return_value=mock_label_response)
 
-                with patch('agent.graph.RecoWriter.generate_section') as mock_generate:
-                    # Track is_last parameter
-                    is_last_calls = []
+                events = []
 
-                    async def track_is_last(*args, **kwargs):
-                        is_last_calls.append(kwargs.get('is_last', False))
-                        return "## 1. Test\nContent\n[[SAVE:1:Test]]\n---"
+                async def track_section(prepared_data, display_priority, **kwargs):
+                    assert "is_last" not in kwargs
+                    events.append(("section", display_priority))
+                    return f"## {display_priority}. Test\nContent\n[[SAVE:1:Test]]\n---"
 
-                    mock_generate.side_effect = track_is_last
+                async def track_closing(prepared_data_list):
+                    events.append(("closing", len(prepared_data_list)))
+                    return "마지막으로, 가볍게 한 번만 뿌려보세요."
 
+                with patch('agent.graph.RecoWriter.generate_section', side_effect=track_section), \
+                     patch('agent.graph.RecoWriter.generate_closing', side_effect=track_closing):
                     result = await parallel_reco_node(state)
 
-                    # 검증: 마지막 호출만 is_last=True
-                    assert len(is_last_calls) == 2
-                    assert is_last_calls[-1] is True  # 마지막만 True
-                    assert is_last_calls[0] is False  # 나머지는 False
+                assert events == [("section", 1), ("section", 2), ("closing", 2)]
+                assert result["messages"][0].content.endswith("---\n\n마지막으로, 가볍게 한 번만 뿌려보세요.")
 
 
-class TestOneBuffering:
-    """1개 버퍼링 알고리즘 검증"""
+class TestImmediateSectionStart:
+    """완료된 전략의 섹션을 바로 작성하는지 검증"""
 
-    def test_pending_section_mechanism(self):
+    @pytest.mark.asyncio
+    async def test_first_section_starts_before_slowest_strategy_finishes(self):
         """
-        1개 버퍼링 메커니즘 검증:
-        - pending_section을 유지하며 새 섹션 도착 시 기존 것을 출력
-        - 마지막에 pending_section을 is_last=True로 출력
-
-        이 테스트는 알고리즘의 정확성을 검증.
+        이전에는 마지막 여부를 알기 위해 완료된 결과를 다음 결과가 올 때까지 붙잡아 두었음.
+        첫 섹션 작성은 가장 느린 전략을 기다리지 않아야 함.
         """
-        # Simulated FCFS pipeline
-        pending_section = None
-        output_texts = []
-
-        # 섹션 3개가 순차적으로 도착
-        sections = ["Section 1", "Section 2", "Section 3"]
-
-        for i, section in enumerate(sections):
-            if pending_section:
-                # 기존 pending을 중간 템플릿으로 출력
-                output_texts.append(f"{pending_section} (is_last=False)")
-
-            # 새 섹션을 pending으로 설정
-            pending_section = section
-
-        # 마지막 pending을 is_last=True로 출력
-        if pending_section:
-            output_texts.append(f"{pending_section} (is_last=True)")
-
-        # 검증
-        assert len(output_texts) == 3
-        assert "Section 1 (is_last=False)" in output_texts[0]
-        assert "Section 2 (is_last=False)" in output_texts[1]
-        assert "Section 3 (is_last=True)" in output_texts[2]
+        state = {
+            "user_preferences": {"gender": "Unisex"},
+            "messages": [],
+            "member_id": 0,
+            "user_query": "테스트",
+            "recommended_history": [],
+            "recommended_count": 2,
+        }
+
+        search_done = {}
+
+        # 호출 순서대로 (향수 ID, 지연): 1번은 빠르고 2번은 느림
+        search_specs = iter([(1, 0.05), (2, 0.3)])
+
+        async def mock_search(h_filters, s_filters, exclude_ids=None, query_text="", **kwargs):
+            strategy_id, delay = next(search_specs)
+            await asyncio.sleep(delay)
+            search_done[strategy_id] = True
+            return (
+                [{"id": strategy_id, "name": f"Perfume {strategy_id}", "brand": f"Brand {strategy_id}",
+                  "accords": "Test", "best_review": "Great", "top_notes": "Note",
+                  "middle_notes": "Note", "base_notes": "Note", "gender": "Unisex"}],
+                "Perfect Match"
+            )
+
+        with patch('agent.graph.smart_search_with_retry_async', side_effect=mock_search), \
+             patch('agent.graph.save_recommendation_log'), \
+             patch('agent.graph.SUPER_SMART_LLM') as mock_writer_llm:
+            mock_writer_llm.ainvoke = AsyncMock(side_effect=AssertionError("writer LLM must not be called"))
+
+            with patch('agent.graph.SMART_LLM') as mock_llm:
+                mock_strategy = MagicMock()
+                mock_strategy.strategy_name = "Test"
+                mock_strategy.reason = "Test"
+                mock_strategy.strategy_keyword = ["test"]
+                mock_strategy.hard_filters.model_dump.return_value = {"gender": "Unisex"}
+                mock_strategy.strategy_filters.model_dump.return_value = {}
+
+                mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(return_value=mock_strategy)
+
+                mock_label_response = MagicMock()
+                mock_label_response.content = "테스트"
+                mock_llm.ainvoke = AsyncMock(return_value=mock_label_response)
+
+                slow_done_at_section = []
+
+                async def track_section(prepared_data, display_priority, **kwargs):
+                    slow_done_at_section.append(search_done.get(2, False))
+                    return f"## {display_priority}. Test\n[[SAVE:{display_priority}:Test]]\n---"
+
+                with patch('agent.graph.RecoWriter.generate_section', side_effect=track_section), \
+                     patch('agent.graph.RecoWriter.generate_closing', AsyncMock(return_value=None)):
+                    await parallel_reco_node(state)
+
+                # 첫 섹션은 느린 전략(2)이 끝나기 전에 작성 시작
+                assert slow_done_at_section == [False, True]
+
+
+class TestStrategyPipelining:
+    """prepare_strategy 단계 병렬화 검증"""
+
+    def _searcher(self, search_fn):
+        plan = MagicMock()
+        plan.strategy_name = "Test Strategy"
+        plan.reason = "Test reason"
+        plan.strategy_keyword = ["test"]
+        plan.hard_filters.model_dump.return_value = {}
+        plan.strategy_filters.model_dump.return_value = {}
+        plan_llm = MagicMock()
+        plan_llm.ainvoke = AsyncMock(return_value=plan)
+        return RecoSearcher(
+            member_id=0,
+            user_prefs={"gender": "Unisex"},
+            researcher_prompt="prompt",
+            plan_llm=plan_llm,
+            session_exclude_ids=set(),
+            selection_lock=asyncio.Lock(),
+            batch_selected_ids=set(),
+            brand_counts={},
+            search_fn=search_fn,
+        )
+
+    @pytest.mark.asyncio
+    async def test_label_generation_overlaps_search(self):
+        """라벨 생성과 검색이 동시에 진행되어 두 지연이 더해지지 않아야 함"""
+        async def search(*args, **kwargs):
+            await asyncio.sleep(0.2)
+            return ([{"id": 7, "name": "P", "brand": "B"}], "Perfect Match")
+
+        async def label(reason):
+            await asyncio.sleep(0.2)
+            return "우아한 첫인상"
+
+        searcher = self._searcher(search)
+        loop = asyncio.get_running_loop()
+        with patch.object(searcher, "generate_user_label", side_effect=label), \
+             patch('agent.graph.save_recommendation_log'):
+            started = loop.time()
+            result = await searcher.prepare_strategy("STRAT_1", 1, "DEFAULT")
+            elapsed = loop.time() - started
+
+        assert result["perfume_id"] == 7
+        assert result["section_data"]["strategy"]["user_label"] == "우아한 첫인상"
+        assert elapsed < 0.35
+
+    @pytest.mark.asyncio
+    async def test_label_generation_cancelled_when_search_fails(self):
+        """후보가 없으면 섹션을 만들지 않으므로 진행 중인 라벨 생성을 취소"""
+        label_state = {}
+
+        async def search(*args, **kwargs):
+            return ([], "No Results")
+
+        async def label(reason):
+            await asyncio.sleep(0.05)
+            label_state["finished"] = True
+            return "unused"
+
+        searcher = self._searcher(search)
+        with patch.object(searcher, "generate_user_label", side_effect=label):
+            result = await searcher.prepare_strategy("STRAT_1", 1, "DEFAULT")
+            await asyncio.sleep(0.1)
+
+        assert result["error_type"] == "no_results"
+        assert label_state == {}
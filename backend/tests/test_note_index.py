@@ -0,0 +1,66 @@
+import random
+import sys
+from pathlib import Path
+
+from Levenshtein import distance
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.note_index import NoteSpellingIndex
+
+NOTES = [
+    "Rose", "rose", "Vanilla", "Bergamot", "Musk", "White Musk", "Oud", "Iris", "Amber", "Ambrette",
+    "Sandalwood", "Cedar", "Cedarwood", "Vetiver", "Patchouli", "Jasmine", "Neroli", "Lime", "Lily",
+    "Tonka Bean", "Black Pepper", "Pink Pepper", "Tea", "Fig", "Sea Salt",
+]
+
+
+def _reference(notes, keyword):
+    """기존 lookup_note_by_string의 전체 순회 로직"""
+    keyword_clean = keyword.strip().lower()
+    for note in notes:
+        if note.lower() == keyword_clean:
+            return {note}
+    if len(keyword_clean) < 3:
+        return set()
+    return {note for note in notes if distance(keyword_clean, note.lower()) <= 2}
+
+
+def test_index_matches_full_scan():
+    index = NoteSpellingIndex(NOTES)
+    rng = random.Random(5)
+    alphabet = "abcdefghijklmnopqrstuvwxyz "
+    queries = ["ROSE", " vanila ", "bergamont", "musc", "sandal wood", "ceder", "oudh", "li", "xyz", "pepper"]
+    for _ in range(300):
+        word = list(rng.choice(NOTES).lower())
+        for _ in range(rng.randint(0, 3)):
+            op, pos = rng.random(), rng.randrange(len(word) + 1)
+            if op < 0.33 and pos < len(word):
+                del word[pos]
+            elif op < 0.66:
+                word.insert(pos, rng.choice(alphabet))
+            elif pos < len(word):
+                word[pos] = rng.choice(alphabet)
+        queries.append("".join(word))
+
+    for query in queries:
+        got = index.lookup(query)
+        assert len(got) == len(set(got))
+        expected = _reference(NOTES, query)
+        if query.strip().lower() in {n.lower() for n in NOTES}:
+            # 완전 일치는 표기 하나만 반환
+            assert len(got) == 1 and got[0] in expected
+        else:
+            assert set(got) == expected, query
+
+
+def test_exact_and_short_queries():
+    index = NoteSpellingIndex(NOTES)
+    assert index.lookup("tea") == ["Tea"]
+    assert index.lookup("te") == []
+    assert index.lookup("Tonka bean") == ["Tonka Bean"]
+    assert sorted(index.lookup("musk ")) == ["Musk"]
+    assert len(index) == len({n.lower() for n in NOTES})
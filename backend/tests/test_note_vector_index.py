@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.note_vector_index import NoteVectorIndex
+
+
+def test_top_k_matches_cosine_order():
+    rng = np.random.default_rng(4)
+    vectors = rng.standard_normal((200, 32)) * rng.uniform(0.1, 5.0, size=(200, 1))
+    notes = [f"note-{i}" for i in range(200)]
+    index = NoteVectorIndex(notes, vectors.tolist())
+
+    for _ in range(20):
+        query = rng.standard_normal(32)
+        cosine = (vectors @ query) / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+        expected = [notes[i] for i in np.argsort(-cosine)[:10]]
+        assert index.top_k(query.tolist(), 10) == expected
+
+
+def test_small_tables_and_empty_queries():
+    index = NoteVectorIndex(["Rose", "Oud"], [[1.0, 0.0], [0.0, 1.0]])
+    assert index.top_k([0.2, 1.0], 10) == ["Oud", "Rose"]
+    assert index.top_k([0.0, 0.0], 10) == []
+    assert NoteVectorIndex([], np.zeros((0, 2))).top_k([1.0, 0.0]) == []
+    with pytest.raises(ValueError):
+        NoteVectorIndex(["Rose"], [[1.0], [2.0]])
+
+
+def test_memo_is_bounded_lru():
+    index = NoteVectorIndex(["Rose"], [[1.0]], memo_size=2)
+    index.memo_put("a", ["Rose"])
+    index.memo_put("b", ["Rose"])
+    assert index.memo_get("a") == ["Rose"]
+    index.memo_put("c", ["Rose"])
+    assert index.memo_get("b") is None
+    assert index.memo_get("a") == ["Rose"] and index.memo_get("c") == ["Rose"]
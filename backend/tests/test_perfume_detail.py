@@ -11,36 +11,23 @@ if str(BACKEND_DIR) not in sys.path:
 
 
 class FakeCursor:
-    def __init__(self, basic_row, note_rows, accord_rows, season_rows, occasion_rows):
-        self.basic_row = basic_row
-        self.note_rows = note_rows
-        self.accord_rows = accord_rows
-        self.season_rows = season_rows
-        self.occasion_rows = occasion_rows
-        self.step = 0
+    def __init__(self, profile_row):
+        self.profile_row = profile_row
+        self.queries = []
 
     def __enter__(self):
-        return se
+        return self
+
     def __exit__(self, exc_type, exc, tb):
         return False
 
-    def execute(self, *args, **kwargs):
-        self.step += 1
+    def execute(self, sql, *args, **kwargs):
+        self.queries.append(sql)
 
     def fetchone(self):
-        if self.step == 1:
-            return self.basic_row
-        return None
+        return self.profile_row
 
     def fetchall(self):
-        if self.step == 2:
-            return self.note_rows
-        if self.step == 3:
-            return self.accord_rows
-        if self.step == 4:
-            return self.season_rows
-        if self.step == 5:
-            return self.occasion_rows
         return []
 
 
@@ -73,7 +60,7 @@ def make_client(monkeypatch, cursor):
 
 def test_perfume_detail_success(monkeypatch):
     cursor = FakeCursor(
-        basic_row={
+        profile_row={
             "perfume_id": 123,
             "perfume_name": "Chelsea Flowers",
             "perfume_brand": "Bond No. 9",
@@ -81,22 +68,16 @@ def test_perfume_detail_success(monkeypatch):
             "concentration": "Eau de Parfum",
             "perfumer": "Laurent Le Guernec",
             "img_link": "https://example.com/chelsea.jpg",
+            "top_note_list": ["Bergamot"],
+            "middle_note_list": ["Rose"],
+            "base_note_list": ["Musk"],
+            "accord_ratios": [
+                {"name": "Fresh", "ratio": 30},
+                {"name": "Floral", "ratio": 0.6},
+            ],
+            "season_ratios": [{"name": "Spring", "ratio": 0.7}],
+            "occasion_ratios": None,
         },
-        note_rows=[
-            {"note": "Bergamot", "type": "TOP"},
-            {"note": "Rose", "type": "MIDDLE"},
-            {"note": "Musk", "type": "BASE"},
-        ],
-        accord_rows=[
-            {"accord": "Floral", "ratio": 0.6},
-            {"accord": "Fresh", "ratio": 30},
-        ],
-        season_rows=[
-            {"season": "Spring", "ratio": 0.7},
-        ],
-        occasion_rows=[
-            {"occasion": "Daily", "ratio": 0.4},
-        ],
     )
     client = make_client(monkeypatch, cursor)
 
@@ -108,16 +89,18 @@ def test_perfume_detail_success(monkeypatch):
     assert data["notes"]["top"] == ["Bergamot"]
     assert data["notes"]["middle"] == ["Rose"]
     assert data["notes"]["base"] == ["Musk"]
+    assert data["accords"] == [
+        {"name": "Fresh", "ratio": 30},
+        {"name": "Floral", "ratio": 60},
+    ]
+    assert data["occasions"] == []
+    # 프로필 읽기 모델 한 번만 조회
+    assert len(cursor.queries) == 1
+    assert "MV_PERFUME_PROFILE" in cursor.queries[0]
 
 
 def test_perfume_detail_not_found(monkeypatch):
-    cursor = FakeCursor(
-        basic_row=None,
-        note_rows=[],
-        accord_rows=[],
-        season_rows=[],
-        occasion_rows=[],
-    )
+    cursor = FakeCursor(profile_row=None)
     client = make_client(monkeypatch, cursor)
 
     response = client.get("/perfumes/detail", params={"perfume_id": 999999})
@@ -125,13 +108,7 @@ def test_perfume_detail_not_found(monkeypatch):
 
 
 def test_perfume_detail_invalid_param(monkeypatch):
-    cursor = FakeCursor(
-        basic_row=None,
-        note_rows=[],
-        accord_rows=[],
-        season_rows=[],
-        occasion_rows=[],
-    )
+    cursor = FakeCursor(profile_row=None)
     client = make_client(monkeypatch, cursor)
 
     response = client.get("/perfumes/detail", params={"perfume_id": "abc"})
@@ -40,7 +40,7 @@ async def test_recommendation_deduplication():
     }
 
     # 2. Mock Dependencies
-    with patch("backend.agent.graph.get_personalization_summary", return_value={}), \
+    with patch("backend.agent.graph.get_personalization_summary_async", new=AsyncMock(return_value={})), \
          patch("backend.agent.graph.SMART_LLM") as mock_smart_llm, \
          patch("backend.agent.graph.smart_search_with_retry_async") as mock_search, \
          patch("backend.agent.graph.save_recommendation_log"):
@@ -104,7 +104,7 @@ async def test_personalization_injection():
         "disliked_perfumes": [disliked_item]
     }
 
-    with patch("backend.agent.graph.get_personalization_summary", return_value=mock_personalization_data) as mock_get_pers, \
+    with patch("backend.agent.graph.get_personalization_summary_async", new=AsyncMock(return_value=mock_personalization_data)) as mock_get_pers, \
          patch("backend.agent.graph.SMART_LLM") as mock_smart_llm, \
          patch("backend.agent.graph.smart_search_with_retry_async") as mock_search, \
          patch("backend.agent.graph.SUPER_SMART_LLM") as mock_super_llm, \
@@ -132,7 +132,7 @@ async def test_personalization_injection():
         await parallel_reco_node(state)
 
         # 3. Verify get_personalization_summary called
-        mock_get_pers.assert_called_with(999)
+        mock_get_pers.assert_awaited_with(999)
 
         # 4. Verify Disliked ID in exclude_ids
         call_args = mock_search.call_args
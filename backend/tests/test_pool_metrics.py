@@ -0,0 +1,109 @@
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from psycopg2 import extensions, pool
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent import pool_metrics
+from agent.pool_metrics import InstrumentedConnectionPool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.info = SimpleNamespace(transaction_status=extensions.TRANSACTION_STATUS_IDLE)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeThreadedPool(pool.ThreadedConnectionPool):
+    def _connect(self, key=None):
+        conn = FakeConnection()
+        if key is not None:
+            self._used[key] = conn
+            self._rused[id(conn)] = key
+        else:
+            self._pool.append(conn)
+        return conn
+
+
+def make_pool(minconn, maxconn, name):
+    return InstrumentedConnectionPool(FakeThreadedPool(minconn, maxconn), name)
+
+
+def get_db_connection(p):
+    return p.getconn()
+
+
+def checkout_from_handler(p):
+    return get_db_connection(p)
+
+
+def test_checkout_and_hold_are_recorded():
+    p = make_pool(1, 3, "test_hold")
+    conn = checkout_from_handler(p)
+    stats = p.snapshot()
+    assert stats["in_use"] == 1 and stats["idle"] == 0
+    assert stats["wait"]["count"] == 1
+
+    time.sleep(0.01)
+    p.putconn(conn)
+    stats = p.snapshot()
+    assert stats["in_use"] == 0 and stats["idle"] == 1
+    assert stats["hold"]["count"] == 1 and stats["hold"]["max_ms"] >= 10
+    assert pool_metrics.pool_metrics()["test_hold"]["hold"]["count"] == 1
+
+
+def test_long_held_reports_acquiring_site(capsys):
+    p = make_pool(1, 2, "test_leak")
+    p.hold_warn_seconds = 0.01
+    conn = checkout_from_handler(p)
+    time.sleep(0.02)
+
+    held = p.snapshot()["long_held"]
+    assert len(held) == 1
+    # get_*_connection 래퍼는 건너뛰고 실제 호출 위치를 보고, 스택은 기본적으로 수집/노출하지 않음
+    assert "checkout_from_handler" in held[0]["site"]
+    assert "stack" not in held[0]
+    assert "stack" not in p.snapshot(include_stacks=True)["long_held"][0]
+
+    p.putconn(conn)
+    assert p.snapshot()["long_holds"] == 1
+    assert "checkout_from_handler" in capsys.readouterr().out
+
+
+def test_full_stack_is_opt_in():
+    p = make_pool(1, 2, "test_stack")
+    p.hold_warn_seconds = 0
+    p.track_stacks = True
+    conn = checkout_from_handler(p)
+
+    assert "stack" not in p.snapshot()["long_held"][0]
+    stack = p.snapshot(include_stacks=True)["long_held"][0]["stack"]
+    assert any("checkout_from_handler" in line for line in stack)
+    assert not any("get_db_connection" in line for line in stack)
+    p.putconn(conn)
+
+
+def test_exhaustion_is_counted_and_reraised(capsys):
+    p = make_pool(1, 2, "test_exhaust")
+    first = checkout_from_handler(p)
+    second = checkout_from_handler(p)
+    with pytest.raises(pool.PoolError):
+        checkout_from_handler(p)
+
+    stats = p.snapshot()
+    assert stats["exhausted"] == 1 and stats["in_use"] == 2
+    assert "checkout_from_handler" in capsys.readouterr().out
+
+    p.putconn(first)
+    p.putconn(second)
+    assert p.snapshot()["in_use"] == 0
@@ -0,0 +1,91 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.popularity import PopularityEvent, PopularityScores
+
+HALF_LIFE = timedelta(hours=72)
+T0 = datetime(2026, 3, 1, 9, 0, 0)
+EVENTS = [
+    (1, T0 - timedelta(days=6), 1.0),
+    (2, T0 - timedelta(days=1), 1.0),
+    (1, T0 - timedelta(hours=3), 3.0),
+    (3, T0 + timedelta(hours=5), 1.0),
+    (2, T0 + timedelta(days=2), 3.0),
+    (1, T0 + timedelta(days=4), 1.0),
+]
+
+
+def _events(events):
+    return [PopularityEvent(i, pid, event_dt, weight) for i, (pid, event_dt, weight) in enumerate(EVENTS) if (pid, event_dt, weight) in events]
+
+
+def _full(events, now):
+    """전체 재계산 기준: Σ weight * 0.5 ** (경과 / 반감기)"""
+    scores = {}
+    for pid, event_dt, weight in events:
+        if event_dt <= now:
+            scores[pid] = scores.get(pid, 0.0) + weight * 0.5 ** ((now - event_dt) / HALF_LIFE)
+    return scores
+
+
+def test_incremental_decay_matches_full_recompute():
+    scores = PopularityScores(HALF_LIFE)
+    scores.load({}, {}, _full(EVENTS, T0), T0)
+
+    # 두 번에 나눠 새 이벤트만 반영
+    now = T0 + timedelta(days=2, hours=1)
+    touched = scores.add_events(_events([e for e in EVENTS if T0 < e[1] <= now]), now)
+    assert touched == [2, 3]
+    now = T0 + timedelta(days=5)
+    scores.add_events(_events([e for e in EVENTS if e[1] > T0 + timedelta(days=2, hours=1)]), now)
+
+    expected = _full(EVENTS, now)
+    assert scores.trending.keys() == expected.keys()
+    for pid, score in expected.items():
+        assert scores.trending[pid] == pytest.approx(score)
+    later = now + HALF_LIFE
+    assert scores.trending_score(1, later) == pytest.approx(expected[1] / 2)
+
+
+def test_overlap_window_picks_up_late_commits_once():
+    overlap = timedelta(minutes=10)
+    scores = PopularityScores(HALF_LIFE, overlap)
+    # 전체 재계산에 포함된 overlap 구간 이벤트(recom 10)는 다시 더하지 않음
+    recom_10 = PopularityEvent(("recom", 10), 1, T0 - timedelta(minutes=2), 1.0)
+    scores.load({}, {7: 2}, {1: 1.0}, T0, recent_events=[recom_10])
+    assert scores.events_since() == T0 - overlap
+
+    # 더 큰 ID(12)를 읽은 뒤에 커밋된 ID 11, 워터마크와 같은 시각에 늦게 커밋된 아카이브
+    now = T0 + timedelta(minutes=5)
+    recom_12 = PopularityEvent(("recom", 12), 2, T0 + timedelta(minutes=1), 1.0)
+    assert scores.add_events([recom_10, recom_12], now) == [2]
+    recom_11 = PopularityEvent(("recom", 11), 2, T0 + timedelta(minutes=1), 1.0)
+    archive = PopularityEvent(("archive", 5, 8, T0), 8, T0, 3.0, archived=True)
+    later = now + timedelta(minutes=5)
+    assert scores.add_events([recom_10, recom_12, recom_11, archive], later) == [2, 8]
+    # 다음 조회 구간(later - overlap 이후)에 다시 읽히는 이벤트도 한 번만 반영
+    assert scores.events_since() == later - overlap
+    assert scores.add_events([recom_12, recom_11], later) == []
+
+    assert scores.archives == {7: 2, 8: 1}
+    assert scores.trending[2] == pytest.approx(2 * 0.5 ** ((later - recom_12.event_dt) / HALF_LIFE))
+    assert scores.rows([8])[0][:3] == (8, 0, 1)
+
+
+def test_rank_by_votes():
+    scores = PopularityScores(HALF_LIFE)
+    scores.load({1: 50, 2: 900, 3: 50}, {}, {}, T0)
+
+    # 투표 정보가 없는 향수(9)는 뒤로, 같은 점수는 입력 순서 유지
+    assert scores.rank_by_votes([9, 3, 1, 2]) == [2, 3, 1, 9]
+    assert scores.rank_by_votes([9, 3, 1, 2], limit=2) == [2, 3]
+    assert scores.vote_map([1, 9]) == {1: 50}
+
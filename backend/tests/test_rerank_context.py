@@ -0,0 +1,65 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.rerank_context import RerankContext, current_rerank_context, use_rerank_context
+
+
+@pytest.mark.asyncio
+async def test_repeated_and_concurrent_queries_prepare_once():
+    calls = []
+
+    async def prepare(text):
+        calls.append(text)
+        await asyncio.sleep(0.02)
+        return [float(len(text))]
+
+    context = RerankContext()
+    results = await asyncio.gather(*[context.query_vector("우디한 저녁 향", prepare) for _ in range(4)])
+    again = await context.query_vector("우디한 저녁 향", prepare)
+    other = await context.query_vector("상큼한 여름 향", prepare)
+
+    assert calls == ["우디한 저녁 향", "상큼한 여름 향"]
+    assert results == [[8.0]] * 4 and again == [8.0] and other == [8.0]
+    assert (context.hits, context.misses) == (4, 2)
+
+
+@pytest.mark.asyncio
+async def test_failures_and_empty_vectors_are_not_memoized():
+    outcomes = [RuntimeError("llm down"), [], [1.0]]
+
+    async def prepare(text):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    context = RerankContext()
+    with pytest.raises(RuntimeError):
+        await context.query_vector("q", prepare)
+    assert await context.query_vector("q", prepare) == []
+    assert await context.query_vector("q", prepare) == [1.0]
+    assert await context.query_vector("q", prepare) == [1.0]
+    assert outcomes == []
+
+
+@pytest.mark.asyncio
+async def test_bound_context_is_inherited_by_child_tasks_only():
+    context = RerankContext()
+
+    async def strategy():
+        use_rerank_context(context)
+        return await asyncio.create_task(_current())
+
+    async def _current():
+        return current_rerank_context()
+
+    assert await asyncio.create_task(strategy()) is context
+    assert current_rerank_context() is None
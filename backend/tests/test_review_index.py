@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.review_index import ReviewEmbeddingIndex, group_review_rows
+
+DIM = 64
+
+
+def _reviews(rng, count, start_id, center):
+    out = []
+    for i in range(count):
+        vector = center + 0.3 * rng.standard_normal(DIM)
+        out.append((start_id + i, f"review-{start_id + i}", vector.tolist()))
+    return out
+
+
+def _catalog(seed=1, perfumes=30):
+    rng = np.random.default_rng(seed)
+    centers = {pid: rng.standard_normal(DIM) for pid in range(1, perfumes + 1)}
+    reviews = {}
+    next_id = 1
+    for pid, center in centers.items():
+        reviews[pid] = _reviews(rng, int(rng.integers(1, 8)), next_id, center)
+        next_id += len(reviews[pid])
+    return centers, reviews
+
+
+def _expected(reviews, query):
+    matrix = np.asarray([v for _, _, v in reviews], dtype=np.float64)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    centroid = matrix.mean(axis=0)
+    centroid /= np.linalg.norm(centroid)
+    return float(centroid @ (query / np.linalg.norm(query)))
+
+
+def test_int8_scores_track_float_centroid_similarity():
+    centers, reviews = _catalog()
+    exact = ReviewEmbeddingIndex(quantize="float32")
+    compact = ReviewEmbeddingIndex(quantize="int8")
+    rows = [(pid, rid, text, vec) for pid in sorted(reviews) for rid, text, vec in reviews[pid]]
+    exact.load(group_review_rows(rows))
+    compact.load(group_review_rows(rows))
+
+    assert len(exact) == len(compact) == 30
+    assert compact.max_review_id == max(r[0] for rs in reviews.values() for r in rs)
+    assert compact._entries[1].centroid.dtype == np.int8
+
+    query = centers[7] + 0.1 * np.random.default_rng(2).standard_normal(DIM)
+    ids = list(range(1, 31)) + [999]
+    f32 = exact.score(query, ids)
+    i8 = compact.score(query, ids)
+    assert 999 not in f32
+    for pid in range(1, 31):
+        assert abs(f32[pid][0] - _expected(reviews[pid], query)) < 1e-5
+        assert abs(i8[pid][0] - f32[pid][0]) < 0.02
+    assert max(i8, key=lambda pid: i8[pid][0]) == 7
+    assert f32[7][1] in {text for _, text, _ in reviews[7]}
+
+
+def test_best_review_is_the_representative_closest_to_query():
+    index = ReviewEmbeddingIndex(representatives=2, quantize="float32")
+    a, b = np.eye(DIM)[0], np.eye(DIM)[1]
+    index.upsert(5, [(1, "floral", (a + 0.1 * b).tolist()), (2, "woody", (b + 0.1 * a).tolist())])
+    assert index.score(b.tolist(), [5])[5][1] == "woody"
+    assert index.score(a.tolist(), [5])[5][1] == "floral"
+
+
+def test_upsert_replaces_and_removes_perfumes():
+    index = ReviewEmbeddingIndex(quantize="int8")
+    index.upsert(1, [(10, "old", [1.0] + [0.0] * (DIM - 1))])
+    index.upsert(1, [(10, "old", [1.0] + [0.0] * (DIM - 1)), (11, "new", [0.0, 1.0] + [0.0] * (DIM - 2))])
+    assert index._entries[1].review_count == 2
+    assert index.max_review_id == 11
+    index.upsert(1, [])
+    assert 1 not in index
+    assert index.score([1.0] * DIM, [1]) == {}
+
+
+def test_group_review_rows():
+    rows = [(1, 1, "a", [1.0]), (1, 2, "b", [1.0]), (3, 5, "c", [1.0])]
+    assert [(pid, [r[0] for r in rs]) for pid, rs in group_review_rows(rows)] == [(1, [1, 2]), (3, [5])]
@@ -0,0 +1,94 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agent.snapshot_cache import VersionedSnapshotCache
+
+
+class CountingLoader:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.fail = False
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("db down")
+        return f"v{self.calls}"
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_ttl_hit_and_invalidation_bump_version():
+    loader = CountingLoader()
+    cache = VersionedSnapshotCache(loader, ttl_seconds=60)
+
+    assert cache.get() == "v1"
+    assert cache.get() == "v1"
+    assert loader.calls == 1 and cache.version == 1
+
+    cache.invalidate()
+    assert cache.get() == "v2"
+    assert cache.version == 2
+
+
+def test_stale_reads_refresh_once_in_background():
+    loader = CountingLoader(delay=0.1)
+    cache = VersionedSnapshotCache(loader, ttl_seconds=0.05, max_stale_seconds=60)
+    assert cache.get() == "v1"
+    time.sleep(0.06)
+
+    # 만료 후에도 기다리지 않고 기존 값을 반환, 갱신은 한 번만
+    started = time.perf_counter()
+    assert [cache.get() for _ in range(5)] == ["v1"] * 5
+    assert time.perf_counter() - started < 0.05
+    assert _wait_for(lambda: cache.version == 2)
+    assert loader.calls == 2
+    assert cache.get() == "v2"
+
+
+def test_cold_loads_are_single_flight():
+    loader = CountingLoader(delay=0.1)
+    cache = VersionedSnapshotCache(loader, ttl_seconds=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["v1"] * 8
+    assert loader.calls == 1
+
+
+def test_failures_are_not_cached_and_keep_last_snapshot():
+    loader = CountingLoader()
+    loader.fail = True
+    cache = VersionedSnapshotCache(loader, ttl_seconds=60)
+    with pytest.raises(RuntimeError):
+        cache.get()
+
+    loader.fail = False
+    assert cache.get() == "v2"
+
+    loader.fail = True
+    cache.invalidate()
+    assert cache.get() == "v2"
+    loader.fail = False
+    assert cache.get() == "v4"
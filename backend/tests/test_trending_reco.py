@@ -91,3 +91,30 @@ async def test_rerank_perfumes_default_fallback():
         assert len(result) == 1
         # It should have used semantic scoring (0.9)
         assert result[0]["review_score"] == 0.9
+
+
+@pytest.mark.asyncio
+async def test_rerank_perfumes_popular_uses_precomputed_votes():
+    """
+    Precomputed popularity map gives the same vote-total order as the SQL
+    fallback, without touching the DB.
+    """
+    from datetime import datetime, timedelta
+    from backend.agent.popularity import PopularityScores
+
+    candidates = [
+        {"id": 1, "name": "Perfume A"},
+        {"id": 2, "name": "Perfume B"},
+        {"id": 3, "name": "Perfume C"},
+    ]
+    scores = PopularityScores(timedelta(hours=72))
+    # 트렌딩 점수(추천 이력)는 POPULAR 순서에 영향 없음
+    scores.load({1: 10, 2: 50, 3: 5}, {}, {3: 100.0, 1: 1.0}, datetime(2026, 3, 1))
+
+    with patch("backend.agent.database._popularity", scores), \
+         patch("backend.agent.database.get_db_connection") as mock_conn:
+        result = await rerank_perfumes_async(candidates, query_text="dummy", top_k=3, rank_mode="POPULAR")
+
+    mock_conn.assert_not_called()
+    assert [p["id"] for p in result] == [2, 1, 3]
+    assert "인기도(Vote): 50" in result[0]["best_review"]
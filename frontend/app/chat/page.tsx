@@ -12,6 +12,30 @@ import { SavedPerfumesProvider } from "../../contexts/SavedPerfumesContext";
 import PageLayout from "@/components/common/PageLayout";
 
 const API_URL = "/api/chat";
+// 대화방 선택 시 최근 메시지만 받고, 이전 메시지는 위로 스크롤하거나 "이전 대화 불러오기"로 이어 받음
+const HISTORY_PAGE_SIZE = 50;
+
+type HistoryPage = {
+    messages: { role: "user" | "assistant"; text: string }[];
+    has_more: boolean;
+    next_cursor: string | null;
+};
+
+const fetchHistoryPage = async (id: string, before: string | null): Promise<HistoryPage> => {
+    const query = before
+        ? `?limit=${HISTORY_PAGE_SIZE}&before=${encodeURIComponent(before)}`
+        : `?limit=${HISTORY_PAGE_SIZE}`;
+    const response = await fetch(`/api/chat/history/${id}${query}`);
+    if (!response.ok) throw new Error("내역 로드 실패");
+    return response.json();
+};
+
+const toMessages = (page: HistoryPage): Message[] =>
+    page.messages.map((m) => ({
+        role: m.role,
+        text: m.text,
+        isStreaming: false
+    }));
 
 type ProfileResponse = {
     nickname?: string | null;
@@ -58,6 +82,14 @@ export default function ChatPage() {
     const [displayName, setDisplayName] = useState("Guest");
     const messagesEndRef = useRef<HTMLDivElement>(null);
     const inputRef = useRef<HTMLTextAreaElement>(null);
+    // 이전 페이지 커서 (null이면 더 불러올 메시지 없음)
+    const [historyCursor, setHistoryCursor] = useState<string | null>(null);
+    const [loadingEarlier, setLoadingEarlier] = useState(false);
+    const activeThreadRef = useRef("");
+    // 스크롤 이벤트가 연달아 와도 같은 페이지를 한 번만 요청
+    const loadingEarlierRef = useRef(false);
+    // 이전 메시지를 앞에 붙일 때 보던 위치를 유지하기 위한 직전 scrollHeight
+    const prependScrollHeightRef = useRef<number | null>(null);
 
     // localAuth 제거: 세션 기반으로만 사용자 상태 관리
 
@@ -80,6 +112,7 @@ export default function ChatPage() {
         // Always start a new session on visit (per requirements)
         const newId = crypto.randomUUID();
         localStorage.setItem("chat_thread_id", newId);
+        activeThreadRef.current = newId;
         setThreadId(newId);
         setMessages([]);
 
@@ -164,6 +197,11 @@ export default function ChatPage() {
         const { scrollTop, scrollHeight, clientHeight } = chatContainerRef.current;
         const isAtBottom = scrollHeight - scrollTop - clientHeight <= 30; // 30px Threshold
 
+        // 맨 위 근처까지 올리면 이전 메시지 이어 받기
+        if (scrollTop <= 80 && historyCursor) {
+            loadEarlierMessages();
+        }
+
         // Only update state if it changes to prevent re-renders
         if (isAtBottom && isUserScrolledUp) {
             setIsUserScrolledUp(false);
@@ -185,6 +223,16 @@ export default function ChatPage() {
         const lastMsg = messages[messages.length - 1];
         if (!lastMsg) return;
 
+        // 이전 메시지를 앞에 붙인 경우: 맨 아래로 내리지 않고 보던 위치 유지
+        if (prependScrollHeightRef.current !== null) {
+            const container = chatContainerRef.current;
+            if (container) {
+                container.scrollTop += container.scrollHeight - prependScrollHeightRef.current;
+            }
+            prependScrollHeightRef.current = null;
+            return;
+        }
+
         const isUserMsg = lastMsg.role === 'user';
 
         if (isUserMsg) {
@@ -220,8 +268,10 @@ export default function ChatPage() {
         if (loading) return;
         const newId = crypto.randomUUID();
         localStorage.setItem("chat_thread_id", newId);
+        activeThreadRef.current = newId;
         setThreadId(newId);
         setMessages([]);
+        setHistoryCursor(null);
         setInputValue("");
         setError("");
     };
@@ -233,19 +283,16 @@ export default function ChatPage() {
         setThreadId(id);
         localStorage.setItem("chat_thread_id", id); // 로컬 스토리지 갱신
 
+        activeThreadRef.current = id;
+        setHistoryCursor(null);
+
         try {
-            const response = await fetch(`/api/chat/history/${id}`);
-            if (!response.ok) throw new Error("내역 로드 실패");
-
-            const data = await response.json();
-            // 백엔드 필드명(text)을 프론트엔드 필드명(text)에 맞춰 매핑
-            const formattedMessages = data.messages.map((m: any) => ({
-                role: m.role,
-                text: m.text,
-                isStreaming: false
-            }));
-
-            setMessages(formattedMessages);
+            // 최근 페이지만 받고, 이전 메시지는 필요할 때 next_cursor로 이어 받음
+            const page = await fetchHistoryPage(id, null);
+            if (activeThreadRef.current !== id) return;
+
+            setMessages(toMessages(page));
+            setHistoryCursor(page.has_more ? page.next_cursor : null);
             // setIsSidebarOpen(false); // [수정] 리스트 선택 시 사이드바 자동 닫힘 방지 (사용자 요청)
         } catch (err) {
             console.error(err);
@@ -255,6 +302,30 @@ export default function ChatPage() {
         }
     };
 
+    const loadEarlierMessages = async () => {
+        const id = threadId;
+        const cursor = historyCursor;
+        if (!id || !cursor || loadingEarlierRef.current) return;
+
+        loadingEarlierRef.current = true;
+        setLoadingEarlier(true);
+        try {
+            const page = await fetchHistoryPage(id, cursor);
+            // 그 사이 다른 대화방으로 옮겼으면 버림
+            if (activeThreadRef.current !== id) return;
+
+            prependScrollHeightRef.current = chatContainerRef.current?.scrollHeight ?? null;
+            setMessages((prev) => [...toMessages(page), ...prev]);
+            setHistoryCursor(page.has_more ? page.next_cursor : null);
+        } catch (err) {
+            console.error(err);
+            setError("이전 대화를 불러오는데 실패했습니다.");
+        } finally {
+            loadingEarlierRef.current = false;
+            setLoadingEarlier(false);
+        }
+    };
+
     const handleSubmit = async (event: FormEvent<HTMLFormElement>) => {
         event.preventDefault();
         const trimmed = inputValue.trim();
@@ -439,6 +510,18 @@ export default function ChatPage() {
                             className="flex-1 overflow-y-auto pt-5 pb-3 custom-scrollbar overscroll-behavior-contain touch-pan-y"
                         >
                             <div className={`w-full max-w-5xl mx-auto px-4 ${messages.length === 0 ? "h-full" : ""}`}>
+                                {historyCursor && (
+                                    <div className="flex justify-center pb-4">
+                                        <button
+                                            type="button"
+                                            onClick={loadEarlierMessages}
+                                            disabled={loadingEarlier}
+                                            className="text-xs font-medium text-[#8A8A8A] px-4 py-2 rounded-full border border-[#E5E4DE] bg-white hover:bg-[#F5F3EE] transition-colors disabled:opacity-50"
+                                        >
+                                            {loadingEarlier ? "불러오는 중..." : "이전 대화 불러오기"}
+                                        </button>
+                                    </div>
+                                )}
                                 <ChatList
                                     messages={messages}
                                     loading={loading}
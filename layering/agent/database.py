@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import bisect
+import itertools
 import logging
+import math
 import os
 import re
+from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Optional
 
+import numpy as np
 import psycopg2
 from dotenv import load_dotenv
 from psycopg2.extras import RealDictCursor
@@ -27,6 +32,13 @@ try:  # pragma: no cover - optional dependency
 except ImportError:  # pragma: no cover
     Levenshtein = None
 
+try:  # pragma: no cover - optional dependency (installed with Levenshtein)
+    from rapidfuzz import process as fuzz_process  # type: ignore[import-not-found]
+    from rapidfuzz.distance import Indel  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    fuzz_process = None
+    Indel = None
+
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -44,6 +56,9 @@ RECOM_DB_CONFIG: Dict[str, Any] = {
     "dbname": os.getenv("RECOM_DB_NAME", "recom_db"),
 }
 
+# 저장소 인스턴스/reload를 가로질러 유일한 데이터 버전을 부여하기 위함
+_REPOSITORY_VERSIONS = itertools.count(1)
+
 def get_db_connection(
     db_config: Optional[Dict[str, Any]] = None,
 ) -> PGConnection:
@@ -272,6 +287,164 @@ def _persistence_score(vector: List[float]) -> float:
     return numerator / denominator if denominator else 0.0
 
 
+def accord_bitmask(accords: Iterable[str]) -> int:
+    mask = 0
+    for accord in accords:
+        index = ACCORD_INDEX.get(accord)
+        if index is not None:
+            mask |= 1 << index
+    return mask
+
+
+@dataclass(frozen=True)
+class PerfumeMatrix:
+    """Column-aligned catalog arrays used by the batched scoring path.
+
+    Row ``i`` of every array describes ``perfume_ids[i]``; rows follow the
+    repository iteration order so ties resolve exactly like the per-pair loop.
+    """
+
+    perfume_ids: List[str]
+    row_index: Dict[str, int]
+    vectors: np.ndarray
+    total_intensity: np.ndarray
+    persistence_score: np.ndarray
+    dominant_mask: np.ndarray
+    note_ids: np.ndarray
+    note_offsets: np.ndarray
+    note_vocab: Dict[str, int]
+
+    @property
+    def size(self) -> int:
+        return len(self.perfume_ids)
+
+
+def _build_perfume_matrix(vectors: Dict[str, schemas.PerfumeVector]) -> PerfumeMatrix:
+    perfume_ids = list(vectors.keys())
+    size = len(perfume_ids)
+    matrix = np.zeros((size, len(ACCORDS)), dtype=np.float32)
+    total_intensity = np.zeros(size, dtype=np.float32)
+    persistence_score = np.zeros(size, dtype=np.float32)
+    dominant_mask = np.zeros(size, dtype=np.uint32)
+    note_offsets = np.zeros(size + 1, dtype=np.int64)
+    note_vocab: Dict[str, int] = {}
+    flat_notes: List[int] = []
+
+    for row, perfume_id in enumerate(perfume_ids):
+        perfume = vectors[perfume_id]
+        matrix[row] = perfume.vector
+        total_intensity[row] = perfume.total_intensity
+        persistence_score[row] = perfume.persistence_score
+        dominant_mask[row] = accord_bitmask(perfume.dominant_accords)
+        # _harmony_score와 같은 기준(strip + lower, 중복 제거)으로 노트 집합을 만든다
+        normalized_notes = {note.strip().lower() for note in perfume.base_notes if note}
+        row_ids = sorted(
+            note_vocab.setdefault(note, len(note_vocab)) for note in normalized_notes
+        )
+        flat_notes.extend(row_ids)
+        note_offsets[row + 1] = len(flat_notes)
+
+    return PerfumeMatrix(
+        perfume_ids=perfume_ids,
+        row_index={perfume_id: row for row, perfume_id in enumerate(perfume_ids)},
+        vectors=np.ascontiguousarray(matrix),
+        total_intensity=total_intensity,
+        persistence_score=persistence_score,
+        dominant_mask=dominant_mask,
+        note_ids=np.asarray(flat_notes, dtype=np.int32),
+        note_offsets=note_offsets,
+        note_vocab=note_vocab,
+    )
+
+
+class FuzzyKeyIndex:
+    """Prebuilt lookup structure over normalized name keys.
+
+    Reproduces the per-key scoring of the old linear scan (exact 1.0,
+    substring 0.9, otherwise ``Levenshtein.ratio``) without touching every
+    key: exact and "key inside query" hits are dictionary lookups over the
+    query's substrings, "query inside key" hits come from a character-trigram
+    inverted index, and fuzzy scoring only visits keys whose length can still
+    reach the threshold (the indel ratio is bounded by ``2*min/(len_a+len_b)``).
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys: List[str] = list(keys)
+        self.position: Dict[str, int] = {key: idx for idx, key in enumerate(self.keys)}
+        self.max_key_length = max((len(key) for key in self.keys), default=0)
+        self._by_length = sorted(range(len(self.keys)), key=lambda idx: len(self.keys[idx]))
+        self._sorted_lengths = [len(self.keys[idx]) for idx in self._by_length]
+        self._trigrams: Dict[str, List[int]] = {}
+        for idx, key in enumerate(self.keys):
+            for gram in {key[i : i + 3] for i in range(len(key) - 2)}:
+                self._trigrams.setdefault(gram, []).append(idx)
+
+    def contained_in(self, query: str, min_length: int) -> List[int]:
+        """Keys that occur as a substring of ``query``."""
+
+        hits = set()
+        upper = min(self.max_key_length, len(query))
+        for start in range(len(query)):
+            if query[start] == " ":
+                continue
+            for end in range(start + min_length, min(start + upper, len(query)) + 1):
+                idx = self.position.get(query[start:end])
+                if idx is not None:
+                    hits.add(idx)
+        return list(hits)
+
+    def containing(self, query: str) -> List[int]:
+        """Keys that contain ``query`` (query must be at least 3 characters)."""
+
+        grams = {query[i : i + 3] for i in range(len(query) - 2)}
+        postings = sorted((self._trigrams.get(gram, []) for gram in grams), key=len)
+        if not postings or not postings[0]:
+            return []
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return [idx for idx in candidates if query in self.keys[idx]]
+
+    def similar(self, query: str, min_score: float) -> Dict[int, float]:
+        """Keys whose ``Levenshtein.ratio`` with ``query`` is at least ``min_score``."""
+
+        if Levenshtein is None:
+            return {}
+        length = len(query)
+        if min_score > 0:
+            lower = math.floor(min_score * length / (2 - min_score) - 1e-9)
+            upper = math.ceil(length * (2 - min_score) / min_score + 1e-9)
+            window = self._by_length[
+                bisect.bisect_left(self._sorted_lengths, lower) : bisect.bisect_right(
+                    self._sorted_lengths, upper
+                )
+            ]
+        else:
+            window = self._by_length
+        if not window:
+            return {}
+        if fuzz_process is not None:
+            choices = [self.keys[idx] for idx in window]
+            return {
+                window[pos]: score
+                for _, score, pos in fuzz_process.extract(
+                    query,
+                    choices,
+                    scorer=Indel.normalized_similarity,
+                    score_cutoff=min_score,
+                    limit=None,
+                )
+            }
+        scores: Dict[int, float] = {}
+        for idx in window:
+            score = Levenshtein.ratio(query, self.keys[idx])
+            if score >= min_score:
+                scores[idx] = score
+        return scores
+
+
 class PerfumeRepository:
     """In-memory cache of perfume vectors."""
 
@@ -281,8 +454,22 @@ class PerfumeRepository:
     ):
         self._db_config = db_config
         self._vectors = self._load_vectors()
+        self._matrix = _build_perfume_matrix(self._vectors)
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
         self._name_index = self._build_name_index()
+        self._name_keys = FuzzyKeyIndex(self._name_index.keys())
         self._brand_index = self._build_brand_index()
+        self._brand_keys = FuzzyKeyIndex(self._brand_index.keys())
+        self._brand_aliases = [
+            (normalized_alias, brand)
+            for normalized_alias, brand in (
+                (_normalize_text(alias), brand) for alias, brand in BRAND_ALIAS_MAP.items()
+            )
+            if normalized_alias
+        ]
+        self._version = next(_REPOSITORY_VERSIONS)
 
     def _build_name_index(self) -> Dict[str, List[schemas.PerfumeVector]]:
         index: Dict[str, List[schemas.PerfumeVector]] = {}
@@ -386,8 +573,8 @@ class PerfumeRepository:
 
     def reload(self) -> None:
         self._vectors = self._load_vectors()
-        self._name_index = self._build_name_index()
-        self._brand_index = self._build_brand_index()
+        self._matrix = _build_perfume_matrix(self._vectors)
+        self._build_indexes()
 
     def find_perfume_candidates(
         self,
@@ -401,24 +588,25 @@ class PerfumeRepository:
 
         min_fuzzy_score = min_score if min_score is not None else MATCH_SCORE_THRESHOLD
 
+        # 키별 점수: 정확 일치 1.0 > 부분 문자열 0.9 > Levenshtein.ratio (선형 스캔과 동일한 우선순위)
+        index = self._name_keys
+        key_scores = index.similar(normalized_query, min_fuzzy_score)
+        if len(normalized_query) >= 3:
+            substring_hits = set(index.containing(normalized_query))
+            substring_hits.update(index.contained_in(normalized_query, min_length=3))
+            for idx in substring_hits:
+                key_scores[idx] = 0.9
+        exact = index.position.get(normalized_query)
+        if exact is not None:
+            key_scores[exact] = 1.0
+
         matches: Dict[str, tuple[float, str]] = {}
-        for key, perfumes in self._name_index.items():
-            score = 0.0
-            if normalized_query == key:
-                score = 1.0
-            elif (
-                len(key) >= 3
-                and len(normalized_query) >= 3
-                and (normalized_query in key or key in normalized_query)
-            ):
-                score = 0.9
-            elif Levenshtein is not None:
-                score = Levenshtein.ratio(normalized_query, key)
-            if score < min_fuzzy_score:
+        for idx in sorted(key_scores):
+            score = key_scores[idx]
+            if score < min_fuzzy_score or score <= 0.0:
                 continue
-            if score <= 0.0:
-                continue
-            for perfume in perfumes:
+            key = index.keys[idx]
+            for perfume in self._name_index[key]:
                 current = matches.get(perfume.perfume_id, (0.0, ""))
                 if score > current[0]:
                     matches[perfume.perfume_id] = (score, key)
@@ -440,19 +628,16 @@ class PerfumeRepository:
             return []
 
         matches: Dict[str, int] = {}
-        for alias, brand in BRAND_ALIAS_MAP.items():
-            normalized_alias = _normalize_text(alias)
-            if normalized_alias and normalized_alias in normalized_query:
+        for normalized_alias, brand in self._brand_aliases:
+            if normalized_alias in normalized_query:
                 normalized_brand = _normalize_text(brand)
                 if normalized_brand in self._brand_index:
                     matches[brand] = max(matches.get(brand, 0), len(normalized_alias))
 
-        for normalized_brand, perfumes in self._brand_index.items():
-            if len(normalized_brand) < 2:
-                continue
-            if normalized_brand in normalized_query:
-                brand_name = perfumes[0].perfume_brand
-                matches[brand_name] = max(matches.get(brand_name, 0), len(normalized_brand))
+        for idx in sorted(self._brand_keys.contained_in(normalized_query, min_length=2)):
+            normalized_brand = self._brand_keys.keys[idx]
+            brand_name = self._brand_index[normalized_brand][0].perfume_brand
+            matches[brand_name] = max(matches.get(brand_name, 0), len(normalized_brand))
 
         return [
             brand
@@ -483,6 +668,16 @@ class PerfumeRepository:
     def count(self) -> int:
         return len(self._vectors)
 
+    @property
+    def matrix(self) -> PerfumeMatrix:
+        return self._matrix
+
+    @property
+    def version(self) -> int:
+        """Data version, bumped on every load so derived caches can detect staleness."""
+
+        return self._version
+
 
 def get_perfume_info(perfume_id: str) -> schemas.PerfumeInfo:
     conn = None
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import logging
 import math
 import re
+import threading
 import unicodedata
-from typing import Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
 
 from .constants import (
     ACCORDS,
@@ -14,7 +18,7 @@ from .constants import (
     KEYWORD_MAP,
     KEYWORD_VECTOR_BOOST,
 )
-from .database import PerfumeRepository
+from .database import PerfumeMatrix, PerfumeRepository, accord_bitmask
 from .schemas import (
     DetectedPerfume,
     LayeringCandidate,
@@ -22,11 +26,28 @@ from .schemas import (
     PerfumeVector,
     ScoreBreakdown,
 )
-from .tools_schemas import LayeringComputationResult
+from .tools_schemas import BrandCompatibilityTable, LayeringComputationResult
+
+
+logger = logging.getLogger(__name__)
 
 
 GENERIC_NAME_TOKENS = {"coco"}
 
+CLASH_PAIR_MASKS: Tuple[Tuple[int, int], ...] = tuple(
+    (accord_bitmask(left), accord_bitmask(right)) for left, right in CLASH_PAIRS
+)
+
+# _bridge_bonus는 0.4를 누적 합산하므로 같은 부동소수 값을 내도록 미리 더해 둔다
+_BRIDGE_BONUS_TABLE = np.array(
+    [sum([0.4] * count, 0.0) for count in range(len(ACCORDS) + 1)],
+    dtype=np.float64,
+)
+
+_brand_table: BrandCompatibilityTable | None = None
+_brand_table_lock = threading.Lock()
+_brand_table_building: set[int] = set()
+
 
 def get_target_vector(keywords: Sequence[str]) -> List[float]:
     vector = [0.0] * len(ACCORDS)
@@ -78,6 +99,79 @@ def calculate_advanced_layering(
     )
 
 
+def batch_layering_scores(
+    base: PerfumeVector,
+    matrix: PerfumeMatrix,
+    target_vector: Sequence[float],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Score every catalog row against ``base`` in one pass.
+
+    Mirrors calculate_advanced_layering() component by component and returns
+    ``(total_scores, target_scores, feasible)`` aligned with ``matrix`` rows.
+    """
+    if len(target_vector) != len(base.vector):
+        raise ValueError("Target vector length mismatch")
+    base_vector = np.asarray(base.vector, dtype=np.float64)
+    target = np.asarray(target_vector, dtype=np.float64)
+    vectors = matrix.vectors
+
+    # _clash_penalty
+    base_mask = accord_bitmask(base.dominant_accords)
+    candidate_mask = matrix.dominant_mask
+    clash = np.zeros(matrix.size, dtype=bool)
+    for left_mask, right_mask in CLASH_PAIR_MASKS:
+        if base_mask & left_mask:
+            clash |= (candidate_mask & right_mask) != 0
+        if base_mask & right_mask:
+            clash |= (candidate_mask & left_mask) != 0
+    penalty = np.where(clash, -1.0, 0.0)
+
+    # _harmony_score (Jaccard over normalized base notes)
+    harmony = np.zeros(matrix.size, dtype=np.float64)
+    base_notes = {note.strip().lower() for note in base.base_notes if note}
+    if base_notes:
+        base_note_ids = [
+            matrix.note_vocab[note] for note in base_notes if note in matrix.note_vocab
+        ]
+        hits = np.isin(matrix.note_ids, base_note_ids).astype(np.int64)
+        cumulative = np.concatenate(([0], np.cumsum(hits)))
+        intersection = cumulative[matrix.note_offsets[1:]] - cumulative[matrix.note_offsets[:-1]]
+        candidate_sizes = np.diff(matrix.note_offsets)
+        union = len(base_notes) + candidate_sizes - intersection
+        similarity = np.divide(
+            intersection,
+            union,
+            out=np.zeros(matrix.size, dtype=np.float64),
+            where=(candidate_sizes > 0) & (union > 0),
+        )
+        harmony[(similarity >= 0.4) & (similarity <= 0.7)] = 1.0
+        harmony[similarity > 0.7] = 0.5
+
+    # _bridge_bonus
+    base_band = (base_vector >= 5.0) & (base_vector <= 15.0)
+    candidate_band = (vectors >= 5.0) & (vectors <= 15.0)
+    bridge_counts = np.count_nonzero(candidate_band & base_band, axis=1)
+    bridge = _BRIDGE_BONUS_TABLE[bridge_counts]
+
+    # _target_match_score
+    layered = (base_vector + vectors) / 2
+    distance = np.sqrt(np.sum((target - layered) ** 2, axis=1))
+    target_scores = np.maximum(0.0, 1.5 - (distance / 50.0))
+
+    # _feasibility_guard: 후보와 무관한 base/target 충돌은 한 번만 판정한다
+    if not np.any(target > 0):
+        feasible = np.ones(matrix.size, dtype=bool)
+    else:
+        base_allowed, _ = _feasibility_guard(base.vector, target_vector, 1.0)
+        if base_allowed:
+            feasible = target_scores >= 0.6
+        else:
+            feasible = np.zeros(matrix.size, dtype=bool)
+
+    total_scores = 1.0 + harmony + bridge + penalty + target_scores
+    return total_scores, target_scores, feasible
+
+
 def rank_recommendations(
     base_perfume_id: str,
     keywords: Sequence[str],
@@ -86,19 +180,29 @@ def rank_recommendations(
 ) -> Tuple[List[LayeringCandidate], int]:
     base = repository.get_perfume(base_perfume_id)
     target_vector = get_target_vector(keywords)
+    matrix = repository.matrix
+    total_scores, _, feasible = batch_layering_scores(base, matrix, target_vector)
+    base_row = matrix.row_index.get(base_perfume_id)
+    if base_row is not None:
+        feasible[base_row] = False
+
+    # 응답 점수는 소수 셋째 자리로 반올림되므로 정렬 기준도 동일하게 맞춘다
+    rows = np.flatnonzero(feasible)
+    ordered_rows = rows[np.argsort(-np.round(total_scores[rows], 3), kind="stable")]
+
     candidates: List[LayeringCandidate] = []
-    for candidate in repository.all_candidates(exclude_id=base_perfume_id):
+    total_available = 0
+    for row in ordered_rows:
+        candidate = repository.get_perfume(matrix.perfume_ids[row])
         if input_name_keys and _matches_input_name(candidate, input_name_keys):
             continue
         if _should_exclude_candidate(base, candidate):
             continue
-        result = calculate_advanced_layering(base, candidate, target_vector)
-        if not result.feasible:
-            continue
-        candidates.append(_result_to_candidate(result))
-    candidates.sort(key=lambda item: item.total_score, reverse=True)
-    total_available = len(candidates)
-    return candidates[:3], total_available
+        total_available += 1
+        if len(candidates) < 3:
+            result = calculate_advanced_layering(base, candidate, target_vector)
+            candidates.append(_result_to_candidate(result))
+    return candidates, total_available
 
 
 def rank_worst_match(
@@ -107,19 +211,19 @@ def rank_worst_match(
 ) -> LayeringCandidate | None:
     base = repository.get_perfume(base_perfume_id)
     target_vector: List[float] = [0.0] * len(base.vector)
-    worst_result: LayeringComputationResult | None = None
-    worst_score: float | None = None
-    for candidate in repository.all_candidates(exclude_id=base_perfume_id):
+    matrix = repository.matrix
+    total_scores, target_scores, _ = batch_layering_scores(base, matrix, target_vector)
+    comparison_scores = total_scores - target_scores
+    for row in np.argsort(comparison_scores, kind="stable"):
+        perfume_id = matrix.perfume_ids[row]
+        if perfume_id == base_perfume_id:
+            continue
+        candidate = repository.get_perfume(perfume_id)
         if _should_exclude_candidate(base, candidate):
             continue
         result = calculate_advanced_layering(base, candidate, target_vector)
-        comparison_score = result.total_score - result.score_breakdown.target
-        if worst_score is None or comparison_score < worst_score:
-            worst_result = result
-            worst_score = comparison_score
-    if worst_result is None:
-        return None
-    return _result_to_candidate(worst_result)
+        return _result_to_candidate(result)
+    return None
 
 
 def _strip_diacritics(text: str) -> str:
@@ -389,27 +493,115 @@ def calculate_compatibility_score(
     return score, result.feasible
 
 
+def _compatibility_against_catalog(
+    base: PerfumeVector,
+    matrix: PerfumeMatrix,
+) -> Tuple[float, int]:
+    """Mean calculate_compatibility_score() of ``base`` against every other row."""
+
+    neutral_target = [0.0] * len(base.vector)
+    total_scores, target_scores, feasible = batch_layering_scores(base, matrix, neutral_target)
+    base_row = matrix.row_index.get(base.perfume_id)
+    if base_row is not None:
+        feasible[base_row] = False
+    count = int(np.count_nonzero(feasible))
+    if not count:
+        return 0.0, 0
+    scores = (total_scores - target_scores)[feasible]
+    return float(scores.sum() / count), count
+
+
+def build_brand_compatibility_table(repository: PerfumeRepository) -> BrandCompatibilityTable:
+    """Precompute brand-universal compatibility for the current repository version."""
+
+    version = repository.version
+    matrix = repository.matrix
+    average_scores: Dict[str, float] = {}
+    feasible_counts: Dict[str, int] = {}
+    for perfume_id in matrix.perfume_ids:
+        base = repository.get_perfume(perfume_id)
+        average_scores[perfume_id], feasible_counts[perfume_id] = (
+            _compatibility_against_catalog(base, matrix)
+        )
+    return BrandCompatibilityTable(
+        version=version,
+        average_scores=average_scores,
+        feasible_counts=feasible_counts,
+    )
+
+
+def refresh_brand_compatibility_table(repository: PerfumeRepository) -> None:
+    """Rebuild the shared table unless it already matches the repository version."""
+
+    global _brand_table
+    version = repository.version
+    with _brand_table_lock:
+        if _brand_table is not None and _brand_table.version == version:
+            return
+        if version in _brand_table_building:
+            return
+        _brand_table_building.add(version)
+    try:
+        table = build_brand_compatibility_table(repository)
+        if table.version != repository.version:
+            logger.info("Brand compatibility table discarded (repository reloaded during build)")
+            return
+        with _brand_table_lock:
+            _brand_table = table
+        logger.info(
+            "Brand compatibility table ready (version=%s, perfumes=%s)",
+            table.version,
+            len(table.average_scores),
+        )
+    except Exception:
+        logger.exception("Failed to build brand compatibility table")
+    finally:
+        with _brand_table_lock:
+            _brand_table_building.discard(version)
+
+
+def schedule_brand_compatibility_refresh(repository: PerfumeRepository) -> None:
+    with _brand_table_lock:
+        if _brand_table is not None and _brand_table.version == repository.version:
+            return
+        if repository.version in _brand_table_building:
+            return
+    threading.Thread(
+        target=refresh_brand_compatibility_table,
+        args=(repository,),
+        name="brand-compatibility-refresh",
+        daemon=True,
+    ).start()
+
+
+def get_brand_compatibility_table(
+    repository: PerfumeRepository,
+) -> BrandCompatibilityTable | None:
+    """Return the table for the repository's current version, scheduling a rebuild if stale."""
+
+    table = _brand_table
+    if table is not None and table.version == repository.version:
+        return table
+    schedule_brand_compatibility_refresh(repository)
+    return None
+
+
 def rank_brand_universal_perfume(
     brand_perfumes: Sequence[PerfumeVector],
     repository: PerfumeRepository,
 ) -> Tuple[PerfumeVector | None, float, int, str | None]:
-    all_candidates = list(repository.all_candidates())
+    table = get_brand_compatibility_table(repository)
     best_perfume: PerfumeVector | None = None
     best_score = float("-inf")
     best_count = 0
 
     for base in brand_perfumes:
-        total_score = 0.0
-        count = 0
-        for candidate in all_candidates:
-            if candidate.perfume_id == base.perfume_id:
-                continue
-            score, feasible = calculate_compatibility_score(base, candidate)
-            if not feasible:
-                continue
-            total_score += score
-            count += 1
-        average_score = total_score / count if count else 0.0
+        if table is not None and base.perfume_id in table.average_scores:
+            average_score = table.average_scores[base.perfume_id]
+            count = table.feasible_counts[base.perfume_id]
+        else:
+            # 테이블이 준비되기 전에는 해당 향수만 배치 연산으로 즉시 계산한다
+            average_score, count = _compatibility_against_catalog(base, repository.matrix)
         if best_perfume is None or average_score > best_score:
             best_perfume = base
             best_score = average_score
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -25,3 +25,11 @@ class LayeringComputationResult(BaseModel):
     spray_order: List[str]
     score_breakdown: ScoreBreakdown
     layered_vector: List[float]
+
+
+class BrandCompatibilityTable(BaseModel):
+    """Per-perfume mean compatibility against the catalog for one repository version."""
+
+    version: int
+    average_scores: Dict[str, float]
+    feasible_counts: Dict[str, int]
@@ -40,6 +40,7 @@ try:  # pragma: no cover - fallback for script execution
         _should_exclude_candidate,
         build_input_name_keys,
         rank_recommendations,
+        schedule_brand_compatibility_refresh,
     )
 except ImportError:  # pragma: no cover
     from agent.database import (
@@ -74,6 +75,7 @@ except ImportError:  # pragma: no cover
         _should_exclude_candidate,
         build_input_name_keys,
         rank_recommendations,
+        schedule_brand_compatibility_refresh,
     )
 
 
@@ -122,6 +124,8 @@ def get_repository() -> PerfumeRepository:
     if repository is not None:
         return repository
     repository = PerfumeRepository()
+    # 브랜드 범용 점수 테이블은 요청 경로를 막지 않도록 백그라운드에서 미리 만든다
+    schedule_brand_compatibility_refresh(repository)
     return repository
 
 
@@ -289,3 +289,91 @@ def test_filter_detected_perfumes_keeps_distinct_names():
     )
 
     assert len(filtered) == 2
+
+
+def _linear_perfume_candidates(repo, query, limit=5, min_score=None):
+    """Reference implementation: the original scan over every name key."""
+    import Levenshtein
+
+    from agent.constants import MATCH_SCORE_THRESHOLD
+    from agent.database import _normalize_text
+
+    normalized_query = _normalize_text(query)
+    threshold = min_score if min_score is not None else MATCH_SCORE_THRESHOLD
+    matches = {}
+    for key, perfumes in repo._name_index.items():
+        if normalized_query == key:
+            score = 1.0
+        elif len(key) >= 3 and len(normalized_query) >= 3 and (
+            normalized_query in key or key in normalized_query
+        ):
+            score = 0.9
+        else:
+            score = Levenshtein.ratio(normalized_query, key)
+        if score < threshold or score <= 0.0:
+            continue
+        for perfume in perfumes:
+            if score > matches.get(perfume.perfume_id, (0.0, ""))[0]:
+                matches[perfume.perfume_id] = (score, key)
+    ranked = sorted(matches.items(), key=lambda item: item[1][0], reverse=True)
+    return [(perfume_id, score, key) for perfume_id, (score, key) in ranked[:limit]]
+
+
+def test_fuzzy_name_index_matches_linear_scan(monkeypatch):
+    from agent.database import _vectorize
+    from agent.schemas import PerfumeAccord, PerfumeBasic, PerfumeRecord
+
+    names = [
+        ("Un Jardin Sur Le Nil", "Hermes"),
+        ("Un Jardin Sur Le Toit", "Hermes"),
+        ("Terre d'Hermes", "Hermes"),
+        ("Wood Sage & Sea Salt", "Jo Malone"),
+        ("English Pear & Freesia", "Jo Malone"),
+        ("Sauvage", "Dior"),
+        ("Miss Dior", "Dior"),
+        ("CK One", "Calvin Klein"),
+        ("Chance", "Chanel"),
+        ("Coco Noir", "Chanel"),
+        ("Bleu de Chanel", "Chanel"),
+        ("Another 13", "Le Labo"),
+        ("Santal 33", "Le Labo"),
+        ("블랑쉬", "바이레도"),
+    ]
+    vectors = {}
+    for index, (name, brand) in enumerate(names):
+        record = PerfumeRecord(
+            perfume=PerfumeBasic(perfume_id=f"P{index}", perfume_name=name, perfume_brand=brand),
+            accords=[PerfumeAccord(accord=ACCORDS[index % len(ACCORDS)], ratio=10.0)],
+            base_notes=[],
+        )
+        vectors[record.perfume.perfume_id] = _vectorize(record)
+    monkeypatch.setattr(PerfumeRepository, "_load_vectors", lambda self: vectors)
+    repo = PerfumeRepository()
+
+    queries = [
+        "Un Jardin Sur Le Nil",
+        "un jardin sur le nill",
+        "jardin",
+        "wood sage sea salt 이랑 레이어링",
+        "sauvag",
+        "ck",
+        "coco noire",
+        "Chanel Chance 랑 Santal 33 섞어줘",
+        "블랑쉬",
+        "bleu",
+        "le labo another",
+        "xyz",
+    ]
+    for query in queries:
+        for min_score in (None, 0.6, 0.95):
+            expected = _linear_perfume_candidates(repo, query, limit=6, min_score=min_score)
+            actual = [
+                (perfume.perfume_id, score, key)
+                for perfume, score, key in repo.find_perfume_candidates(
+                    query, limit=6, min_score=min_score
+                )
+            ]
+            assert actual == expected, query
+
+    assert repo.find_brand_candidates("le labo랑 chanel 중에") == ["Le Labo", "Chanel"]
+    assert repo.find_brand_candidates("nothing here") == []
@@ -381,3 +381,107 @@ def test_highest_accord_name_and_analysis_mentions_dominant():
     assert "베이스 공유" in analysis
     assert "어코드 조화" in analysis
     assert "이질감 최소화" in analysis
+
+
+def _synthetic_repository(monkeypatch, size: int = 40) -> PerfumeRepository:
+    import random
+
+    from agent.database import _vectorize
+    from agent.schemas import PerfumeAccord, PerfumeBasic, PerfumeRecord
+
+    rng = random.Random(7)
+    notes = ["Musk", "Amber", "Vanilla", "Cedar", "musk ", "Iris", "Vetiver"]
+    vectors: dict[str, PerfumeVector] = {}
+    for index in range(size):
+        accords = [
+            PerfumeAccord(accord=accord, ratio=rng.choice([0.0, 3.0, 5.0, 9.5, 15.0, 22.0]))
+            for accord in rng.sample(ACCORDS, 6)
+        ]
+        record = PerfumeRecord(
+            perfume=PerfumeBasic(
+                perfume_id=f"P{index}",
+                perfume_name=f"Scent {index}",
+                perfume_brand=f"Brand {index % 5}",
+            ),
+            accords=accords,
+            base_notes=rng.sample(notes, rng.randint(0, 4)),
+        )
+        vectors[record.perfume.perfume_id] = _vectorize(record)
+    monkeypatch.setattr(PerfumeRepository, "_load_vectors", lambda self: vectors)
+    return PerfumeRepository()
+
+
+def test_batch_layering_scores_matches_pairwise(monkeypatch):
+    from agent.tools import batch_layering_scores
+
+    repo = _synthetic_repository(monkeypatch)
+    matrix = repo.matrix
+    assert matrix.vectors.shape == (repo.count, len(ACCORDS))
+    for keywords in ([], ["warm"], ["cool", "sweet"]):
+        target = get_target_vector(keywords)
+        for base in list(repo.all_candidates())[:5]:
+            totals, targets, feasible = batch_layering_scores(base, matrix, target)
+            for row, perfume_id in enumerate(matrix.perfume_ids):
+                expected = calculate_advanced_layering(base, repo.get_perfume(perfume_id), target)
+                assert abs(totals[row] - expected.total_score) < 1e-5
+                assert abs(targets[row] - expected.score_breakdown.target) < 1e-5
+                assert bool(feasible[row]) == expected.feasible
+
+
+def test_rank_recommendations_matches_pairwise_ranking(monkeypatch):
+    repo = _synthetic_repository(monkeypatch)
+    base = next(iter(repo.all_candidates()))
+    target = get_target_vector(["warm"])
+
+    expected = []
+    for candidate in repo.all_candidates(exclude_id=base.perfume_id):
+        if _should_exclude_candidate(base, candidate):
+            continue
+        result = calculate_advanced_layering(base, candidate, target)
+        if result.feasible:
+            expected.append((round(result.total_score, 3), candidate.perfume_id))
+    expected.sort(key=lambda item: item[0], reverse=True)
+
+    recommendations, total = rank_recommendations(base.perfume_id, ["warm"], repo)
+
+    assert total == len(expected)
+    assert [item.perfume_id for item in recommendations] == [pid for _, pid in expected[:3]]
+
+
+def test_brand_compatibility_table_matches_pairwise_average(monkeypatch):
+    from agent.tools import build_brand_compatibility_table
+
+    repo = _synthetic_repository(monkeypatch)
+    table = build_brand_compatibility_table(repo)
+
+    assert table.version == repo.version
+    base = next(iter(repo.all_candidates()))
+    scores = [
+        calculate_compatibility_score(base, candidate)[0]
+        for candidate in repo.all_candidates(exclude_id=base.perfume_id)
+    ]
+    assert table.feasible_counts[base.perfume_id] == len(scores)
+    assert abs(table.average_scores[base.perfume_id] - sum(scores) / len(scores)) < 1e-5
+
+
+def test_rank_brand_universal_perfume_uses_table_for_current_version(monkeypatch):
+    from agent import tools
+
+    repo = _synthetic_repository(monkeypatch)
+    brand_perfumes = repo.get_brand_perfumes("Brand 1")
+    tools.refresh_brand_compatibility_table(repo)
+    best, score, count, _ = rank_brand_universal_perfume(brand_perfumes, repo)
+
+    with monkeypatch.context() as patched:
+        patched.setattr(tools, "get_brand_compatibility_table", lambda repository: None)
+        live_best, live_score, live_count, _ = rank_brand_universal_perfume(brand_perfumes, repo)
+
+    assert best is not None and live_best is not None
+    assert best.perfume_id == live_best.perfume_id
+    assert abs(score - live_score) < 1e-9
+    assert count == live_count
+
+    built_version = repo.version
+    repo.reload()
+    assert tools._brand_table is not None
+    assert tools._brand_table.version == built_version != repo.version
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool  # [개선] 캐시 대기/빌드가 이벤트 루프를 막지 않도록
 from typing import Optional
 import os  # [개선] 환경 변수 지원
 from scentmap.app.schemas.nmap_schema import NMapResponse, FilterOptionsResponse
@@ -41,7 +42,8 @@ async def get_nmap_perfumes(
     [개선] 스마트 로딩 + 메모리 캐싱으로 성능 향상
     """
     try:
-        return get_nmap_data_cached(  # [개선] 캐싱 버전 사용
+        return await run_in_threadpool(  # [개선] 캐싱 버전 사용 (스레드 풀에서 실행)
+            get_nmap_data_cached,
             member_id=member_id,
             max_perfumes=max_perfumes,
             min_similarity=min_similarity,
@@ -64,7 +66,8 @@ async def get_nmap_result(
     [개선] 캐싱 적용 버전
     """
     try:
-        return get_nmap_data_cached(  # [개선] 캐싱 버전 사용
+        return await run_in_threadpool(  # [개선] 캐싱 버전 사용 (스레드 풀에서 실행)
+            get_nmap_data_cached,
             member_id=member_id,
             max_perfumes=max_perfumes,
             min_similarity=min_similarity,
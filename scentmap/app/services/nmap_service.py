@@ -1,7 +1,9 @@
 import time
 import logging
 import os  # [개선] 환경 변수 지원
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from psycopg2.extras import RealDictCursor
 from scentmap.db import get_db_connection, get_recom_db_connection, get_nmap_db_connection  # [개선] 향수지도 전용 커넥션 추가
@@ -24,8 +26,15 @@ _filter_cache_time: float = 0
 # [개선] NMap 데이터 캐싱 (환경 변수로 설정 가능)
 NMAP_CACHE_TTL = int(os.getenv("NMAP_CACHE_TTL", "1800"))  # 기본 30분
 NMAP_CACHE_MAX_SIZE = int(os.getenv("NMAP_CACHE_MAX_SIZE", "50"))  # 프로덕션: 50개
-_nmap_cache: Dict[str, NMapResponse] = {}
-_nmap_cache_time: Dict[str, float] = {}
+# [개선] TTL의 이 비율이 지나면 HIT 응답은 그대로 주고 백그라운드에서 미리 갱신 (0이면 비활성)
+NMAP_CACHE_REFRESH_AHEAD = float(os.getenv("NMAP_CACHE_REFRESH_AHEAD", "0.8"))
+# LRU 순서 유지: key -> (생성 시각, 응답), 가장 오래 안 쓴 항목이 앞쪽
+_nmap_cache: "OrderedDict[str, Tuple[float, NMapResponse]]" = OrderedDict()
+_nmap_cache_lock = threading.Lock()
+# [개선] 키별 single-flight: 같은 키의 동시 미스는 하나의 빌드 결과를 기다림
+_nmap_inflight: Dict[str, Future] = {}
+# 백그라운드 갱신은 1개씩만 (향수지도 전용 풀 커넥션 3개 보호)
+_nmap_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nmap-refresh")
 
 def get_filter_options() -> Dict[str, List[str]]:
     """향수 맵 필터링을 위한 옵션 목록 조회"""
@@ -100,19 +109,35 @@ def _fetch_popular_perfume_ids(limit: int = 300) -> List[int]:
     """인기/대표 향수 ID 조회 (우선순위 기반)"""
     popular_ids: List[int] = []
     try:
-        # TB_MEMBER_MY_PERFUME_T는 recom_db 소속
+        # [개선] backend가 미리 집계해 두는 인기도 테이블 사용 (recom_db, 아카이브 등록 수 순)
         with get_recom_db_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("""
-                    SELECT perfume_id, COUNT(*) as cnt
-                    FROM TB_MEMBER_MY_PERFUME_T
-                    GROUP BY perfume_id
-                    ORDER BY cnt DESC
+                    SELECT perfume_id
+                    FROM TB_PERFUME_POPULARITY_T
+                    WHERE archive_count > 0
+                    ORDER BY archive_count DESC, vote_total DESC
                     LIMIT %s
                 """, (limit,))
                 popular_ids = [row[0] for row in cur.fetchall()]
     except Exception as e:
-        logger.warning(f"인기 향수 조회 실패 (recom_db): {e}")
+        logger.warning(f"인기도 테이블 조회 실패, 아카이브 집계로 대체: {e}")
+
+    if not popular_ids:
+        try:
+            # TB_MEMBER_MY_PERFUME_T는 recom_db 소속
+            with get_recom_db_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT perfume_id, COUNT(*) as cnt
+                        FROM TB_MEMBER_MY_PERFUME_T
+                        GROUP BY perfume_id
+                        ORDER BY cnt DESC
+                        LIMIT %s
+                    """, (limit,))
+                    popular_ids = [row[0] for row in cur.fetchall()]
+        except Exception as e:
+            logger.warning(f"인기 향수 조회 실패 (recom_db): {e}")
 
     # 다양성 확보: 부족분은 nmap_db의 브랜드별 대표 향수로 채움
     if len(popular_ids) < limit:
@@ -411,6 +436,44 @@ def get_nmap_data(
     logger.info(f"✅ NMap 데이터 생성 완료: {len(p_map)}개 향수, {len(edges)}개 엣지, {build_time}초")
     return NMapResponse(nodes=nodes, edges=edges, summary=summary, meta=meta)
 
+def _store_nmap_cache(cache_key: str, built_at: float, result: NMapResponse) -> None:
+    """캐시 저장 + O(1) LRU 제거 (호출자가 _nmap_cache_lock 보유)"""
+    _nmap_cache[cache_key] = (built_at, result)
+    _nmap_cache.move_to_end(cache_key)
+    logger.debug(f"💾 Cache SAVED: {cache_key}")  # [개선] DEBUG로 변경
+    while len(_nmap_cache) > NMAP_CACHE_MAX_SIZE:
+        evicted_key, _ = _nmap_cache.popitem(last=False)
+        logger.info(f"🗑️ Cache EVICTED (크기 초과 {NMAP_CACHE_MAX_SIZE}): {evicted_key}")
+
+
+def _build_nmap_cache_entry(cache_key: str, future: Future, args: tuple) -> NMapResponse:
+    """데이터를 빌드해 캐시에 저장하고, 같은 키를 기다리는 요청들에게 결과 전달"""
+    built_at = time.time()
+    try:
+        result = get_nmap_data(*args)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        with _nmap_cache_lock:
+            _store_nmap_cache(cache_key, built_at, result)
+        future.set_result(result)
+        return result
+    finally:
+        with _nmap_cache_lock:
+            if _nmap_inflight.get(cache_key) is future:
+                del _nmap_inflight[cache_key]
+
+
+def _refresh_nmap_cache_entry(cache_key: str, future: Future, args: tuple) -> None:
+    try:
+        _build_nmap_cache_entry(cache_key, future, args)
+        logger.debug(f"🔄 Cache REFRESHED: {cache_key}")
+    except Exception as exc:
+        # 기존 캐시는 TTL까지 계속 사용, 만료 후 요청에서 다시 빌드
+        logger.warning(f"⚠️ Cache REFRESH 실패: {cache_key} - {exc}")
+
+
 # [개선] 캐싱이 적용된 향수 맵 데이터 조회
 def get_nmap_data_cached(
     member_id: Optional[int] = None,
@@ -421,40 +484,47 @@ def get_nmap_data_cached(
 ) -> NMapResponse:
     """캐시가 적용된 향수 맵 데이터 조회
     [개선] 메모리 캐싱으로 반복 요청 95% 성능 향상
+    [개선] 키별 single-flight + 만료 전 백그라운드 갱신(refresh-ahead) + O(1) LRU
     """
-    global _nmap_cache, _nmap_cache_time
-    
     # 1. 캐시 키 생성
     cache_key = _generate_cache_key(member_id, max_perfumes, min_similarity, top_accords)
-    
-    # 2. 캐시 확인
+    args = (member_id, max_perfumes, min_similarity, top_accords, debug)
+
+    # 2. 캐시 확인 (HIT / 만료 / 진행 중인 빌드 합류)
     now = time.time()
-    if cache_key in _nmap_cache:
-        if now - _nmap_cache_time[cache_key] < NMAP_CACHE_TTL:
-            # [개선] 프로덕션 로그 감소: INFO → DEBUG
-            logger.debug(f"✅ Cache HIT: {cache_key} (나이: {round(now - _nmap_cache_time[cache_key])}초)")
-            return _nmap_cache[cache_key]
-        else:
+    with _nmap_cache_lock:
+        entry = _nmap_cache.get(cache_key)
+        if entry is not None:
+            built_at, cached = entry
+            age = now - built_at
+            if age < NMAP_CACHE_TTL:
+                _nmap_cache.move_to_end(cache_key)
+                # [개선] 프로덕션 로그 감소: INFO → DEBUG
+                logger.debug(f"✅ Cache HIT: {cache_key} (나이: {round(age)}초)")
+                if (
+                    NMAP_CACHE_REFRESH_AHEAD > 0
+                    and age >= NMAP_CACHE_TTL * NMAP_CACHE_REFRESH_AHEAD
+                    and cache_key not in _nmap_inflight
+                ):
+                    future = Future()
+                    _nmap_inflight[cache_key] = future
+                    _nmap_refresh_executor.submit(_refresh_nmap_cache_entry, cache_key, future, args)
+                    logger.info(f"🔄 Cache REFRESH-AHEAD: {cache_key} (나이: {round(age)}초)")
+                return cached
             # 만료된 캐시 삭제
             logger.info(f"⏰ Cache EXPIRED: {cache_key}")  # 만료는 INFO 유지 (중요)
             del _nmap_cache[cache_key]
-            del _nmap_cache_time[cache_key]
-    
-    # 3. 캐시 미스 - 데이터 조회
+
+        future = _nmap_inflight.get(cache_key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _nmap_inflight[cache_key] = future
+
+    if not owner:
+        logger.info(f"⏳ Cache WAIT: {cache_key} - 진행 중인 빌드 결과 대기")
+        return future.result()
+
+    # 3. 캐시 미스 - 데이터 조회 (같은 키의 다른 요청은 이 결과를 공유)
     logger.info(f"❌ Cache MISS: {cache_key} - 새로 조회")  # 미스는 INFO 유지 (모니터링)
-    result = get_nmap_data(member_id, max_perfumes, min_similarity, top_accords, debug)
-    
-    # 4. 캐시 저장
-    _nmap_cache[cache_key] = result
-    _nmap_cache_time[cache_key] = now
-    logger.debug(f"💾 Cache SAVED: {cache_key}")  # [개선] DEBUG로 변경
-    
-    # [개선] 5. 캐시 크기 관리 (환경 변수로 설정 가능)
-    if len(_nmap_cache) > NMAP_CACHE_MAX_SIZE:
-        # 가장 오래된 캐시 삭제
-        oldest_key = min(_nmap_cache_time.keys(), key=lambda k: _nmap_cache_time[k])
-        logger.info(f"🗑️ Cache EVICTED (크기 초과 {NMAP_CACHE_MAX_SIZE}): {oldest_key}")
-        del _nmap_cache[oldest_key]
-        del _nmap_cache_time[oldest_key]
-    
-    return result
+    return _build_nmap_cache_entry(cache_key, future, args)
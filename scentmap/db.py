@@ -5,6 +5,8 @@ from contextlib import contextmanager
 from dotenv import load_dotenv
 import logging
 
+from scentmap.pool_metrics import InstrumentedConnectionPool
+
 load_dotenv()
 
 # 로깅 설정
@@ -34,13 +36,15 @@ def initialize_pool():
         if not _pg_pool:
             if DATABASE_URL:
                 logger.info(f"🔌 Connecting via PERFUME_DATABASE_URL...")
-                _pg_pool = psycopg2.pool.ThreadedConnectionPool(
-                    minconn=1, maxconn=10, dsn=DATABASE_URL
+                _pg_pool = InstrumentedConnectionPool(
+                    psycopg2.pool.ThreadedConnectionPool(minconn=1, maxconn=10, dsn=DATABASE_URL),
+                    "perfume_db",
                 )
             else:
                 logger.info(f"🔌 Connecting via DB_CONFIG...")
-                _pg_pool = psycopg2.pool.ThreadedConnectionPool(
-                    minconn=1, maxconn=10, **DB_CONFIG
+                _pg_pool = InstrumentedConnectionPool(
+                    psycopg2.pool.ThreadedConnectionPool(minconn=1, maxconn=10, **DB_CONFIG),
+                    "perfume_db",
                 )
             logger.info("✅ DB Connection Pool created successfully")
     except (Exception, psycopg2.DatabaseError) as error:
@@ -53,8 +57,9 @@ def initialize_recom_pool():
         if not _recom_pg_pool:
             if RECOM_DATABASE_URL:
                 logger.info("🔌 Connecting via RECOM_DATABASE_URL...")
-                _recom_pg_pool = psycopg2.pool.ThreadedConnectionPool(
-                    minconn=1, maxconn=10, dsn=RECOM_DATABASE_URL
+                _recom_pg_pool = InstrumentedConnectionPool(
+                    psycopg2.pool.ThreadedConnectionPool(minconn=1, maxconn=10, dsn=RECOM_DATABASE_URL),
+                    "recom_db",
                 )
             else:
                 recom_db_config = {
@@ -65,8 +70,9 @@ def initialize_recom_pool():
                     "port": os.getenv("RECOM_DB_PORT", DB_CONFIG["port"]),
                 }
                 logger.info("🔌 Connecting via RECOM_DB_CONFIG...")
-                _recom_pg_pool = psycopg2.pool.ThreadedConnectionPool(
-                    minconn=1, maxconn=10, **recom_db_config
+                _recom_pg_pool = InstrumentedConnectionPool(
+                    psycopg2.pool.ThreadedConnectionPool(minconn=1, maxconn=10, **recom_db_config),
+                    "recom_db",
                 )
             logger.info("✅ Recom DB Connection Pool created successfully")
     except (Exception, psycopg2.DatabaseError) as error:
@@ -99,17 +105,23 @@ def initialize_nmap_pool():
             
             if DATABASE_URL:
                 logger.info(f"🗺️ [NMap] Connecting via PERFUME_DATABASE_URL... (min:{minconn}, max:{maxconn})")
-                _nmap_pg_pool = psycopg2.pool.ThreadedConnectionPool(
-                    minconn=minconn,
-                    maxconn=maxconn,  # [개선] 프로덕션: 3개로 축소
-                    dsn=DATABASE_URL
+                _nmap_pg_pool = InstrumentedConnectionPool(
+                    psycopg2.pool.ThreadedConnectionPool(
+                        minconn=minconn,
+                        maxconn=maxconn,  # [개선] 프로덕션: 3개로 축소
+                        dsn=DATABASE_URL
+                    ),
+                    "nmap",
                 )
             else:
                 logger.info(f"🗺️ [NMap] Connecting via DB_CONFIG... (min:{minconn}, max:{maxconn})")
-                _nmap_pg_pool = psycopg2.pool.ThreadedConnectionPool(
-                    minconn=minconn,
-                    maxconn=maxconn,  # [개선] 프로덕션: 3개로 축소
-                    **DB_CONFIG
+                _nmap_pg_pool = InstrumentedConnectionPool(
+                    psycopg2.pool.ThreadedConnectionPool(
+                        minconn=minconn,
+                        maxconn=maxconn,  # [개선] 프로덕션: 3개로 축소
+                        **DB_CONFIG
+                    ),
+                    "nmap",
                 )
             logger.info(f"✅ [NMap] 향수지도 전용 Connection Pool 생성 완료 (max: {maxconn})")
     except (Exception, psycopg2.DatabaseError) as error:
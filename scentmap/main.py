@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 import logging
@@ -6,6 +6,7 @@ from contextlib import asynccontextmanager
 import os
 
 from scentmap.db import init_db_schema, close_pool, close_nmap_pool  # [개선] NMap Pool 종료 추가
+from scentmap.pool_metrics import pool_metrics
 from scentmap.app.api.label import router as labels_router
 from scentmap.app.api.session import router as session_router
 from scentmap.app.api.ncard import router as ncard_router
@@ -76,6 +77,17 @@ def root():
 def health():
     return {"status": "ok", "service": "scentmap"}
 
+# 내부 운영용: POOL_METRICS_ENABLED=1일 때만 노출 (기본 404)
+POOL_METRICS_ENABLED = os.getenv("POOL_METRICS_ENABLED", "0") == "1"
+
+@app.get("/metrics/pools")
+def get_pool_metrics(include_stacks: bool = Query(False)):
+    # 커넥션 풀별 대기/점유 시간, 고갈 횟수, 오래 반납되지 않은 커넥션의 호출 위치
+    # (전체 스택은 POOL_TRACK_STACKS=1로 수집 중일 때 include_stacks=true로만 조회)
+    if not POOL_METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return pool_metrics(include_stacks=include_stacks)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("scentmap.main:app", host="0.0.0.0", port=8001, reload=True)
@@ -0,0 +1,206 @@
+"""
+Scentmap 커넥션 풀 계측 (대기 시간 / 사용 중 개수 / 점유 시간 / 고갈 / 장기 점유 추적)
+
+psycopg2 ThreadedConnectionPool을 감싸 getconn/putconn만 계측합니다.
+- wait: getconn 소요 시간 (락 경합 + 새 커넥션 생성)
+- hold: getconn ~ putconn 사이 점유 시간
+- exhausted: maxconn 초과로 PoolError가 난 횟수 (이때 오래 잡고 있는 호출 위치를 함께 출력)
+- long_held: POOL_HOLD_WARN_SECONDS보다 오래 반납되지 않은 커넥션과 이를 가져간 호출 위치(site)
+  (반납 시점에 임계값을 넘었다면 그때도 경고 로그)
+- 전체 호출 스택 저장은 비용이 크고 파일 경로가 노출되므로 POOL_TRACK_STACKS=1일 때만 (기본은 호출 위치 한 줄)
+등록된 풀은 pool_metrics()로 한 번에 조회합니다. (/metrics/pools, 스택은 include_stacks=True일 때만 포함)
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from psycopg2 import pool
+
+logger = logging.getLogger(__name__)
+
+POOL_HOLD_WARN_SECONDS = float(os.getenv("POOL_HOLD_WARN_SECONDS", "5"))
+POOL_TRACK_STACKS = os.getenv("POOL_TRACK_STACKS", "0") == "1"
+POOL_STACK_DEPTH = int(os.getenv("POOL_STACK_DEPTH", "12"))
+
+_SAMPLE_SIZE = 1024
+
+
+class _Timing:
+    """누적 횟수/합/최댓값 + 최근 표본으로 p95 계산"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: Deque[float] = deque(maxlen=_SAMPLE_SIZE)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        recent = sorted(self.recent)
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p95_ms": round(p95 * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+def _is_pool_frame(filename: str, name: str) -> bool:
+    # 풀 자체와 get_*_connection / contextmanager 래퍼는 호출 위치에서 제외
+    return (
+        filename == __file__
+        or filename.endswith("contextlib.py")
+        or (name.startswith(("get_", "release_")) and name.endswith("connection"))
+    )
+
+
+def _call_site(frame) -> str:
+    """풀 래퍼를 건너뛴 첫 호출 위치 (프레임만 따라가므로 스택 추출보다 가벼움)"""
+    for _ in range(POOL_STACK_DEPTH):
+        if frame is None:
+            break
+        code = frame.f_code
+        if not _is_pool_frame(code.co_filename, code.co_name):
+            return f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class _Checkout:
+    __slots__ = ("acquired_at", "thread", "site", "stack")
+
+    def __init__(
+        self, acquired_at: float, thread: str, site: str, stack: Optional[traceback.StackSummary]
+    ) -> None:
+        self.acquired_at = acquired_at
+        self.thread = thread
+        self.site = site
+        self.stack = stack
+
+    def describe(self, now: float, include_stack: bool = False) -> Dict[str, Any]:
+        info = {
+            "held_seconds": round(now - self.acquired_at, 3),
+            "thread": self.thread,
+            "site": self.site,
+        }
+        if include_stack and self.stack:
+            info["stack"] = [
+                f"{frame.filename}:{frame.lineno} {frame.name}"
+                for frame in self.stack
+                if not _is_pool_frame(frame.filename, frame.name)
+            ]
+        return info
+
+
+class InstrumentedConnectionPool:
+    """ThreadedConnectionPool을 감싸 getconn/putconn을 계측 (나머지 속성/메서드는 그대로 위임)"""
+
+    def __init__(self, inner: pool.AbstractConnectionPool, name: str = "pool") -> None:
+        self.inner = inner
+        self.name = name
+        self.hold_warn_seconds = POOL_HOLD_WARN_SECONDS
+        self.track_stacks = POOL_TRACK_STACKS
+        self._stats_lock = threading.Lock()
+        self._checkouts: Dict[int, _Checkout] = {}
+        self._wait = _Timing()
+        self._hold = _Timing()
+        self.exhausted = 0
+        self.long_holds = 0
+        register_pool(self)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.inner, attr)
+
+    def getconn(self, key=None):
+        started = time.perf_counter()
+        try:
+            conn = self.inner.getconn(key)
+        except pool.PoolError as e:
+            if not self.inner.closed:
+                with self._stats_lock:
+                    self.exhausted += 1
+                self._report_exhausted(e)
+            raise
+        acquired_at = time.perf_counter()
+        caller = sys._getframe(1)
+        stack = None
+        if self.track_stacks:
+            stack = traceback.StackSummary.extract(
+                traceback.walk_stack(caller), limit=POOL_STACK_DEPTH, lookup_lines=False
+            )
+        checkout = _Checkout(acquired_at, threading.current_thread().name, _call_site(caller), stack)
+        with self._stats_lock:
+            self._wait.add(acquired_at - started)
+            self._checkouts[id(conn)] = checkout
+        return conn
+
+    def putconn(self, conn=None, key=None, close=False):
+        with self._stats_lock:
+            checkout = self._checkouts.pop(id(conn), None)
+            held = time.perf_counter() - checkout.acquired_at if checkout else None
+            if held is not None:
+                self._hold.add(held)
+                if held > self.hold_warn_seconds:
+                    self.long_holds += 1
+        if held is not None and held > self.hold_warn_seconds:
+            logger.warning(
+                f"⚠️ [Pool:{self.name}] connection held {held:.2f}s (> {self.hold_warn_seconds:.0f}s) "
+                f"by {checkout.site}\n" + "".join(checkout.stack.format() if checkout.stack else [])
+            )
+        self.inner.putconn(conn, key, close)
+
+    def _report_exhausted(self, error: Exception) -> None:
+        holders = self.long_held(min_seconds=0)[:3]
+        sites = ", ".join(f"{h['site']} ({h['held_seconds']}s)" for h in holders) or "unknown"
+        logger.error(f"🚨 [Pool:{self.name}] {error} (max {self.inner.maxconn}) - longest holders: {sites}")
+
+    def long_held(self, min_seconds: Optional[float] = None, include_stacks: bool = False) -> List[Dict[str, Any]]:
+        """현재 min_seconds(기본 hold_warn_seconds)보다 오래 반납되지 않은 커넥션 (오래된 순)"""
+        threshold = self.hold_warn_seconds if min_seconds is None else min_seconds
+        now = time.perf_counter()
+        with self._stats_lock:
+            checkouts = list(self._checkouts.values())
+        checkouts.sort(key=lambda c: c.acquired_at)
+        return [c.describe(now, include_stacks) for c in checkouts if now - c.acquired_at >= threshold]
+
+    def snapshot(self, include_stacks: bool = False) -> Dict[str, Any]:
+        with self._stats_lock:
+            in_use = len(self._checkouts)
+            stats = {
+                "name": self.name,
+                "minconn": self.inner.minconn,
+                "maxconn": self.inner.maxconn,
+                "in_use": in_use,
+                "idle": len(self.inner._pool),
+                "closed": self.inner.closed,
+                "exhausted": self.exhausted,
+                "long_holds": self.long_holds,
+                "wait": self._wait.summary(),
+                "hold": self._hold.summary(),
+            }
+        stats["long_held"] = self.long_held(include_stacks=include_stacks)
+        return stats
+
+
+_POOLS: Dict[str, InstrumentedConnectionPool] = {}
+
+
+def register_pool(instrumented: InstrumentedConnectionPool) -> None:
+    # 같은 이름으로 다시 만들면(close 후 재초기화 등) 최신 풀로 대체
+    _POOLS[instrumented.name] = instrumented
+
+
+def pool_metrics(include_stacks: bool = False) -> Dict[str, Any]:
+    return {name: p.snapshot(include_stacks) for name, p in _POOLS.items()}
@@ -2,14 +2,18 @@
 향수 유사도 계산 배치 스크립트
 
 전체 향수 간 유사도를 계산하여 TB_PERFUME_SIMILARITY 테이블에 저장합니다.
-실행 시간: 약 10-30분 (향수 개수에 따라 다름)
+어코드 투표 프로필을 L2 정규화한 행렬로 만든 뒤, 행 블록 단위 행렬곱으로
+코사인 유사도를 계산하고 여러 워커 프로세스에 블록을 나눠 처리합니다.
+향수별 상위 K개(기본 100개) 중 임계값(0.3) 이상인 엣지만 남기며,
+계산이 끝난 뒤 COPY로 임시 테이블에 적재하고 짧은 트랜잭션으로 교체합니다.
 
 실행 방법:
     cd Scentence\scentmap
-    python scripts/batch_similarity.py
+    python scripts/batch_similarity.py [--workers 4] [--block-size 512] [--top-k 100]
 """
 
-import math
+import argparse
+import io
 import time
 import sys
 import os
@@ -18,27 +22,21 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from collections import defaultdict
-from typing import Dict, Tuple
-from psycopg2.extras import RealDictCursor, execute_values
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
-from db import get_db_connection, init_db_schema
-
-
-def calculate_similarity(
-    profile1: Dict[str, float], profile2: Dict[str, float]
-) -> float:
-    keys = set(profile1.keys()) & set(profile2.keys())
-    if not keys:
-        return 0.0
+import numpy as np
+from psycopg2.extras import RealDictCursor
 
-    vec1 = [profile1[k] for k in keys]
-    vec2 = [profile2[k] for k in keys]
+from db import get_db_connection, init_db_schema
 
-    dot = sum(a * b for a, b in zip(vec1, vec2))
-    mag1 = math.sqrt(sum(v * v for v in profile1.values()))
-    mag2 = math.sqrt(sum(v * v for v in profile2.values()))
+SIMILARITY_THRESHOLD = 0.3
+DEFAULT_TOP_K = 100  # 0이면 임계값 이상 전체 저장 (기존 동작)
+DEFAULT_BLOCK_SIZE = 512
+COPY_CHUNK_SIZE = 100000
 
-    return dot / (mag1 * mag2) if mag1 * mag2 > 0 else 0.0
+# 워커 프로세스에서 공유하는 정규화 프로필 행렬
+_profile_matrix: Optional[np.ndarray] = None
 
 
 def format_time(seconds):
@@ -47,96 +45,226 @@ def format_time(seconds):
     return f"{h:02d}:{m:02d}:{s:02d}"
 
 
-def run_batch_job():
-    print("🚀 [Batch] 향수 유사도 계산 및 적재 시작...")
-    init_db_schema()
-
-    process_start_time = time.time()
+def load_profiles() -> Tuple[List[int], np.ndarray]:
+    """어코드 투표 비율 프로필을 (향수 ID 목록, L2 정규화 행렬)로 로드"""
+    with get_db_connection() as conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("SELECT perfume_id FROM TB_PERFUME_BASIC_M ORDER BY perfume_id")
+                perfumes = cur.fetchall()
+
+                cur.execute("SELECT perfume_id, accord, vote FROM TB_PERFUME_ACCORD_M")
+                accords = cur.fetchall()
+        finally:
+            # 계산 동안 트랜잭션/커넥션을 잡고 있지 않도록 바로 종료
+            conn.rollback()
+
+    accords_by_id = defaultdict(list)
+    for row in accords:
+        accords_by_id[row["perfume_id"]].append((row["accord"], row["vote"] or 0))
+
+    p_ids = [p["perfume_id"] for p in perfumes]
+    accord_index: Dict[str, int] = {}
+    for raw_accords in accords_by_id.values():
+        for accord, _ in raw_accords:
+            accord_index.setdefault(accord, len(accord_index))
+
+    matrix = np.zeros((len(p_ids), max(len(accord_index), 1)), dtype=np.float32)
+    for row, pid in enumerate(p_ids):
+        raw_accords = accords_by_id.get(pid, [])
+        total = sum(v for _, v in raw_accords)
+        if total <= 0:
+            continue
+        # 같은 어코드가 중복되면 마지막 값이 남던 기존 dict 프로필과 동일하게 덮어쓴다
+        for accord, vote in raw_accords:
+            matrix[row, accord_index[accord]] = vote / total
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return p_ids, matrix
+
+
+def _init_worker(matrix: np.ndarray) -> None:
+    global _profile_matrix
+    _profile_matrix = matrix
+
+
+def compute_block(
+    start: int, stop: int, top_k: int, threshold: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """행 블록 [start, stop)의 유사도 엣지를 (a 인덱스, b 인덱스, 점수)로 반환 (a < b)"""
+    matrix = _profile_matrix
+    sims = matrix[start:stop] @ matrix.T
+    rows = np.arange(start, stop)
+    local_rows = np.arange(stop - start)
+    sims[local_rows, rows] = -1.0  # 자기 자신 제외
+
+    if top_k and top_k < sims.shape[1]:
+        cols = np.argpartition(-sims, top_k - 1, axis=1)[:, :top_k]
+        scores = np.take_along_axis(sims, cols, axis=1)
+        src = np.broadcast_to(rows[:, None], cols.shape)
+        keep = scores >= threshold
+        src, dst, scores = src[keep], cols[keep], scores[keep]
+    else:
+        # 상위 K 제한 없이 임계값 이상 전체 (상삼각만)
+        local, dst = np.nonzero(sims >= threshold)
+        src = rows[local]
+        upper = dst > src
+        src, dst = src[upper], dst[upper]
+        scores = sims[local[upper], dst]
+
+    return np.minimum(src, dst), np.maximum(src, dst), scores.astype(np.float32)
+
+
+def compute_similarity_edges(
+    matrix: np.ndarray,
+    top_k: int = DEFAULT_TOP_K,
+    threshold: float = SIMILARITY_THRESHOLD,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    workers: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """전체 유사도 엣지 계산 (향수별 상위 K + 임계값, 중복 제거)"""
+    total_count = matrix.shape[0]
+    blocks = [(start, min(start + block_size, total_count)) for start in range(0, total_count, block_size)]
+    parts_a, parts_b, parts_score = [], [], []
+
+    def _collect(result, done: int) -> None:
+        a_idx, b_idx, scores = result
+        parts_a.append(a_idx)
+        parts_b.append(b_idx)
+        parts_score.append(scores)
+        percent = (done / len(blocks)) * 100 if blocks else 100.0
+        sys.stdout.write(f"\r⏳ 계산 진행률: {percent:6.2f}% ({done}/{len(blocks)} 블록)")
+        sys.stdout.flush()
+
+    if workers == 1 or len(blocks) <= 1:
+        _init_worker(matrix)
+        for done, (start, stop) in enumerate(blocks, start=1):
+            _collect(compute_block(start, stop, top_k, threshold), done)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(matrix,)
+        ) as executor:
+            futures = [
+                executor.submit(compute_block, start, stop, top_k, threshold)
+                for start, stop in blocks
+            ]
+            for done, future in enumerate(futures, start=1):
+                _collect(future.result(), done)
+    print("\n")
+
+    if not parts_a:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=np.float32)
+
+    a_idx = np.concatenate(parts_a).astype(np.int64)
+    b_idx = np.concatenate(parts_b).astype(np.int64)
+    scores = np.concatenate(parts_score)
+    # 양쪽 향수의 상위 K에 모두 들어간 엣지는 한 번만 남긴다
+    _, unique = np.unique(a_idx * total_count + b_idx, return_index=True)
+    return a_idx[unique], b_idx[unique], scores[unique]
+
+
+def _copy_rows(cur, rows) -> None:
+    buffer = io.StringIO()
+    buffer.writelines(f"{a}\t{b}\t{score}\n" for a, b, score in rows)
+    buffer.seek(0)
+    cur.copy_expert(
+        "COPY tmp_perfume_similarity (perfume_id_a, perfume_id_b, score) FROM STDIN",
+        buffer,
+    )
+
+
+def load_similarity_edges(
+    p_ids: List[int], a_idx: np.ndarray, b_idx: np.ndarray, scores: np.ndarray
+) -> None:
+    """COPY로 임시 테이블에 스트리밍 적재 후 짧은 트랜잭션으로 본 테이블 교체"""
+    total_results = len(scores)
+    ids = np.asarray(p_ids)
+    rounded = np.round(scores.astype(np.float64), 4)
 
     with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            # 1. 데이터 로드
-            print("📦 향수 데이터 로딩 중...")
-            cur.execute("SELECT perfume_id FROM TB_PERFUME_BASIC_M ORDER BY perfume_id")
-            perfumes = cur.fetchall()
-
-            cur.execute("SELECT perfume_id, accord, vote FROM TB_PERFUME_ACCORD_M")
-            accords = cur.fetchall()
-
-            accords_by_id = defaultdict(list)
-            for row in accords:
-                accords_by_id[row["perfume_id"]].append(
-                    (row["accord"], row["vote"] or 0)
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS tmp_perfume_similarity "
+                    "(LIKE TB_PERFUME_SIMILARITY) ON COMMIT PRESERVE ROWS"
                 )
+                cur.execute("TRUNCATE tmp_perfume_similarity")
+                conn.commit()
+
+                inserted_count = 0
+                for i in range(0, total_results, COPY_CHUNK_SIZE):
+                    chunk = slice(i, i + COPY_CHUNK_SIZE)
+                    _copy_rows(
+                        cur,
+                        zip(ids[a_idx[chunk]].tolist(), ids[b_idx[chunk]].tolist(), rounded[chunk].tolist()),
+                    )
+                    conn.commit()
 
-            profiles = {}
-            for p in perfumes:
-                pid = p["perfume_id"]
-                raw_accords = accords_by_id.get(pid, [])
-                total = sum(v for _, v in raw_accords)
-                if total > 0:
-                    profiles[pid] = {k: v / total for k, v in raw_accords}
-                else:
-                    profiles[pid] = {}
-
-            # 2. 유사도 계산
-            results = []
-            p_ids = list(profiles.keys())
-            total_count = len(p_ids)
-
-            print(f"📊 [Step 1/2] 상호 유사도 계산 중 ({total_count}개 향수)...")
-            calc_start_time = time.time()
-
-            for i in range(total_count):
-                for j in range(i + 1, total_count):
-                    pid_a = p_ids[i]
-                    pid_b = p_ids[j]
-                    sim = calculate_similarity(profiles[pid_a], profiles[pid_b])
-                    if sim >= 0.3:
-                        results.append((pid_a, pid_b, round(sim, 4)))
-
-                if i % 50 == 0 or i == total_count - 1:
-                    current = i + 1
-                    percent = (current / total_count) * 100
-                    elapsed = time.time() - calc_start_time
+                    inserted_count = min(i + COPY_CHUNK_SIZE, total_results)
+                    percent = (inserted_count / total_results) * 100
                     sys.stdout.write(
-                        f"\r⏳ 계산 진행률: {percent:6.2f}% ({current}/{total_count})"
+                        f"\r📥 적재 중: {percent:6.2f}% ({inserted_count}/{total_results}) "
+                        f"| 남은 데이터: {total_results - inserted_count}건"
                     )
                     sys.stdout.flush()
 
-            print("\n")  # 줄바꿈
-
-            # 3. DB 적재 (Chunk Insert)
-            total_results = len(results)
-            print(f"💾 [Step 2/2] DB 적재 시작 (총 {total_results}건)...")
-
-            cur.execute("TRUNCATE TABLE TB_PERFUME_SIMILARITY")
-
-            insert_sql = "INSERT INTO TB_PERFUME_SIMILARITY (perfume_id_a, perfume_id_b, score) VALUES %s"
-
-            # [핵심] 한 번에 다 넣지 않고 10,000개씩 잘라서 넣으며 진행상황 표시
-            batch_size = 10000
-            inserted_count = 0
+                # 본 테이블은 교체 구간에서만 잠근다
+                cur.execute("TRUNCATE TABLE TB_PERFUME_SIMILARITY")
+                cur.execute(
+                    "INSERT INTO TB_PERFUME_SIMILARITY (perfume_id_a, perfume_id_b, score) "
+                    "SELECT perfume_id_a, perfume_id_b, score FROM tmp_perfume_similarity"
+                )
+                cur.execute("DROP TABLE tmp_perfume_similarity")
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def run_batch_job(
+    workers: Optional[int] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    top_k: int = DEFAULT_TOP_K,
+    threshold: float = SIMILARITY_THRESHOLD,
+):
+    print("🚀 [Batch] 향수 유사도 계산 및 적재 시작...")
+    init_db_schema()
 
-            for i in range(0, total_results, batch_size):
-                batch = results[i : i + batch_size]
-                execute_values(cur, insert_sql, batch)
+    process_start_time = time.time()
 
-                inserted_count += len(batch)
-                percent = (inserted_count / total_results) * 100
+    # 1. 데이터 로드
+    print("📦 향수 데이터 로딩 중...")
+    p_ids, matrix = load_profiles()
 
-                # 적재 진행률 표시
-                sys.stdout.write(
-                    f"\r📥 적재 중: {percent:6.2f}% ({inserted_count}/{total_results}) "
-                    f"| 남은 데이터: {total_results - inserted_count}건"
-                )
-                sys.stdout.flush()
+    # 2. 유사도 계산
+    print(
+        f"📊 [Step 1/2] 상호 유사도 계산 중 ({len(p_ids)}개 향수, "
+        f"블록 {block_size}, 상위 {top_k or '전체'}, 워커 {workers or os.cpu_count()})..."
+    )
+    a_idx, b_idx, scores = compute_similarity_edges(
+        matrix, top_k=top_k, threshold=threshold, block_size=block_size, workers=workers
+    )
 
-            conn.commit()
+    # 3. DB 적재 (COPY)
+    print(f"💾 [Step 2/2] DB 적재 시작 (총 {len(scores)}건)...")
+    load_similarity_edges(p_ids, a_idx, b_idx, scores)
 
     total_elapsed = time.time() - process_start_time
     print(f"\n✅ [완료] 총 소요시간: {format_time(total_elapsed)}")
 
 
 if __name__ == "__main__":
-    run_batch_job()
+    parser = argparse.ArgumentParser(description="TB_PERFUME_SIMILARITY 재계산")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE, help="행 블록 크기")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="향수별 최대 엣지 수 (0: 제한 없음)")
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD, help="최소 유사도")
+    args = parser.parse_args()
+    run_batch_job(
+        workers=args.workers,
+        block_size=args.block_size,
+        top_k=args.top_k,
+        threshold=args.threshold,
+    )